@@ -8,13 +8,18 @@ import httpx
 from ..config import settings
 
 
+# items_page returns 25 items unless asked for more; Monday caps a page at 500.
+ITEMS_PER_QUERY = 100
+
+
 class MondayClient:
-    def __init__(self, token: str | None = None) -> None:
+    def __init__(self, token: str | None = None, client: httpx.AsyncClient | None = None) -> None:
         self.token = token or settings.MONDAY_TOKEN
-        self.client = httpx.AsyncClient(
+        self.client = client or httpx.AsyncClient(
             base_url="https://api.monday.com/v2",
             headers={"Authorization": self.token},
             trust_env=False,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
         )
 
     async def close(self) -> None:
@@ -39,6 +44,33 @@ class MondayClient:
         items = data["data"]["boards"][0]["items_page"]["items"]
         return items[0] if items else {}
 
+    async def get_items(self, board_id: str, item_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several items of one board, ``ITEMS_PER_QUERY`` per GraphQL request."""
+        query = """
+        query ($bid:[ID!], $iid:[ID!], $limit:Int!) {
+          boards(ids:$bid) {
+            items_page(limit:$limit, query_params:{ids:$iid}) {
+              items { id name updated_at group { id title } column_values { id title text type value } subitems { id name } }
+            }
+          }
+        }
+        """
+        items: List[Dict[str, Any]] = []
+        for start in range(0, len(item_ids), ITEMS_PER_QUERY):
+            chunk = item_ids[start:start + ITEMS_PER_QUERY]
+            variables = {"bid": board_id, "iid": chunk, "limit": len(chunk)}
+            resp = await self.client.post(
+                "/", json={"query": query, "variables": variables}
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            boards = data["data"]["boards"]
+            if boards:
+                items.extend(boards[0]["items_page"]["items"])
+        for item in items:
+            item.setdefault("board_id", board_id)
+        return items
+
     async def update_status(self, board_id: str, item_id: str, value: str) -> None:
         mutation = """
         mutation($bid:ID!, $iid:ID!, $col:ID!, $val:String!) {
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import weakref
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopScopedPool(Generic[T]):
+    """
+    One long-lived instance per running event loop.
+
+    httpx async clients (and asyncio primitives) are bound to the loop that
+    created them, so the app keeps one per loop instead of one per request.
+    In a server process that is a single app-lifetime instance.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self.factory = factory
+        self._instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        instance = self._instances.get(loop)
+        if instance is None:
+            instance = self._instances[loop] = self.factory()
+        return instance
+
+    async def aclose(self) -> None:
+        """Close and drop the current loop's instance, if any."""
+        instance = self._instances.pop(asyncio.get_running_loop(), None)
+        close = getattr(instance, "close", None)
+        if close is not None:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     ENV: str = "dev"
     DATABASE_URL: str = "sqlite+aiosqlite:///./dev.db"
     ALLOW_MONDAY_WRITES: bool = False
+    WEBHOOK_DEBOUNCE_SECONDS: float = 0.05
+    WEBHOOK_MAX_BATCH: int = 200
     LLM_API_KEY: str = ""
     LLM_ENDPOINT: str = ""
     LLM_MODEL: str = ""
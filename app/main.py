@@ -4,11 +4,20 @@ Canonical MCP runtime lives in `app.mcp_gateway:app`.
 This module remains for compatibility with older middleware-only integrations.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from .routes import agent, health, webhooks
 
-app = FastAPI(title="Task Middleware")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    await webhooks.close_clients()
+
+
+app = FastAPI(title="Task Middleware", lifespan=lifespan)
 app.include_router(health.router)
 app.include_router(webhooks.router)
 app.include_router(agent.router)
@@ -236,7 +236,7 @@ async def exchange_a2a_handshake(
     handshake_service: A2AHandshakeService = Depends(get_handshake_service),
 ) -> dict[str, Any]:
     try:
-        envelope = handshake_service.exchange_handshake(
+        envelope = await handshake_service.aexchange_handshake(
             handshake_id=handshake_id,
             requested_scopes=request.requested_scopes,
             requested_tools=request.requested_tools,
@@ -1,28 +1,69 @@
+from collections import defaultdict
+
 from fastapi import APIRouter, Depends
 
+from ..config import settings
 from ..deps import get_session
 from ..clients.monday import MondayClient
+from ..clients.pool import LoopScopedPool
 from ..services import normalize, sync
+from ..services.webhook_intake import CoalescingIntake
 from ..schemas.events import MondayWebhookEvent, AirtableWebhookEvent
 
 router = APIRouter()
 
+# App-lifetime Monday client; a board-wide bulk edit reuses its connections.
+monday_clients = LoopScopedPool(lambda: MondayClient())
+
+
+async def _sync_monday_events(events, session) -> None:
+    client = monday_clients.get()
+    item_ids = defaultdict(list)
+    for event in events:
+        item_ids[event.board_id].append(event.item_id)
+    items = []
+    for board_id, ids in item_ids.items():
+        items.extend(await client.get_items(board_id, ids))
+    tasks = [normalize.normalize_monday_item(item) for item in items]
+    ctxs = [{"proposed_status": task.status, "actor_system": "monday"} for task in tasks]
+    await sync.bulk_upsert_and_sync(session, list(zip(tasks, ctxs)), client)
+
+
+async def _sync_airtable_events(events, session) -> None:
+    tasks = [
+        normalize.normalize_airtable_record({"id": event.record_id, "fields": event.fields})
+        for event in events
+    ]
+    ctxs = [{"proposed_status": task.status, "actor_system": "airtable"} for task in tasks]
+    await sync.bulk_upsert_and_sync(session, list(zip(tasks, ctxs)))
+
+
+def _intake(process, key) -> LoopScopedPool:
+    return LoopScopedPool(
+        lambda: CoalescingIntake(
+            key,
+            process,
+            debounce_seconds=settings.WEBHOOK_DEBOUNCE_SECONDS,
+            max_batch=settings.WEBHOOK_MAX_BATCH,
+        )
+    )
+
+
+monday_intake = _intake(_sync_monday_events, lambda e: (e.board_id, e.item_id))
+airtable_intake = _intake(_sync_airtable_events, lambda e: e.fields.get("item_id") or e.record_id)
+
+
+async def close_clients() -> None:
+    await monday_clients.aclose()
+
 
 @router.post("/webhook/monday")
 async def webhook_monday(event: MondayWebhookEvent, session=Depends(get_session)):
-    client = MondayClient()
-    item = await client.get_item(event.board_id, event.item_id)
-    task = normalize.normalize_monday_item(item)
-    ctx = {"proposed_status": task.status, "actor_system": "monday"}
-    await sync.upsert_and_sync(session, task, ctx, client)
-    await client.close()
+    await monday_intake.get().submit(event, session)
     return {"received": True}
 
 
 @router.post("/webhook/airtable")
 async def webhook_airtable(event: AirtableWebhookEvent, session=Depends(get_session)):
-    record = {"id": event.record_id, "fields": event.fields}
-    task = normalize.normalize_airtable_record(record)
-    ctx = {"proposed_status": task.status, "actor_system": "airtable"}
-    await sync.upsert_and_sync(session, task, ctx)
+    await airtable_intake.get().submit(event, session)
     return {"received": True}
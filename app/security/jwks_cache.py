@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from typing import Any, Callable, Mapping
+
+import jwt
+
+LOGGER = logging.getLogger(__name__)
+
+
+class JWKSUnavailableError(Exception):
+    """No usable signing key could be obtained for a token."""
+
+
+def _fetch_jwks_document(url: str, timeout: float) -> dict[str, Any]:
+    request = urllib.request.Request(url, headers={"Accept": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+class JWKSCache:
+    """
+    Kid-indexed signing keys for one JWKS endpoint.
+
+    Keys older than ``refresh_interval`` are still served while a background
+    thread refetches them; an unknown ``kid`` forces a synchronous refetch at
+    most once per ``min_refetch_interval``. If the issuer is unreachable the
+    last good key set is served for up to ``max_stale`` seconds.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        *,
+        refresh_interval: float = 300.0,
+        min_refetch_interval: float = 30.0,
+        max_stale: float = 86_400.0,
+        timeout: float = 5.0,
+        fetch: Callable[[str, float], Mapping[str, Any]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.max_stale = max_stale
+        self.timeout = timeout
+        self.fetch = fetch or _fetch_jwks_document
+        self.clock = clock
+
+        self._keys: dict[str | None, jwt.PyJWK] = {}
+        self._fetched_at: float | None = None
+        self._last_attempt: float | None = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.fetch_count = 0
+
+    def get_signing_key(self, kid: str | None) -> jwt.PyJWK:
+        now = self.clock()
+        key = self._keys.get(kid)
+        age = None if self._fetched_at is None else now - self._fetched_at
+
+        if key is not None and age is not None:
+            if age <= self.refresh_interval:
+                return key
+            if age <= self.max_stale:
+                self._refresh_in_background()
+                return key
+
+        if self._may_refetch(now):
+            self.refresh()
+
+        if self._fetched_at is None or self.clock() - self._fetched_at > self.max_stale:
+            raise JWKSUnavailableError(f"JWKS key set unavailable for {self.jwks_url}")
+        key = self._keys.get(kid)
+        if key is None:
+            raise JWKSUnavailableError(f"no JWKS signing key for kid={kid!r}")
+        return key
+
+    def refresh(self) -> bool:
+        """Refetch the key set; keeps the previous keys if the fetch fails."""
+        with self._lock:
+            self._last_attempt = self.clock()
+            self.fetch_count += 1
+        try:
+            document = self.fetch(self.jwks_url, self.timeout)
+            keys = self._index(jwt.PyJWKSet.from_dict(dict(document)))
+        except Exception as exc:
+            LOGGER.warning("JWKS refresh failed for %s: %s", self.jwks_url, exc)
+            return False
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = self.clock()
+        return True
+
+    def _may_refetch(self, now: float) -> bool:
+        with self._lock:
+            last = self._last_attempt
+        return last is None or now - last >= self.min_refetch_interval
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    @staticmethod
+    def _index(jwk_set: jwt.PyJWKSet) -> dict[str | None, jwt.PyJWK]:
+        return {
+            key.key_id: key
+            for key in jwk_set.keys
+            if key.public_key_use in {"sig", None}
+        }
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified tokens, keyed by a SHA-256 fingerprint.
+
+    Entries are only served until the token's ``exp`` claim, so a cache hit
+    never extends a token's lifetime.
+    """
+
+    def __init__(self, max_entries: int = 4096, clock: Callable[[], float] = time.time) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(token: str, *scope: str) -> str:
+        digest = hashlib.sha256()
+        for part in scope:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(token.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, fingerprint: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[fingerprint]
+                return None
+            self._entries.move_to_end(fingerprint)
+            return dict(claims)
+
+    def put(self, fingerprint: str, claims: Mapping[str, Any]) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or isinstance(exp, bool):
+            return
+        with self._lock:
+            self._entries[fingerprint] = (dict(claims), float(exp))
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
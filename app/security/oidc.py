@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import uuid
 from dataclasses import dataclass
 from enum import Enum
@@ -9,6 +10,8 @@ from typing import Any, Mapping
 
 import jwt
 
+from app.security.jwks_cache import JWKSCache, VerifiedTokenCache
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -136,25 +139,50 @@ def extract_bearer_token(authorization: str | None) -> str:
     return token.strip()
 
 
+_JWKS_CACHES: dict[str, JWKSCache] = {}
+_JWKS_CACHES_LOCK = threading.Lock()
+_VERIFIED_TOKENS = VerifiedTokenCache()
+
+
+def get_jwks_cache(jwks_url: str) -> JWKSCache:
+    """Process-wide signing-key cache for one JWKS endpoint."""
+    cache = _JWKS_CACHES.get(jwks_url)
+    if cache is None:
+        with _JWKS_CACHES_LOCK:
+            cache = _JWKS_CACHES.setdefault(jwks_url, JWKSCache(jwks_url))
+    return cache
+
+
+def reset_oidc_caches() -> None:
+    """Drop cached JWKS key sets and verified tokens."""
+    with _JWKS_CACHES_LOCK:
+        _JWKS_CACHES.clear()
+    _VERIFIED_TOKENS.clear()
+
+
 def verify_bearer_token(token: str, request_id: str) -> dict[str, Any]:
     config = load_oidc_config()
     if not config.issuer or not config.audience or not config.jwks_url:
         LOGGER.error("OIDC misconfiguration; request_id=%s", request_id)
         raise OIDCAuthError("unauthorized")
 
-    try:
-        jwks_client = jwt.PyJWKClient(config.jwks_url)
-        signing_key = jwks_client.get_signing_key_from_jwt(token).key
-        claims = jwt.decode(
-            token,
-            signing_key,
-            algorithms=["RS256"],
-            audience=config.audience,
-            issuer=config.issuer,
-        )
-    except Exception:
-        LOGGER.warning("OIDC token verification failed; request_id=%s", request_id)
-        raise OIDCAuthError("unauthorized")
+    fingerprint = VerifiedTokenCache.fingerprint(token, config.issuer, config.audience, config.jwks_url)
+    claims = _VERIFIED_TOKENS.get(fingerprint)
+    if claims is None:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            signing_key = get_jwks_cache(config.jwks_url).get_signing_key(kid).key
+            claims = jwt.decode(
+                token,
+                signing_key,
+                algorithms=["RS256"],
+                audience=config.audience,
+                issuer=config.issuer,
+            )
+        except Exception:
+            LOGGER.warning("OIDC token verification failed; request_id=%s", request_id)
+            raise OIDCAuthError("unauthorized")
+        _VERIFIED_TOKENS.put(fingerprint, claims)
 
     repository = str(claims.get("repository", "")).strip()
     actor = str(claims.get("actor", "")).strip()
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 import json
+import logging
 import os
 from pathlib import Path
 import re
-from typing import Any
+import threading
+import time
+from typing import Any, Callable
 import urllib.parse
 import urllib.request
 
@@ -18,6 +22,9 @@ from rbac.token_service import RBACJWTIssuer, token_fingerprint
 from schemas.handshake import RbacClaimProposal
 
 
+logger = logging.getLogger(__name__)
+
+
 class AuthBrokerError(RuntimeError):
     """Raised when handshake exchange auth steps fail."""
 
@@ -193,14 +200,147 @@ class ClaimPolicyValidator:
         )
 
 
+class _TokenFlight:
+    """One in-flight OAuth exchange that concurrent callers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.token: GeminiAccessToken | None = None
+        self.error: BaseException | None = None
+
+
 class GeminiServiceAccountTokenProvider:
-    """Acquire Gemini access token via Google service-account OAuth flow."""
+    """
+    Acquire Gemini access token via Google service-account OAuth flow.
+
+    Tokens are cached per scope set until ``expires_in``. Once a token is
+    within ``refresh_margin_seconds`` of expiry it is still served while a
+    background refresh runs; below ``min_remaining_seconds`` callers wait for
+    a fresh token. Concurrent refreshes for one scope set share a single
+    OAuth request.
+    """
 
-    def __init__(self, *, token_endpoint: str = "https://oauth2.googleapis.com/token", timeout_seconds: int = 30) -> None:
+    def __init__(
+        self,
+        *,
+        token_endpoint: str = "https://oauth2.googleapis.com/token",
+        timeout_seconds: int = 30,
+        refresh_margin_seconds: float = 300.0,
+        min_remaining_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.token_endpoint = token_endpoint
         self.timeout_seconds = timeout_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_remaining_seconds = min_remaining_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._tokens: dict[tuple[str, ...], tuple[GeminiAccessToken, float]] = {}
+        self._flights: dict[tuple[str, ...], _TokenFlight] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "background_refreshes": 0,
+            "coalesced": 0,
+            "refresh_failures": 0,
+        }
 
     def get_access_token(self, *, scopes: list[str]) -> GeminiAccessToken:
+        key = tuple(sorted(set(scopes)))
+        cached = self._cached_token(key)
+        if cached is not None:
+            return cached
+        return self._refresh(key)
+
+    async def aget_access_token(self, *, scopes: list[str]) -> GeminiAccessToken:
+        """Async variant: cache hits return inline, refreshes run off the event loop."""
+        key = tuple(sorted(set(scopes)))
+        cached = self._cached_token(key)
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self._refresh, key)
+
+    def cache_stats(self) -> dict[str, int]:
+        """Hit/miss/refresh counters plus the number of cached scope sets."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_scope_sets"] = len(self._tokens)
+            return stats
+
+    def invalidate(self, scopes: list[str] | None = None) -> None:
+        """Forget cached tokens for one scope set, or all of them."""
+        with self._lock:
+            if scopes is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(tuple(sorted(set(scopes))), None)
+
+    def _cached_token(self, key: tuple[str, ...]) -> GeminiAccessToken | None:
+        with self._lock:
+            entry = self._tokens.get(key)
+            remaining = entry[1] - self.clock() if entry else 0.0
+            if entry is None or remaining <= self.min_remaining_seconds:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            refresh_ahead = remaining <= self.refresh_margin_seconds and key not in self._flights
+        if refresh_ahead:
+            self._refresh_in_background(key)
+        return replace(entry[0], expires_in=int(remaining))
+
+    def _refresh(self, key: tuple[str, ...]) -> GeminiAccessToken:
+        with self._lock:
+            entry = self._tokens.get(key)
+            remaining = entry[1] - self.clock() if entry else 0.0
+            if remaining > self.refresh_margin_seconds:
+                # Another flight stored a fresh token after this caller's cache miss.
+                self._stats["coalesced"] += 1
+                return replace(entry[0], expires_in=int(remaining))
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _TokenFlight()
+                self._stats["refreshes"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.token
+
+        try:
+            token = self._fetch_access_token(list(key))
+            with self._lock:
+                if token.expires_in > 0:
+                    self._tokens[key] = (token, self.clock() + token.expires_in)
+            flight.token = token
+            return token
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                self._stats["refresh_failures"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, key: tuple[str, ...]) -> None:
+        with self._lock:
+            self._stats["background_refreshes"] += 1
+
+        def run() -> None:
+            try:
+                self._refresh(key)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Background Gemini token refresh failed: %s", exc)
+
+        threading.Thread(target=run, name="gemini-token-refresh", daemon=True).start()
+
+    def _fetch_access_token(self, scopes: list[str]) -> GeminiAccessToken:
         account = self._load_service_account()
         now = int(datetime.now(timezone.utc).timestamp())
         assertion = self._build_assertion(account, scopes=scopes, now=now)
@@ -287,6 +427,11 @@ class A2AAuthBroker:
         self._rbac_issuer = rbac_issuer or RBACJWTIssuer()
         self._gemini_provider = gemini_provider or GeminiServiceAccountTokenProvider()
 
+    GEMINI_SCOPES = [
+        "https://www.googleapis.com/auth/cloud-platform",
+        "https://www.googleapis.com/auth/generative-language",
+    ]
+
     def exchange(
         self,
         *,
@@ -310,7 +455,45 @@ class A2AAuthBroker:
             requested_scopes=requested_scopes,
             requested_tools=requested_tools,
         )
-        token, claims = self._rbac_issuer.issue_access_token(
+        token, claims = self._mint_rbac_token(proposal)
+        gemini = self._gemini_provider.get_access_token(scopes=self.GEMINI_SCOPES)
+        return self._exchange_result(proposal, token, claims, gemini)
+
+    async def aexchange(
+        self,
+        *,
+        tenant_id: str,
+        client_id: str,
+        avatar_id: str,
+        requested_scopes: list[str],
+        requested_tools: list[str],
+        ttl_seconds: int,
+    ) -> dict[str, Any]:
+        """Async :meth:`exchange`; blocking network steps run off the event loop."""
+        proposal = await asyncio.to_thread(
+            self._synthesizer.synthesize,
+            tenant_id=tenant_id,
+            client_id=client_id,
+            avatar_id=avatar_id,
+            requested_scopes=requested_scopes,
+            requested_tools=requested_tools,
+            ttl_seconds=ttl_seconds,
+        )
+        proposal = self._validator.validate(
+            proposal,
+            requested_scopes=requested_scopes,
+            requested_tools=requested_tools,
+        )
+        token, claims = self._mint_rbac_token(proposal)
+        aget_access_token = getattr(self._gemini_provider, "aget_access_token", None)
+        if aget_access_token is not None:
+            gemini = await aget_access_token(scopes=self.GEMINI_SCOPES)
+        else:
+            gemini = await asyncio.to_thread(self._gemini_provider.get_access_token, scopes=self.GEMINI_SCOPES)
+        return self._exchange_result(proposal, token, claims, gemini)
+
+    def _mint_rbac_token(self, proposal: RbacClaimProposal) -> tuple[str, dict[str, Any]]:
+        return self._rbac_issuer.issue_access_token(
             {
                 "sub": f"{proposal.client_id}:{proposal.avatar_id}",
                 "tenant_id": proposal.tenant_id,
@@ -322,13 +505,14 @@ class A2AAuthBroker:
             },
             ttl_seconds=proposal.ttl_seconds,
         )
-        gemini = self._gemini_provider.get_access_token(
-            scopes=[
-                "https://www.googleapis.com/auth/cloud-platform",
-                "https://www.googleapis.com/auth/generative-language",
-            ]
-        )
 
+    @staticmethod
+    def _exchange_result(
+        proposal: RbacClaimProposal,
+        token: str,
+        claims: dict[str, Any],
+        gemini: GeminiAccessToken,
+    ) -> dict[str, Any]:
         rbac_fp = token_fingerprint(token)
         gemini_fp = token_fingerprint(gemini.access_token)
         return {
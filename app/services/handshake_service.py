@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 =======
 from datetime import datetime, timedelta, timezone
 >>>>>>> origin/main
+import asyncio
 import hashlib
 import json
 import threading
@@ -125,11 +126,7 @@ class A2AHandshakeService:
         ttl_seconds: int = 900,
         metadata: dict[str, Any] | None = None,
     ) -> A2AHandshakeEnvelope:
-        with self._lock:
-            envelope = self._handshakes.get(handshake_id)
-            if envelope is None:
-                raise KeyError(f"Unknown handshake_id: {handshake_id}")
-
+        envelope = self._require_handshake(handshake_id)
         auth_result = self._broker.exchange(
             tenant_id=envelope.tenant_id,
             client_id=envelope.client_id,
@@ -138,6 +135,48 @@ class A2AHandshakeService:
             requested_tools=requested_tools,
             ttl_seconds=ttl_seconds,
         )
+        return self._record_exchange(handshake_id, envelope, auth_result, metadata)
+
+    async def aexchange_handshake(
+        self,
+        *,
+        handshake_id: str,
+        requested_scopes: list[str],
+        requested_tools: list[str],
+        ttl_seconds: int = 900,
+        metadata: dict[str, Any] | None = None,
+    ) -> A2AHandshakeEnvelope:
+        """Async :meth:`exchange_handshake` that keeps broker I/O off the event loop."""
+        envelope = self._require_handshake(handshake_id)
+        exchange_kwargs = {
+            "tenant_id": envelope.tenant_id,
+            "client_id": envelope.client_id,
+            "avatar_id": envelope.avatar_id,
+            "requested_scopes": requested_scopes,
+            "requested_tools": requested_tools,
+            "ttl_seconds": ttl_seconds,
+        }
+        aexchange = getattr(self._broker, "aexchange", None)
+        if aexchange is not None:
+            auth_result = await aexchange(**exchange_kwargs)
+        else:
+            auth_result = await asyncio.to_thread(lambda: self._broker.exchange(**exchange_kwargs))
+        return self._record_exchange(handshake_id, envelope, auth_result, metadata)
+
+    def _require_handshake(self, handshake_id: str) -> A2AHandshakeEnvelope:
+        with self._lock:
+            envelope = self._handshakes.get(handshake_id)
+        if envelope is None:
+            raise KeyError(f"Unknown handshake_id: {handshake_id}")
+        return envelope
+
+    def _record_exchange(
+        self,
+        handshake_id: str,
+        envelope: A2AHandshakeEnvelope,
+        auth_result: dict[str, Any],
+        metadata: dict[str, Any] | None,
+    ) -> A2AHandshakeEnvelope:
         proposal = auth_result["claim_proposal"]
         capability_scores = self._score_capabilities(
             capabilities=envelope.capabilities,
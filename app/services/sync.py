@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple
+import asyncio
+from typing import Dict, List, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
@@ -61,3 +62,99 @@ async def upsert_and_sync(
         session.add(audit)
         await session.commit()
     return existing, results
+
+
+def _dialect_insert(session: AsyncSession):
+    """``insert`` with ON CONFLICT support for the session's dialect, if any."""
+    dialect = session.bind.dialect.name if session.bind is not None else ""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+async def bulk_upsert_and_sync(
+    session: AsyncSession,
+    items: Sequence[Tuple[CanonicalTask, Dict]],
+    monday_client=None,
+) -> List[Tuple[CanonicalTask, list]]:
+    """
+    Batch form of ``upsert_and_sync`` for a flush of webhook events.
+
+    Tasks and id-map rows are written with one ``INSERT ... ON CONFLICT``
+    each; incoming ``None`` values keep the stored column, as in the
+    single-event path. Gate failures and audit rows go into the same
+    transaction, so a flush costs one commit. Tasks without an item_id
+    (and dialects without ON CONFLICT) fall back to ``upsert_and_sync``.
+    """
+    insert = _dialect_insert(session)
+    results: List[Tuple[CanonicalTask, list]] = []
+    bulk: Dict[str, Tuple[CanonicalTask, Dict]] = {}
+    for task, ctx in items:
+        if insert is None or task.item_id is None:
+            _, gate_results = await upsert_and_sync(session, task, ctx, monday_client)
+            results.append((task, gate_results))
+        else:
+            bulk[task.item_id] = (task, ctx)
+    if not bulk:
+        return results
+
+    table = Task.__table__
+    task_fields = [task.dict() for task, _ in bulk.values()]
+    columns = [c.name for c in table.columns if c.name in task_fields[0]]
+    task_stmt = insert(table).values(
+        [{name: fields[name] for name in columns} for fields in task_fields]
+    )
+    task_stmt = task_stmt.on_conflict_do_update(
+        index_elements=[table.c.item_id],
+        set_={
+            name: func.coalesce(task_stmt.excluded[name], table.c[name])
+            for name in columns
+            if name != "item_id"
+        },
+    )
+    await session.execute(task_stmt)
+
+    idmap_stmt = insert(IdMap.__table__).values(
+        [
+            {"monday_item_id": item_id, "airtable_id": task.external_ids.get("airtable")}
+            for item_id, (task, _) in bulk.items()
+        ]
+    )
+    idmap_stmt = idmap_stmt.on_conflict_do_update(
+        index_elements=[IdMap.__table__.c.monday_item_id],
+        set_={"airtable_id": idmap_stmt.excluded.airtable_id},
+    )
+    await session.execute(idmap_stmt)
+
+    passed: List[Tuple[CanonicalTask, Dict]] = []
+    failed_ids: List[str] = []
+    for item_id, (task, ctx) in bulk.items():
+        gate_results = evaluate_gates(task, ctx)
+        results.append((task, gate_results))
+        if all(r.ok for r in gate_results):
+            passed.append((task, ctx))
+            continue
+        failed_ids.append(item_id)
+        session.add(
+            AuditLog(
+                actor_system=ctx.get("actor_system", "system"),
+                action="gates_failed",
+                after=task.dict(),
+                gate_results=[r.__dict__ for r in gate_results],
+            )
+        )
+    if failed_ids:
+        await session.execute(
+            update(Task).where(Task.item_id.in_(failed_ids)).values(needs_human_review=True)
+        )
+    await session.commit()
+
+    if monday_client and passed:
+        await asyncio.gather(
+            *(commit_to_monday(monday_client, task, ctx) for task, ctx in passed)
+        )
+    return results
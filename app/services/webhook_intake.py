@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+E = TypeVar("E")
+
+
+class _Batch(Generic[E]):
+    def __init__(self) -> None:
+        self.events: Dict[Hashable, E] = {}
+        self.full = asyncio.Event()
+        self.done: "asyncio.Future[int]" = asyncio.get_running_loop().create_future()
+
+
+class CoalescingIntake(Generic[E]):
+    """
+    Debounced webhook intake that flushes events in batches.
+
+    The first event opens a batch and its request becomes the leader: it
+    waits ``debounce_seconds`` (or until ``max_batch`` distinct keys
+    arrive), then hands the batch to ``process`` with its own session.
+    A batch never holds more than ``max_batch`` keys; the flush runs in its
+    own task, so cancelling the leader does not cancel it for the followers.
+    Later events for a key already in the batch replace the earlier one.
+    Every submitter returns once its batch is persisted, or gets the
+    batch's error, so the webhook sender still sees failures and retries.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[E], Hashable],
+        process: Callable[[List[E], Any], Awaitable[Any]],
+        *,
+        debounce_seconds: float = 0.05,
+        max_batch: int = 200,
+    ) -> None:
+        self.key = key
+        self.process = process
+        self.debounce_seconds = debounce_seconds
+        self.max_batch = max(1, max_batch)
+        self._batch: Optional[_Batch[E]] = None
+        self._stats = {"events": 0, "coalesced": 0, "flushes": 0, "flushed_events": 0}
+
+    async def submit(self, event: E, session: Any) -> None:
+        self._stats["events"] += 1
+        batch = self._batch
+        leader = batch is None
+        if leader:
+            batch = self._batch = _Batch()
+
+        key = self.key(event)
+        if key in batch.events:
+            self._stats["coalesced"] += 1
+        batch.events[key] = event
+        if len(batch.events) >= self.max_batch:
+            # A full batch takes no more events; later ones open the next batch.
+            self._close(batch)
+            batch.full.set()
+
+        if not leader:
+            await asyncio.shield(batch.done)
+            return
+
+        flush = asyncio.ensure_future(self._flush(batch, session))
+        try:
+            await asyncio.shield(flush)
+        except asyncio.CancelledError:
+            # Followers still wait on this batch and it runs on the leader's
+            # session, so the flush finishes before the leader gives up.
+            if not flush.done():
+                await asyncio.wait([flush])
+            raise
+
+    async def _flush(self, batch: _Batch[E], session: Any) -> None:
+        events: List[E] = []
+        try:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.debounce_seconds)
+            except asyncio.TimeoutError:
+                pass
+            # Events arriving from here on open the next batch.
+            self._close(batch)
+            events = list(batch.events.values())
+            await self.process(events, session)
+        except BaseException as exc:
+            self._close(batch)
+            if isinstance(exc, asyncio.CancelledError):
+                batch.done.cancel()
+            else:
+                batch.done.set_exception(exc)
+                batch.done.exception()
+            raise
+        self._stats["flushes"] += 1
+        self._stats["flushed_events"] += len(events)
+        batch.done.set_result(len(events))
+
+    def _close(self, batch: _Batch[E]) -> None:
+        if self._batch is batch:
+            self._batch = None
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
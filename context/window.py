@@ -25,22 +25,52 @@ class Turn:
         }
 
 
+@dataclass
+class SummaryNode:
+    """Summary of a contiguous run of compacted turns."""
+    level: int
+    turn_count: int
+    text: str
+    tokens: int
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap whitespace token estimate used for summary budgeting."""
+    return len(text.split())
+
+
 class ContextWindow:
     """
     Sliding window context manager with semantic compression.
 
     Keeps last N turns verbatim; older turns folded into summaries.
     Critical artifacts (spec changes, eval failures) pinned.
+
+    In streaming mode (default) a turn is summarized exactly once, when it
+    leaves the verbatim window, and its raw payload is released. As in
+    legacy mode nothing is summarized before ``compression_threshold`` turns
+    have been added; turns evicted earlier are held until then. Leaf
+    summaries are merged pairwise by level (like a binary counter) and
+    further folded until they fit ``summary_token_budget``, so memory and
+    per-turn work stay bounded over long sessions. ``streaming=False``
+    keeps the original full-history compression behaviour.
     """
 
-    def __init__(self, window_size: int = 15, compression_threshold: int = 20):
+    def __init__(self, window_size: int = 15, compression_threshold: int = 20,
+                 streaming: bool = True, summary_token_budget: int = 512):
         self.window_size = window_size  # Keep N recent turns verbatim
         self.compression_threshold = compression_threshold  # Compress after N total turns
+        self.streaming = streaming
+        self.summary_token_budget = summary_token_budget
         self._turns: deque = deque(maxlen=window_size)
-        self._all_turns: List[Turn] = []  # Full history for compression
+        self._all_turns: List[Turn] = []  # Full history for compression (legacy mode)
         self._compressed_summaries: List[str] = []  # Semantic summaries of old turns
+        self._summary_nodes: List[SummaryNode] = []  # Streaming-mode summary tree roots
+        self._pinned_turns: List[Turn] = []  # Pinned turns that left the window
+        self._deferred_turns: List[Turn] = []  # Evicted before compression_threshold (streaming)
         self._turn_count = 0
         self._pinned_artifacts: List[Dict[str, Any]] = []  # Critical items to preserve
+        self._rendered: Dict[bool, str] = {}  # get_context cache keyed by include_summaries
 
     def add_turn(self, agent_message: str, user_feedback: Optional[str] = None,
                  metadata: Optional[Dict[str, Any]] = None, pinned: bool = False) -> Turn:
@@ -67,9 +97,20 @@ class ContextWindow:
             is_pinned=pinned
         )
 
+        self._rendered.clear()
+        self._turn_count += 1
+
+        if self.streaming:
+            evicted = None
+            if len(self._turns) == self.window_size:
+                evicted = self._turns[0] if self._turns else turn
+            self._turns.append(turn)
+            if evicted is not None:
+                self._evict_turn(evicted)
+            return turn
+
         self._turns.append(turn)
         self._all_turns.append(turn)
-        self._turn_count += 1
 
         # Trigger compression if needed
         if len(self._all_turns) >= self.compression_threshold:
@@ -87,6 +128,7 @@ class ContextWindow:
             "content": content,
             "reason": reason
         })
+        self._rendered.clear()
 
     def _compress_old_turns(self) -> None:
         """
@@ -107,6 +149,66 @@ class ContextWindow:
         summary = self._create_summary(turns_to_compress)
         self._compressed_summaries.append(summary)
 
+    def _evict_turn(self, turn: Turn) -> None:
+        """Streaming mode: fold a turn that just left the verbatim window."""
+        if turn.is_pinned:
+            self._pinned_turns.append(turn)
+            return
+
+        self._deferred_turns.append(turn)
+        if self._turn_count < self.compression_threshold:
+            return
+
+        # Summarize once; the Turn (and its raw payload) is not retained
+        for deferred in self._deferred_turns:
+            text = self._create_summary([deferred])
+            self._summary_nodes.append(
+                SummaryNode(level=0, turn_count=1, text=text, tokens=_estimate_tokens(text))
+            )
+            self._rebalance_summaries()
+        self._deferred_turns.clear()
+
+    def _rebalance_summaries(self) -> None:
+        """Merge equal-level neighbours, then fold oldest nodes until under budget."""
+        nodes = self._summary_nodes
+        while len(nodes) >= 2 and nodes[-1].level == nodes[-2].level:
+            newer = nodes.pop()
+            older = nodes.pop()
+            nodes.append(self._merge_summaries(older, newer))
+
+        while len(nodes) >= 2 and sum(n.tokens for n in nodes) > self.summary_token_budget:
+            older = nodes.pop(0)
+            newer = nodes.pop(0)
+            nodes.insert(0, self._merge_summaries(older, newer))
+        if len(nodes) == 1 and nodes[0].tokens > self.summary_token_budget:
+            only = nodes.pop()
+            nodes.append(self._merge_summaries(only, SummaryNode(0, 0, "", 0)))
+
+        self._compressed_summaries = [n.text for n in nodes]
+
+    def _merge_summaries(self, older: SummaryNode, newer: SummaryNode) -> SummaryNode:
+        """
+        Merge two adjacent summaries into one node.
+        Placeholder: keep the leading words of each side, capped at half the
+        token budget so both old and recent history stay represented.
+        Production: re-summarize with the abstractive summarizer.
+        """
+        turn_count = older.turn_count + newer.turn_count
+        older_words = self._summary_body(older.text).split()
+        newer_words = self._summary_body(newer.text).split()
+        cap = max(1, self.summary_token_budget // 2)
+        take_older = min(len(older_words), max(cap // 2, cap - len(newer_words)))
+        words = older_words[:take_older] + newer_words[:cap - take_older]
+        text = f"[SUMMARY: {turn_count} turns] " + " ".join(words)
+        return SummaryNode(level=max(older.level, newer.level) + 1, turn_count=turn_count,
+                           text=text, tokens=_estimate_tokens(text))
+
+    @staticmethod
+    def _summary_body(text: str) -> str:
+        if text.startswith("[SUMMARY:"):
+            return text.split("] ", 1)[1] if "] " in text else ""
+        return text
+
     def _create_summary(self, turns: List[Turn]) -> str:
         """
         Create semantic summary of old turns.
@@ -122,20 +224,30 @@ class ContextWindow:
 
         Returns:
             Formatted context with recent turns + compressed summaries.
+            Served from a cache that is invalidated when the window changes.
         """
+        cached = self._rendered.get(include_summaries)
+        if cached is not None:
+            return cached
+
         parts = []
 
-        # Compressed summaries
+        # Compressed summaries (streaming summaries already fit the token budget)
         if include_summaries and self._compressed_summaries:
             parts.append("=== Historical Context ===")
-            parts.extend(self._compressed_summaries[-3:])  # Last 3 summaries
+            if self.streaming:
+                parts.extend(self._compressed_summaries)
+            else:
+                parts.extend(self._compressed_summaries[-3:])  # Last 3 summaries
             parts.append("")
 
         # Pinned artifacts
-        if self._pinned_artifacts:
+        if self._pinned_artifacts or self._pinned_turns:
             parts.append("=== Critical Artifacts ===")
             for artifact in self._pinned_artifacts:
                 parts.append(f"[{artifact['type']}] {artifact['content'][:100]}")
+            for turn in self._pinned_turns:
+                parts.append(f"[pinned turn {turn.turn_id}] {turn.agent_message[:100]}")
             parts.append("")
 
         # Recent turns
@@ -145,7 +257,9 @@ class ContextWindow:
             if turn.user_feedback:
                 parts.append(f"User: {turn.user_feedback}")
 
-        return "\n".join(parts)
+        rendered = "\n".join(parts)
+        self._rendered[include_summaries] = rendered
+        return rendered
 
     def get_json_context(self) -> Dict[str, Any]:
         """Get context as JSON structure."""
@@ -154,6 +268,7 @@ class ContextWindow:
             "window_size": len(self._turns),
             "compressed_summaries": self._compressed_summaries,
             "pinned_artifacts": self._pinned_artifacts,
+            "pinned_turns": [t.to_dict() for t in self._pinned_turns],
             "recent_turns": [t.to_dict() for t in self._turns]
         }
 
@@ -162,7 +277,11 @@ class ContextWindow:
         self._turns.clear()
         self._all_turns.clear()
         self._compressed_summaries.clear()
+        self._summary_nodes.clear()
+        self._pinned_turns.clear()
+        self._deferred_turns.clear()
         self._pinned_artifacts.clear()
+        self._rendered.clear()
         self._turn_count = 0
 
     def __repr__(self) -> str:
@@ -1,45 +1,297 @@
+"""
+Postgres event store on an asyncpg pool.
+
+Appends are committed before observers see them. Single events and small
+batches go through one prepared ``INSERT ... SELECT FROM unnest(...)``
+statement; larger batches use ``COPY``. Observers are fed from a bounded
+queue drained by a fixed pool of worker tasks, so a slow observer slows
+appenders down instead of piling up tasks. Each committed event is also
+announced with ``NOTIFY`` so consumers in other processes can stream
+appends with :meth:`PostgresEventStore.listen`.
+"""
 import asyncio
+import importlib
+import json
 import logging
-from typing import List, Optional, Any
+import weakref
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set
+
 from .models import Event
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TABLE = "event_store_events"
+DEFAULT_CHANNEL = "event_store_events"
+
+_COLUMNS = ("execution_id", "event_type", "state", "hash_current", "occurred_at", "payload")
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+def _notification(event: Event) -> str:
+    """Compact NOTIFY payload; NOTIFY is capped at 8000 bytes, so the event payload stays in the table."""
+    return json.dumps(
+        {
+            "execution_id": event.execution_id,
+            "event_type": event.event_type,
+            "state": event.state,
+            "hash_current": event.hash_current,
+            "timestamp": _utc(event.timestamp).isoformat(),
+        },
+        separators=(",", ":"),
+    )
+
+
+class _Fanout:
+    """Observer queue and workers for one event loop."""
+
+    def __init__(self, size: int) -> None:
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(size)
+        self.workers: Set["asyncio.Task[None]"] = set()
+
+
 class PostgresEventStore:
-    def __init__(self, pool: Any, observers: Optional[List[Any]] = None):
+    def __init__(
+        self,
+        pool: Any,
+        observers: Optional[List[Any]] = None,
+        *,
+        table: str = DEFAULT_TABLE,
+        channel: Optional[str] = DEFAULT_CHANNEL,
+        copy_threshold: int = 256,
+        observer_queue_size: int = 1000,
+        observer_workers: int = 4,
+    ):
         """
         Initializes the PostgresEventStore.
 
         Args:
             pool: The database connection pool (e.g., asyncpg.Pool).
             observers: A list of observer objects (e.g., WhatsAppEventObserver).
+            table: Events table (see :meth:`ensure_schema`).
+            channel: NOTIFY channel for committed events; None disables NOTIFY.
+            copy_threshold: Batches at least this large are written with COPY.
+            observer_queue_size: Events buffered for observers before appends wait.
+            observer_workers: Concurrent observer deliveries.
         """
         self.pool = pool
         self.observers = observers or []
+        self.table = table
+        self.channel = channel
+        self.copy_threshold = max(1, copy_threshold)
+        self.observer_queue_size = observer_queue_size
+        self.observer_workers = max(1, observer_workers)
+        self._fanouts: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Fanout]" = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, int] = {
+            "appended": 0,
+            "insert_batches": 0,
+            "copy_batches": 0,
+            "observer_errors": 0,
+            "listener_dropped": 0,
+        }
+
+        table_sql = _quote_ident(table)
+        self._schema_sql = f"""
+            CREATE TABLE IF NOT EXISTS {table_sql} (
+                id BIGSERIAL PRIMARY KEY,
+                execution_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                state TEXT NOT NULL,
+                hash_current TEXT NOT NULL,
+                occurred_at TIMESTAMPTZ NOT NULL,
+                payload JSONB NOT NULL DEFAULT '{{}}'::jsonb
+            );
+            CREATE INDEX IF NOT EXISTS {_quote_ident(f"ix_{table}_execution")} ON {table_sql} (execution_id, id);
+        """
+        # One statement, so a batch is a single round trip; NOTIFY fires on commit.
+        self._insert_sql = f"""
+            WITH inserted AS (
+                INSERT INTO {table_sql} ({", ".join(_COLUMNS)})
+                SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::timestamptz[], $6::jsonb[])
+                RETURNING 1
+            )
+            SELECT (SELECT count(*) FROM inserted) AS inserted,
+                   (SELECT count(pg_notify($7, n)) FROM unnest($8::text[]) AS n) AS notified
+        """
+        self._notify_sql = "SELECT count(pg_notify($1, n)) FROM unnest($2::text[]) AS n"
+        self._select_sql = f"""
+            SELECT execution_id, event_type, state, hash_current, occurred_at, payload
+            FROM {table_sql} WHERE execution_id = $1 ORDER BY id ASC
+        """
+
+    @classmethod
+    async def connect(
+        cls,
+        dsn: str,
+        observers: Optional[List[Any]] = None,
+        *,
+        min_size: int = 2,
+        max_size: int = 10,
+        **options: Any,
+    ) -> "PostgresEventStore":
+        """Create an asyncpg pool for ``dsn`` and a store on top of it."""
+        asyncpg = importlib.import_module("asyncpg")
+        pool = await asyncpg.create_pool(dsn, min_size=min_size, max_size=max_size)
+        return cls(pool, observers, **options)
+
+    async def ensure_schema(self) -> None:
+        async with self.pool.acquire() as conn:
+            await conn.execute(self._schema_sql)
 
     async def append_event(self, event: Event) -> Event:
         """
         Appends an event to the event store and notifies observers.
 
-        This implementation simulates the database insertion.
-        In a real implementation, this would use self.pool to insert into Postgres.
+        Observers run after the insert commits, on the store's worker pool.
         """
-        # Simulate database insertion logic
-        # async with self.pool.acquire() as conn:
-        #     async with conn.transaction():
-        #         await self._insert_event_internal(conn, event)
+        await self.append_events([event])
+        return event
+
+    async def append_events(self, events: Sequence[Event]) -> List[Event]:
+        """Append ``events`` atomically, in order, then hand them to observers."""
+        events = list(events)
+        if not events:
+            return events
+        notifications = [_notification(e) for e in events] if self.channel else []
+
+        async with self.pool.acquire() as conn:
+            if len(events) >= self.copy_threshold:
+                async with conn.transaction():
+                    await conn.copy_records_to_table(
+                        self.table,
+                        records=[
+                            (
+                                e.execution_id,
+                                e.event_type,
+                                e.state,
+                                e.hash_current,
+                                _utc(e.timestamp),
+                                json.dumps(e.payload),
+                            )
+                            for e in events
+                        ],
+                        columns=list(_COLUMNS),
+                    )
+                    if notifications:
+                        await conn.fetchval(self._notify_sql, self.channel, notifications)
+                self._stats["copy_batches"] += 1
+            else:
+                # asyncpg prepares and caches the statement per connection.
+                await conn.fetchrow(
+                    self._insert_sql,
+                    [e.execution_id for e in events],
+                    [e.event_type for e in events],
+                    [e.state for e in events],
+                    [e.hash_current for e in events],
+                    [_utc(e.timestamp) for e in events],
+                    [json.dumps(e.payload) for e in events],
+                    self.channel,
+                    notifications,
+                )
+                self._stats["insert_batches"] += 1
 
-        logger.info(f"Appended event: {event.execution_id} ({event.event_type})")
+        self._stats["appended"] += len(events)
+        logger.debug("Appended %d events to %s", len(events), self.table)
 
-        # Fire observers POST-COMMIT (non-blocking)
         if self.observers:
-            # We use create_task to ensure it doesn't block the caller
-            asyncio.create_task(self._notify_observers(event))
+            fanout = self._fanout()
+            for event in events:
+                # Blocks when the observer queue is full: backpressure instead of unbounded tasks.
+                await fanout.queue.put(event)
+        return events
 
-        return event
+    async def get_execution(self, execution_id: str) -> List[Event]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(self._select_sql, execution_id)
+        return [
+            Event(
+                execution_id=row["execution_id"],
+                event_type=row["event_type"],
+                state=row["state"],
+                hash_current=row["hash_current"],
+                timestamp=row["occurred_at"],
+                payload=json.loads(row["payload"]),
+            )
+            for row in rows
+        ]
+
+    async def listen(self, *, queue_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream committed appends from any process via LISTEN/NOTIFY.
+
+        Holds one pool connection while iterating. If the consumer falls
+        more than ``queue_size`` notifications behind, the oldest are
+        dropped (counted in ``stats()["listener_dropped"]``); fetch the
+        execution with :meth:`get_execution` to catch up.
+        """
+        if not self.channel:
+            raise RuntimeError("NOTIFY is disabled for this store (channel=None)")
+        queue: "asyncio.Queue[str]" = asyncio.Queue(queue_size)
+
+        def on_notify(_conn: Any, _pid: int, _channel: str, payload: str) -> None:
+            if queue.full():
+                queue.get_nowait()
+                self._stats["listener_dropped"] += 1
+            queue.put_nowait(payload)
+
+        async with self.pool.acquire() as conn:
+            await conn.add_listener(self.channel, on_notify)
+            try:
+                while True:
+                    yield json.loads(await queue.get())
+            finally:
+                await conn.remove_listener(self.channel, on_notify)
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been delivered to observers."""
+        fanout = self._fanouts.get(asyncio.get_running_loop())
+        if fanout is not None:
+            await fanout.queue.join()
+
+    async def aclose(self) -> None:
+        """Deliver queued events, then stop this loop's observer workers."""
+        fanout = self._fanouts.pop(asyncio.get_running_loop(), None)
+        if fanout is None:
+            return
+        await fanout.queue.join()
+        for task in fanout.workers:
+            task.cancel()
+        await asyncio.gather(*fanout.workers, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def _fanout(self) -> _Fanout:
+        loop = asyncio.get_running_loop()
+        fanout = self._fanouts.get(loop)
+        if fanout is None:
+            fanout = self._fanouts[loop] = _Fanout(self.observer_queue_size)
+            for i in range(self.observer_workers):
+                # The set keeps strong references so workers are never garbage-collected mid-flight.
+                fanout.workers.add(loop.create_task(self._observer_worker(fanout.queue), name=f"event-store-observer-{i}"))
+        return fanout
+
+    async def _observer_worker(self, queue: "asyncio.Queue[Event]") -> None:
+        while True:
+            event = await queue.get()
+            try:
+                await self._notify_observers(event)
+            finally:
+                queue.task_done()
 
     async def _notify_observers(self, event: Event):
         """Fire observers in parallel, swallow errors."""
         tasks = [obs.on_state_change(event) for obs in self.observers]
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    self._stats["observer_errors"] += 1
+                    logger.warning(f"Event observer failed for {event.execution_id}: {result}")
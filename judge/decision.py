@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Callable, Tuple
 from enum import Enum
 
+import numpy as np
+
 
 class CriteriaType(str, Enum):
     """Types of decision criteria."""
@@ -20,8 +25,11 @@ class DecisionCriteria:
     """Evaluation criteria for decision scoring."""
     criteria_type: CriteriaType
     weight: float = 1.0  # Relative importance (0.0-1.0)
-    scorer: Callable[[Any], float] = None  # Function: context -> score [0, 1]
+    scorer: Callable[..., float] = None  # Function: context -> score [0, 1]
     description: str = ""
+    # When True, scorer is called as scorer(action, context); otherwise the
+    # score depends only on context and is computed once per judging call.
+    action_dependent: bool = False
 
     def score(self, context: Any) -> float:
         """Score this criterion given context."""
@@ -32,6 +40,17 @@ class DecisionCriteria:
         except Exception:
             return 0.0
 
+    def score_action(self, action: str, context: Any) -> float:
+        """Score this criterion for one action (context-only criteria ignore it)."""
+        if not self.action_dependent:
+            return self.score(context)
+        if not self.scorer:
+            return 0.5
+        try:
+            return min(1.0, max(0.0, self.scorer(action, context)))
+        except Exception:
+            return 0.0
+
 
 @dataclass
 class ActionScore:
@@ -45,6 +64,31 @@ class ActionScore:
         return f"<ActionScore action={self.action} score={self.overall_score:.3f}>"
 
 
+def weighted_scores(features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted-average score per row of an (actions x criteria) feature matrix.
+
+    Falls back to a neutral 0.5 when the weights sum to zero or less.
+    """
+    features = np.asarray(features, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    weight_sum = weights.sum()
+    if weight_sum <= 0:
+        return np.full(features.shape[0], 0.5)
+    return (features * weights).sum(axis=1) / weight_sum
+
+
+def rank_scores(features: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score and rank an (actions x criteria) feature matrix.
+
+    Returns:
+        (overall scores, row indices ordered best-first; ties keep input order)
+    """
+    overall = weighted_scores(features, weights)
+    return overall, np.argsort(-overall, kind="stable")
+
+
 class JudgmentModel:
     """
     Multi-criteria decision analysis for agent judgment.
@@ -121,35 +165,23 @@ class JudgmentModel:
         """
         Evaluate multiple actions using MCDA framework.
         Returns sorted list by overall_score (highest first).
+
+        Context-only criteria are scored once per call; only action-dependent
+        criteria are scored per action.
         """
-        scores: List[ActionScore] = []
-
-        for action in actions:
-            # Calculate per-criterion scores
-            criterion_scores: Dict[CriteriaType, float] = {}
-            weighted_sum = 0.0
-            weight_sum = 0.0
-
-            for crit_type, criterion in self._criteria.items():
-                crit_score = criterion.score(context)
-                criterion_scores[crit_type] = crit_score
-                weighted_sum += criterion.weight * crit_score
-                weight_sum += criterion.weight
-
-            # Weighted average
-            overall_score = weighted_sum / weight_sum if weight_sum > 0 else 0.5
-
-            score = ActionScore(
-                action=action,
-                overall_score=overall_score,
-                criterion_scores=criterion_scores,
-                metadata={"preset": self._preset, "context_keys": list(context.keys())},
-            )
-            scores.append(score)
-
-        # Sort by score (highest first)
-        scores.sort(key=lambda s: s.overall_score, reverse=True)
-        return scores
+        context_scores = self._context_scores(context)
+        if not self._has_action_dependent_criteria():
+            # Every action scores identically, so input order is already ranked
+            overall = self._weighted_average(context_scores)
+            return [self._action_score(a, overall, context_scores, context) for a in actions]
+
+        actions = list(actions)
+        features = self.feature_matrix(actions, context, context_scores)
+        overall, order = rank_scores(features, self.weight_vector())
+        return [
+            self._action_score(actions[i], float(overall[i]), self._row_scores(features[i]), context)
+            for i in order
+        ]
 
     def best_action(
         self,
@@ -157,8 +189,113 @@ class JudgmentModel:
         context: Dict[str, Any]
     ) -> Optional[ActionScore]:
         """Get highest-scoring action."""
-        scores = self.judge_actions(actions, context)
-        return scores[0] if scores else None
+        best = self.top_actions(actions, context, k=1)
+        return best[0] if best else None
+
+    def top_actions(
+        self,
+        actions: Iterable[str],
+        context: Dict[str, Any],
+        k: int = 1,
+        chunk_size: int = 1024,
+    ) -> List[ActionScore]:
+        """
+        Highest-scoring k actions, best first, matching ``judge_actions(...)[:k]``.
+
+        Actions are scored in chunks and streamed through a bounded heap, so
+        only the winners are materialized as ActionScore objects.
+        """
+        if k <= 0:
+            return []
+        context_scores = self._context_scores(context)
+        if not self._has_action_dependent_criteria():
+            overall = self._weighted_average(context_scores)
+            return [
+                self._action_score(a, overall, context_scores, context)
+                for a in islice(actions, k)
+            ]
+
+        weights = self.weight_vector()
+        scored = self._stream_scores(actions, context, context_scores, weights, chunk_size)
+        best = heapq.nlargest(k, scored, key=itemgetter(0))
+        return [
+            self._action_score(action, score, self._row_scores(row), context)
+            for score, action, row in best
+        ]
+
+    def feature_matrix(
+        self,
+        actions: List[str],
+        context: Dict[str, Any],
+        context_scores: Optional[Dict[CriteriaType, float]] = None,
+    ) -> np.ndarray:
+        """(actions x criteria) score matrix, columns in criteria registration order."""
+        if context_scores is None:
+            context_scores = self._context_scores(context)
+        features = np.empty((len(actions), len(self._criteria)), dtype=float)
+        for col, (crit_type, criterion) in enumerate(self._criteria.items()):
+            if criterion.action_dependent:
+                features[:, col] = [criterion.score_action(a, context) for a in actions]
+            else:
+                features[:, col] = context_scores[crit_type]
+        return features
+
+    def weight_vector(self) -> np.ndarray:
+        """Criteria weights, in the same column order as ``feature_matrix``."""
+        return np.array([c.weight for c in self._criteria.values()], dtype=float)
+
+    def _stream_scores(
+        self,
+        actions: Iterable[str],
+        context: Dict[str, Any],
+        context_scores: Dict[CriteriaType, float],
+        weights: np.ndarray,
+        chunk_size: int,
+    ) -> Iterator[Tuple[float, str, np.ndarray]]:
+        iterator = iter(actions)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            features = self.feature_matrix(chunk, context, context_scores)
+            overall = weighted_scores(features, weights)
+            for i, action in enumerate(chunk):
+                yield float(overall[i]), action, features[i]
+
+    def _has_action_dependent_criteria(self) -> bool:
+        return any(c.action_dependent for c in self._criteria.values())
+
+    def _context_scores(self, context: Dict[str, Any]) -> Dict[CriteriaType, float]:
+        return {
+            crit_type: criterion.score(context)
+            for crit_type, criterion in self._criteria.items()
+            if not criterion.action_dependent
+        }
+
+    def _weighted_average(self, criterion_scores: Dict[CriteriaType, float]) -> float:
+        weighted_sum = 0.0
+        weight_sum = 0.0
+        for crit_type, criterion in self._criteria.items():
+            weighted_sum += criterion.weight * criterion_scores[crit_type]
+            weight_sum += criterion.weight
+        return weighted_sum / weight_sum if weight_sum > 0 else 0.5
+
+    def _row_scores(self, row: np.ndarray) -> Dict[CriteriaType, float]:
+        return {crit_type: float(value) for crit_type, value in zip(self._criteria, row)}
+
+    def _action_score(
+        self,
+        action: str,
+        overall_score: float,
+        criterion_scores: Dict[CriteriaType, float],
+        context: Dict[str, Any],
+    ) -> ActionScore:
+        return ActionScore(
+            action=action,
+            overall_score=overall_score,
+            criterion_scores=dict(criterion_scores),
+            metadata={"preset": self._preset, "context_keys": list(context.keys())},
+        )
 
     # Default criterion scorers
 
@@ -0,0 +1,333 @@
+"""
+DMN Condition Compiler
+======================
+Parses DMN rule conditions once into a small predicate AST that can be
+evaluated against a single context dict or, column-wise, against a batch of
+contexts with numpy.
+
+Grammar (keywords are case-insensitive)::
+
+    expr     := and_expr ("OR" and_expr)*
+    and_expr := not_expr ("AND" not_expr)*
+    not_expr := "NOT" not_expr | primary
+    primary  := "(" expr ")" | key [op literal]
+    op       := "=" | "==" | "!=" | ">" | ">=" | "<" | "<="
+    literal  := number | "quoted" | 'quoted' | true | false | BARE_WORD
+
+A bare ``key`` is a truthiness test. Comparisons against a key missing from
+the context never match.
+"""
+
+import numbers
+import operator
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+_MISSING = object()
+
+_ORDERING_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+class ConditionSyntaxError(ValueError):
+    """Raised when a rule condition cannot be parsed."""
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real)
+
+
+class ContextColumns:
+    """
+    Column-oriented view of a batch of contexts.
+
+    Only keys referenced by compiled predicates are materialized, each in a
+    single pass over the batch.
+    """
+
+    def __init__(self, contexts: Sequence[Dict[str, Any]], keys: FrozenSet[str]):
+        self.size = len(contexts)
+        self._values: Dict[str, np.ndarray] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+        self._truthy: Dict[str, np.ndarray] = {}
+        for key in keys:
+            values = np.empty(self.size, dtype=object)
+            values[:] = [context.get(key, _MISSING) for context in contexts]
+            self._values[key] = values
+
+    def values(self, key: str) -> np.ndarray:
+        return self._values[key]
+
+    def present(self, key: str) -> np.ndarray:
+        return self._values[key] != _MISSING
+
+    def numeric(self, key: str) -> np.ndarray:
+        """Float column; NaN where the value is missing or not a number."""
+        column = self._numeric.get(key)
+        if column is None:
+            column = np.fromiter(
+                (float(v) if _is_number(v) else np.nan for v in self._values[key]),
+                dtype=float,
+                count=self.size,
+            )
+            self._numeric[key] = column
+        return column
+
+    def truthy(self, key: str) -> np.ndarray:
+        column = self._truthy.get(key)
+        if column is None:
+            column = np.fromiter(
+                (v is not _MISSING and bool(v) for v in self._values[key]),
+                dtype=bool,
+                count=self.size,
+            )
+            self._truthy[key] = column
+        return column
+
+
+@dataclass(frozen=True)
+class Truthy:
+    key: str
+
+    def keys(self) -> FrozenSet[str]:
+        return frozenset((self.key,))
+
+    def index_keys(self) -> Optional[FrozenSet[str]]:
+        return self.keys()
+
+    def matches(self, context: Dict[str, Any]) -> bool:
+        return bool(context.get(self.key, False))
+
+    def matches_columns(self, columns: ContextColumns) -> np.ndarray:
+        return columns.truthy(self.key)
+
+
+@dataclass(frozen=True)
+class Compare:
+    key: str
+    op: str
+    value: Any
+
+    def keys(self) -> FrozenSet[str]:
+        return frozenset((self.key,))
+
+    def index_keys(self) -> Optional[FrozenSet[str]]:
+        return self.keys()
+
+    def matches(self, context: Dict[str, Any]) -> bool:
+        actual = context.get(self.key, _MISSING)
+        if actual is _MISSING:
+            return False
+        if self.op in _ORDERING_OPS:
+            return _is_number(actual) and _ORDERING_OPS[self.op](actual, self.value)
+        equal = actual == self.value
+        return not equal if self.op == "!=" else bool(equal)
+
+    def matches_columns(self, columns: ContextColumns) -> np.ndarray:
+        if self.op in _ORDERING_OPS:
+            with np.errstate(invalid="ignore"):
+                return _ORDERING_OPS[self.op](columns.numeric(self.key), self.value)
+        equal = np.asarray(columns.values(self.key) == self.value, dtype=bool)
+        if self.op == "!=":
+            return columns.present(self.key) & ~equal
+        return equal
+
+
+@dataclass(frozen=True)
+class Not:
+    term: "Predicate"
+
+    def keys(self) -> FrozenSet[str]:
+        return self.term.keys()
+
+    def index_keys(self) -> Optional[FrozenSet[str]]:
+        # A negation matches when its keys are absent, so it cannot be indexed
+        return None
+
+    def matches(self, context: Dict[str, Any]) -> bool:
+        return not self.term.matches(context)
+
+    def matches_columns(self, columns: ContextColumns) -> np.ndarray:
+        return ~self.term.matches_columns(columns)
+
+
+@dataclass(frozen=True)
+class And:
+    terms: Tuple["Predicate", ...]
+
+    def keys(self) -> FrozenSet[str]:
+        return frozenset().union(*(t.keys() for t in self.terms))
+
+    def index_keys(self) -> Optional[FrozenSet[str]]:
+        # Every positive term must match, so any of their keys must be present
+        positive = [k for k in (t.index_keys() for t in self.terms) if k is not None]
+        return frozenset().union(*positive) if positive else None
+
+    def matches(self, context: Dict[str, Any]) -> bool:
+        return all(t.matches(context) for t in self.terms)
+
+    def matches_columns(self, columns: ContextColumns) -> np.ndarray:
+        result = np.ones(columns.size, dtype=bool)
+        for term in self.terms:
+            result &= term.matches_columns(columns)
+        return result
+
+
+@dataclass(frozen=True)
+class Or:
+    terms: Tuple["Predicate", ...]
+
+    def keys(self) -> FrozenSet[str]:
+        return frozenset().union(*(t.keys() for t in self.terms))
+
+    def index_keys(self) -> Optional[FrozenSet[str]]:
+        term_keys = [t.index_keys() for t in self.terms]
+        if any(k is None for k in term_keys):
+            return None
+        return frozenset().union(*term_keys)
+
+    def matches(self, context: Dict[str, Any]) -> bool:
+        return any(t.matches(context) for t in self.terms)
+
+    def matches_columns(self, columns: ContextColumns) -> np.ndarray:
+        result = np.zeros(columns.size, dtype=bool)
+        for term in self.terms:
+            result |= term.matches_columns(columns)
+        return result
+
+
+Predicate = Union[Truthy, Compare, Not, And, Or]
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<op>==|!=|>=|<=|=|>|<)
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<word>[A-Za-z_][\w.\-]*)
+    )""",
+    re.VERBOSE,
+)
+_KEYWORDS = {"and", "or", "not"}
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    stripped = text.rstrip()
+    while pos < len(stripped):
+        match = _TOKEN_RE.match(stripped, pos)
+        if match is None or match.end() == pos:
+            raise ConditionSyntaxError(f"Unexpected input at {pos} in condition: {text!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "word" and value.lower() in _KEYWORDS:
+            kind = value.lower()
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def _peek(self) -> str:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else "end"
+
+    def _take(self, kind: str) -> str:
+        if self._peek() != kind:
+            raise ConditionSyntaxError(f"Expected {kind} in condition: {self.text!r}")
+        value = self.tokens[self.pos][1]
+        self.pos += 1
+        return value
+
+    def parse(self) -> Predicate:
+        node = self._or()
+        if self._peek() != "end":
+            raise ConditionSyntaxError(f"Trailing input in condition: {self.text!r}")
+        return node
+
+    def _or(self) -> Predicate:
+        terms = [self._and()]
+        while self._peek() == "or":
+            self._take("or")
+            terms.append(self._and())
+        return terms[0] if len(terms) == 1 else Or(tuple(terms))
+
+    def _and(self) -> Predicate:
+        terms = [self._not()]
+        while self._peek() == "and":
+            self._take("and")
+            terms.append(self._not())
+        return terms[0] if len(terms) == 1 else And(tuple(terms))
+
+    def _not(self) -> Predicate:
+        if self._peek() == "not":
+            self._take("not")
+            return Not(self._not())
+        return self._primary()
+
+    def _primary(self) -> Predicate:
+        if self._peek() == "lparen":
+            self._take("lparen")
+            node = self._or()
+            self._take("rparen")
+            return node
+        key = self._take("word")
+        if self._peek() != "op":
+            return Truthy(key)
+        op = self._take("op")
+        value = self._literal()
+        if op in _ORDERING_OPS and not _is_number(value):
+            raise ConditionSyntaxError(f"Ordering comparison needs a number: {self.text!r}")
+        return Compare(key, "=" if op == "==" else op, value)
+
+    def _literal(self) -> Any:
+        kind = self._peek()
+        if kind == "number":
+            raw = self._take("number")
+            return float(raw) if "." in raw else int(raw)
+        if kind == "string":
+            return self._take("string")[1:-1]
+        if kind == "word":
+            word = self._take("word")
+            lowered = word.lower()
+            if lowered in ("true", "false"):
+                return lowered == "true"
+            return word
+        raise ConditionSyntaxError(f"Expected a literal in condition: {self.text!r}")
+
+
+def parse_condition(text: str) -> Predicate:
+    """Compile a DMN condition expression into a predicate AST."""
+    return _Parser(text).parse()
+
+
+def compile_keyword_condition(text: str) -> Predicate:
+    """
+    Compile a descriptive condition using the engine's keyword semantics.
+
+    A condition mentioning "critical", "exhausted" or "gaps" fires on a truthy
+    ``critical_dtc``, a truthy ``healing_loop_exhausted`` or a
+    ``structural_gap_count`` above 3 respectively.
+    """
+    lowered = text.lower()
+    terms: List[Predicate] = []
+    if "critical" in lowered:
+        terms.append(Truthy("critical_dtc"))
+    if "exhausted" in lowered:
+        terms.append(Truthy("healing_loop_exhausted"))
+    if "gaps" in lowered:
+        terms.append(Compare("structural_gap_count", ">", 3))
+    return terms[0] if len(terms) == 1 else Or(tuple(terms))
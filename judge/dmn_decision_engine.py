@@ -6,11 +6,20 @@ constraint violations, and loose threads. Integrated with Decision Agent for
 formal decision-making and remediation.
 """
 
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple, Any
 from enum import Enum
+import bisect
 import uuid
 from datetime import datetime
 
+import numpy as np
+
+from judge.dmn_compiler import (
+    ContextColumns,
+    Predicate,
+    compile_keyword_condition,
+    parse_condition,
+)
 from schemas.telemetry import DMNToken, DTCSeverity, ConstraintViolation
 
 
@@ -22,6 +31,21 @@ class DecisionOutcome(str, Enum):
     TERMINATE = "TERMINATE"          # System must halt
 
 
+# Outcome severity, used to combine table results and for 'priority' hit policy
+OUTCOME_RANK: Dict[DecisionOutcome, int] = {
+    DecisionOutcome.PROCEED: 0,
+    DecisionOutcome.HEALING_REQUIRED: 1,
+    DecisionOutcome.ESCALATE_TO_MANUAL: 2,
+    DecisionOutcome.TERMINATE: 3,
+}
+
+HIT_POLICIES = ("first", "unique", "any", "priority", "collect")
+
+KEYWORD_CONDITIONS = "keyword"
+EXPRESSION_CONDITIONS = "expression"
+CONDITION_MODES = (KEYWORD_CONDITIONS, EXPRESSION_CONDITIONS)
+
+
 class ConstraintViolationMode(str, Enum):
     """How constraints are evaluated"""
     STRICT = "strict"                # All constraints must pass (AND)
@@ -50,20 +74,94 @@ class DMNDecisionRule:
         return f"<DMNRule {self.name} → {self.outcome.value}>"
 
 
+class DMNHitPolicyViolation(ValueError):
+    """Raised when matches violate a table's 'unique' or 'any' hit policy."""
+
+
 class DMNTable:
-    """DMN Decision Table - Maps constraints to outcomes"""
+    """
+    DMN Decision Table - Maps constraints to outcomes
+
+    Rule conditions are compiled once on ``add_rule`` and rules are indexed
+    by the context keys their predicates reference, so evaluation only
+    visits rules that can match.
+
+    Args:
+        table_id: Table identifier
+        name: Human-readable table name
+        hit_policy: 'first', 'unique', 'any', 'priority' or 'collect'
+        condition_mode: 'keyword' compiles descriptive conditions with the
+            engine's keyword semantics; 'expression' parses them as DMN
+            expressions (see ``judge.dmn_compiler``)
+    """
 
-    def __init__(self, table_id: str, name: str):
+    def __init__(
+        self,
+        table_id: str,
+        name: str,
+        hit_policy: str = "first",
+        condition_mode: str = KEYWORD_CONDITIONS,
+    ):
+        if hit_policy not in HIT_POLICIES:
+            raise ValueError(f"Unknown hit policy: {hit_policy}")
+        if condition_mode not in CONDITION_MODES:
+            raise ValueError(f"Unknown condition mode: {condition_mode}")
         self.table_id = table_id
         self.name = name
         self.rules: List[DMNDecisionRule] = []
-        self.hit_policy = "first"  # 'first', 'unique', 'any', 'priority'
+        self.hit_policy = hit_policy
+        self.condition_mode = condition_mode
+        self._predicates: List[Predicate] = []
+        self._sort_keys: List[int] = []  # -priority, parallel to rules
+        self._key_index: Optional[Dict[str, List[int]]] = None
+        self._unkeyed: List[int] = []
+        self._keys: FrozenSet[str] = frozenset()
 
     def add_rule(self, rule: DMNDecisionRule):
-        """Add a decision rule"""
-        self.rules.append(rule)
-        # Sort by priority (descending)
-        self.rules.sort(key=lambda r: r.priority, reverse=True)
+        """Add a decision rule, keeping rules ordered by priority (descending)"""
+        if self.condition_mode == EXPRESSION_CONDITIONS:
+            predicate = parse_condition(rule.condition)
+        else:
+            predicate = compile_keyword_condition(rule.condition)
+        position = bisect.bisect_right(self._sort_keys, -rule.priority)
+        self._sort_keys.insert(position, -rule.priority)
+        self.rules.insert(position, rule)
+        self._predicates.insert(position, predicate)
+        self._key_index = None
+
+    def _ensure_index(self) -> Dict[str, List[int]]:
+        if self._key_index is None:
+            index: Dict[str, List[int]] = {}
+            unkeyed = []
+            for position, predicate in enumerate(self._predicates):
+                # Negations can match without their keys, so they are always evaluated
+                keys = predicate.index_keys()
+                if not keys:
+                    unkeyed.append(position)
+                    continue
+                for key in keys:
+                    index.setdefault(key, []).append(position)
+            self._key_index = index
+            self._unkeyed = unkeyed
+            self._keys = frozenset().union(*(p.keys() for p in self._predicates))
+        return self._key_index
+
+    def matching_rules(self, context: Dict[str, Any]) -> List[DMNDecisionRule]:
+        """All rules whose condition matches, in priority order"""
+        return [self.rules[p] for p in self._match_positions(context)]
+
+    def _match_positions(self, context: Dict[str, Any], first_only: bool = False) -> List[int]:
+        index = self._ensure_index()
+        candidates = set(self._unkeyed)
+        for key in index.keys() & context.keys():
+            candidates.update(index[key])
+        matched = []
+        for position in sorted(candidates):
+            if self._predicates[position].matches(context):
+                matched.append(position)
+                if first_only:
+                    break
+        return matched
 
     def evaluate(
         self,
@@ -75,34 +173,75 @@ class DMNTable:
         Returns:
             (DecisionOutcome, explanation)
         """
-        for rule in self.rules:
-            # Evaluate rule condition against context
-            # (Simplified semantic evaluation)
-            if self._matches_condition(rule, context):
-                return rule.outcome, rule.name
+        positions = self._match_positions(context, first_only=self.hit_policy == "first")
+        return self._resolve(positions)
 
-        # Default outcome if no rules match
-        return DecisionOutcome.PROCEED, "No specific rules matched, proceeding"
+    def evaluate_many(
+        self,
+        contexts: Sequence[Dict[str, Any]],
+    ) -> List[Tuple[DecisionOutcome, Optional[str]]]:
+        """
+        Evaluate many contexts in one column-wise pass over the compiled rules
 
-    @staticmethod
-    def _matches_condition(rule: DMNDecisionRule, context: Dict[str, Any]) -> bool:
-        """Evaluate whether rule condition matches context"""
-        # This is a simplified implementation
-        # In production, would use expression evaluator
-
-        # Check severity-based conditions
-        if "critical_dtc" in context and context["critical_dtc"]:
-            if "critical" in rule.condition.lower():
-                return True
-        if "healing_loop_exhausted" in context and context["healing_loop_exhausted"]:
-            if "exhausted" in rule.condition.lower():
-                return True
-        if "structural_gap_count" in context:
-            gap_count = context["structural_gap_count"]
-            if gap_count > 3 and "gaps" in rule.condition.lower():
-                return True
-
-        return False
+        Returns:
+            (DecisionOutcome, explanation) per context, same as ``evaluate``
+        """
+        if not contexts:
+            return []
+        self._ensure_index()
+        columns = ContextColumns(contexts, self._keys)
+        n_rules = len(self.rules)
+        if n_rules == 0:
+            return [self._resolve([]) for _ in contexts]
+
+        hits = np.empty((len(contexts), n_rules), dtype=bool)
+        for position, predicate in enumerate(self._predicates):
+            hits[:, position] = predicate.matches_columns(columns)
+        any_hit = hits.any(axis=1)
+
+        if self.hit_policy == "first":
+            chosen = hits.argmax(axis=1)
+            return [
+                self._single(int(chosen[i])) if any_hit[i] else self._resolve([])
+                for i in range(len(contexts))
+            ]
+        if self.hit_policy == "priority":
+            ranks = np.array([OUTCOME_RANK[r.outcome] for r in self.rules])
+            # Highest outcome rank wins; earlier rules break ties
+            score = np.where(hits, ranks * n_rules + (n_rules - 1 - np.arange(n_rules)), -1)
+            chosen = score.argmax(axis=1)
+            return [
+                self._single(int(chosen[i])) if any_hit[i] else self._resolve([])
+                for i in range(len(contexts))
+            ]
+        return [self._resolve(np.flatnonzero(row).tolist()) for row in hits]
+
+    def _single(self, position: int) -> Tuple[DecisionOutcome, Optional[str]]:
+        rule = self.rules[position]
+        return rule.outcome, rule.name
+
+    def _resolve(self, positions: List[int]) -> Tuple[DecisionOutcome, Optional[str]]:
+        if not positions:
+            # Default outcome if no rules match
+            return DecisionOutcome.PROCEED, "No specific rules matched, proceeding"
+        matched = [self.rules[p] for p in positions]
+        if self.hit_policy == "unique" and len(matched) > 1:
+            raise DMNHitPolicyViolation(
+                f"{self.table_id}: unique hit policy matched {[r.rule_id for r in matched]}"
+            )
+        if self.hit_policy == "any" and len({r.outcome for r in matched}) > 1:
+            raise DMNHitPolicyViolation(
+                f"{self.table_id}: any hit policy matched conflicting outcomes "
+                f"{[r.rule_id for r in matched]}"
+            )
+        if self.hit_policy == "priority":
+            best = max(matched, key=lambda r: OUTCOME_RANK[r.outcome])
+            return best.outcome, best.name
+        if self.hit_policy == "collect":
+            # Collected outcomes reduce to the most severe; all names are reported
+            outcome = max((r.outcome for r in matched), key=OUTCOME_RANK.__getitem__)
+            return outcome, "; ".join(r.name for r in matched)
+        return matched[0].outcome, matched[0].name
 
 
 class DMNDecisionEngine:
@@ -247,37 +386,64 @@ class DMNDecisionEngine:
         Returns:
             (DecisionOutcome, detailed_analysis)
         """
+        # Build evaluation context from token
+        context = self._build_evaluation_context(token)
+
+        # Evaluate each decision table
+        results = {
+            table_name: table.evaluate(context)
+            for table_name, table in self.tables.items()
+        }
+        return self._record_decision(token, results, datetime.utcnow().isoformat())
+
+    def evaluate_many(
+        self,
+        tokens: Sequence[DMNToken],
+    ) -> List[Tuple[DecisionOutcome, Dict[str, Any]]]:
+        """
+        Evaluate a batch of DMN tokens with one column-wise pass per table
+
+        Args:
+            tokens: Telemetry tokens to evaluate
+
+        Returns:
+            (DecisionOutcome, detailed_analysis) per token, as ``evaluate_token``
+        """
+        contexts = [self._build_evaluation_context(token) for token in tokens]
+        table_results = {
+            table_name: table.evaluate_many(contexts)
+            for table_name, table in self.tables.items()
+        }
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            self._record_decision(
+                token,
+                {table_name: results[i] for table_name, results in table_results.items()},
+                timestamp,
+            )
+            for i, token in enumerate(tokens)
+        ]
+
+    def _record_decision(
+        self,
+        token: DMNToken,
+        table_results: Dict[str, Tuple[DecisionOutcome, Optional[str]]],
+        timestamp: str,
+    ) -> Tuple[DecisionOutcome, Dict[str, Any]]:
+        """Combine per-table outcomes (most severe wins) and record the decision"""
         decision_outcome = DecisionOutcome.PROCEED
         findings = {
             "token_id": token.token_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "table_evaluations": {},
         }
-
-        # Build evaluation context from token
-        context = self._build_evaluation_context(token)
-
-        # Evaluate each decision table
-        for table_name, table in self.tables.items():
-            outcome, explanation = table.evaluate(context)
+        for table_name, (outcome, explanation) in table_results.items():
             findings["table_evaluations"][table_name] = {
                 "outcome": outcome.value,
                 "explanation": explanation,
             }
-
-            # Update decision outcome (use most severe)
-            if outcome == DecisionOutcome.TERMINATE:
-                decision_outcome = DecisionOutcome.TERMINATE
-            elif (
-                outcome == DecisionOutcome.ESCALATE_TO_MANUAL
-                and decision_outcome != DecisionOutcome.TERMINATE
-            ):
-                decision_outcome = DecisionOutcome.ESCALATE_TO_MANUAL
-            elif (
-                outcome == DecisionOutcome.HEALING_REQUIRED
-                and decision_outcome == DecisionOutcome.PROCEED
-            ):
-                decision_outcome = DecisionOutcome.HEALING_REQUIRED
+            if OUTCOME_RANK[outcome] > OUTCOME_RANK[decision_outcome]:
+                decision_outcome = outcome
 
         # Record decision
         decision_record = {
@@ -285,7 +451,7 @@ class DMNDecisionEngine:
             "token_id": token.token_id,
             "outcome": decision_outcome,
             "findings": findings,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
         }
         self.decisions_made.append(decision_record)
 
@@ -414,8 +580,7 @@ class DMNDecisionEngine:
 
         worst_outcome = DecisionOutcome.PROCEED
 
-        for token in loose_threads:
-            outcome, findings = self.evaluate_token(token)
+        for token, (outcome, findings) in zip(loose_threads, self.evaluate_many(loose_threads)):
             decision["thread_outcomes"].append(
                 {
                     "loose_thread_id": token.loose_thread_id,
@@ -425,18 +590,8 @@ class DMNDecisionEngine:
             )
 
             # Track worst outcome
-            if outcome == DecisionOutcome.TERMINATE:
-                worst_outcome = DecisionOutcome.TERMINATE
-            elif (
-                outcome == DecisionOutcome.ESCALATE_TO_MANUAL
-                and worst_outcome != DecisionOutcome.TERMINATE
-            ):
-                worst_outcome = DecisionOutcome.ESCALATE_TO_MANUAL
-            elif (
-                outcome == DecisionOutcome.HEALING_REQUIRED
-                and worst_outcome == DecisionOutcome.PROCEED
-            ):
-                worst_outcome = DecisionOutcome.HEALING_REQUIRED
+            if OUTCOME_RANK[outcome] > OUTCOME_RANK[worst_outcome]:
+                worst_outcome = outcome
 
         # Factor in judge score
         if judge_score < 0.3:
@@ -0,0 +1,107 @@
+"""Dependency-aware concurrent execution of blueprint actions."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Sequence, Tuple, TypeVar
+
+from schemas.project_plan import PlanAction
+
+T = TypeVar("T")
+
+# Comma-separated action_ids an action must wait for (overrides task chaining).
+DEPENDS_ON_KEY = "depends_on"
+# Actions sharing an original task run in blueprint order.
+TASK_KEY = "original_task"
+
+
+class ActionDAGError(ValueError):
+    """Raised when blueprint dependencies are unknown or cyclic."""
+
+
+def build_action_dag(actions: Sequence[PlanAction]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Map each action_id to the action_ids it depends on.
+
+    An explicit ``depends_on`` metadata entry wins. Otherwise an action
+    depends on the previous action for the same ``original_task``, so a
+    task's pipeline stages stay ordered while separate tasks run
+    concurrently. Actions with neither key are independent.
+    """
+    known = {action.action_id for action in actions}
+    if len(known) != len(actions):
+        raise ActionDAGError("Blueprint contains duplicate action_ids")
+
+    dag: Dict[str, Tuple[str, ...]] = {}
+    last_for_task: Dict[str, str] = {}
+    for action in actions:
+        explicit = action.metadata.get(DEPENDS_ON_KEY)
+        task = action.metadata.get(TASK_KEY)
+        if explicit is not None:
+            deps = tuple(dep.strip() for dep in explicit.split(",") if dep.strip())
+            unknown = [dep for dep in deps if dep not in known]
+            if unknown:
+                raise ActionDAGError(f"Action {action.action_id} depends on unknown actions: {unknown}")
+        elif task is not None and task in last_for_task:
+            deps = (last_for_task[task],)
+        else:
+            deps = ()
+        dag[action.action_id] = deps
+        if task is not None:
+            last_for_task[task] = action.action_id
+
+    _check_acyclic(dag)
+    return dag
+
+
+def _check_acyclic(dag: Dict[str, Tuple[str, ...]]) -> None:
+    remaining = {node: set(deps) for node, deps in dag.items()}
+    ready = [node for node, deps in remaining.items() if not deps]
+    dependents: Dict[str, List[str]] = {}
+    for node, deps in dag.items():
+        for dep in deps:
+            dependents.setdefault(dep, []).append(node)
+
+    visited = 0
+    while ready:
+        node = ready.pop()
+        visited += 1
+        for child in dependents.get(node, ()):
+            remaining[child].discard(node)
+            if not remaining[child]:
+                ready.append(child)
+    if visited != len(dag):
+        raise ActionDAGError("Blueprint action dependencies contain a cycle")
+
+
+async def run_action_dag(
+    actions: Sequence[PlanAction],
+    dag: Dict[str, Tuple[str, ...]],
+    worker: Callable[[PlanAction], Awaitable[T]],
+    max_concurrency: int,
+) -> List[T]:
+    """
+    Run ``worker`` for every action once its dependencies have finished.
+
+    At most ``max_concurrency`` workers run at a time. Results are returned
+    in blueprint order regardless of completion order. If any worker raises,
+    the remaining workers are cancelled and the error propagates.
+    """
+    limit = asyncio.Semaphore(max(1, int(max_concurrency)))
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(action: PlanAction) -> T:
+        for dep in dag[action.action_id]:
+            await tasks[dep]
+        async with limit:
+            return await worker(action)
+
+    for action in actions:
+        tasks[action.action_id] = asyncio.ensure_future(run(action))
+    try:
+        return list(await asyncio.gather(*tasks.values()))
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
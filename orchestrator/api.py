@@ -245,12 +245,12 @@ async def orchestrate(
                     detail="Provide either query param `user_query` or JSON body payload with `command`.",
                 )
 
-        engine = IntentEngine()
-        result = await engine.run_full_pipeline(
-            description=description,
-            requester=resolved_requester,
-            max_healing_retries=max_healing_retries,
-        )
+        async with IntentEngine() as engine:
+            result = await engine.run_full_pipeline(
+                description=description,
+                requester=resolved_requester,
+                max_healing_retries=max_healing_retries,
+            )
         response = _build_pipeline_response(result)
 
         if optionb_service is not None and run_record_id:
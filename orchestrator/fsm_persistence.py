@@ -3,9 +3,17 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError as DBIntegrityError
 
 from orchestrator import storage
 from schemas.database import FSMEventModel, FSMExecutionModel, FSMSnapshotModel
@@ -94,10 +102,143 @@ def _event_meta_bytes(
     )
 
 
+@dataclass(frozen=True)
+class EventInput:
+    event_type: str
+    payload: dict[str, Any]
+    occurred_at_iso: str
+    event_version: int = 1
+    system_version: str = "1.0.0"
+    hash_version: int = 1
+    certification: str = "CERTIFIABLE"
+
+
+@dataclass(frozen=True)
+class ExecutionHead:
+    seq: int
+    head_hash: Optional[bytes]
+    fsm_id: str
+
+
+class _StaleHead(Exception):
+    """The cached head no longer matches ``fsm_execution``; reload and retry."""
+
+
+class ExecutionHeadCache:
+    """
+    Short-lived, bounded cache of execution heads plus verified-chain checkpoints.
+
+    Heads are only a hint: appends write with ``WHERE head_seq = <cached>``
+    and reload from the database when another writer got there first.
+    Checkpoints record the last ``(seq, event_hash)`` that ``verify_chain``
+    proved, so later verifications only re-hash newer events.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._heads: "OrderedDict[tuple[str, str], tuple[ExecutionHead, float]]" = OrderedDict()
+        self._checkpoints: "OrderedDict[tuple[str, str], tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id: str, execution_id: str) -> Optional[ExecutionHead]:
+        key = (tenant_id, execution_id)
+        with self._lock:
+            cached = self._heads.get(key)
+            if cached is None:
+                return None
+            head, expires_at = cached
+            if expires_at <= self.clock():
+                del self._heads[key]
+                return None
+            self._heads.move_to_end(key)
+            return head
+
+    def put(self, tenant_id: str, execution_id: str, head: ExecutionHead) -> None:
+        key = (tenant_id, execution_id)
+        with self._lock:
+            self._heads[key] = (head, self.clock() + self.ttl_seconds)
+            self._heads.move_to_end(key)
+            while len(self._heads) > self.max_entries:
+                self._heads.popitem(last=False)
+
+    def invalidate(self, tenant_id: str, execution_id: str) -> None:
+        with self._lock:
+            self._heads.pop((tenant_id, execution_id), None)
+
+    def get_checkpoint(self, tenant_id: str, execution_id: str) -> Optional[tuple[int, bytes]]:
+        with self._lock:
+            return self._checkpoints.get((tenant_id, execution_id))
+
+    def set_checkpoint(self, tenant_id: str, execution_id: str, seq: int, event_hash: bytes) -> None:
+        key = (tenant_id, execution_id)
+        with self._lock:
+            self._checkpoints[key] = (seq, event_hash)
+            self._checkpoints.move_to_end(key)
+            while len(self._checkpoints) > self.max_entries:
+                self._checkpoints.popitem(last=False)
+
+    def drop_checkpoint(self, tenant_id: str, execution_id: str) -> None:
+        with self._lock:
+            self._checkpoints.pop((tenant_id, execution_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heads.clear()
+            self._checkpoints.clear()
+
+
+# Heads are per database, and stores are constructed per call, so caches hang off the engine.
+_HEAD_CACHES: "weakref.WeakKeyDictionary[Any, ExecutionHeadCache]" = weakref.WeakKeyDictionary()
+_HEAD_CACHES_LOCK = threading.Lock()
+
+
+def get_head_cache(engine: Any) -> ExecutionHeadCache:
+    """Process-wide head cache for ``engine``, sized by ``FSM_HEAD_CACHE_*`` env vars."""
+    cache = _HEAD_CACHES.get(engine)
+    if cache is None:
+        with _HEAD_CACHES_LOCK:
+            cache = _HEAD_CACHES.get(engine)
+            if cache is None:
+                cache = ExecutionHeadCache(
+                    ttl_seconds=float(os.getenv("FSM_HEAD_CACHE_TTL_SECONDS", "30")),
+                    max_entries=int(os.getenv("FSM_HEAD_CACHE_MAX_ENTRIES", "4096")),
+                )
+                _HEAD_CACHES[engine] = cache
+    return cache
+
+
+def reset_head_caches() -> None:
+    with _HEAD_CACHES_LOCK:
+        _HEAD_CACHES.clear()
+
+
+_TERMINAL_STATUS = {
+    "VERDICT_PASS": "FINALIZED",
+    "RETRY_LIMIT_EXCEEDED": "FINALIZED",
+    "VERDICT_FAIL": "ABORTED",
+    "REPAIR_ABORT": "ABORTED",
+}
+
+
 class FSMEventStore:
+    max_attempts = 3
+    stream_batch_size = 500
+
     def __init__(self, db_manager: storage.DBManager | None = None):
         self._db = db_manager or storage._db_manager
 
+    @property
+    def head_cache(self) -> ExecutionHeadCache:
+        return get_head_cache(self._db.engine)
+
     def append_event(
         self,
         *,
@@ -116,214 +257,351 @@ class FSMEventStore:
         role_matrix_ver: str = "unknown",
         materiality_ver: str = "unknown",
     ) -> EventRow:
-        session = self._db.SessionLocal()
-        try:
-            execution = (
-                session.query(FSMExecutionModel)
-                .filter(
-                    FSMExecutionModel.tenant_id == tenant_id,
-                    FSMExecutionModel.execution_id == execution_id,
+        event = EventInput(
+            event_type=event_type,
+            payload=payload,
+            occurred_at_iso=occurred_at_iso,
+            event_version=event_version,
+            system_version=system_version,
+            hash_version=hash_version,
+            certification=certification,
+        )
+        return self.append_events(
+            tenant_id=tenant_id,
+            execution_id=execution_id,
+            events=[event],
+            fsm_id=fsm_id,
+            expected_seq=expected_seq,
+            policy_hash=policy_hash,
+            role_matrix_ver=role_matrix_ver,
+            materiality_ver=materiality_ver,
+        )[0]
+
+    def append_events(
+        self,
+        *,
+        tenant_id: str,
+        execution_id: str,
+        events: Sequence[EventInput],
+        fsm_id: str = DEFAULT_FSM_ID,
+        expected_seq: int | None = None,
+        policy_hash: bytes = b"",
+        role_matrix_ver: str = "unknown",
+        materiality_ver: str = "unknown",
+    ) -> list[EventRow]:
+        """
+        Append ``events`` to one execution in a single transaction.
+
+        ``events[i]`` gets sequence ``expected_seq + i`` (or the next free
+        sequence when ``expected_seq`` is None). Events whose sequence is
+        already stored are idempotent retries and come back as stored. The
+        execution head is taken from the head cache and written back with
+        an optimistic ``head_seq`` check; on a lost race the head is
+        reloaded and the batch retried up to ``max_attempts`` times.
+        """
+        if not events:
+            return []
+        cache = self.head_cache
+        for attempt in range(self.max_attempts):
+            session = self._db.SessionLocal()
+            try:
+                rows, head = self._append_batch(
+                    session,
+                    cache.get(tenant_id, execution_id) if attempt == 0 else None,
+                    tenant_id=tenant_id,
+                    execution_id=execution_id,
+                    events=events,
+                    fsm_id=fsm_id,
+                    expected_seq=expected_seq,
+                    policy_hash=policy_hash,
+                    role_matrix_ver=role_matrix_ver,
+                    materiality_ver=materiality_ver,
                 )
-                .first()
-            )
-
-            occurred_at = _parse_occurred_at(occurred_at_iso)
+                session.commit()
+            except (_StaleHead, DBIntegrityError):
+                session.rollback()
+                cache.invalidate(tenant_id, execution_id)
+                continue
+            except Exception:
+                session.rollback()
+                cache.invalidate(tenant_id, execution_id)
+                raise
+            finally:
+                session.close()
+            cache.put(tenant_id, execution_id, head)
+            return rows
+        raise IntegrityError(
+            f"Concurrent appends to {tenant_id}/{execution_id} did not settle after {self.max_attempts} attempts"
+        )
 
-            if execution is None:
-                execution = FSMExecutionModel(
+    def _append_batch(
+        self,
+        session: Any,
+        head: Optional[ExecutionHead],
+        *,
+        tenant_id: str,
+        execution_id: str,
+        events: Sequence[EventInput],
+        fsm_id: str,
+        expected_seq: int | None,
+        policy_hash: bytes,
+        role_matrix_ver: str,
+        materiality_ver: str,
+    ) -> tuple[list[EventRow], ExecutionHead]:
+        from_cache = head is not None
+        if head is None:
+            head = self._load_head(session, tenant_id, execution_id)
+        if head is None:
+            first = events[0]
+            session.execute(
+                insert(FSMExecutionModel).values(
                     tenant_id=tenant_id,
                     execution_id=execution_id,
                     fsm_id=fsm_id,
-                    started_at=occurred_at,
+                    started_at=_parse_occurred_at(first.occurred_at_iso),
                     head_seq=0,
                     head_hash=None,
                     status="RUNNING",
                     policy_hash=policy_hash,
                     role_matrix_ver=role_matrix_ver,
                     materiality_ver=materiality_ver,
-                    system_version=system_version,
-                    hash_version=hash_version,
+                    system_version=first.system_version,
+                    hash_version=first.hash_version,
                 )
-                session.add(execution)
-                session.flush()
-
-            seq = int(execution.head_seq) + 1
-            if expected_seq is not None:
-                if expected_seq <= int(execution.head_seq):
-                    existing = (
-                        session.query(FSMEventModel)
-                        .filter(
-                            FSMEventModel.tenant_id == tenant_id,
-                            FSMEventModel.execution_id == execution_id,
-                            FSMEventModel.seq == expected_seq,
-                        )
-                        .first()
-                    )
-                    if existing is None:
-                        raise IntegrityError("Missing expected event for idempotent retry")
-                    return self._to_event_row(existing)
-                if expected_seq != seq:
-                    raise IntegrityError(f"Sequence mismatch: expected {expected_seq} got {seq}")
-            prev_hash = execution.head_hash
-            canonical_payload = canonical_json_bytes(payload)
+            )
+            head = ExecutionHead(seq=0, head_hash=None, fsm_id=fsm_id)
+
+        rows: list[EventRow] = []
+        pending = list(events)
+        if expected_seq is not None:
+            if expected_seq > head.seq + 1:
+                if from_cache:
+                    raise _StaleHead()
+                raise IntegrityError(f"Sequence mismatch: expected {expected_seq} got {head.seq + 1}")
+            replayed = min(len(pending), head.seq - expected_seq + 1)
+            if replayed > 0:
+                rows.extend(self._stored_range(session, tenant_id, execution_id, expected_seq, replayed))
+                if len(rows) != replayed:
+                    if from_cache:
+                        raise _StaleHead()
+                    raise IntegrityError("Missing expected event for idempotent retry")
+                pending = pending[replayed:]
+        if not pending:
+            return rows, head
+
+        seq = head.seq
+        prev_hash = head.head_hash
+        status: Optional[str] = None
+        finalized_at: Optional[datetime] = None
+        event_values: list[dict[str, Any]] = []
+        for event in pending:
+            seq += 1
+            occurred_at = _parse_occurred_at(event.occurred_at_iso)
+            canonical_payload = canonical_json_bytes(event.payload)
             payload_hash = sha256_bytes(canonical_payload)
             meta_bytes = _event_meta_bytes(
                 tenant_id=tenant_id,
-                fsm_id=execution.fsm_id,
+                fsm_id=head.fsm_id,
                 execution_id=execution_id,
                 seq=seq,
-                event_type=event_type,
-                event_version=event_version,
-                occurred_at_iso=occurred_at_iso,
-                system_version=system_version,
-                hash_version=hash_version,
-                certification=certification,
+                event_type=event.event_type,
+                event_version=event.event_version,
+                occurred_at_iso=event.occurred_at_iso,
+                system_version=event.system_version,
+                hash_version=event.hash_version,
+                certification=event.certification,
             )
             event_hash = sha256_bytes((prev_hash or b"") + payload_hash + meta_bytes)
-
-            existing = (
-                session.query(FSMEventModel)
-                .filter(
-                    FSMEventModel.tenant_id == tenant_id,
-                    FSMEventModel.execution_id == execution_id,
-                    FSMEventModel.seq == seq,
-                )
-                .first()
-            )
-            if existing is not None:
-                if (
-                    existing.event_hash != event_hash
-                    or existing.payload_hash != payload_hash
-                    or existing.payload_canonical != canonical_payload
-                    or existing.prev_event_hash != prev_hash
-                    or existing.event_type != event_type
-                ):
-                    raise IntegrityError("Idempotency conflict: existing event differs for same sequence")
-                return self._to_event_row(existing)
-
-            row = FSMEventModel(
-                tenant_id=tenant_id,
-                fsm_id=execution.fsm_id,
-                execution_id=execution_id,
-                seq=seq,
-                event_type=event_type,
-                event_version=event_version,
-                occurred_at=occurred_at,
-                payload_canonical=canonical_payload,
-                payload_hash=payload_hash,
-                prev_event_hash=prev_hash,
-                event_hash=event_hash,
-                system_version=system_version,
-                hash_version=hash_version,
-                certification=certification,
+            event_values.append(
+                {
+                    "tenant_id": tenant_id,
+                    "fsm_id": head.fsm_id,
+                    "execution_id": execution_id,
+                    "seq": seq,
+                    "event_type": event.event_type,
+                    "event_version": event.event_version,
+                    "occurred_at": occurred_at,
+                    "payload_canonical": canonical_payload,
+                    "payload_hash": payload_hash,
+                    "prev_event_hash": prev_hash,
+                    "event_hash": event_hash,
+                    "system_version": event.system_version,
+                    "hash_version": event.hash_version,
+                    "certification": event.certification,
+                }
             )
-            session.add(row)
-
-            execution.head_seq = seq
-            execution.head_hash = event_hash
-            if event_type in {"VERDICT_PASS", "RETRY_LIMIT_EXCEEDED"}:
-                execution.status = "FINALIZED"
-                execution.finalized_at = occurred_at
-            elif event_type in {"VERDICT_FAIL", "REPAIR_ABORT"}:
-                execution.status = "ABORTED"
-                execution.finalized_at = occurred_at
-
-            snapshot_hash = sha256_bytes(canonical_payload)
-            session.add(
-                FSMSnapshotModel(
+            rows.append(
+                EventRow(
                     tenant_id=tenant_id,
+                    fsm_id=head.fsm_id,
                     execution_id=execution_id,
-                    snapshot_seq=seq,
-                    snapshot_canonical=canonical_payload,
-                    snapshot_hash=snapshot_hash,
-                    created_at=occurred_at,
+                    seq=seq,
+                    occurred_at_iso=event.occurred_at_iso,
+                    event_type=event.event_type,
+                    event_version=event.event_version,
+                    payload_canonical=canonical_payload,
+                    payload_hash=payload_hash,
+                    prev_event_hash=prev_hash,
+                    event_hash=event_hash,
+                    system_version=event.system_version,
+                    hash_version=event.hash_version,
+                    certification=event.certification,
                 )
             )
-            session.commit()
-            return EventRow(
+            if event.event_type in _TERMINAL_STATUS:
+                status = _TERMINAL_STATUS[event.event_type]
+                finalized_at = occurred_at
+            prev_hash = event_hash
+
+        session.execute(insert(FSMEventModel), event_values)
+        # Only the batch tail is snapshotted; latest_snapshot reads the highest seq.
+        last = event_values[-1]
+        session.execute(
+            insert(FSMSnapshotModel).values(
                 tenant_id=tenant_id,
-                fsm_id=execution.fsm_id,
                 execution_id=execution_id,
-                seq=seq,
-                occurred_at_iso=occurred_at_iso,
-                event_type=event_type,
-                event_version=event_version,
-                payload_canonical=canonical_payload,
-                payload_hash=payload_hash,
-                prev_event_hash=prev_hash,
-                event_hash=event_hash,
-                system_version=system_version,
-                hash_version=hash_version,
-                certification=certification,
+                snapshot_seq=last["seq"],
+                snapshot_canonical=last["payload_canonical"],
+                snapshot_hash=last["payload_hash"],
+                created_at=last["occurred_at"],
             )
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
+        )
 
-    def load_events(self, tenant_id: str, execution_id: str, from_seq: int = 1) -> list[EventRow]:
+        head_values: dict[str, Any] = {"head_seq": seq, "head_hash": prev_hash}
+        if status is not None:
+            head_values.update(status=status, finalized_at=finalized_at)
+        result = session.execute(
+            update(FSMExecutionModel)
+            .where(
+                FSMExecutionModel.tenant_id == tenant_id,
+                FSMExecutionModel.execution_id == execution_id,
+                FSMExecutionModel.head_seq == head.seq,
+            )
+            .values(**head_values)
+        )
+        if result.rowcount != 1:
+            raise _StaleHead()
+        return rows, ExecutionHead(seq=seq, head_hash=prev_hash, fsm_id=head.fsm_id)
+
+    def _load_head(self, session: Any, tenant_id: str, execution_id: str) -> Optional[ExecutionHead]:
+        row = session.execute(
+            select(FSMExecutionModel.head_seq, FSMExecutionModel.head_hash, FSMExecutionModel.fsm_id).where(
+                FSMExecutionModel.tenant_id == tenant_id,
+                FSMExecutionModel.execution_id == execution_id,
+            )
+        ).first()
+        if row is None:
+            return None
+        return ExecutionHead(seq=int(row.head_seq), head_hash=row.head_hash, fsm_id=row.fsm_id)
+
+    def _stored_range(self, session: Any, tenant_id: str, execution_id: str, from_seq: int, count: int) -> list[EventRow]:
+        result = session.execute(
+            select(FSMEventModel.__table__)
+            .where(
+                FSMEventModel.tenant_id == tenant_id,
+                FSMEventModel.execution_id == execution_id,
+                FSMEventModel.seq >= from_seq,
+                FSMEventModel.seq < from_seq + count,
+            )
+            .order_by(FSMEventModel.seq.asc())
+        )
+        return [self._to_event_row(r) for r in result]
+
+    def iter_events(
+        self,
+        tenant_id: str,
+        execution_id: str,
+        from_seq: int = 1,
+        to_seq: int | None = None,
+    ) -> Iterator[EventRow]:
+        """
+        Stream events in sequence order through a server-side cursor.
+
+        Rows are fetched ``stream_batch_size`` at a time; the session stays
+        open until the iterator is exhausted or closed.
+        """
+        stmt = (
+            select(FSMEventModel.__table__)
+            .where(
+                FSMEventModel.tenant_id == tenant_id,
+                FSMEventModel.execution_id == execution_id,
+                FSMEventModel.seq >= from_seq,
+            )
+            .order_by(FSMEventModel.seq.asc())
+            .execution_options(yield_per=self.stream_batch_size)
+        )
+        if to_seq is not None:
+            stmt = stmt.where(FSMEventModel.seq <= to_seq)
         session = self._db.SessionLocal()
         try:
-            rows = (
-                session.query(FSMEventModel)
-                .filter(
-                    FSMEventModel.tenant_id == tenant_id,
-                    FSMEventModel.execution_id == execution_id,
-                    FSMEventModel.seq >= from_seq,
-                )
-                .order_by(FSMEventModel.seq.asc())
-                .all()
-            )
-            return [self._to_event_row(r) for r in rows]
+            for row in session.execute(stmt):
+                yield self._to_event_row(row)
         finally:
             session.close()
 
+    def load_events(self, tenant_id: str, execution_id: str, from_seq: int = 1) -> list[EventRow]:
+        return list(self.iter_events(tenant_id, execution_id, from_seq))
+
     def get_head(self, tenant_id: str, execution_id: str) -> tuple[int, Optional[bytes]]:
         session = self._db.SessionLocal()
         try:
-            execution = (
-                session.query(FSMExecutionModel)
-                .filter(
-                    FSMExecutionModel.tenant_id == tenant_id,
-                    FSMExecutionModel.execution_id == execution_id,
-                )
-                .first()
-            )
-            if execution is None:
+            head = self._load_head(session, tenant_id, execution_id)
+            if head is None:
                 return 0, None
-            return int(execution.head_seq), execution.head_hash
+            return head.seq, head.head_hash
         finally:
             session.close()
 
-    def verify_chain(self, tenant_id: str, execution_id: str) -> bool:
-        events = self.load_events(tenant_id, execution_id)
-        prev: Optional[bytes] = None
-        expected_seq = 1
-        for event in events:
-            if event.seq != expected_seq:
-                return False
-            meta = _event_meta_bytes(
-                tenant_id=tenant_id,
-                fsm_id=event.fsm_id,
-                execution_id=execution_id,
-                seq=event.seq,
-                event_type=event.event_type,
-                event_version=event.event_version,
-                occurred_at_iso=event.occurred_at_iso,
-                system_version=event.system_version,
-                hash_version=event.hash_version,
-                certification=event.certification,
-            )
-            expected_hash = sha256_bytes((prev or b"") + event.payload_hash + meta)
-            if event.payload_hash != sha256_bytes(event.payload_canonical):
-                return False
-            if event.prev_event_hash != prev:
-                return False
-            if event.event_hash != expected_hash:
-                return False
-            prev = event.event_hash
-            expected_seq += 1
+    def verify_chain(self, tenant_id: str, execution_id: str, *, full: bool = False) -> bool:
+        """
+        Check sequence continuity, payload hashes and hash links.
+
+        Verification resumes from the last checkpoint this process proved
+        for the execution, re-checking only that the checkpoint event's
+        stored hash is unchanged; ``full=True`` re-hashes from genesis.
+        """
+        cache = self.head_cache
+        checkpoint = None if full else cache.get_checkpoint(tenant_id, execution_id)
+        from_seq = checkpoint[0] if checkpoint is not None else 1
+        with closing(self.iter_events(tenant_id, execution_id, from_seq=from_seq)) as events:
+            prev: Optional[bytes] = None
+            expected_seq = 1
+            if checkpoint is not None:
+                anchor = next(events, None)
+                if anchor is None or anchor.seq != checkpoint[0] or anchor.event_hash != checkpoint[1]:
+                    cache.drop_checkpoint(tenant_id, execution_id)
+                    return False
+                prev = anchor.event_hash
+                expected_seq = anchor.seq + 1
+
+            last: Optional[tuple[int, bytes]] = checkpoint
+            for event in events:
+                if event.seq != expected_seq:
+                    return False
+                meta = _event_meta_bytes(
+                    tenant_id=tenant_id,
+                    fsm_id=event.fsm_id,
+                    execution_id=execution_id,
+                    seq=event.seq,
+                    event_type=event.event_type,
+                    event_version=event.event_version,
+                    occurred_at_iso=event.occurred_at_iso,
+                    system_version=event.system_version,
+                    hash_version=event.hash_version,
+                    certification=event.certification,
+                )
+                expected_hash = sha256_bytes((prev or b"") + event.payload_hash + meta)
+                if event.payload_hash != sha256_bytes(event.payload_canonical):
+                    return False
+                if event.prev_event_hash != prev:
+                    return False
+                if event.event_hash != expected_hash:
+                    return False
+                prev = event.event_hash
+                last = (event.seq, event.event_hash)
+                expected_seq += 1
+        if last is not None:
+            cache.set_checkpoint(tenant_id, execution_id, *last)
         return True
 
     def latest_snapshot(self, tenant_id: str, execution_id: str) -> Optional[dict[str, Any]]:
@@ -344,34 +622,50 @@ class FSMEventStore:
         finally:
             session.close()
 
-    def export_execution_bundle_bytes(self, tenant_id: str, execution_id: str) -> bytes:
+    def iter_execution_bundle(self, tenant_id: str, execution_id: str) -> Iterator[bytes]:
+        """
+        Stream the canonical execution bundle in chunks.
+
+        Yields exactly the bytes of ``canonical_json_bytes`` over the whole
+        bundle: keys are sorted, so ``events`` is emitted first and the head
+        fields follow. Events are read up to the head observed at the start.
+        """
         head_seq, head_hash = self.get_head(tenant_id, execution_id)
-        events = self.load_events(tenant_id, execution_id)
-        payload = {
-            "tenant_id": tenant_id,
-            "execution_id": execution_id,
-            "head_seq": head_seq,
-            "head_hash": head_hash.hex() if head_hash else None,
-            "events": [
-                {
-                    "seq": e.seq,
-                    "occurred_at": e.occurred_at_iso,
-                    "event_type": e.event_type,
-                    "event_version": e.event_version,
-                    "payload": json.loads(e.payload_canonical.decode("utf-8")),
-                    "payload_hash": e.payload_hash.hex(),
-                    "prev_event_hash": e.prev_event_hash.hex() if e.prev_event_hash else None,
-                    "event_hash": e.event_hash.hex(),
-                    "system_version": e.system_version,
-                    "hash_version": e.hash_version,
-                    "certification": e.certification,
-                }
-                for e in events
-            ],
+        yield b'{"events":['
+        separator = b""
+        for e in self.iter_events(tenant_id, execution_id, to_seq=head_seq):
+            yield separator + canonical_json_bytes(self._bundle_event(e))
+            separator = b","
+        tail = canonical_json_bytes(
+            {
+                "tenant_id": tenant_id,
+                "execution_id": execution_id,
+                "head_seq": head_seq,
+                "head_hash": head_hash.hex() if head_hash else None,
+            }
+        )
+        yield b"]," + tail[1:]
+
+    def export_execution_bundle_bytes(self, tenant_id: str, execution_id: str) -> bytes:
+        return b"".join(self.iter_execution_bundle(tenant_id, execution_id))
+
+    @staticmethod
+    def _bundle_event(e: EventRow) -> dict[str, Any]:
+        return {
+            "seq": e.seq,
+            "occurred_at": e.occurred_at_iso,
+            "event_type": e.event_type,
+            "event_version": e.event_version,
+            "payload": json.loads(e.payload_canonical.decode("utf-8")),
+            "payload_hash": e.payload_hash.hex(),
+            "prev_event_hash": e.prev_event_hash.hex() if e.prev_event_hash else None,
+            "event_hash": e.event_hash.hex(),
+            "system_version": e.system_version,
+            "hash_version": e.hash_version,
+            "certification": e.certification,
         }
-        return canonical_json_bytes(payload)
 
-    def _to_event_row(self, row: FSMEventModel) -> EventRow:
+    def _to_event_row(self, row: Any) -> EventRow:
         return EventRow(
             tenant_id=row.tenant_id,
             fsm_id=row.fsm_id,
@@ -412,5 +706,31 @@ def persist_state_machine_snapshot(plan_id: str, snapshot: dict[str, Any], tenan
     )
 
 
+def persist_state_machine_deltas(plan_id: str, deltas: list[dict[str, Any]], tenant_id: str = _DEFAULT_TENANT) -> None:
+    """Append write-behind transition deltas (see ``storage.save_plan_state_deltas``) as one batch."""
+    if not deltas:
+        return
+    events = [
+        EventInput(
+            event_type=str(delta["transition"].get("event", "UNKNOWN")),
+            payload=delta,
+            occurred_at_iso=_to_iso_z(
+                datetime.fromtimestamp(float(delta["transition"].get("timestamp", time.time())), tz=timezone.utc)
+            ),
+        )
+        for delta in deltas
+    ]
+    FSMEventStore().append_events(
+        tenant_id=tenant_id,
+        execution_id=plan_id,
+        events=events,
+        expected_seq=int(deltas[0]["seq"]),
+    )
+
+
 def load_state_machine_snapshot(plan_id: str, tenant_id: str = _DEFAULT_TENANT) -> Optional[dict[str, Any]]:
-    return FSMEventStore().latest_snapshot(tenant_id, plan_id)
+    snapshot = FSMEventStore().latest_snapshot(tenant_id, plan_id)
+    # Plans persisted through deltas carry single transitions, not full snapshots.
+    if snapshot is None or "history" not in snapshot:
+        return None
+    return snapshot
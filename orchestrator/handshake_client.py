@@ -136,6 +136,7 @@ class A2AHandshakeClient:
 
     def close(self) -> None:
         self.http.close()
+        self.rbac.close()
 
     def __enter__(self) -> "A2AHandshakeClient":
         return self
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import uuid
 from dataclasses import dataclass, field
 from types import SimpleNamespace
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from agents.architecture_agent import ArchitectureAgent
 from agents.coder import CoderAgent
@@ -15,6 +16,7 @@ from agents.managing_agent import ManagingAgent
 from agents.orchestration_agent import OrchestrationAgent
 from agents.pinn_agent import PINNAgent
 from agents.tester import TesterAgent
+from orchestrator.action_scheduler import build_action_dag, run_action_dag
 from orchestrator.judge_orchestrator import get_judge_orchestrator
 from orchestrator.stateflow import StateMachine, State
 from orchestrator.storage import DBManager
@@ -32,15 +34,27 @@ class PipelineResult:
     architecture_artifacts: List[MCPArtifact] = field(default_factory=list)
     code_artifacts: List[MCPArtifact] = field(default_factory=list)
     test_verdicts: List[Dict[str, str]] = field(default_factory=list)
+    action_states: Dict[str, str] = field(default_factory=dict)
     success: bool = False
 
 
+@dataclass
+class _ActionOutcome:
+    """Per-action output, merged into the PipelineResult in blueprint order."""
+
+    artifact: MCPArtifact
+    test_verdicts: List[Dict[str, str]]
+    state: Optional[str] = None
+    shard: Optional[Dict[str, Any]] = None
+
+
 class IntentEngine:
     """Coordinates multi-agent execution across the full swarm with physics-informed verification."""
 
     _logger = logging.getLogger("IntentEngine")
+    _RBAC_ACTIONS = ("run_pipeline",)
 
-    def __init__(self, sm: StateMachine | None = None) -> None:
+    def __init__(self, sm: StateMachine | None = None, max_concurrency: int | None = None) -> None:
         self.manager = ManagingAgent()
         self.orchestrator = OrchestrationAgent()
         self.architect = ArchitectureAgent()
@@ -51,23 +65,36 @@ class IntentEngine:
         self.db = DBManager()
         self.vector_gate = VectorGate()
         self.sm = sm
+        self.max_concurrency = max_concurrency or int(os.getenv("A2A_PIPELINE_CONCURRENCY", "4"))
 
         # RBAC integration (optional, gracefully degrades)
         self._rbac_enabled = os.getenv("RBAC_ENABLED", "true").lower() == "true"
         self._rbac_client = None
         if self._rbac_enabled:
             try:
-                from rbac.client import RBACClient
+                from rbac.client import AsyncRBACClient
                 rbac_url = os.getenv("RBAC_URL", "http://rbac-gateway:8001")
-                self._rbac_client = RBACClient(rbac_url)
+                self._rbac_client = AsyncRBACClient(rbac_url)
             except ImportError:
                 self._logger.warning("rbac package not installed — RBAC disabled.")
 
+    async def aclose(self) -> None:
+        """Close the engine's pooled RBAC gateway connections."""
+        if self._rbac_client is not None:
+            await self._rbac_client.aclose()
+
+    async def __aenter__(self) -> "IntentEngine":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
     async def run_full_pipeline(
         self,
         description: str,
         requester: str = "system",
         max_healing_retries: int = 3,
+        max_concurrency: int | None = None,
     ) -> PipelineResult:
         """
         End-to-end orchestration with Prime Directive lifecycle:
@@ -78,10 +105,19 @@ class IntentEngine:
         4. **CoderAgent** — generate code.
         5. **TesterAgent** — validate + self-heal.
         6. **Prime Directive** — formal PINN verification & export.
+
+        Steps 4-6 run per blueprint action. Actions are scheduled over their
+        dependency DAG (see ``orchestrator.action_scheduler``) with at most
+        ``max_concurrency`` in flight; each action drives its own shard of
+        the pipeline StateMachine. Results are merged in blueprint order, and
+        the pipeline machine then takes one aggregate pass through the Prime
+        Directive states with the shard histories attached.
         """
         # RBAC gate
         if self._rbac_client and self._rbac_enabled:
-            if not self._rbac_client.verify_permission(requester, action="run_pipeline"):
+            # One scope fetch answers every RBAC check this run makes for the requester.
+            await self._rbac_client.prefetch(requester, actions=self._RBAC_ACTIONS)
+            if not await self._rbac_client.verify_permission(requester, action="run_pipeline"):
                 raise PermissionError(f"Agent '{requester}' is not permitted to run the pipeline.")
             self._logger.info("RBAC: '%s' authorized for run_pipeline.", requester)
 
@@ -107,85 +143,145 @@ class IntentEngine:
         arch_artifacts = await self.architect.map_system(blueprint)
         result.architecture_artifacts = arch_artifacts
 
-        for action in blueprint.actions:
-            action.status = "in_progress"
+        dag = build_action_dag(blueprint.actions)
+
+        async def run_action(action: PlanAction) -> _ActionOutcome:
+            return await self._run_action(action, blueprint.plan_id, max_healing_retries)
+
+        outcomes = await run_action_dag(
+            blueprint.actions,
+            dag,
+            run_action,
+            max_concurrency or self.max_concurrency,
+        )
+        for action, outcome in zip(blueprint.actions, outcomes):
+            result.code_artifacts.append(outcome.artifact)
+            result.test_verdicts.extend(outcome.test_verdicts)
+            if outcome.state is not None:
+                result.action_states[action.action_id] = outcome.state
+
+        result.success = all(a.status == "completed" for a in blueprint.actions)
+        self._finish_pipeline_state(
+            result.success,
+            {a.action_id: o.shard for a, o in zip(blueprint.actions, outcomes) if o.shard is not None},
+        )
+        return result
+
+    async def _run_action(
+        self,
+        action: PlanAction,
+        parent_id: str,
+        max_healing_retries: int,
+    ) -> _ActionOutcome:
+        """Coder → tester → self-heal → Prime Directive for one blueprint action."""
+        action.status = "in_progress"
+        sm = self.sm.spawn_shard(action.action_id) if self.sm else None
+        if sm:
+            sm.trigger("OBJECTIVE_INGRESS", action_id=action.action_id)
+            sm.trigger("RUN_DISPATCHED", action_id=action.action_id)
+
+        coder_context = self.judge.get_agent_system_context("CoderAgent")
+        coding_task = f"{coder_context}\n\nImplement this task:\n{action.instruction}"
+
+        artifact = await self.coder.generate_solution(
+            parent_id=parent_id,
+            feedback=coding_task,
+        )
+        await asyncio.to_thread(self.db.save_artifact, artifact)
+
+        # Self-healing loop
+        verdicts: List[Dict[str, str]] = []
+        healed = False
+        for attempt in range(max_healing_retries):
+            report = await self.tester.validate(artifact.artifact_id)
+            judgment = self.judge.judge_action(
+                action=f"Tester verdict for {artifact.artifact_id}: {report.status}",
+                context={"attempt": attempt + 1, "artifact_id": artifact.artifact_id},
+                agent_name="TesterAgent",
+            )
+            verdicts.append({
+                "artifact": artifact.artifact_id,
+                "status": report.status,
+                "judge_score": f"{judgment.overall_score:.3f}",
+            })
+
+            if report.status == "PASS":
+                healed = True
+                break
 
-            coder_context = self.judge.get_agent_system_context("CoderAgent")
-            coding_task = f"{coder_context}\n\nImplement this task:\n{action.instruction}"
-            
             artifact = await self.coder.generate_solution(
-                parent_id=blueprint.plan_id,
-                feedback=coding_task,
+                parent_id=artifact.artifact_id,
+                feedback=f"Tester feedback:\n{report.critique}",
             )
-            self.db.save_artifact(artifact)
-
-            # Self-healing loop
-            healed = False
-            for attempt in range(max_healing_retries):
-                report = await self.tester.validate(artifact.artifact_id)
-                judgment = self.judge.judge_action(
-                    action=f"Tester verdict for {artifact.artifact_id}: {report.status}",
-                    context={"attempt": attempt + 1, "artifact_id": artifact.artifact_id},
-                    agent_name="TesterAgent",
-                )
-                result.test_verdicts.append({
-                    "artifact": artifact.artifact_id,
-                    "status": report.status,
-                    "judge_score": f"{judgment.overall_score:.3f}",
-                })
-
-                if report.status == "PASS":
-                    healed = True
-                    break
-
-                artifact = await self.coder.generate_solution(
-                    parent_id=artifact.artifact_id,
-                    feedback=f"Tester feedback:\n{report.critique}",
-                )
-                self.db.save_artifact(artifact)
+            await asyncio.to_thread(self.db.save_artifact, artifact)
 
-            result.code_artifacts.append(artifact)
-            action.status = "completed" if healed else "failed"
+        action.status = "completed" if healed else "failed"
 
-            if action.status == "completed":
-                if self.sm and self.sm.state == State.EXECUTING:
-                    self.sm.trigger("EXECUTION_COMPLETE")
-                
-                # Apply Prime Directive Cycle
-                prime_success = await self._apply_prime_directive(artifact, action.title)
-                if not prime_success:
-                    action.status = "failed"
-                    action.validation_feedback = "Prime Directive validation failed (residual too high)"
-            
-            if self.sm and self.sm.state == State.TERMINATED_SUCCESS:
-                if action != blueprint.actions[-1]:
-                    self.sm.override(State.EXECUTING, reason="Next action in blueprint")
+        if action.status == "completed":
+            if sm and sm.state == State.EXECUTING:
+                sm.trigger("EXECUTION_COMPLETE")
 
-        result.success = all(a.status == "completed" for a in blueprint.actions)
-        return result
+            # Apply Prime Directive Cycle
+            prime_success = await self._apply_prime_directive(artifact, action.title, sm=sm)
+            if not prime_success:
+                action.status = "failed"
+                action.validation_feedback = "Prime Directive validation failed (residual too high)"
 
-    async def _apply_prime_directive(self, artifact: MCPArtifact, action_title: str) -> bool:
+        return _ActionOutcome(
+            artifact=artifact,
+            test_verdicts=verdicts,
+            state=sm.state.value if sm else None,
+            shard=sm.to_dict() if sm else None,
+        )
+
+    def _finish_pipeline_state(self, success: bool, shards: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Close the pipeline-level StateMachine once every action shard is done.
+
+        Shards are not persisted on their own; their snapshots travel in the
+        ``action_shards`` metadata of the pipeline's EXECUTION_COMPLETE
+        transition. The pipeline then passes through the Prime Directive
+        states once for the whole blueprint, or fails with the failed actions.
+        """
+        if not self.sm or self.sm.state != State.EXECUTING:
+            return
+        self.sm.trigger("EXECUTION_COMPLETE", action_shards=shards)
+        if not success:
+            failed = [a for a, shard in shards.items() if shard["state"] != State.TERMINATED_SUCCESS.value]
+            self.sm.trigger("VERDICT_FAIL", failed_actions=failed)
+            return
+        self.sm.trigger("VERDICT_PASS", aggregate=True, actions=len(shards))
+        for event in ("PRIME_RENDER_COMPLETE", "PRIME_VALIDATION_PASS", "PRIME_EXPORT_COMPLETE", "PRIME_COMMIT_COMPLETE"):
+            self.sm.trigger(event, aggregate=True)
+
+    async def _apply_prime_directive(
+        self,
+        artifact: MCPArtifact,
+        action_title: str,
+        sm: StateMachine | None = None,
+    ) -> bool:
         """Execute the Prime Directive lifecycle for a verified artifact."""
-        if not self.sm:
+        sm = sm or self.sm
+        if not sm:
             residual = self.pinn.calculate_residual(artifact.content)
             self._attach_pinn_metadata(artifact, residual)
             return True
 
         try:
-            if self.sm.state == State.EVALUATING:
-                self.sm.trigger("VERDICT_PASS")
+            if sm.state == State.EVALUATING:
+                sm.trigger("VERDICT_PASS")
 
-            self.sm.trigger("PRIME_RENDER_COMPLETE")
+            sm.trigger("PRIME_RENDER_COMPLETE")
             residual = self.pinn.calculate_residual(artifact.content)
             self._attach_pinn_metadata(artifact, residual)
             
             if residual > 0.15:
-                self.sm.trigger("PRIME_VALIDATION_FAIL", residual=residual, reason="PINN residual above threshold")
+                sm.trigger("PRIME_VALIDATION_FAIL", residual=residual, reason="PINN residual above threshold")
                 return False
             
-            self.sm.trigger("PRIME_VALIDATION_PASS", residual=residual)
-            self.sm.trigger("PRIME_EXPORT_COMPLETE")
-            self.sm.trigger("PRIME_COMMIT_COMPLETE")
+            sm.trigger("PRIME_VALIDATION_PASS", residual=residual)
+            sm.trigger("PRIME_EXPORT_COMPLETE")
+            sm.trigger("PRIME_COMMIT_COMPLETE")
             return True
         except Exception as e:
             self._logger.error(f"Prime Directive cycle failed: {e}")
@@ -6,13 +6,25 @@ from orchestrator.llm_adapters.base import (
     InternalLLMRequest,
     InternalLLMResponse,
 )
-from orchestrator.llm_adapters.registry import LLMAdapterRegistry, ProviderRoutingPolicy
+from orchestrator.llm_adapters.cached_adapter import CachedLLMAdapter
+from orchestrator.llm_adapters.http_adapter import HTTPLLMAdapter
+from orchestrator.llm_adapters.registry import (
+    LLMAdapterRegistry,
+    ProviderRoutingPolicy,
+    get_llm_adapter_registry,
+)
+from orchestrator.llm_adapters.transport import ProviderTransport, get_transport
 
 __all__ = [
     "BaseLLMAdapter",
+    "CachedLLMAdapter",
+    "HTTPLLMAdapter",
     "InternalLLMMessage",
     "InternalLLMRequest",
     "InternalLLMResponse",
     "LLMAdapterRegistry",
     "ProviderRoutingPolicy",
+    "ProviderTransport",
+    "get_llm_adapter_registry",
+    "get_transport",
 ]
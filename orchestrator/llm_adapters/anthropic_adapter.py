@@ -2,24 +2,25 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-import requests
+from orchestrator.llm_adapters.base import InternalLLMRequest
+from orchestrator.llm_adapters.http_adapter import HTTPLLMAdapter, PreparedRequest, sse_data
+from orchestrator.llm_adapters.transport import ProviderTransport
 
-from orchestrator.llm_adapters.base import BaseLLMAdapter, InternalLLMRequest, InternalLLMResponse
 
-
-class AnthropicAdapter(BaseLLMAdapter):
+class AnthropicAdapter(HTTPLLMAdapter):
     """Adapter for Anthropic's messages API."""
 
     provider_name = "anthropic"
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Optional[ProviderTransport] = None) -> None:
+        super().__init__(transport)
         self._api_key = os.getenv("ANTHROPIC_API_KEY")
         self._endpoint = os.getenv("ANTHROPIC_ENDPOINT", "https://api.anthropic.com/v1/messages")
         self._default_model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-latest")
 
-    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+    def _prepare(self, request: InternalLLMRequest, stream: bool = False) -> PreparedRequest:
         if not self._api_key:
             raise ValueError("ANTHROPIC_API_KEY missing from environment variables")
 
@@ -38,16 +39,17 @@ class AnthropicAdapter(BaseLLMAdapter):
             "max_tokens": 1024,
             "messages": [{"role": "user", "content": user_content}],
         }
+        if stream:
+            payload["stream"] = True
+        return PreparedRequest(url=self._endpoint, model=payload["model"], payload=payload, headers=headers)
 
-        response = requests.post(self._endpoint, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        raw = response.json()
+    def _parse(self, raw: Dict[str, Any]) -> str:
         content_blocks: List[Dict[str, Any]] = raw.get("content", [])
-        content = "".join(block.get("text", "") for block in content_blocks if block.get("type") == "text")
-
-        return InternalLLMResponse(
-            content=content,
-            provider=self.provider_name,
-            model=payload["model"],
-            raw_response=raw,
-        )
+        return "".join(block.get("text", "") for block in content_blocks if block.get("type") == "text")
+
+    def _parse_stream_line(self, line: str) -> Optional[str]:
+        event = sse_data(line)
+        if not event or event.get("type") != "content_block_delta":
+            return None
+        delta = event.get("delta", {})
+        return delta.get("text") if delta.get("type") == "text_delta" else None
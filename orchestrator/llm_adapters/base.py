@@ -1,9 +1,10 @@
 """Base contracts and DTOs for LLM adapters."""
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 
 @dataclass(frozen=True)
@@ -44,3 +45,23 @@ class BaseLLMAdapter(ABC):
     @abstractmethod
     def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
         """Generate a response using a concrete provider transport."""
+
+    async def agenerate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+        """Async generation; adapters without a native path use a worker thread."""
+        return await asyncio.to_thread(self.generate, request)
+
+    async def astream(
+        self,
+        request: InternalLLMRequest,
+        on_response: Optional[Callable[[InternalLLMResponse], None]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield response text as it arrives; the default yields the full completion once.
+
+        ``on_response`` receives the completed response (same provider/model
+        metadata as ``generate``) once the stream is exhausted.
+        """
+        response = await self.agenerate(request)
+        yield response.content
+        if on_response is not None:
+            on_response(response)
@@ -0,0 +1,94 @@
+"""Response-cache wrapper shared by every provider adapter."""
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from orchestrator.llm_adapters.base import BaseLLMAdapter, InternalLLMRequest, InternalLLMResponse
+from orchestrator.llm_cache import LLMResponseCache, llm_cache_key
+
+# Request metadata key; ``False`` sends the request straight to the provider.
+CACHE_METADATA_KEY = "cache"
+
+
+class CachedLLMAdapter(BaseLLMAdapter):
+    """Serves repeated requests from an LLMResponseCache in front of ``inner``."""
+
+    def __init__(self, inner: BaseLLMAdapter, cache: LLMResponseCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.provider_name = inner.provider_name
+
+    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+        cached = self.cache.get_or_compute(
+            self._key(request),
+            lambda: self._encode(self.inner.generate(request)),
+            use_cache=self._use_cache(request),
+        )
+        return InternalLLMResponse(**cached)
+
+    async def agenerate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+        async def compute() -> Dict[str, Any]:
+            return self._encode(await self.inner.agenerate(request))
+
+        cached = await self.cache.aget_or_compute(
+            self._key(request),
+            compute,
+            use_cache=self._use_cache(request),
+        )
+        return InternalLLMResponse(**cached)
+
+    async def astream(
+        self,
+        request: InternalLLMRequest,
+        on_response: Optional[Callable[[InternalLLMResponse], None]] = None,
+    ) -> AsyncIterator[str]:
+        """Replay a cached completion as one chunk; otherwise stream and cache the result."""
+        use_cache = self._use_cache(request)
+        key = self._key(request)
+        if use_cache:
+            hit, cached = self.cache.get(key)
+            if hit:
+                yield cached["content"]
+                if on_response is not None:
+                    on_response(InternalLLMResponse(**cached))
+                return
+
+        completed: List[InternalLLMResponse] = []
+        async for chunk in self.inner.astream(request, completed.append):
+            yield chunk
+        if not completed:
+            return
+        if use_cache:
+            self.cache.put(key, self._encode(completed[0]))
+        if on_response is not None:
+            on_response(completed[0])
+
+    @staticmethod
+    def _use_cache(request: InternalLLMRequest) -> bool:
+        return request.metadata.get(CACHE_METADATA_KEY, True) is not False
+
+    def _key(self, request: InternalLLMRequest) -> str:
+        return llm_cache_key(
+            provider=self.provider_name,
+            model=request.model or getattr(self.inner, "_default_model", "") or "",
+            messages=self._messages(request),
+            params={"endpoint": getattr(self.inner, "_endpoint", None)},
+        )
+
+    @staticmethod
+    def _messages(request: InternalLLMRequest) -> List[Dict[str, str]]:
+        messages = [{"role": "system", "content": request.system_prompt}]
+        if request.messages:
+            messages.extend({"role": m.role, "content": m.content} for m in request.messages)
+        else:
+            messages.append({"role": "user", "content": request.prompt})
+        return messages
+
+    @staticmethod
+    def _encode(response: InternalLLMResponse) -> Dict[str, Any]:
+        return {
+            "content": response.content,
+            "provider": response.provider,
+            "model": response.model,
+            "raw_response": response.raw_response,
+        }
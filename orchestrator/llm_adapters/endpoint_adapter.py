@@ -2,23 +2,20 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-import requests
+from orchestrator.llm_adapters.base import InternalLLMRequest
+from orchestrator.llm_adapters.http_adapter import HTTPLLMAdapter, PreparedRequest, sse_data
+from orchestrator.llm_adapters.transport import ProviderTransport
 
-from orchestrator.llm_adapters.base import (
-    BaseLLMAdapter,
-    InternalLLMRequest,
-    InternalLLMResponse,
-)
 
-
-class EndpointAdapter(BaseLLMAdapter):
+class EndpointAdapter(HTTPLLMAdapter):
     """Adapter for OpenAI-compatible chat completion endpoints."""
 
     provider_name = "endpoint"
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Optional[ProviderTransport] = None) -> None:
+        super().__init__(transport)
         self._api_key = os.getenv("LLM_API_KEY")
         self._endpoint = os.getenv("LLM_ENDPOINT")
         self._default_model = os.getenv("LLM_MODEL", "codestral-latest")
@@ -32,7 +29,7 @@ class EndpointAdapter(BaseLLMAdapter):
             {"role": "user", "content": request.prompt},
         ]
 
-    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+    def _prepare(self, request: InternalLLMRequest, stream: bool = False) -> PreparedRequest:
         if not self._api_key or not self._endpoint:
             raise ValueError("API Key or Endpoint missing from environment variables")
 
@@ -44,15 +41,15 @@ class EndpointAdapter(BaseLLMAdapter):
             "model": request.model or self._default_model,
             "messages": self._normalize_messages(request),
         }
-
-        response = requests.post(self._endpoint, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        raw = response.json()
-        content = raw["choices"][0]["message"]["content"]
-
-        return InternalLLMResponse(
-            content=content,
-            provider=self.provider_name,
-            model=payload["model"],
-            raw_response=raw,
-        )
+        if stream:
+            payload["stream"] = True
+        return PreparedRequest(url=self._endpoint, model=payload["model"], payload=payload, headers=headers)
+
+    def _parse(self, raw: Dict[str, Any]) -> str:
+        return raw["choices"][0]["message"]["content"]
+
+    def _parse_stream_line(self, line: str) -> Optional[str]:
+        event = sse_data(line)
+        if not event or not event.get("choices"):
+            return None
+        return event["choices"][0].get("delta", {}).get("content")
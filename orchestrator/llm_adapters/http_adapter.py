@@ -0,0 +1,119 @@
+"""Shared request/response plumbing for HTTP-backed provider adapters."""
+from __future__ import annotations
+
+import json
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from orchestrator.llm_adapters.base import BaseLLMAdapter, InternalLLMRequest, InternalLLMResponse
+from orchestrator.llm_adapters.transport import ProviderTransport, get_transport
+
+
+@dataclass(frozen=True)
+class PreparedRequest:
+    """Provider-specific HTTP call derived from an InternalLLMRequest."""
+
+    url: str
+    model: str
+    payload: Dict[str, Any]
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class HTTPLLMAdapter(BaseLLMAdapter):
+    """
+    Base for adapters that POST JSON to a provider endpoint.
+
+    Subclasses describe the wire format (``_prepare``/``_parse`` and, when the
+    provider can stream, ``_parse_stream_line``); the pooled, retrying
+    ``ProviderTransport`` for ``provider_name`` carries the requests.
+    ``supports_streaming`` follows from whether ``_parse_stream_line`` is
+    overridden.
+    """
+
+    supports_streaming = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.supports_streaming = cls._parse_stream_line is not HTTPLLMAdapter._parse_stream_line
+
+    def __init__(self, transport: Optional[ProviderTransport] = None) -> None:
+        self._transport = transport
+
+    @property
+    def transport(self) -> ProviderTransport:
+        return self._transport or get_transport(self.provider_name)
+
+    @abstractmethod
+    def _prepare(self, request: InternalLLMRequest, stream: bool = False) -> PreparedRequest:
+        """Build the provider call; raises ValueError when credentials are missing."""
+
+    @abstractmethod
+    def _parse(self, raw: Dict[str, Any]) -> str:
+        """Extract completion text from a provider response body."""
+
+    def _parse_stream_line(self, line: str) -> Optional[str]:
+        """Extract a text delta from one streamed line, or None to skip it."""
+        return None
+
+    def _response(self, prepared: PreparedRequest, raw: Dict[str, Any]) -> InternalLLMResponse:
+        return InternalLLMResponse(
+            content=self._parse(raw),
+            provider=self.provider_name,
+            model=prepared.model,
+            raw_response=raw,
+        )
+
+    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+        prepared = self._prepare(request)
+        response = self.transport.post(prepared.url, headers=prepared.headers, json=prepared.payload)
+        response.raise_for_status()
+        return self._response(prepared, response.json())
+
+    async def agenerate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+        prepared = self._prepare(request)
+        response = await self.transport.apost(prepared.url, headers=prepared.headers, json=prepared.payload)
+        response.raise_for_status()
+        return self._response(prepared, response.json())
+
+    async def astream(
+        self,
+        request: InternalLLMRequest,
+        on_response: Optional[Callable[[InternalLLMResponse], None]] = None,
+    ) -> AsyncIterator[str]:
+        if not self.supports_streaming:
+            async for chunk in super().astream(request, on_response):
+                yield chunk
+            return
+
+        prepared = self._prepare(request, stream=True)
+        chunks: List[str] = []
+        async with self.transport.astream(prepared.url, headers=prepared.headers, json=prepared.payload) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = self._parse_stream_line(line)
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+        if on_response is not None:
+            on_response(
+                InternalLLMResponse(
+                    content="".join(chunks),
+                    provider=self.provider_name,
+                    model=prepared.model,
+                )
+            )
+
+
+def sse_data(line: str) -> Optional[Dict[str, Any]]:
+    """Decode a ``data:`` line of a server-sent event stream."""
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data or data == "[DONE]":
+        return None
+    return json.loads(data)
@@ -1,41 +1,39 @@
 """Ollama adapter."""
 from __future__ import annotations
 
+import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-import requests
+from orchestrator.llm_adapters.base import InternalLLMRequest
+from orchestrator.llm_adapters.http_adapter import HTTPLLMAdapter, PreparedRequest
+from orchestrator.llm_adapters.transport import ProviderTransport
 
-from orchestrator.llm_adapters.base import BaseLLMAdapter, InternalLLMRequest, InternalLLMResponse
 
-
-class OllamaAdapter(BaseLLMAdapter):
+class OllamaAdapter(HTTPLLMAdapter):
     """Adapter for local Ollama chat API."""
 
     provider_name = "ollama"
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Optional[ProviderTransport] = None) -> None:
+        super().__init__(transport)
         self._endpoint = os.getenv("OLLAMA_ENDPOINT", "http://localhost:11434/api/chat")
         self._default_model = os.getenv("OLLAMA_MODEL", "llama3.1")
 
-    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+    def _prepare(self, request: InternalLLMRequest, stream: bool = False) -> PreparedRequest:
         payload: Dict[str, Any] = {
             "model": request.model or self._default_model,
             "messages": [
                 {"role": "system", "content": request.system_prompt},
                 {"role": "user", "content": request.prompt},
             ],
-            "stream": False,
+            "stream": stream,
         }
+        return PreparedRequest(url=self._endpoint, model=payload["model"], payload=payload)
+
+    def _parse(self, raw: Dict[str, Any]) -> str:
+        return raw.get("message", {}).get("content", "")
 
-        response = requests.post(self._endpoint, json=payload, timeout=60)
-        response.raise_for_status()
-        raw = response.json()
-        content = raw.get("message", {}).get("content", "")
-
-        return InternalLLMResponse(
-            content=content,
-            provider=self.provider_name,
-            model=payload["model"],
-            raw_response=raw,
-        )
+    def _parse_stream_line(self, line: str) -> Optional[str]:
+        # Ollama streams newline-delimited JSON objects rather than SSE.
+        return json.loads(line).get("message", {}).get("content")
@@ -2,14 +2,17 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
 from typing import Dict, Optional, Type
 
 from orchestrator.llm_adapters.anthropic_adapter import AnthropicAdapter
 from orchestrator.llm_adapters.base import BaseLLMAdapter, InternalLLMRequest
+from orchestrator.llm_adapters.cached_adapter import CachedLLMAdapter
 from orchestrator.llm_adapters.endpoint_adapter import EndpointAdapter
 from orchestrator.llm_adapters.ollama_adapter import OllamaAdapter
 from orchestrator.llm_adapters.vertex_adapter import VertexAdapter
+from orchestrator.llm_cache import LLMResponseCache, get_llm_cache, llm_cache_enabled
 
 
 @dataclass(frozen=True)
@@ -34,20 +37,57 @@ class ProviderRoutingPolicy:
 
 
 class LLMAdapterRegistry:
-    """Factory that returns concrete adapters from provider/model routing policy."""
+    """
+    Resolves requests to long-lived adapters via the provider/model routing policy.
 
-    def __init__(self, routing_policy: Optional[ProviderRoutingPolicy] = None) -> None:
+    Each provider's adapter is built once per registry and reused, so its
+    pooled transport and response-cache wrapper are shared by every request.
+    """
+
+    def __init__(
+        self,
+        routing_policy: Optional[ProviderRoutingPolicy] = None,
+        cache: Optional[LLMResponseCache] = None,
+    ) -> None:
         self._routing_policy = routing_policy or ProviderRoutingPolicy()
+        self._cache = cache if cache is not None else (get_llm_cache() if llm_cache_enabled() else None)
         self._adapters: Dict[str, Type[BaseLLMAdapter]] = {
             "endpoint": EndpointAdapter,
             "anthropic": AnthropicAdapter,
             "vertex": VertexAdapter,
             "ollama": OllamaAdapter,
         }
+        self._instances: Dict[str, BaseLLMAdapter] = {}
+        self._lock = threading.Lock()
 
     def resolve(self, request: InternalLLMRequest) -> BaseLLMAdapter:
         provider = self._routing_policy.resolve_provider(request)
+        adapter = self._instances.get(provider)
+        if adapter is not None:
+            return adapter
+
         adapter_cls = self._adapters.get(provider)
         if adapter_cls is None:
             raise ValueError(f"Unsupported LLM provider: {provider}")
-        return adapter_cls()
+        with self._lock:
+            adapter = self._instances.get(provider)
+            if adapter is None:
+                adapter = adapter_cls()
+                if self._cache is not None:
+                    adapter = CachedLLMAdapter(adapter, self._cache)
+                self._instances[provider] = adapter
+        return adapter
+
+
+_DEFAULT_REGISTRY: Optional[LLMAdapterRegistry] = None
+_DEFAULT_REGISTRY_LOCK = threading.Lock()
+
+
+def get_llm_adapter_registry() -> LLMAdapterRegistry:
+    """Process-wide registry, so adapters are singletons per provider."""
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        with _DEFAULT_REGISTRY_LOCK:
+            if _DEFAULT_REGISTRY is None:
+                _DEFAULT_REGISTRY = LLMAdapterRegistry()
+    return _DEFAULT_REGISTRY
@@ -0,0 +1,266 @@
+"""Pooled, retrying HTTP transport shared by the provider adapters.
+
+One ``ProviderTransport`` exists per provider. It owns a keep-alive
+``httpx.Client`` for synchronous calls and one ``httpx.AsyncClient`` per
+running event loop (HTTP/2 when the ``h2`` package is installed), caps the
+number of in-flight requests to the provider, and retries transport errors
+and retryable status codes with full-jitter exponential backoff.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ProviderTransport:
+    """
+    Shared connection pool, concurrency limit and retry policy for one provider.
+
+    Args:
+        provider: Provider name, used in log messages
+        max_concurrency: In-flight request cap across threads (sync) and per
+            event loop (async)
+        max_connections: Connection pool size
+        timeout: Per-request timeout in seconds
+        max_retries: Retries after the first attempt
+        backoff_base: First backoff ceiling in seconds, doubled per retry
+        backoff_max: Upper bound on a single backoff
+        transport: Optional httpx transport (tests, local fakes)
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        max_concurrency: int = 8,
+        max_connections: int = 20,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.http2 = http2_available()
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._transport = transport
+        self._async_transport = async_transport
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_limit = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        http2=self.http2,
+                        limits=self._limits,
+                        timeout=self.timeout,
+                        transport=self._transport,
+                    )
+        return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled client for the running loop; clients are loop-bound in httpx."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self._limits,
+                timeout=self.timeout,
+                transport=self._async_transport,
+            )
+            self._async_clients[loop] = client
+            self._async_limits[loop] = asyncio.Semaphore(self.max_concurrency)
+        return client
+
+    def _async_limit(self) -> asyncio.Semaphore:
+        self.async_client()
+        return self._async_limits[asyncio.get_running_loop()]
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Full-jitter delay before retry ``attempt``; honours Retry-After seconds."""
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _should_retry(self, attempt: int, response: Optional[httpx.Response]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in RETRYABLE_STATUS
+
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST with pooling, the provider concurrency cap and retries."""
+        attempt = 0
+        while True:
+            try:
+                with self._sync_limit:
+                    response = self.client.post(url, **kwargs)
+            except httpx.TransportError as exc:
+                if not self._should_retry(attempt, None):
+                    raise
+                logger.warning("%s transport error (attempt %d): %s", self.provider, attempt + 1, exc)
+                response = None
+            else:
+                if not self._should_retry(attempt, response):
+                    return response
+            time.sleep(self.backoff(attempt, response))
+            attempt += 1
+
+    async def apost(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Async counterpart of :meth:`post`."""
+        client = self.async_client()
+        limit = self._async_limit()
+        attempt = 0
+        while True:
+            try:
+                async with limit:
+                    response = await client.post(url, **kwargs)
+            except httpx.TransportError as exc:
+                if not self._should_retry(attempt, None):
+                    raise
+                logger.warning("%s transport error (attempt %d): %s", self.provider, attempt + 1, exc)
+                response = None
+            else:
+                if not self._should_retry(attempt, response):
+                    return response
+            await asyncio.sleep(self.backoff(attempt, response))
+            attempt += 1
+
+    @asynccontextmanager
+    async def astream(self, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Streaming POST. Retries apply only until response headers arrive;
+        once the body starts streaming, errors propagate to the caller.
+        """
+        client = self.async_client()
+        limit = self._async_limit()
+        attempt = 0
+        async with limit:
+            while True:
+                try:
+                    request = client.build_request("POST", url, **kwargs)
+                    response = await client.send(request, stream=True)
+                except httpx.TransportError:
+                    if not self._should_retry(attempt, None):
+                        raise
+                    response = None
+                if response is not None and not self._should_retry(attempt, response):
+                    break
+                if response is not None:
+                    await response.aclose()
+                await asyncio.sleep(self.backoff(attempt, response))
+                attempt += 1
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        """Close the running loop's async client (and the sync client)."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.pop(loop, None)
+        self._async_limits.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+
+_TRANSPORTS: Dict[str, ProviderTransport] = {}
+_TRANSPORTS_LOCK = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def get_transport(provider: str) -> ProviderTransport:
+    """
+    Process-wide transport for ``provider``.
+
+    ``LLM_<PROVIDER>_MAX_CONCURRENCY`` overrides ``LLM_MAX_CONCURRENCY``;
+    ``LLM_HTTP_MAX_CONNECTIONS``, ``LLM_HTTP_TIMEOUT_SECONDS`` and
+    ``LLM_HTTP_MAX_RETRIES`` apply to every provider.
+    """
+    transport = _TRANSPORTS.get(provider)
+    if transport is None:
+        with _TRANSPORTS_LOCK:
+            transport = _TRANSPORTS.get(provider)
+            if transport is None:
+                default_concurrency = _env_int("LLM_MAX_CONCURRENCY", 8)
+                transport = ProviderTransport(
+                    provider,
+                    max_concurrency=_env_int(f"LLM_{provider.upper()}_MAX_CONCURRENCY", default_concurrency),
+                    max_connections=_env_int("LLM_HTTP_MAX_CONNECTIONS", 20),
+                    timeout=float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", "60")),
+                    max_retries=_env_int("LLM_HTTP_MAX_RETRIES", 2),
+                )
+                _TRANSPORTS[provider] = transport
+    return transport
+
+
+def set_transport(provider: str, transport: ProviderTransport) -> None:
+    """Install a transport for ``provider`` (local fakes, tests)."""
+    with _TRANSPORTS_LOCK:
+        previous = _TRANSPORTS.pop(provider, None)
+        _TRANSPORTS[provider] = transport
+    if previous is not None and previous is not transport:
+        previous.close()
+
+
+def reset_transports() -> None:
+    """Close and forget every provider transport."""
+    with _TRANSPORTS_LOCK:
+        transports = list(_TRANSPORTS.values())
+        _TRANSPORTS.clear()
+    for transport in transports:
+        transport.close()
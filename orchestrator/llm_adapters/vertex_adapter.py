@@ -2,24 +2,25 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-import requests
+from orchestrator.llm_adapters.base import InternalLLMRequest
+from orchestrator.llm_adapters.http_adapter import HTTPLLMAdapter, PreparedRequest
+from orchestrator.llm_adapters.transport import ProviderTransport
 
-from orchestrator.llm_adapters.base import BaseLLMAdapter, InternalLLMRequest, InternalLLMResponse
 
-
-class VertexAdapter(BaseLLMAdapter):
+class VertexAdapter(HTTPLLMAdapter):
     """Adapter for Vertex AI Gemini endpoints via REST."""
 
     provider_name = "vertex"
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Optional[ProviderTransport] = None) -> None:
+        super().__init__(transport)
         self._api_key = os.getenv("VERTEX_API_KEY")
         self._endpoint = os.getenv("VERTEX_ENDPOINT")
         self._default_model = os.getenv("VERTEX_MODEL", "gemini-1.5-pro")
 
-    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+    def _prepare(self, request: InternalLLMRequest, stream: bool = False) -> PreparedRequest:
         if not self._api_key or not self._endpoint:
             raise ValueError("VERTEX_API_KEY or VERTEX_ENDPOINT missing from environment variables")
 
@@ -30,20 +31,11 @@ class VertexAdapter(BaseLLMAdapter):
         }
         headers = {"Content-Type": "application/json"}
         endpoint = f"{self._endpoint}?key={self._api_key}"
+        return PreparedRequest(url=endpoint, model=payload["model"], payload=payload, headers=headers)
 
-        response = requests.post(endpoint, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        raw = response.json()
-
+    def _parse(self, raw: Dict[str, Any]) -> str:
         candidates = raw.get("candidates", [])
         parts = []
         if candidates:
             parts = candidates[0].get("content", {}).get("parts", [])
-        content = "".join(part.get("text", "") for part in parts)
-
-        return InternalLLMResponse(
-            content=content,
-            provider=self.provider_name,
-            model=payload["model"],
-            raw_response=raw,
-        )
+        return "".join(part.get("text", "") for part in parts)
@@ -0,0 +1,376 @@
+"""Content-addressed cache for LLM responses.
+
+Responses are keyed on a SHA-256 of (provider, model, messages, params), so
+identical prompts sent from self-healing loops or sibling agents reuse one
+provider call. A bounded in-memory LRU sits in front of an optional SQLite
+tier; both honour a TTL. Concurrent misses for the same key are
+single-flighted: one caller hits the provider, the rest wait for its result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def llm_cache_key(
+    provider: str,
+    model: str,
+    messages: List[Mapping[str, Any]],
+    params: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Stable content hash of everything that determines a completion."""
+    document = {
+        "provider": provider,
+        "model": model,
+        "messages": [dict(message) for message in messages],
+        "params": dict(params or {}),
+    }
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Entry:
+    value: Any
+    latency_ms: float
+    expires_at: float
+
+
+class _Flight:
+    """One in-flight provider call that later callers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _SQLiteTier:
+    """Disk tier: TTL-bounded rows, evicted least-recently-used past ``max_entries``."""
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " latency_ms REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> Optional[_Entry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, latency_ms, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[2] <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return _Entry(value=json.loads(row[0]), latency_ms=row[1], expires_at=row[2])
+
+    def put(self, key: str, entry: _Entry, now: float) -> int:
+        """Store ``entry``; returns the number of rows evicted."""
+        encoded = json.dumps(entry.value, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, latency_ms, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, entry.latency_ms, entry.expires_at, now),
+            )
+            expired = self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+            overflow = self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        return max(expired, 0) + max(overflow, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """
+    Two-tier, single-flighted cache of JSON-serializable LLM responses.
+
+    The cache keeps its own copy of each value and hands every caller a fresh
+    copy, so one caller mutating a response cannot change it for the others.
+
+    Args:
+        ttl_seconds: Default lifetime of an entry in either tier
+        max_entries: Bound on the in-memory LRU
+        disk_path: SQLite file for the disk tier; None keeps the cache in memory
+        max_disk_entries: Bound on rows in the disk tier
+        clock: Wall-clock source; disk entries outlive the process
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 1024,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._memory: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._disk = _SQLiteTier(disk_path, max_disk_entries) if disk_path else None
+        self._inflight: Dict[str, _Flight] = {}
+        self._ainflight: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "bypassed": 0,
+            "errors": 0,
+            "evictions": 0,
+        }
+        self._saved_latency_ms = 0.0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(hit, value)``, promoting disk hits into memory."""
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._memory[key]
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                self._saved_latency_ms += entry.latency_ms
+                return True, copy.deepcopy(entry.value)
+
+        if self._disk is None:
+            return False, None
+        try:
+            entry = self._disk.get(key, now)
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache disk read failed: %s", exc)
+            return False, None
+        if entry is None:
+            return False, None
+        with self._lock:
+            self._remember(key, entry)
+            self._stats["disk_hits"] += 1
+            self._saved_latency_ms += entry.latency_ms
+        return True, copy.deepcopy(entry.value)
+
+    def put(self, key: str, value: Any, latency_ms: float = 0.0, ttl_seconds: Optional[float] = None) -> None:
+        now = self.clock()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        entry = _Entry(value=copy.deepcopy(value), latency_ms=latency_ms, expires_at=now + ttl)
+        with self._lock:
+            self._remember(key, entry)
+        if self._disk is None:
+            return
+        try:
+            evicted = self._disk.put(key, entry, now)
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            logger.warning("LLM cache disk write failed: %s", exc)
+            return
+        if evicted:
+            with self._lock:
+                self._stats["evictions"] += evicted
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        *,
+        use_cache: bool = True,
+        ttl_seconds: Optional[float] = None,
+    ) -> Any:
+        """
+        Serve ``key`` from cache or run ``compute`` once for all concurrent callers.
+
+        With ``use_cache=False`` the call goes straight to ``compute`` and
+        its result is neither read from nor written to the cache. Errors
+        are propagated to every waiter and never cached.
+        """
+        if not use_cache:
+            with self._lock:
+                self._stats["bypassed"] += 1
+            return compute()
+
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value)
+
+        started = time.perf_counter()
+        try:
+            flight.value = compute()
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        else:
+            self.put(key, flight.value, (time.perf_counter() - started) * 1000.0, ttl_seconds)
+            return flight.value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        use_cache: bool = True,
+        ttl_seconds: Optional[float] = None,
+    ) -> Any:
+        """Async :meth:`get_or_compute`; callers on the same loop share one ``compute``."""
+        if not use_cache:
+            with self._lock:
+                self._stats["bypassed"] += 1
+            return await compute()
+
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            flight = self._ainflight.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._ainflight[flight_key] = asyncio.get_running_loop().create_future()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return copy.deepcopy(await asyncio.shield(flight))
+
+        started = time.perf_counter()
+        try:
+            value = await compute()
+        except BaseException as exc:
+            with self._lock:
+                self._stats["errors"] += 1
+            if isinstance(exc, asyncio.CancelledError):
+                flight.cancel()
+            else:
+                flight.set_exception(exc)
+                # Waiters receive the exception; mark it retrieved for the leader-only case.
+                flight.exception()
+            raise
+        else:
+            self.put(key, value, (time.perf_counter() - started) * 1000.0, ttl_seconds)
+            flight.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._ainflight.pop(flight_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus hit ratio and provider latency avoided by hits."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["saved_latency_ms"] = round(self._saved_latency_ms, 3)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = hits / lookups if lookups else 0.0
+        stats["disk_enabled"] = self._disk is not None
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+
+_LLM_CACHE: Optional[LLMResponseCache] = None
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+def llm_cache_enabled() -> bool:
+    return os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide response cache, configured from ``LLM_CACHE_*`` env vars."""
+    global _LLM_CACHE
+    if _LLM_CACHE is None:
+        with _LLM_CACHE_LOCK:
+            if _LLM_CACHE is None:
+                _LLM_CACHE = LLMResponseCache(
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+                    disk_path=os.getenv("LLM_CACHE_PATH") or None,
+                    max_disk_entries=int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "10000")),
+                )
+    return _LLM_CACHE
+
+
+def reset_llm_cache() -> None:
+    """Drop the process-wide cache; the next call rebuilds it from env."""
+    global _LLM_CACHE
+    with _LLM_CACHE_LOCK:
+        if _LLM_CACHE is not None:
+            _LLM_CACHE.close()
+        _LLM_CACHE = None
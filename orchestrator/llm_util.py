@@ -1,23 +1,41 @@
 from __future__ import annotations
 
-import asyncio
 import os
-from typing import Optional, Any
+from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
+from orchestrator.llm_adapters.transport import ProviderTransport, get_transport
+from orchestrator.llm_cache import LLMResponseCache, get_llm_cache, llm_cache_enabled, llm_cache_key
 from schemas.prompt_inputs import PromptIntent
 
 load_dotenv()
 
 
 class LLMService:
-    def __init__(self):
+    """
+    Chat completions against the configured OpenAI-compatible endpoint.
+
+    Requests share the pooled, retrying "endpoint" ProviderTransport and the
+    process-wide response cache; ``acall_llm`` is natively async.
+    """
+
+    def __init__(
+        self,
+        cache: LLMResponseCache | None = None,
+        transport: ProviderTransport | None = None,
+    ):
         self.api_key = os.getenv("LLM_API_KEY")
         self.endpoint = os.getenv("LLM_ENDPOINT")
         self.model = os.getenv("LLM_MODEL", "gpt-4o-mini")
         fallback = os.getenv("LLM_FALLBACK_MODELS", "")
         self.fallback_models = [m.strip() for m in fallback.split(",") if m.strip()]
         self.timeout_s = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+        self.cache = cache if cache is not None else (get_llm_cache() if llm_cache_enabled() else None)
+        self._transport = transport
+
+    @property
+    def transport(self) -> ProviderTransport:
+        return self._transport or get_transport("endpoint")
 
     @staticmethod
     def _is_unsupported_model_error(response) -> bool:
@@ -34,12 +52,12 @@ class LLMService:
         models = [self.model] + self.fallback_models
         return list(dict.fromkeys([m for m in models if m]))
 
-    def call_llm(
+    def _messages(
         self,
-        prompt: str | None = None,
-        system_prompt: str = "You are a helpful coding assistant.",
-        prompt_intent: "PromptIntent" | None = None,
-    ):
+        prompt: str | None,
+        system_prompt: str,
+        prompt_intent: "PromptIntent" | None,
+    ) -> List[Dict[str, str]]:
         if prompt_intent:
             # Simple conversion from intent to prompt string
             prompt = f"{prompt_intent.task_context}\n\n{prompt_intent.user_input}"
@@ -48,53 +66,109 @@ class LLMService:
         if not self.api_key or not self.endpoint:
             raise ValueError("API Key or Endpoint missing from your local .env file!")
 
-        import requests
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+    def _cache_key(self, messages: List[Dict[str, str]]) -> str:
+        return llm_cache_key(
+            provider=f"endpoint:{self.endpoint}",
+            model=",".join(self._candidate_models()),
+            messages=messages,
+        )
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
+    def call_llm(
+        self,
+        prompt: str | None = None,
+        system_prompt: str = "You are a helpful coding assistant.",
+        prompt_intent: "PromptIntent" | None = None,
+        use_cache: bool = True,
+    ):
+        """
+        Complete ``prompt`` against the configured endpoint.
+
+        Identical requests are served from the shared response cache; pass
+        ``use_cache=False`` for calls that must reach the provider (for
+        example sampling several candidate solutions).
+        """
+        messages = self._messages(prompt, system_prompt, prompt_intent)
+        if self.cache is None:
+            return self._post_completion(messages)
+        return self.cache.get_or_compute(
+            self._cache_key(messages),
+            lambda: self._post_completion(messages),
+            use_cache=use_cache,
+        )
+
+    async def acall_llm(
+        self,
+        prompt: str | None = None,
+        system_prompt: str = "You are a helpful coding assistant.",
+        prompt_intent: "PromptIntent" | None = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Async ``call_llm`` on the pooled async client; never blocks the event loop."""
+        messages = self._messages(prompt, system_prompt, prompt_intent)
+        if self.cache is None:
+            return await self._apost_completion(messages)
+        return await self.cache.aget_or_compute(
+            self._cache_key(messages),
+            lambda: self._apost_completion(messages),
+            use_cache=use_cache,
+        )
+
+    def _request_kwargs(self, model: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        return {
+            "headers": {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            "json": {"model": model, "messages": messages},
+            "timeout": self.timeout_s,
         }
-        errors = []
 
-        for model in self._candidate_models():
-            payload = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt},
-                ],
-            }
-
-            response = requests.post(
-                self.endpoint,
-                headers=headers,
-                json=payload,
-                timeout=self.timeout_s,
-            )
-
-            if response.ok:
-                body = response.json()
-                return body["choices"][0]["message"]["content"]
-
-            if self._is_unsupported_model_error(response):
-                errors.append(f"{model}: unsupported")
-                continue
-
-            try:
-                response.raise_for_status()
-            except Exception as exc:
-                errors.append(f"{model}: {exc}")
-                raise RuntimeError(
-                    f"LLM request failed using model '{model}': {exc}"
-                ) from exc
+    def _completion_or_none(self, model: str, response, errors: List[str]) -> Optional[str]:
+        """Content on success, None to try the next model; raises on hard errors."""
+        if response.is_success:
+            body = response.json()
+            return body["choices"][0]["message"]["content"]
+
+        if self._is_unsupported_model_error(response):
+            errors.append(f"{model}: unsupported")
+            return None
 
+        try:
+            response.raise_for_status()
+        except Exception as exc:
+            errors.append(f"{model}: {exc}")
+            raise RuntimeError(
+                f"LLM request failed using model '{model}': {exc}"
+            ) from exc
+        return None
+
+    def _no_supported_model(self, errors: List[str]) -> RuntimeError:
         tried = ", ".join(self._candidate_models())
         detail = "; ".join(errors) if errors else "no additional error details"
-        raise RuntimeError(
+        return RuntimeError(
             f"No supported model found for endpoint '{self.endpoint}'. "
             f"Tried: {tried}. Details: {detail}"
         )
 
-    async def acall_llm(self, *args: Any, **kwargs: Any) -> str:
-        """Async wrapper around call_llm to prevent blocking the event loop."""
-        return await asyncio.to_thread(self.call_llm, *args, **kwargs)
+    def _post_completion(self, messages: List[Dict[str, str]]) -> str:
+        errors: List[str] = []
+        for model in self._candidate_models():
+            response = self.transport.post(self.endpoint, **self._request_kwargs(model, messages))
+            content = self._completion_or_none(model, response, errors)
+            if content is not None:
+                return content
+        raise self._no_supported_model(errors)
+
+    async def _apost_completion(self, messages: List[Dict[str, str]]) -> str:
+        errors: List[str] = []
+        for model in self._candidate_models():
+            response = await self.transport.apost(self.endpoint, **self._request_kwargs(model, messages))
+            content = self._completion_or_none(model, response, errors)
+            if content is not None:
+                return content
+        raise self._no_supported_model(errors)
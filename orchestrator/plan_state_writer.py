@@ -0,0 +1,228 @@
+"""
+Plan State Writer - Write-Behind FSM Persistence
+================================================
+Background persistence for ``StateMachine`` transitions. Each transition is
+queued as a small delta (the new ``TransitionRecord`` plus the machine's
+state/attempts); every ``checkpoint_every`` transitions the machine also hands
+over a full snapshot, which replaces the plan's checkpoint and compacts the
+deltas it covers. A single flusher thread writes queued work in submission
+order, grouping each plan's deltas into one transaction and one FSM-ledger
+batch, so a plan's rows are never reordered.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from orchestrator import storage
+
+logger = logging.getLogger(__name__)
+
+_Item = Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+def _append_to_ledger(plan_id: str, deltas: List[Dict[str, Any]]) -> None:
+    from orchestrator.fsm_persistence import persist_state_machine_deltas
+
+    persist_state_machine_deltas(plan_id, deltas)
+
+
+class PlanStateWriter:
+    """
+    Ordered write-behind queue for FSM transition deltas and checkpoints.
+
+    Args:
+        save: Persists ``(plan_id, deltas, checkpoint)`` in one transaction.
+        ledger: Appends ``(plan_id, deltas)`` to the FSM event ledger, or None.
+        checkpoint_every: Transitions between full snapshots per plan.
+        capacity: Queued transitions before ``submit`` blocks the caller.
+            Transitions are never dropped.
+        batch_size: Transitions taken per flush.
+        flush_interval: Seconds to wait before flushing a partial batch.
+    """
+
+    def __init__(
+        self,
+        save: Callable[[str, List[Dict[str, Any]], Optional[Dict[str, Any]]], None] = storage.save_plan_state_deltas,
+        ledger: Optional[Callable[[str, List[Dict[str, Any]]], None]] = _append_to_ledger,
+        checkpoint_every: int = 50,
+        capacity: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+    ):
+        self.save = save
+        self.ledger = ledger
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Deque[_Item] = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._flush_requested = False
+        self._needs_checkpoint: Set[str] = set()
+        self._counters: Dict[str, int] = {
+            "submitted": 0,
+            "deltas_written": 0,
+            "checkpoints_written": 0,
+            "batches": 0,
+            "blocked": 0,
+            "failed": 0,
+            "ledger_failed": 0,
+        }
+        self._thread = threading.Thread(target=self._run, name="plan-state-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def checkpoint_due(self, plan_id: str, seq: int) -> bool:
+        """Whether the transition ``seq`` should carry a full snapshot."""
+        if seq % self.checkpoint_every == 0:
+            return True
+        with self._cond:
+            return plan_id in self._needs_checkpoint
+
+    def submit(self, plan_id: str, delta: Dict[str, Any], checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Queue one transition. Callers must submit a plan's transitions in
+        ``seq`` order (``StateMachine`` does so under its lock).
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PlanStateWriter is closed")
+            if len(self._queue) >= self.capacity:
+                self._counters["blocked"] += 1
+                self._cond.notify_all()
+                while len(self._queue) >= self.capacity and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    raise RuntimeError("PlanStateWriter is closed")
+            self._queue.append((plan_id, delta, checkpoint))
+            self._counters["submitted"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every transition submitted so far has been written (or failed)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush queued transitions and stop the flusher thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters plus the current queue depth."""
+        with self._cond:
+            stats = dict(self._counters)
+            stats["queued"] = len(self._queue)
+            return stats
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.batch_size and not self._closed and not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._queue:
+                    self._flush_requested = False
+                    if self._closed:
+                        return
+                    continue
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_flight = len(batch)
+                self._cond.notify_all()  # wake blocked producers
+
+            self._write(batch)
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, batch: List[_Item]) -> None:
+        grouped: Dict[str, Tuple[List[Dict[str, Any]], List[Optional[Dict[str, Any]]]]] = {}
+        for plan_id, delta, checkpoint in batch:
+            deltas, checkpoints = grouped.setdefault(plan_id, ([], [None]))
+            deltas.append(delta)
+            if checkpoint is not None:
+                checkpoints[0] = checkpoint
+
+        for plan_id, (deltas, (checkpoint,)) in grouped.items():
+            try:
+                self.save(plan_id, deltas, checkpoint)
+            except Exception as e:
+                logger.error(f"Failed to persist {len(deltas)} transitions for plan {plan_id}: {e}", exc_info=True)
+                with self._cond:
+                    self._counters["failed"] += len(deltas)
+                    # Deltas after a gap are unusable until a full snapshot lands.
+                    self._needs_checkpoint.add(plan_id)
+            else:
+                with self._cond:
+                    self._counters["deltas_written"] += len(deltas)
+                    self._counters["batches"] += 1
+                    if checkpoint is not None:
+                        self._counters["checkpoints_written"] += 1
+                        self._needs_checkpoint.discard(plan_id)
+
+            # The ledger is independent of the plan tables; keep its sequence moving either way.
+            if self.ledger is None:
+                continue
+            try:
+                self.ledger(plan_id, deltas)
+            except Exception as e:
+                logger.warning(f"Failed to append {len(deltas)} transitions for plan {plan_id} to the FSM ledger: {e}")
+                with self._cond:
+                    self._counters["ledger_failed"] += len(deltas)
+
+
+_WRITER: Optional[PlanStateWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_plan_state_writer() -> PlanStateWriter:
+    """Process-wide writer, configured from ``PLAN_STATE_*`` env vars."""
+    global _WRITER
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                _WRITER = PlanStateWriter(
+                    checkpoint_every=int(os.getenv("PLAN_STATE_CHECKPOINT_EVERY", "50")),
+                    batch_size=int(os.getenv("PLAN_STATE_BATCH_SIZE", "256")),
+                    flush_interval=float(os.getenv("PLAN_STATE_FLUSH_INTERVAL_SECONDS", "0.05")),
+                )
+    return _WRITER
+
+
+def flush_plan_state_writer(timeout: Optional[float] = 5.0) -> bool:
+    """Flush the process-wide writer if one has been started."""
+    writer = _WRITER
+    return writer.flush(timeout) if writer is not None else True
+
+
+def reset_plan_state_writer() -> None:
+    """Flush and stop the process-wide writer; the next call starts a new one."""
+    global _WRITER
+    with _WRITER_LOCK:
+        writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.close()
@@ -4,7 +4,7 @@ Stateflow / FSM for A2A_MCP
 
 This implementation hardens the original stateflow with:
 - thread-safety (RLock)
-- explicit persistence hook (persistence_callback)
+- explicit persistence hooks (persistence_callback, persistence_writer)
 - serialization / deserialization (to_dict / from_dict)
 - clear retry semantics and override auditing
 """
@@ -12,10 +12,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import time
 import threading
 import json
+import logging
 
 try:
     from schemas.runtime_event import EventPayload, RuntimeEvent
@@ -24,6 +25,8 @@ except ImportError:
     RuntimeEvent = Any
     EventPayload = Any
 
+logger = logging.getLogger(__name__)
+
 
 class State(str, Enum):
     IDLE = "IDLE"
@@ -80,11 +83,22 @@ class StateMachine:
     persistence_callback: Optional[Callable[[plan_id: str, state_dict: dict], None]]
       - Called after every committed transition so the caller can persist FSM snapshots.
 
+    persistence_writer: Optional write-behind sink (see orchestrator.plan_state_writer)
+      - Receives only the new transition as a delta, plus a full snapshot when
+        ``checkpoint_due(plan_id, seq)`` says so. Deltas are submitted under the
+        machine lock, so they reach the writer in transition order without
+        blocking the caller on I/O.
+
     Note: to keep the FSM lightweight and testable, persistence is handled via
-    a caller-supplied callback rather than embedding DB logic here.
+    caller-supplied hooks rather than embedding DB logic here.
     """
 
-    def __init__(self, max_retries: int = 3, persistence_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        persistence_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        persistence_writer: Optional[Any] = None,
+    ):
         self.state: State = State.IDLE
         self.history: List[TransitionRecord] = []
         self.attempts: int = 0
@@ -92,10 +106,13 @@ class StateMachine:
         self.callbacks: Dict[State, List[Callable[[TransitionRecord], None]]] = {}
         self._lock = threading.RLock()
         self._persistence_callback = persistence_callback
+        self._persistence_writer = persistence_writer
         self.plan_id: Optional[str] = None
         self._transition_seq: int = 0
         self._last_persisted_seq: int = 0
         self._persist_cond = threading.Condition(self._lock)
+        # Set when a delta could not be handed to the writer; the next commit sends a full snapshot.
+        self._checkpoint_pending: bool = False
 
     _TRANSITIONS: Dict[str, Any] = {
         "OBJECTIVE_INGRESS": ([State.IDLE], State.SCHEDULED),
@@ -148,14 +165,44 @@ class StateMachine:
         self.state = rec.to_state
         return list(self.callbacks.get(rec.to_state, []))
 
-    def _persist_snapshot(self, snapshot: Dict[str, Any], plan_id: Optional[str]) -> None:
+    def _commit(self, rec: TransitionRecord) -> Tuple[List[Callable[[TransitionRecord], None]], Optional[Dict[str, Any]], Optional[str], int]:
+        """Enter ``rec.to_state`` and hand the transition to persistence; call with the lock held."""
+        callbacks = self._enter_state(rec)
+        self._transition_seq += 1
+        seq = self._transition_seq
+        # The full snapshot is O(history); only build it for a callback that wants it.
+        snapshot = self.to_dict() if self._persistence_callback else None
+        writer = self._persistence_writer
+        if writer is not None and self.plan_id is not None:
+            delta = {
+                "seq": seq,
+                "state": self.state.value,
+                "attempts": self.attempts,
+                "max_retries": self.max_retries,
+                "transition": rec.to_dict(),
+            }
+            checkpoint = None
+            if self._checkpoint_pending or writer.checkpoint_due(self.plan_id, seq):
+                checkpoint = snapshot if snapshot is not None else self.to_dict()
+            try:
+                writer.submit(self.plan_id, delta, checkpoint)
+            except Exception as e:
+                # Later deltas cannot be replayed across the gap until a snapshot covers it.
+                self._checkpoint_pending = True
+                logger.error(f"Failed to submit transition {seq} for plan {self.plan_id}: {e}", exc_info=True)
+            else:
+                if checkpoint is not None:
+                    self._checkpoint_pending = False
+        return callbacks, snapshot, self.plan_id, seq
+
+    def _persist_snapshot(self, snapshot: Optional[Dict[str, Any]], plan_id: Optional[str]) -> None:
         if self._persistence_callback and callable(self._persistence_callback):
             try:
                 self._persistence_callback(plan_id, snapshot)
             except Exception:
                 pass
 
-    def _run_post_transition(self, rec: TransitionRecord, callbacks: List[Callable[[TransitionRecord], None]], snapshot: Dict[str, Any], plan_id: Optional[str], seq: int) -> None:
+    def _run_post_transition(self, rec: TransitionRecord, callbacks: List[Callable[[TransitionRecord], None]], snapshot: Optional[Dict[str, Any]], plan_id: Optional[str], seq: int) -> None:
         with self._persist_cond:
             while seq != self._last_persisted_seq + 1:
                 self._persist_cond.wait()
@@ -185,28 +232,16 @@ class StateMachine:
                 self.attempts += 1
                 if self.attempts >= self.max_retries:
                     rec = self._record(self.state, State.TERMINATED_FAIL, "RETRY_LIMIT_EXCEEDED", meta)
-                    callbacks = self._enter_state(rec)
-                    snapshot = self.to_dict()
-                    plan_id = self.plan_id
-                    self._transition_seq += 1
-                    seq = self._transition_seq
+                    callbacks, snapshot, plan_id, seq = self._commit(rec)
                 else:
                     rec = self._record(self.state, to_state, event, meta)
-                    callbacks = self._enter_state(rec)
-                    snapshot = self.to_dict()
-                    plan_id = self.plan_id
-                    self._transition_seq += 1
-                    seq = self._transition_seq
+                    callbacks, snapshot, plan_id, seq = self._commit(rec)
             else:
                 # Do not reset attempts on RETRY_DISPATCHED; only reset after PASS.
                 if event == "VERDICT_PASS":
                     self.attempts = 0
                 rec = self._record(self.state, to_state, event, meta)
-                callbacks = self._enter_state(rec)
-                snapshot = self.to_dict()
-                plan_id = self.plan_id
-                self._transition_seq += 1
-                seq = self._transition_seq
+                callbacks, snapshot, plan_id, seq = self._commit(rec)
 
         self._run_post_transition(rec, callbacks, snapshot, plan_id, seq)
         return rec
@@ -265,11 +300,7 @@ class StateMachine:
                 meta["override_by"] = override_by
 
             rec = self._record(self.state, to_state, "OVERRIDE_EVENT", meta)
-            callbacks = self._enter_state(rec)
-            snapshot = self.to_dict()
-            plan_id = self.plan_id
-            self._transition_seq += 1
-            seq = self._transition_seq
+            callbacks, snapshot, plan_id, seq = self._commit(rec)
 
         self._run_post_transition(rec, callbacks, snapshot, plan_id, seq)
         return rec
@@ -285,8 +316,16 @@ class StateMachine:
             }
 
     @staticmethod
-    def from_dict(d: Dict[str, Any], persistence_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> "StateMachine":
-        sm = StateMachine(max_retries=d.get("max_retries", 3), persistence_callback=persistence_callback)
+    def from_dict(
+        d: Dict[str, Any],
+        persistence_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        persistence_writer: Optional[Any] = None,
+    ) -> "StateMachine":
+        sm = StateMachine(
+            max_retries=d.get("max_retries", 3),
+            persistence_callback=persistence_callback,
+            persistence_writer=persistence_writer,
+        )
         sm.plan_id = d.get("plan_id")
         sm.state = State(d["state"])
         sm.attempts = int(d.get("attempts", 0))
@@ -295,6 +334,19 @@ class StateMachine:
         sm._last_persisted_seq = len(sm.history)
         return sm
 
+    def spawn_shard(self, shard_id: str) -> "StateMachine":
+        """
+        Fresh machine for one concurrent unit of work, sharing the retry policy.
+
+        Shards have no persistence hooks, so they never appear as plans of
+        their own. Their ``plan_id`` is ``"{parent plan_id}:{shard_id}"``, a
+        label for logs and snapshots; the owner records the shard's
+        ``to_dict()`` under the parent plan (see IntentEngine).
+        """
+        shard = StateMachine(max_retries=self.max_retries)
+        shard.plan_id = f"{self.plan_id}:{shard_id}" if self.plan_id else shard_id
+        return shard
+
     def current_state(self) -> State:
         with self._lock:
             return self.state
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import atexit
 import json
+import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
 
 from schemas.agent_artifacts import MCPArtifact
-from schemas.database import Base, ArtifactModel, PlanStateModel
+from schemas.database import Base, ArtifactModel, PlanStateDeltaModel, PlanStateModel
+
+logger = logging.getLogger(__name__)
 
 SQLITE_DEFAULT_PATH = "./a2a_mcp.db"
 
@@ -136,24 +139,106 @@ def save_plan_state(plan_id: str, snapshot: Dict[str, Any]) -> None:
     except ImportError:
         pass
 
-def load_plan_state(plan_id: str) -> Optional[Dict[str, Any]]:
-    """Load FSM plan state snapshot."""
-    from orchestrator.fsm_persistence import load_state_machine_snapshot
+def save_plan_state_deltas(
+    plan_id: str,
+    deltas: List[Dict[str, Any]],
+    checkpoint: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Append FSM transition deltas and, optionally, compact them into a checkpoint.
 
+    Each delta is ``{"seq", "state", "attempts", "max_retries", "transition"}``
+    with ``transition`` a ``TransitionRecord.to_dict()``. Rows at or after the
+    first delta's ``seq`` are replaced, so the latest writer wins as with
+    ``save_plan_state``. A checkpoint is a full ``StateMachine.to_dict()``;
+    it replaces the ``plan_states`` row and drops the deltas it covers.
+    """
+    db = _db_manager.SessionLocal()
     try:
-        snapshot = load_state_machine_snapshot(plan_id)
-        if snapshot is not None:
-            return snapshot
-    except ImportError:
-        pass
+        if deltas:
+            db.query(PlanStateDeltaModel).filter(
+                PlanStateDeltaModel.plan_id == plan_id,
+                PlanStateDeltaModel.seq >= deltas[0]["seq"],
+            ).delete(synchronize_session=False)
+        covered = len(checkpoint.get("history", [])) if checkpoint is not None else 0
+        rows = [
+            {
+                "plan_id": plan_id,
+                "seq": delta["seq"],
+                "state": delta["state"],
+                "attempts": delta["attempts"],
+                "max_retries": delta["max_retries"],
+                "transition": json.dumps(delta["transition"]),
+            }
+            for delta in deltas
+            if delta["seq"] > covered
+        ]
+        if rows:
+            db.execute(insert(PlanStateDeltaModel), rows)
+        if checkpoint is not None:
+            serialized = json.dumps(checkpoint)
+            existing = db.query(PlanStateModel).filter(PlanStateModel.plan_id == plan_id).first()
+            if existing:
+                existing.snapshot = serialized
+            else:
+                db.add(PlanStateModel(plan_id=plan_id, snapshot=serialized))
+            db.query(PlanStateDeltaModel).filter(
+                PlanStateDeltaModel.plan_id == plan_id,
+                PlanStateDeltaModel.seq <= covered,
+            ).delete(synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
+def _rebuild_plan_state(plan_id: str) -> Optional[Dict[str, Any]]:
+    """Last checkpoint (or an empty machine) with later deltas replayed onto it."""
     db = _db_manager.SessionLocal()
     try:
         state = db.query(PlanStateModel).filter(PlanStateModel.plan_id == plan_id).first()
-        return json.loads(state.snapshot) if state else None
+        snapshot = json.loads(state.snapshot) if state else None
+        base = snapshot or {"plan_id": plan_id, "state": "IDLE", "attempts": 0, "max_retries": 3, "history": []}
+        deltas = (
+            db.query(PlanStateDeltaModel)
+            .filter(
+                PlanStateDeltaModel.plan_id == plan_id,
+                PlanStateDeltaModel.seq > len(base.get("history", [])),
+            )
+            .order_by(PlanStateDeltaModel.seq.asc())
+            .all()
+        )
     finally:
         db.close()
 
+    if snapshot is None and not deltas:
+        return None
+    history = base.setdefault("history", [])
+    for delta in deltas:
+        if delta.seq != len(history) + 1:
+            logger.warning("Plan %s deltas stop at seq %d (next stored: %d)", plan_id, len(history), delta.seq)
+            break
+        history.append(json.loads(delta.transition))
+        base.update(state=delta.state, attempts=delta.attempts, max_retries=delta.max_retries)
+    return base
+
+def load_plan_state(plan_id: str) -> Optional[Dict[str, Any]]:
+    """Load FSM plan state: checkpoint plus deltas, falling back to the FSM ledger."""
+    from orchestrator.fsm_persistence import load_state_machine_snapshot
+    from orchestrator.plan_state_writer import flush_plan_state_writer
+
+    # Read-your-writes for transitions still queued in this process.
+    flush_plan_state_writer()
+    snapshot = _rebuild_plan_state(plan_id)
+    if snapshot is not None:
+        return snapshot
+
+    try:
+        return load_state_machine_snapshot(plan_id)
+    except ImportError:
+        return None
+
 def init_db() -> None:
     """Initialize database tables."""
     Base.metadata.create_all(bind=_db_manager.engine)
@@ -0,0 +1,206 @@
+"""
+Telemetry Aggregates - Incremental DTC Counters
+================================================
+Per-component / per-DTC counters, severity maxima and sliding-window rates
+maintained as events are logged, so diagnostic reports and health probes cost
+O(#DTC codes) instead of a rescan of the event buffer.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from schemas.telemetry import DTC_CATALOG, DTCSeverity
+
+# Default sliding windows exposed for dashboards, label -> seconds
+DEFAULT_WINDOWS: Dict[str, float] = {"1m": 60.0, "5m": 300.0, "1h": 3600.0}
+
+SEVERITY_RANK: Dict[DTCSeverity, int] = {
+    DTCSeverity.LOW: 0,
+    DTCSeverity.MEDIUM: 1,
+    DTCSeverity.HIGH: 2,
+    DTCSeverity.CRITICAL: 3,
+}
+
+# Error-message keyword -> DTC, checked in order
+_ERROR_KEYWORD_DTCS = (
+    ("inference", "T01-01"),  # LLM_INFERENCE_FAILURE
+    ("parse", "I01-01"),  # INTENT_PARSING_FAILURE
+    ("persist", "O01-01"),  # ARTIFACT_PERSISTENCE_FAILURE
+)
+
+
+def classify_error(error_message: Optional[str]) -> Optional[str]:
+    """Map a failed event's error message to a DTC code, if one applies."""
+    if not error_message:
+        return None
+    lowered = error_message.lower()
+    for keyword, dtc_code in _ERROR_KEYWORD_DTCS:
+        if keyword in lowered:
+            return dtc_code
+    return None
+
+
+class SlidingWindowCounter:
+    """
+    Event count over a trailing time window.
+
+    The window is split into fixed-width buckets; expired buckets are dropped
+    from the left as time advances, so adds and reads are amortized O(1).
+    """
+
+    def __init__(self, window_seconds: float, buckets: int = 60):
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.bucket_seconds = window_seconds / buckets
+        self._buckets: Deque[List[float]] = deque()  # [bucket_index, count]
+        self._total = 0
+
+    def _expire(self, now: float) -> None:
+        oldest = int(now // self.bucket_seconds) - self.buckets + 1
+        while self._buckets and self._buckets[0][0] < oldest:
+            self._total -= self._buckets.popleft()[1]
+
+    def add(self, now: float, count: int = 1) -> None:
+        index = int(now // self.bucket_seconds)
+        self._expire(now)
+        if self._buckets and self._buckets[-1][0] == index:
+            self._buckets[-1][1] += count
+        else:
+            self._buckets.append([index, count])
+        self._total += count
+
+    def count(self, now: float) -> int:
+        self._expire(now)
+        return self._total
+
+    def rate(self, now: float) -> float:
+        """Events per second over the window."""
+        return self.count(now) / self.window_seconds
+
+
+class DTCAggregator:
+    """
+    Incrementally maintained DTC statistics.
+
+    Args:
+        windows: Sliding windows to track, label -> seconds
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        windows: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all counters, severity maxima and window contents."""
+        with self._lock:
+            self.events_total = 0
+            self.failures_total = 0
+            self.dtc_counts: Dict[str, int] = {}  # insertion order == first detection
+            self.component_dtc_counts: Dict[str, Dict[str, int]] = {}
+            self.component_max_severity: Dict[str, DTCSeverity] = {}
+            self.max_severity = DTCSeverity.LOW
+
+            self._event_windows = self._new_windows()
+            self._failure_windows = self._new_windows()
+            self._dtc_windows: Dict[str, Dict[str, SlidingWindowCounter]] = {}
+
+    def _new_windows(self) -> Dict[str, SlidingWindowCounter]:
+        return {label: SlidingWindowCounter(seconds) for label, seconds in self.windows.items()}
+
+    def observe(self, component: str, success: bool, error_message: Optional[str]) -> Optional[str]:
+        """
+        Fold one logged event into the counters.
+
+        Returns:
+            The DTC code the event mapped to, if any
+        """
+        now = self.clock()
+        dtc_code = None if success else classify_error(error_message)
+        with self._lock:
+            self.events_total += 1
+            for counter in self._event_windows.values():
+                counter.add(now)
+            if success:
+                return None
+
+            self.failures_total += 1
+            for counter in self._failure_windows.values():
+                counter.add(now)
+            if dtc_code is None:
+                return None
+
+            self.dtc_counts[dtc_code] = self.dtc_counts.get(dtc_code, 0) + 1
+            per_component = self.component_dtc_counts.setdefault(component, {})
+            per_component[dtc_code] = per_component.get(dtc_code, 0) + 1
+            windows = self._dtc_windows.get(dtc_code)
+            if windows is None:
+                windows = self._dtc_windows[dtc_code] = self._new_windows()
+            for counter in windows.values():
+                counter.add(now)
+
+            dtc = DTC_CATALOG.get(dtc_code)
+            if dtc is not None:
+                rank = SEVERITY_RANK[dtc.severity]
+                current = self.component_max_severity.get(component)
+                if current is None or rank > SEVERITY_RANK[current]:
+                    self.component_max_severity[component] = dtc.severity
+                if rank > SEVERITY_RANK[self.max_severity]:
+                    self.max_severity = dtc.severity
+        return dtc_code
+
+    def detected_dtcs(self) -> List[str]:
+        """DTC codes seen so far, in order of first detection."""
+        with self._lock:
+            return list(self.dtc_counts)
+
+    def rates(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Per-window event, failure and per-DTC rates (events/second)."""
+        now = self.clock()
+        with self._lock:
+            return {
+                label: {
+                    "events": self._event_windows[label].rate(now),
+                    "failures": self._failure_windows[label].rate(now),
+                    "dtcs": {
+                        code: windows[label].rate(now)
+                        for code, windows in self._dtc_windows.items()
+                    },
+                }
+                for label in self.windows
+            }
+
+    def window_counts(self, label: str) -> Dict[str, int]:
+        """Per-DTC occurrence counts within one window."""
+        now = self.clock()
+        with self._lock:
+            return {code: windows[label].count(now) for code, windows in self._dtc_windows.items()}
+
+    def snapshot(self) -> Dict[str, object]:
+        """Cumulative counters, severity maxima and windowed rates."""
+        with self._lock:
+            snapshot = {
+                "events_total": self.events_total,
+                "failures_total": self.failures_total,
+                "max_severity": self.max_severity.value,
+                "dtc_counts": dict(self.dtc_counts),
+                "components": {
+                    component: {
+                        "dtc_counts": dict(counts),
+                        "max_severity": self.component_max_severity.get(
+                            component, DTCSeverity.LOW
+                        ).value,
+                    }
+                    for component, counts in self.component_dtc_counts.items()
+                },
+            }
+        snapshot["rates"] = self.rates()
+        return snapshot
@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Any
 import uuid
 from datetime import datetime
 
+from orchestrator.llm_cache import get_llm_cache
 from orchestrator.telemetry_service import TelemetryService, get_telemetry, init_telemetry
 from judge.dmn_decision_engine import DMNDecisionEngine, DecisionOutcome, get_dmn, init_dmn
 from schemas.telemetry import DMNToken, ConstraintViolation, DTCSeverity
@@ -123,6 +124,16 @@ def hook_transformer_output_telemetry(
     return diff
 
 
+def hook_llm_cache_telemetry(telemetry: TelemetryService, cache=None):
+    """
+    Hook to export LLM response-cache effectiveness
+
+    Call periodically (or at pipeline end); defaults to the process-wide
+    cache used by LLMService and LLMAdapterRegistry
+    """
+    return telemetry.record_llm_cache_stats((cache or get_llm_cache()).stats())
+
+
 def hook_structural_gap_detection(
     telemetry: TelemetryService,
     source_agent: str,
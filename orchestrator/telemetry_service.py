@@ -8,8 +8,9 @@ embeddings, and formal diagnostic reports for the A2A-MCP system.
 import uuid
 import logging
 import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Deque, Dict, List, Optional, Tuple, Any, Type
 from scipy.spatial.distance import cosine
 
 from schemas.telemetry import (
@@ -28,17 +29,64 @@ from schemas.database import (
     TransformerDiffModel,
     DMNTokenModel,
 )
+from orchestrator.telemetry_aggregates import SEVERITY_RANK, DTCAggregator
+from orchestrator.telemetry_sink import TelemetrySink
 
 logger = logging.getLogger(__name__)
 
 class TelemetryService:
     """Core telemetry and diagnostic service for system monitoring"""
 
-    def __init__(self, db_session=None):
-        """Initialize telemetry service with optional database connection"""
+    def __init__(
+        self,
+        db_session=None,
+        sink: Optional[TelemetrySink] = None,
+        max_buffered_events: int = 10_000,
+        max_trajectory_points: int = 1_000,
+        rate_windows: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize telemetry service with optional database connection
+
+        Args:
+            db_session: Session used for synchronous per-record commits
+            sink: Write-behind sink; when set, records are enqueued and
+                bulk-inserted off the request path instead of committed inline
+            max_buffered_events: Bound on the in-memory event buffer
+            max_trajectory_points: Bound on the in-memory embedding trajectory
+            rate_windows: Sliding windows for DTC rates, label -> seconds
+                (defaults to 1m/5m/1h)
+        """
         self.db_session = db_session
-        self.event_buffer: List[TelemetryEvent] = []
-        self.embedding_trajectory: List[Tuple[str, List[float]]] = []
+        self.sink = sink
+        self.event_buffer: Deque[TelemetryEvent] = deque(maxlen=max_buffered_events)
+        self.embedding_trajectory: Deque[Tuple[str, List[float]]] = deque(
+            maxlen=max_trajectory_points
+        )
+        self.dtc_aggregator = DTCAggregator(windows=rate_windows)
+
+    @property
+    def persistence_enabled(self) -> bool:
+        """True when records are persisted, inline or write-behind."""
+        return self.sink is not None or bool(self.db_session)
+
+    def _persist_row(self, model: Type, row: Dict[str, Any]) -> bool:
+        """Hand a row to the write-behind sink; False means persist inline."""
+        if self.sink is None:
+            return False
+        self.sink.enqueue(model, row)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for write-behind rows to reach the database."""
+        if self.sink is None:
+            return True
+        return self.sink.flush(timeout)
+
+    def close(self) -> None:
+        """Flush and stop the write-behind sink, if any."""
+        if self.sink is not None:
+            self.sink.close()
 
     def log_event(
         self,
@@ -93,9 +141,10 @@ class TelemetryService:
         )
 
         self.event_buffer.append(event)
+        self.dtc_aggregator.observe(component, success, error_message)
 
         # Persist to database if available
-        if self.db_session:
+        if self.persistence_enabled:
             self._persist_event(event, artifact_id)
 
         return event
@@ -177,24 +226,35 @@ class TelemetryService:
             error_message=anomaly,
         )
 
+    def record_llm_cache_stats(self, stats: Dict[str, Any]) -> TelemetryEvent:
+        """Export LLM response-cache hit ratio and provider latency saved by hits."""
+        return self.log_event(
+            component="llm_cache",
+            event_type="cache_stats",
+            metadata=dict(stats),
+            duration_ms=stats.get("saved_latency_ms"),
+        )
+
     def _persist_event(self, event: TelemetryEvent, artifact_id: Optional[str] = None):
         """Persist telemetry event to database"""
+        row = {
+            "event_id": event.event_id,
+            "timestamp": event.timestamp,
+            "component": event.component,
+            "event_type": event.event_type,
+            "input_embedding": event.input_embedding,
+            "output_embedding": event.output_embedding,
+            "embedding_distance": event.embedding_distance,
+            "metadata_json": event.metadata,
+            "duration_ms": event.duration_ms,
+            "success": event.success,
+            "error_message": event.error_message,
+            "artifact_id": artifact_id,
+        }
+        if self._persist_row(TelemetryEventModel, row):
+            return
         try:
-            db_event = TelemetryEventModel(
-                event_id=event.event_id,
-                timestamp=event.timestamp,
-                component=event.component,
-                event_type=event.event_type,
-                input_embedding=event.input_embedding,
-                output_embedding=event.output_embedding,
-                embedding_distance=event.embedding_distance,
-                metadata=event.metadata,
-                duration_ms=event.duration_ms,
-                success=event.success,
-                error_message=event.error_message,
-                artifact_id=artifact_id,
-            )
-            self.db_session.add(db_event)
+            self.db_session.add(TelemetryEventModel(**row))
             self.db_session.commit()
         except Exception as e:
             logger.error(f"Failed to persist telemetry event: {e}", exc_info=True)
@@ -265,31 +325,33 @@ class TelemetryService:
         )
 
         # Persist to database
-        if self.db_session:
+        if self.persistence_enabled:
             self._persist_structural_gap(gap)
 
         return gap
 
     def _persist_structural_gap(self, gap: StructuralGap):
         """Persist structural gap to database"""
+        row = {
+            "gap_id": gap.gap_id,
+            "timestamp": gap.timestamp,
+            "source_component": gap.source_component,
+            "target_component": gap.target_component,
+            "artifact_type": gap.artifact_type,
+            "expected_schema": gap.expected_schema,
+            "actual_schema": gap.actual_schema,
+            "missing_fields": gap.missing_fields,
+            "extra_fields": gap.extra_fields,
+            "expected_embedding": gap.expected_embedding,
+            "actual_embedding": gap.actual_embedding,
+            "semantic_distance": gap.semantic_distance,
+            "related_dtc": gap.related_dtc,
+            "severity": gap.severity.value,
+        }
+        if self._persist_row(StructuralGapModel, row):
+            return
         try:
-            db_gap = StructuralGapModel(
-                gap_id=gap.gap_id,
-                timestamp=gap.timestamp,
-                source_component=gap.source_component,
-                target_component=gap.target_component,
-                artifact_type=gap.artifact_type,
-                expected_schema=gap.expected_schema,
-                actual_schema=gap.actual_schema,
-                missing_fields=gap.missing_fields,
-                extra_fields=gap.extra_fields,
-                expected_embedding=gap.expected_embedding,
-                actual_embedding=gap.actual_embedding,
-                semantic_distance=gap.semantic_distance,
-                related_dtc=gap.related_dtc,
-                severity=gap.severity.value,
-            )
-            self.db_session.add(db_gap)
+            self.db_session.add(StructuralGapModel(**row))
             self.db_session.commit()
         except Exception as e:
             logger.error(f"Failed to persist structural gap: {e}", exc_info=True)
@@ -344,28 +406,30 @@ class TelemetryService:
         )
 
         # Persist to database
-        if self.db_session:
+        if self.persistence_enabled:
             self._persist_transformer_diff(diff)
 
         return diff
 
     def _persist_transformer_diff(self, diff: TransformerDiff):
         """Persist transformer diff to database"""
+        row = {
+            "diff_id": diff.diff_id,
+            "timestamp": diff.timestamp,
+            "prompt_id": diff.prompt_id,
+            "generation_id": diff.generation_id,
+            "prompt_embedding": diff.prompt_embedding,
+            "generated_embedding": diff.generated_embedding,
+            "expected_embedding": diff.expected_embedding,
+            "prompt_to_generated_distance": diff.prompt_to_generated_distance,
+            "generated_to_expected_distance": diff.generated_to_expected_distance,
+            "generated_artifact_id": diff.generated_artifact_id,
+            "status": diff.status,
+        }
+        if self._persist_row(TransformerDiffModel, row):
+            return
         try:
-            db_diff = TransformerDiffModel(
-                diff_id=diff.diff_id,
-                timestamp=diff.timestamp,
-                prompt_id=diff.prompt_id,
-                generation_id=diff.generation_id,
-                prompt_embedding=diff.prompt_embedding,
-                generated_embedding=diff.generated_embedding,
-                expected_embedding=diff.expected_embedding,
-                prompt_to_generated_distance=diff.prompt_to_generated_distance,
-                generated_to_expected_distance=diff.generated_to_expected_distance,
-                generated_artifact_id=diff.generated_artifact_id,
-                status=diff.status,
-            )
-            self.db_session.add(db_diff)
+            self.db_session.add(TransformerDiffModel(**row))
             self.db_session.commit()
         except Exception as e:
             print(f"Failed to persist transformer diff: {e}")
@@ -387,35 +451,24 @@ class TelemetryService:
         Returns:
             DiagnosticReport object
         """
-        detected_dtcs = []
         dtc_details = {}
         critical_actions = []
         max_severity = DTCSeverity.LOW
 
-        # Scan event buffer for error conditions
-        for event in self.event_buffer:
-            if not event.success and event.error_message:
-                # Map error to potential DTCs
-                if "inference" in event.error_message.lower():
-                    dtc_code = "T01-01"  # LLM_INFERENCE_FAILURE
-                elif "parse" in event.error_message.lower():
-                    dtc_code = "I01-01"  # INTENT_PARSING_FAILURE
-                elif "persist" in event.error_message.lower():
-                    dtc_code = "O01-01"  # ARTIFACT_PERSISTENCE_FAILURE
-                else:
-                    continue
-
-                if dtc_code not in detected_dtcs:
-                    detected_dtcs.append(dtc_code)
-                    dtc_info = DTC_CATALOG.get(dtc_code)
-                    if dtc_info:
-                        dtc_details[dtc_code] = {
-                            "name": dtc_info.name,
-                            "severity": dtc_info.severity.value,
-                            "remediation": dtc_info.remediation,
-                        }
-                        if dtc_info.severity.value == DTCSeverity.CRITICAL.value:
-                            critical_actions.append(dtc_info.remediation)
+        # Error-derived DTCs are aggregated as events are logged
+        detected_dtcs = self.dtc_aggregator.detected_dtcs()
+        dtc_counts = self.dtc_aggregator.dtc_counts
+        for dtc_code in detected_dtcs:
+            dtc_info = DTC_CATALOG.get(dtc_code)
+            if dtc_info:
+                dtc_details[dtc_code] = {
+                    "name": dtc_info.name,
+                    "severity": dtc_info.severity.value,
+                    "remediation": dtc_info.remediation,
+                    "occurrences": dtc_counts.get(dtc_code, 0),
+                }
+                if dtc_info.severity == DTCSeverity.CRITICAL:
+                    critical_actions.append(dtc_info.remediation)
 
         # Include structural gaps
         gaps = structural_gaps or []
@@ -425,10 +478,9 @@ class TelemetryService:
 
         # Calculate divergence points in embedding trajectory
         vector_divergence_points = []
-        if len(self.embedding_trajectory) > 1:
-            for i in range(len(self.embedding_trajectory) - 1):
-                comp1, vec1 = self.embedding_trajectory[i]
-                comp2, vec2 = self.embedding_trajectory[i + 1]
+        trajectory = list(self.embedding_trajectory)
+        if len(trajectory) > 1:
+            for (comp1, vec1), (comp2, vec2) in zip(trajectory, trajectory[1:]):
                 dist = cosine(vec1, vec2)
                 if dist > 0.3:  # Significant divergence threshold
                     vector_divergence_points.append(
@@ -442,13 +494,9 @@ class TelemetryService:
         # Determine max severity
         for dtc_code in detected_dtcs:
             if dtc_code in DTC_CATALOG:
-                dtc = DTC_CATALOG[dtc_code]
-                if dtc.severity == DTCSeverity.CRITICAL:
-                    max_severity = DTCSeverity.CRITICAL
-                elif dtc.severity == DTCSeverity.HIGH and max_severity != DTCSeverity.CRITICAL:
-                    max_severity = DTCSeverity.HIGH
-                elif dtc.severity == DTCSeverity.MEDIUM and max_severity == DTCSeverity.LOW:
-                    max_severity = DTCSeverity.MEDIUM
+                severity = DTC_CATALOG[dtc_code].severity
+                if SEVERITY_RANK[severity] > SEVERITY_RANK[max_severity]:
+                    max_severity = severity
 
         # Build recommendations
         recommendations = []
@@ -469,7 +517,7 @@ class TelemetryService:
             detected_dtcs=detected_dtcs,
             dtc_details=dtc_details,
             structural_gaps=gaps,
-            embedding_trajectory=self.embedding_trajectory,
+            embedding_trajectory=trajectory,
             vector_divergence_points=vector_divergence_points,
             recommendations=recommendations,
             critical_actions=critical_actions,
@@ -478,30 +526,40 @@ class TelemetryService:
         )
 
         # Persist to database
-        if self.db_session:
+        if self.persistence_enabled:
             self._persist_diagnostic_report(report)
 
         return report
 
+    def get_dtc_rates(self) -> Dict[str, Dict[str, Any]]:
+        """Windowed event, failure and per-DTC rates (events/second) for dashboards."""
+        return self.dtc_aggregator.rates()
+
+    def get_health_snapshot(self) -> Dict[str, Any]:
+        """Cumulative DTC counters, per-component severity maxima and windowed rates."""
+        return self.dtc_aggregator.snapshot()
+
     def _persist_diagnostic_report(self, report: DiagnosticReport):
         """Persist diagnostic report to database"""
+        row = {
+            "report_id": report.report_id,
+            "timestamp": report.timestamp,
+            "execution_phase": report.execution_phase,
+            "trigger_event": report.trigger_event,
+            "detected_dtcs": report.detected_dtcs,
+            "dtc_details": report.dtc_details,
+            "embedding_trajectory": report.embedding_trajectory,
+            "vector_divergence_points": report.vector_divergence_points,
+            "recommendations": report.recommendations,
+            "critical_actions": report.critical_actions,
+            "max_severity": report.max_severity.value,
+            "summary": report.summary,
+            "structural_gaps_count": len(report.structural_gaps),
+        }
+        if self._persist_row(DiagnosticReportModel, row):
+            return
         try:
-            db_report = DiagnosticReportModel(
-                report_id=report.report_id,
-                timestamp=report.timestamp,
-                execution_phase=report.execution_phase,
-                trigger_event=report.trigger_event,
-                detected_dtcs=report.detected_dtcs,
-                dtc_details=report.dtc_details,
-                embedding_trajectory=report.embedding_trajectory,
-                vector_divergence_points=report.vector_divergence_points,
-                recommendations=report.recommendations,
-                critical_actions=report.critical_actions,
-                max_severity=report.max_severity.value,
-                summary=report.summary,
-                structural_gaps_count=len(report.structural_gaps),
-            )
-            self.db_session.add(db_report)
+            self.db_session.add(DiagnosticReportModel(**row))
             self.db_session.commit()
         except Exception as e:
             print(f"Failed to persist diagnostic report: {e}")
@@ -554,43 +612,59 @@ class TelemetryService:
         )
 
         # Persist to database
-        if self.db_session:
+        if self.persistence_enabled:
             self._persist_dmn_token(token)
 
         return token
 
     def _persist_dmn_token(self, token: DMNToken):
         """Persist DMN token to database"""
+        row = {
+            "token_id": token.token_id,
+            "loose_thread_id": token.loose_thread_id,
+            "vector": token.vector,
+            "problem_statement": token.problem_statement,
+            "context_artifacts": token.context_artifacts,
+            "constraints_json": [c.dict() if hasattr(c, 'dict') else c for c in token.constraints],
+            "decision_criteria_input": token.decision_criteria_input,
+            "expected_decision_score": token.expected_decision_score,
+        }
+        if self._persist_row(DMNTokenModel, row):
+            return
         try:
-            db_token = DMNTokenModel(
-                token_id=token.token_id,
-                loose_thread_id=token.loose_thread_id,
-                vector=token.vector,
-                problem_statement=token.problem_statement,
-                context_artifacts=token.context_artifacts,
-                constraints_json=[c.dict() if hasattr(c, 'dict') else c for c in token.constraints],
-                decision_criteria_input=token.decision_criteria_input,
-                expected_decision_score=token.expected_decision_score,
-            )
-            self.db_session.add(db_token)
+            self.db_session.add(DMNTokenModel(**row))
             self.db_session.commit()
         except Exception as e:
             print(f"Failed to persist DMN token: {e}")
 
     def clear_buffer(self):
-        """Clear event buffer and embedding trajectory"""
+        """Clear event buffer, embedding trajectory and DTC aggregates"""
         self.event_buffer.clear()
         self.embedding_trajectory.clear()
+        self.dtc_aggregator.reset()
 
 
 # Global telemetry instance
 _telemetry_service: Optional[TelemetryService] = None
 
 
-def init_telemetry(db_session=None) -> TelemetryService:
-    """Initialize global telemetry service"""
+def init_telemetry(db_session=None, write_behind: bool = False, **sink_options) -> TelemetryService:
+    """
+    Initialize global telemetry service
+
+    Args:
+        db_session: Database session for persistence
+        write_behind: Persist through a background TelemetrySink bound to
+            ``db_session``'s engine instead of committing per record
+        **sink_options: Forwarded to TelemetrySink (capacity, batch_size, ...)
+    """
     global _telemetry_service
-    _telemetry_service = TelemetryService(db_session)
+    if _telemetry_service is not None:
+        _telemetry_service.close()
+    sink = None
+    if write_behind and db_session is not None:
+        sink = TelemetrySink.from_session(db_session, **sink_options)
+    _telemetry_service = TelemetryService(db_session, sink=sink)
     return _telemetry_service
 
 
@@ -0,0 +1,200 @@
+"""
+Telemetry Sink - Write-Behind Persistence
+==========================================
+Asynchronous, batched persistence for telemetry rows. Request-path callers
+enqueue ORM rows into a bounded ring buffer; a background flusher bulk-inserts
+them in configurable batches/intervals on its own session and commits once
+per batch.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class TelemetrySink:
+    """
+    Bounded write-behind buffer with a background bulk-insert flusher.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session; the
+            flusher thread owns every session it creates.
+        capacity: Maximum rows held in memory before the overflow policy applies.
+        batch_size: Rows per bulk insert / commit.
+        flush_interval: Seconds to wait before flushing a partial batch.
+        overflow_policy: ``drop_oldest`` (ring buffer), ``drop_newest``
+            (reject incoming rows) or ``block`` (backpressure on the caller).
+        block_timeout: Maximum seconds ``block`` waits before dropping the row.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        capacity: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        overflow_policy: str = DROP_OLDEST,
+        block_timeout: float = 1.0,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self._buffer: Deque[Tuple[Type, Dict[str, Any]]] = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._flush_requested = False
+        self._counters: Dict[str, int] = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped_oldest": 0,
+            "dropped_newest": 0,
+            "blocked": 0,
+            "failed": 0,
+        }
+        self._thread = threading.Thread(
+            target=self._run, name="telemetry-sink-flusher", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_session(cls, db_session, **options) -> "TelemetrySink":
+        """Build a sink whose flusher opens sessions on ``db_session``'s engine."""
+        return cls(sessionmaker(bind=db_session.get_bind()), **options)
+
+    def enqueue(self, model: Type, row: Dict[str, Any]) -> bool:
+        """
+        Queue one row for bulk insert.
+
+        Returns:
+            True if the row was buffered, False if it was dropped.
+        """
+        with self._cond:
+            if self._closed:
+                self._counters["dropped_newest"] += 1
+                return False
+
+            if len(self._buffer) >= self.capacity:
+                if self.overflow_policy == DROP_OLDEST:
+                    self._buffer.popleft()
+                    self._counters["dropped_oldest"] += 1
+                elif self.overflow_policy == DROP_NEWEST:
+                    self._counters["dropped_newest"] += 1
+                    return False
+                else:
+                    self._counters["blocked"] += 1
+                    self._cond.notify_all()
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self._buffer) >= self.capacity and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._counters["dropped_newest"] += 1
+                            return False
+                        self._cond.wait(remaining)
+
+            self._buffer.append((model, row))
+            self._counters["enqueued"] += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything enqueued so far has been written (or failed)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._buffer or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush remaining rows and stop the flusher thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters plus the current buffer depth."""
+        with self._cond:
+            stats = dict(self._counters)
+            stats["buffered"] = len(self._buffer)
+            return stats
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while (
+                    len(self._buffer) < self.batch_size
+                    and not self._closed
+                    and not self._flush_requested
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._buffer:
+                    self._flush_requested = False
+                    if self._closed:
+                        return
+                    continue
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                self._in_flight = len(batch)
+                self._cond.notify_all()  # wake blocked producers
+
+            self._write(batch)
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, batch: List[Tuple[Type, Dict[str, Any]]]) -> None:
+        grouped: Dict[Type, List[Dict[str, Any]]] = {}
+        for model, row in batch:
+            grouped.setdefault(model, []).append(row)
+
+        session = self.session_factory()
+        try:
+            for model, rows in grouped.items():
+                session.execute(insert(model), rows)
+            session.commit()
+            with self._cond:
+                self._counters["written"] += len(batch)
+                self._counters["batches"] += 1
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} telemetry rows: {e}", exc_info=True)
+            session.rollback()
+            with self._cond:
+                self._counters["failed"] += len(batch)
+        finally:
+            session.close()
@@ -4,7 +4,7 @@ from typing import Any
 from fastapi import FastAPI, HTTPException, Body, Response, APIRouter, Depends
 from prometheus_client import generate_latest, REGISTRY
 from orchestrator.stateflow import StateMachine, State
-from orchestrator.storage import save_plan_state
+from orchestrator.plan_state_writer import get_plan_state_writer
 from orchestrator.intent_engine import IntentEngine
 from orchestrator.utils import extract_plan_id_from_path
 from orchestrator.verify_api import router as verify_router
@@ -20,13 +20,6 @@ ingress_router = APIRouter()
 # in-memory map
 PLAN_STATE_MACHINES = {}
 
-def persistence_callback(plan_id: str, state_dict: dict) -> None:
-    """Callback to persist FSM state to database."""
-    try:
-        save_plan_state(plan_id, state_dict)
-    except Exception as e:
-        logger.warning(f"Failed to persist plan state for {plan_id}: {e}")
-
 def _register_executing_callback(sm: StateMachine, engine: Any):
     # Logic to trigger actual agent processing when state enters EXECUTING
     pass
@@ -45,7 +38,7 @@ async def _plan_ingress_impl(path_plan_id: str | None, payload: dict):
 
     sm = PLAN_STATE_MACHINES.get(plan_id)
     if not sm:
-        sm = StateMachine(max_retries=3, persistence_callback=persistence_callback)
+        sm = StateMachine(max_retries=3, persistence_writer=get_plan_state_writer())
         sm.plan_id = plan_id
         _register_executing_callback(sm, sm)
         PLAN_STATE_MACHINES[plan_id] = sm
@@ -63,9 +56,9 @@ async def plan_ingress_by_id(plan_id: str, payload: dict = Body(default={})):
 
 @app.post("/orchestrate")
 async def orchestrate(user_query: str):
-    engine = IntentEngine()
     try:
-        result = await engine.run_full_pipeline(description=user_query, requester="api_user")
+        async with IntentEngine() as engine:
+            result = await engine.run_full_pipeline(description=user_query, requester="api_user")
         return {
             "status": "A2A Workflow Complete",
             "success": result.success,
@@ -1,14 +1,27 @@
 """
 Docling Worker
 Parses documents using IBM Docling and normalizes text.
+
+Run as a script, a supervisor keeps ``DOCLING_WORKERS`` processes alive.
+Each process holds long-lived DocumentConverters and consumes the parse
+queue reliably: tasks are BLMOVEd into a per-worker processing list, and
+acknowledged (removed) in the same transaction that enqueues their embed
+batches. In-flight items of workers whose heartbeat expired are re-queued
+when a worker starts.
 """
 
 import ast
 import json
+import multiprocessing
+import os
 import redis
+import signal
+import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 import sys
 
 # Add parent directory to path for lib imports
@@ -23,16 +36,23 @@ except ImportError:
     print("Warning: Docling not installed. Install with: pip install docling")
     DocumentConverter = None
 
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+
 # Redis connection
 redis_client = redis.Redis(
-    host='redis',
-    port=6379,
+    host=REDIS_HOST,
+    port=REDIS_PORT,
     db=0,
     decode_responses=True
 )
 
 PARSE_QUEUE = "parse_queue"
 EMBED_QUEUE = "embed_queue"
+PROCESSING_PREFIX = f"{PARSE_QUEUE}:processing:"  # + worker id
+HEARTBEAT_PREFIX = f"{PARSE_QUEUE}:heartbeat:"  # + worker id
+DEAD_LETTER_QUEUE = f"{PARSE_QUEUE}:dead"
+HEARTBEAT_TTL = int(os.getenv("DOCLING_HEARTBEAT_TTL", "30"))
 BATCH_SIZE = 32  # Chunks per batch for embedding
 CODE_EXTENSIONS = {
     ".py",
@@ -403,12 +423,34 @@ def hybrid_chunk_text(text: str, source_type: str, file_path: Path) -> list[dict
     )
 
 
-def process_document(task_payload: Dict[str, Any]) -> None:
+_converters = threading.local()
+
+
+def get_converter():
     """
-    Process a document: parse with Docling, normalize, chunk, and enqueue for embedding.
+    DocumentConverter for the calling thread, created on first use.
+
+    Converter construction loads Docling's models, so each worker thread
+    keeps one warm instance for its lifetime instead of one per document.
+    """
+    if DocumentConverter is None:
+        return None
+    converter = getattr(_converters, "converter", None)
+    if converter is None:
+        converter = _converters.converter = DocumentConverter()
+    return converter
+
+
+def build_chunk_records(task_payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Parse, normalize and chunk a document into hashed chunk records.
     
     Args:
         task_payload: Task payload from ingest API
+    
+    Returns:
+        Chunk records in document order; ``chunk_id`` is derived from the
+        task's ``bundle_id``
     """
     bundle_id = task_payload['bundle_id']
     file_path = Path(task_payload['file_path'])
@@ -420,12 +462,12 @@ def process_document(task_payload: Dict[str, Any]) -> None:
         source_type = _infer_source_type(file_path)
         repo_context = _derive_repo_context(task_payload, file_path)
         # Parse with Docling
-        if DocumentConverter is None:
+        converter = get_converter()
+        if converter is None:
             # Fallback: read as plain text
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 raw_text = f.read()
         else:
-            converter = DocumentConverter()
             result = converter.convert(str(file_path))
             raw_text = result.document.export_to_markdown()
         
@@ -490,51 +532,299 @@ def process_document(task_payload: Dict[str, Any]) -> None:
             hash_canonical_without_integrity(chunk_record)
             chunk_records.append(chunk_record)
         
-        # Batch chunks for embedding
-        batches = [
-            chunk_records[i:i + BATCH_SIZE]
-            for i in range(0, len(chunk_records), BATCH_SIZE)
-        ]
-        
-        # Enqueue batches to embed_queue
-        for batch_idx, batch in enumerate(batches):
-            batch_payload = {
-                "batch_id": f"{bundle_id}_batch_{batch_idx}",
-                "doc_id": bundle_id,
-                "chunks": batch,
-                "pipeline_version": pipeline_version
-            }
-            hash_canonical_without_integrity(batch_payload)
-            redis_client.rpush(EMBED_QUEUE, json.dumps(batch_payload))
-        
-        print(f"Enqueued {len(batches)} batches for embedding")
+        return chunk_records
         
     except Exception as e:
         print(f"Error processing bundle {bundle_id}: {str(e)}")
         raise
 
 
-def worker_loop():
+def build_embed_batches(task_payload: Dict[str, Any]) -> List[str]:
+    """
+    Parse, normalize and chunk a document into serialized embed batches.
+    
+    Args:
+        task_payload: Task payload from ingest API
+    
+    Returns:
+        JSON batch payloads for the embed queue, in order
+    """
+    bundle_id = task_payload['bundle_id']
+    chunk_records = build_chunk_records(task_payload)
+    
+    # Batch chunks for embedding
+    batches = [
+        chunk_records[i:i + BATCH_SIZE]
+        for i in range(0, len(chunk_records), BATCH_SIZE)
+    ]
+    
+    # Serialize batches for embed_queue
+    batch_payloads = []
+    for batch_idx, batch in enumerate(batches):
+        batch_payload = {
+            "batch_id": f"{bundle_id}_batch_{batch_idx}",
+            "doc_id": bundle_id,
+            "chunks": batch,
+            "pipeline_version": task_payload['pipeline_version']
+        }
+        hash_canonical_without_integrity(batch_payload)
+        batch_payloads.append(json.dumps(batch_payload))
+    
+    return batch_payloads
+
+
+def process_document(task_payload: Dict[str, Any]) -> None:
+    """
+    Process a document: parse with Docling, normalize, chunk, and enqueue for embedding.
+    
+    Args:
+        task_payload: Task payload from ingest API
+    """
+    batch_payloads = build_embed_batches(task_payload)
+    if batch_payloads:
+        redis_client.rpush(EMBED_QUEUE, *batch_payloads)
+    print(f"Enqueued {len(batch_payloads)} batches for embedding")
+
+
+def requeue_worker_tasks(client: redis.Redis, worker_id: str) -> int:
+    """
+    Re-queue the in-flight tasks of a worker known to be dead.
+
+    Items go back to the head of the parse queue in their original order,
+    and the worker's heartbeat key is dropped.
+
+    Returns:
+        Number of tasks re-queued
+    """
+    key = f"{PROCESSING_PREFIX}{worker_id}"
+    requeued = 0
+    while client.lmove(key, PARSE_QUEUE, "RIGHT", "LEFT") is not None:
+        requeued += 1
+    client.delete(f"{HEARTBEAT_PREFIX}{worker_id}")
+    return requeued
+
+
+def recover_stale_tasks(client: redis.Redis) -> int:
+    """
+    Re-queue in-flight tasks of workers whose heartbeat has expired.
+
+    Returns:
+        Number of tasks re-queued
+    """
+    requeued = 0
+    for key in client.scan_iter(match=f"{PROCESSING_PREFIX}*"):
+        worker_id = key[len(PROCESSING_PREFIX):]
+        if client.exists(f"{HEARTBEAT_PREFIX}{worker_id}"):
+            continue
+        requeued += requeue_worker_tasks(client, worker_id)
+    if requeued:
+        print(f"Re-queued {requeued} stale in-flight tasks")
+    return requeued
+
+
+class QueueConsumer:
+    """
+    Reliable parse-queue consumer for one worker process.
+
+    Up to ``prefetch`` tasks are moved into this worker's processing list
+    and handled by ``concurrency`` threads. A task is acknowledged by
+    removing it from the processing list in the same MULTI/EXEC that
+    pushes its embed batches, so a crash either leaves it in flight (and
+    it is re-queued) or hands it off completely. Tasks whose handler
+    raises go to the dead-letter list.
+
+    Args:
+        client: Redis client (``decode_responses=True``)
+        worker_id: Unique id; names the processing list and heartbeat key
+        prefetch: Tasks held in flight at once
+        concurrency: Handler threads (Docling's native conversion and
+            Redis I/O overlap; pure-Python chunking scales with processes)
+        block_timeout: Seconds each BLMOVE waits for work
+        handler: Turns a task payload into serialized embed batches
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        worker_id: Optional[str] = None,
+        prefetch: int = 2,
+        concurrency: int = 1,
+        block_timeout: float = 1,
+        handler: Callable[[Dict[str, Any]], List[str]] = build_embed_batches,
+    ):
+        self.client = client
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.processing_key = f"{PROCESSING_PREFIX}{self.worker_id}"
+        self.heartbeat_key = f"{HEARTBEAT_PREFIX}{self.worker_id}"
+        self.prefetch = max(1, prefetch)
+        self.concurrency = max(1, concurrency)
+        self.block_timeout = block_timeout
+        self.handler = handler
+        self.processed = 0
+        self.failed = 0
+        self._counter_lock = threading.Lock()
+
+    def run(self, stop: Optional[threading.Event] = None, max_tasks: Optional[int] = None) -> None:
+        """Consume until ``stop`` is set (or ``max_tasks`` have been taken)."""
+        stop = stop or threading.Event()
+        self._beat()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(stop,), daemon=True)
+        heartbeat.start()
+        recover_stale_tasks(self.client)
+
+        in_flight = threading.BoundedSemaphore(self.prefetch)
+        taken = 0
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="docling") as pool:
+            while not stop.is_set() and (max_tasks is None or taken < max_tasks):
+                if not in_flight.acquire(timeout=self.block_timeout):
+                    continue
+                try:
+                    raw = self.client.blmove(PARSE_QUEUE, self.processing_key, self.block_timeout, "LEFT", "RIGHT")
+                except redis.RedisError as e:
+                    in_flight.release()
+                    print(f"Worker error: {str(e)}")
+                    time.sleep(1)
+                    continue
+                if raw is None:
+                    in_flight.release()
+                    continue
+                taken += 1
+                pool.submit(self._handle, raw, in_flight)
+        # Leaving the pool waits for in-flight tasks, so a clean stop acknowledges everything it took.
+        self.client.delete(self.heartbeat_key)
+
+    def _handle(self, raw: str, in_flight: threading.BoundedSemaphore) -> None:
+        try:
+            try:
+                batch_payloads = self.handler(json.loads(raw))
+            except Exception as e:
+                print(f"Task failed, moved to {DEAD_LETTER_QUEUE}: {str(e)}")
+                pipe = self.client.pipeline(transaction=True)
+                pipe.rpush(DEAD_LETTER_QUEUE, raw)
+                pipe.lrem(self.processing_key, 1, raw)
+                pipe.execute()
+                with self._counter_lock:
+                    self.failed += 1
+                return
+
+            pipe = self.client.pipeline(transaction=True)
+            if batch_payloads:
+                pipe.rpush(EMBED_QUEUE, *batch_payloads)
+            pipe.lrem(self.processing_key, 1, raw)
+            pipe.execute()
+            print(f"Enqueued {len(batch_payloads)} batches for embedding")
+            with self._counter_lock:
+                self.processed += 1
+        except redis.RedisError as e:
+            # Still in the processing list; re-queued once this worker dies or its heartbeat lapses.
+            print(f"Worker error acknowledging task: {str(e)}")
+        finally:
+            in_flight.release()
+
+    def _beat(self) -> None:
+        self.client.set(self.heartbeat_key, int(time.time()), ex=HEARTBEAT_TTL)
+
+    def _heartbeat_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(HEARTBEAT_TTL / 3):
+            try:
+                self._beat()
+            except redis.RedisError as e:
+                print(f"Heartbeat failed: {str(e)}")
+
+
+def worker_loop(
+    client: Optional[redis.Redis] = None,
+    prefetch: int = 2,
+    concurrency: int = 1,
+    stop: Optional[threading.Event] = None,
+):
     """Main worker loop."""
     print("Docling worker started. Waiting for tasks...")
-    
-    while True:
+    consumer = QueueConsumer(client or redis_client, prefetch=prefetch, concurrency=concurrency)
+    try:
+        consumer.run(stop)
+    except KeyboardInterrupt:
+        print("Worker shutting down...")
+
+
+def _worker_process(host: str, port: int, prefetch: int, concurrency: int) -> None:
+    # The supervisor owns shutdown and stops workers with SIGTERM. A shared
+    # multiprocessing.Event would deadlock its set() once a waiting worker is SIGKILLed.
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    client = redis.Redis(host=host, port=port, db=0, decode_responses=True)
+    QueueConsumer(client, prefetch=prefetch, concurrency=concurrency).run(stop)
+
+
+def run_supervisor(
+    processes: Optional[int] = None,
+    prefetch: int = 2,
+    concurrency: int = 1,
+    host: str = REDIS_HOST,
+    port: int = REDIS_PORT,
+    stop=None,
+) -> None:
+    """
+    Keep ``processes`` worker processes running until SIGTERM/SIGINT.
+
+    Crashed workers are replaced. Their in-flight tasks are re-queued
+    before the replacement starts, without waiting for the dead worker's
+    heartbeat to expire.
+    """
+    processes = processes or os.cpu_count() or 1
+    ctx = multiprocessing.get_context("spawn")
+    stop = stop or threading.Event()
+    client = redis.Redis(host=host, port=port, db=0, decode_responses=True)
+    hostname = socket.gethostname()
+
+    def reap(proc) -> None:
+        # Workers are named host:pid (see QueueConsumer), and spawned children share our host.
         try:
-            # Blocking pop from queue (timeout 1 second)
-            result = redis_client.blpop(PARSE_QUEUE, timeout=1)
-            
-            if result:
-                _, task_json = result
-                task_payload = json.loads(task_json)
-                process_document(task_payload)
-            
-        except KeyboardInterrupt:
-            print("Worker shutting down...")
-            break
-        except Exception as e:
-            print(f"Worker error: {str(e)}")
-            time.sleep(1)
+            requeued = requeue_worker_tasks(client, f"{hostname}:{proc.pid}")
+        except redis.RedisError as e:
+            print(f"Could not re-queue tasks of {proc.name}: {str(e)}")
+            return
+        if requeued:
+            print(f"Re-queued {requeued} in-flight tasks of {proc.name}")
+
+    def start(index: int):
+        proc = ctx.Process(
+            target=_worker_process,
+            args=(host, port, prefetch, concurrency),
+            name=f"docling-worker-{index}",
+        )
+        proc.start()
+        return proc
+
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+
+    print(f"Docling supervisor starting {processes} workers (prefetch={prefetch}, threads={concurrency})")
+    workers = [start(i) for i in range(processes)]
+    try:
+        while not stop.wait(1):
+            for i, proc in enumerate(workers):
+                if not proc.is_alive():
+                    print(f"{proc.name} exited with {proc.exitcode}; restarting")
+                    reap(proc)
+                    workers[i] = start(i)
+    finally:
+        stop.set()
+        for proc in workers:
+            proc.terminate()
+        for proc in workers:
+            proc.join(HEARTBEAT_TTL)
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+            reap(proc)
 
 
 if __name__ == "__main__":
-    worker_loop()
+    run_supervisor(
+        processes=int(os.getenv("DOCLING_WORKERS", "0")) or None,
+        prefetch=int(os.getenv("DOCLING_PREFETCH", "2")),
+        concurrency=int(os.getenv("DOCLING_THREADS", "1")),
+    )
@@ -4,6 +4,7 @@ Generates embeddings using PyTorch and stores in Qdrant.
 """
 
 import json
+import os
 import redis
 import time
 import torch
@@ -17,7 +18,9 @@ import sys
 # Add parent directory to path for lib imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from lib.normalize import l2_normalize
-from lib.canonical import append_to_ledger
+from lib.canonical import LedgerWriter
+from lib.embedding_cache import EmbeddingCache, embed_with_cache
+from lib.embedding_sidecar import EmbeddingSidecar, sidecar_path
 
 # Redis connection
 redis_client = redis.Redis(
@@ -34,6 +37,13 @@ EMBED_QUEUE = "embed_queue"
 COLLECTION_NAME = "docling_chunks"
 LEDGER_PATH = Path("/data/ledger/ledger.jsonl")
 
+# Keeps the chain head in memory; one fsync per batch
+ledger_writer = LedgerWriter(LEDGER_PATH, fsync=True)
+
+# Vectors go to a binary sidecar next to the ledger; records carry a hashed reference.
+EMBED_LEDGER_DTYPE = os.getenv("EMBED_LEDGER_DTYPE", "float32")
+embedding_sidecar = EmbeddingSidecar(sidecar_path(LEDGER_PATH, EMBED_LEDGER_DTYPE), dtype=EMBED_LEDGER_DTYPE, fsync=True)
+
 # Model configuration (should be from ConfigMap in production)
 MODEL_CONFIG = {
     "embedder_model_id": "sentence-transformers/all-mpnet-base-v2",
@@ -46,6 +56,20 @@ print(f"Loading model: {MODEL_CONFIG['embedder_model_id']}")
 model = SentenceTransformer(MODEL_CONFIG['embedder_model_id'])
 model.eval()
 
+# Embedding cache: unchanged chunks are served from disk instead of the model.
+# Set EMBED_CACHE_DIR to an empty string to disable.
+EMBED_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", "/data/embed_cache")
+embedding_cache = (
+    EmbeddingCache(
+        EMBED_CACHE_DIR,
+        embedder_model_id=MODEL_CONFIG['embedder_model_id'],
+        weights_hash=MODEL_CONFIG['weights_hash'],
+        max_bytes=int(os.getenv("EMBED_CACHE_MAX_BYTES", str(4 * 1024 ** 3))),
+    )
+    if EMBED_CACHE_DIR
+    else None
+)
+
 
 def initialize_collection():
     """Initialize Qdrant collection if it doesn't exist."""
@@ -63,6 +87,22 @@ def initialize_collection():
         )
 
 
+def encode_texts(texts: List[str]) -> List[List[float]]:
+    """Encode and L2-normalize a batch of texts with the loaded model."""
+    with torch.no_grad():
+        embeddings = model.encode(
+            texts,
+            convert_to_tensor=True,
+            show_progress_bar=False
+        )
+        
+        # L2 normalize
+        embeddings = l2_normalize(embeddings)
+        
+        # Convert to list for storage
+        return embeddings.cpu().tolist()
+
+
 def process_batch(batch_payload: Dict[str, Any]) -> None:
     """
     Process a batch of chunks: generate embeddings and store in Qdrant.
@@ -79,25 +119,18 @@ def process_batch(batch_payload: Dict[str, Any]) -> None:
         # Extract text content
         texts = [chunk['text_content'] for chunk in chunks]
         
-        # Generate embeddings (batch inference)
-        with torch.no_grad():
-            embeddings = model.encode(
-                texts,
-                convert_to_tensor=True,
-                show_progress_bar=False
-            )
-            
-            # L2 normalize
-            embeddings = l2_normalize(embeddings)
-            
-            # Convert to list for storage
-            embeddings_list = embeddings.cpu().tolist()
+        # Generate embeddings (batch inference on cache misses only)
+        embeddings_list, cache_hits = embed_with_cache(embedding_cache, texts, encode_texts)
+        batch_hit_ratio = round(sum(cache_hits) / len(texts), 4) if texts else 0.0
         
         # Prepare points for Qdrant
         points = []
         ledger_records = []
         
-        for chunk, embedding in zip(chunks, embeddings_list):
+        # Sidecar first, so ledger records never reference missing bytes
+        embedding_refs = embedding_sidecar.append(embeddings_list)
+        
+        for chunk, embedding, embedding_ref, cache_hit in zip(chunks, embeddings_list, embedding_refs, cache_hits):
             chunk_id = chunk['chunk_id']
             source_type = chunk.get('source_type', 'text')
             chunk_locator = chunk.get('chunk_locator', {})
@@ -115,7 +148,7 @@ def process_batch(batch_payload: Dict[str, Any]) -> None:
                 "chunk_id": chunk_id,
                 "doc_id": chunk['doc_id'],
                 "text_content": chunk['text_content'],
-                "embedding": embedding,
+                "embedding_ref": embedding_ref,
                 "source_type": source_type,
                 "chunk_locator": chunk_locator,
                 "chunker_version": chunk.get('chunker_version'),
@@ -129,7 +162,9 @@ def process_batch(batch_payload: Dict[str, Any]) -> None:
                 "module_name": module_name,
                 "embedder_model_id": MODEL_CONFIG['embedder_model_id'],
                 "weights_hash": MODEL_CONFIG['weights_hash'],
-                "chunk_integrity_hash": chunk['integrity_hash']
+                "chunk_integrity_hash": chunk['integrity_hash'],
+                "embedding_cache_hit": cache_hit,
+                "batch_cache_hit_ratio": batch_hit_ratio
             }
             
             # Create Qdrant point
@@ -163,11 +198,10 @@ def process_batch(batch_payload: Dict[str, Any]) -> None:
             points=points
         )
         
-        # Append to ledger (batch write)
-        for record in ledger_records:
-            append_to_ledger(record, LEDGER_PATH)
+        # Append to ledger (group commit)
+        ledger_writer.append_many(ledger_records)
         
-        print(f"Successfully processed batch {batch_id}")
+        print(f"Successfully processed batch {batch_id} (cache hit ratio {batch_hit_ratio:.2f})")
         
     except Exception as e:
         print(f"Error processing batch {batch_id}: {str(e)}")
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Incremental repository re-ingestion driven by git diffs.
+
+Indexes a git repository straight from its object store: parse and chunk
+with the docling worker's chunker, embed (through the embedding cache),
+upsert into Qdrant and record everything in the ledger. A per-repository
+manifest (``lib/repo_manifest.py``) remembers the indexed commit and, per
+file, the blob SHA and chunk ids. The next run diffs the new commit
+against it with ``git diff --name-status`` and only re-processes
+added/modified files; vectors of deleted files and of replaced file
+versions are removed.
+
+Ids are deterministic: a file version's doc id is derived from
+(repo_key, relative_path, blob_sha), so an unchanged file keeps its chunk
+ids. Each run lands as one ledger group commit: the embedding records,
+``chunk.deleted`` tombstones and a closing ``repo.reindex.checkpoint`` that
+names both commits and the new manifest's digest. The checkpoint is the
+commit point; the manifest is saved after it, and an interrupted run is
+simply repeated (upserts and deletes are idempotent).
+
+Usage:
+    python incremental_ingest.py /path/to/repo --repo-key org/repo
+    python incremental_ingest.py /path/to/repo --repo-key org/repo --commit v1.2.0 --full
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.blob_store import BlobStore
+from lib.canonical import LedgerWriter
+from lib.embedding_cache import EmbeddingCache, embed_with_cache
+from lib.embedding_sidecar import EmbeddingSidecar, sidecar_path
+from lib.repo_manifest import RepoManifest
+from docling_worker import worker as docling_worker
+
+# Namespace for deterministic doc ids and Qdrant point ids (Qdrant accepts UUIDs, not arbitrary strings)
+ID_NAMESPACE = uuid.UUID("6f1c2a4e-3b7d-5e8f-9a0b-1c2d3e4f5a6b")
+
+CHECKPOINT_EVENT = "repo.reindex.checkpoint"
+TOMBSTONE_EVENT = "chunk.deleted"
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+
+MODEL_CONFIG = {
+    "embedder_model_id": "sentence-transformers/all-mpnet-base-v2",
+    "weights_hash": "sha256:4509c1ee9d2c8edeefc99bd9ca58668916bee2b9b0cf8bf505310e7b64baf670",
+}
+
+
+class IngestPlan(NamedTuple):
+    """Files to (re-)process and remove for one run."""
+
+    mode: str  # "full" or "incremental"
+    base_commit: Optional[str]
+    commit: str
+    upserts: Dict[str, str]  # relative_path -> blob sha
+    deletes: List[str]
+
+
+def _git(repo: Path, *args: str) -> bytes:
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True).stdout
+
+
+def resolve_commit(repo: Path, rev: str) -> str:
+    """Full SHA of ``rev``."""
+    return _git(repo, "rev-parse", "--verify", f"{rev}^{{commit}}").decode().strip()
+
+
+def list_tree(repo: Path, commit: str) -> Dict[str, Tuple[str, int]]:
+    """``relative_path -> (blob sha, size)`` for regular files at ``commit``."""
+    entries = {}
+    for entry in _git(repo, "ls-tree", "-r", "-l", "-z", "--full-tree", commit).split(b"\0"):
+        if not entry:
+            continue
+        meta, path = entry.split(b"\t", 1)
+        mode, kind, sha, size = meta.split()
+        if kind == b"blob" and mode in (b"100644", b"100755"):
+            entries[path.decode("utf-8", "surrogateescape")] = (sha.decode(), int(size))
+    return entries
+
+
+def diff_name_status(repo: Path, base: str, commit: str) -> List[Tuple[str, str]]:
+    """``(status letter, path)`` pairs between two commits; renames show as delete + add."""
+    fields = _git(repo, "diff", "--name-status", "--no-renames", "-z", base, commit).split(b"\0")
+    return [
+        (fields[i].decode()[0], fields[i + 1].decode("utf-8", "surrogateescape"))
+        for i in range(0, len(fields) - 1, 2)
+    ]
+
+
+def is_ingestible(relative_path: str) -> bool:
+    """Whether the docling worker can parse files like ``relative_path``."""
+    suffix = PurePosixPath(relative_path).suffix.lower()
+    if suffix in (".pdf", ".docx"):
+        return docling_worker.DocumentConverter is not None
+    return suffix in docling_worker.CODE_EXTENSIONS or suffix in docling_worker.DOCUMENT_EXTENSIONS
+
+
+def plan_reingest(
+    repo: Path,
+    manifest: RepoManifest,
+    commit: str,
+    full: bool = False,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> IngestPlan:
+    """
+    Decide which files to process for ``commit``.
+
+    Without a manifest (or with ``full``) every ingestible file is
+    processed. Otherwise only paths reported by ``git diff --name-status``
+    whose blob differs from the manifest's; falls back to a full run when
+    the manifest's commit is no longer in the repository.
+    """
+    tree = {
+        path: sha
+        for path, (sha, size) in list_tree(repo, commit).items()
+        if size <= max_file_bytes and is_ingestible(path)
+    }
+
+    if not full and manifest.commit_sha:
+        try:
+            changes = diff_name_status(repo, manifest.commit_sha, commit)
+        except subprocess.CalledProcessError:
+            print(f"Manifest commit {manifest.commit_sha} not found; falling back to a full reindex")
+        else:
+            upserts, deletes = {}, []
+            for _status, path in changes:
+                if path in tree:
+                    if manifest.files.get(path, {}).get("blob_sha") != tree[path]:
+                        upserts[path] = tree[path]
+                elif path in manifest.files:
+                    deletes.append(path)
+            return IngestPlan("incremental", manifest.commit_sha, commit, upserts, sorted(deletes))
+
+    deletes = sorted(path for path in manifest.files if path not in tree)
+    return IngestPlan("full", manifest.commit_sha, commit, tree, deletes)
+
+
+class _BlobReader:
+    """Reads blobs through one long-lived ``git cat-file --batch`` process."""
+
+    def __init__(self, repo: Path):
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def read(self, sha: str) -> bytes:
+        self._proc.stdin.write(f"{sha}\n".encode())
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError(f"git object {sha} is missing")
+        data = self._proc.stdout.read(int(header[2]))
+        self._proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        self._proc.stdin.close()
+        self._proc.wait()
+
+
+def point_id(chunk_id: str) -> str:
+    """Qdrant point id for a chunk id."""
+    return str(uuid.uuid5(ID_NAMESPACE, chunk_id))
+
+
+class IncrementalIngestor:
+    """
+    Brings one repository's index up to a commit.
+
+    Args:
+        repo_path: Git working tree or bare repository
+        repo_key: Routing key; also names the manifest
+        manifest_root: Directory holding manifests
+        encode: Embeds a list of texts (L2-normalized vectors)
+        qdrant_client: Vector store client
+        collection_name: Qdrant collection
+        ledger_path: Ledger to append to; vectors go to its sidecar
+        blob_store: Where file versions are materialized for parsing
+        embedding_cache: Optional cache consulted before ``encode``
+        pipeline_version: Pipeline version identifier
+        embedder_model_id: Recorded on embedding records
+        weights_hash: Recorded on embedding records
+        max_file_bytes: Larger files are skipped
+        batch_size: Chunks per embedding and upsert batch
+        ledger_fsync: fsync the ledger checkpoint and sidecar
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        repo_key: str,
+        manifest_root: Path,
+        encode: Callable[[List[str]], List[List[float]]],
+        qdrant_client: Any,
+        collection_name: str,
+        ledger_path: Path,
+        blob_store: BlobStore,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        pipeline_version: str = "v1.0.0",
+        embedder_model_id: str = MODEL_CONFIG["embedder_model_id"],
+        weights_hash: str = MODEL_CONFIG["weights_hash"],
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        batch_size: int = docling_worker.BATCH_SIZE,
+        ledger_fsync: bool = True,
+    ):
+        self.repo_path = Path(repo_path)
+        self.repo_key = repo_key
+        self.manifest_root = Path(manifest_root)
+        self.encode = encode
+        self.qdrant_client = qdrant_client
+        self.collection_name = collection_name
+        self.ledger_path = Path(ledger_path)
+        self.blob_store = blob_store
+        self.embedding_cache = embedding_cache
+        self.pipeline_version = pipeline_version
+        self.embedder_model_id = embedder_model_id
+        self.weights_hash = weights_hash
+        self.max_file_bytes = max_file_bytes
+        self.batch_size = batch_size
+        self.ledger_fsync = ledger_fsync
+
+    def run(self, commit: str = "HEAD", full: bool = False) -> Dict[str, Any]:
+        """
+        Index ``commit`` and write its ledger checkpoint.
+
+        Args:
+            commit: Revision to bring the index up to
+            full: Re-process every file instead of diffing
+
+        Returns:
+            Summary of the run (mode, commits, file and chunk counts)
+        """
+        started = time.perf_counter()
+        commit = resolve_commit(self.repo_path, commit)
+        manifest = RepoManifest.load(self.manifest_root, self.repo_key)
+        plan = plan_reingest(self.repo_path, manifest, commit, full, self.max_file_bytes)
+        print(f"{plan.mode} reindex of {self.repo_key} {plan.base_commit or '(none)'} -> {commit}: "
+              f"{len(plan.upserts)} files to process, {len(plan.deletes)} to remove")
+
+        ledger_records: List[Dict[str, Any]] = []
+        new_files: Dict[str, Dict[str, Any]] = {}
+        pending: List[Dict[str, Any]] = []
+        cache_hits = 0
+        sidecar = EmbeddingSidecar(sidecar_path(self.ledger_path), fsync=self.ledger_fsync)
+        reader = _BlobReader(self.repo_path)
+        try:
+            for path in sorted(plan.upserts):
+                chunks = self._chunk_file(reader, path, plan.upserts[path], commit)
+                new_files[path] = {"blob_sha": plan.upserts[path], "chunk_ids": [c["chunk_id"] for c in chunks]}
+                pending.extend(chunks)
+                while len(pending) >= self.batch_size:
+                    cache_hits += self._embed_and_upsert(pending[:self.batch_size], sidecar, ledger_records)
+                    del pending[:self.batch_size]
+            if pending:
+                cache_hits += self._embed_and_upsert(pending, sidecar, ledger_records)
+        finally:
+            reader.close()
+            sidecar.close()
+        chunks_upserted = len(ledger_records)
+
+        # Chunks no longer referenced: removed files, and old versions of re-processed files
+        stale: List[Tuple[str, str]] = [(path, cid) for path in plan.deletes for cid in manifest.chunk_ids(path)]
+        for path, entry in new_files.items():
+            kept = set(entry["chunk_ids"])
+            stale.extend((path, cid) for cid in manifest.chunk_ids(path) if cid not in kept)
+        self._delete_points([cid for _, cid in stale])
+        for path, chunk_id in stale:
+            ledger_records.append({
+                "event": TOMBSTONE_EVENT,
+                "chunk_id": chunk_id,
+                "repo_key": self.repo_key,
+                "relative_path": path,
+                "commit_sha": commit,
+            })
+
+        for path in plan.deletes:
+            manifest.files.pop(path, None)
+        manifest.files.update(new_files)
+        manifest.commit_sha = commit
+
+        summary = {
+            "mode": plan.mode,
+            "repo_key": self.repo_key,
+            "base_commit": plan.base_commit,
+            "commit": commit,
+            "files_processed": len(plan.upserts),
+            "files_removed": len(plan.deletes),
+            "chunks_upserted": chunks_upserted,
+            "chunks_deleted": len(stale),
+            "embedding_cache_hits": cache_hits,
+            "files_indexed": len(manifest.files),
+            "manifest_sha256": manifest.digest(),
+        }
+        checkpoint = {"event": CHECKPOINT_EVENT, **summary}
+        ledger_records.append(checkpoint)
+        with LedgerWriter(self.ledger_path, fsync=self.ledger_fsync) as writer:
+            summary["checkpoint_hash"] = writer.append_many(ledger_records)[-1]
+        manifest.save(self.manifest_root)
+
+        summary["wall_s"] = round(time.perf_counter() - started, 3)
+        print(f"Checkpoint {summary['checkpoint_hash']}: {chunks_upserted} chunks upserted, {len(stale)} deleted")
+        return summary
+
+    def _chunk_file(self, reader: _BlobReader, path: str, blob_sha: str, commit: str) -> List[Dict[str, Any]]:
+        blob = self.blob_store.put_stream(io.BytesIO(reader.read(blob_sha)), PurePosixPath(path).suffix)
+        task_payload = {
+            "bundle_id": str(uuid.uuid5(ID_NAMESPACE, f"{self.repo_key}\n{path}\n{blob_sha}")),
+            "filename": PurePosixPath(path).name,
+            "file_path": str(blob.path),
+            "pipeline_version": self.pipeline_version,
+            "metadata": {
+                "repo_key": self.repo_key,
+                "repo_kind": "git",
+                "repo_root": str(self.repo_path),
+                "relative_path": path,
+                "commit_sha": commit,
+            },
+        }
+        return docling_worker.build_chunk_records(task_payload)
+
+    def _embed_and_upsert(self, chunks: List[Dict[str, Any]], sidecar: EmbeddingSidecar, ledger_records: List[Dict[str, Any]]) -> int:
+        from qdrant_client.models import PointStruct
+
+        texts = [chunk["text_content"] for chunk in chunks]
+        embeddings, hits = embed_with_cache(self.embedding_cache, texts, self.encode)
+        embedding_refs = sidecar.append(embeddings)
+        self._ensure_collection(len(embeddings[0]))
+
+        points = []
+        for chunk, embedding, embedding_ref, hit in zip(chunks, embeddings, embedding_refs, hits):
+            context = {key: chunk.get(key, "") for key in ("repo_key", "repo_kind", "repo_url", "repo_root", "relative_path", "commit_sha", "branch", "module_name")}
+            ledger_records.append({
+                "chunk_id": chunk["chunk_id"],
+                "doc_id": chunk["doc_id"],
+                "text_content": chunk["text_content"],
+                "embedding_ref": embedding_ref,
+                "source_type": chunk.get("source_type", "text"),
+                "chunk_locator": chunk.get("chunk_locator", {}),
+                "chunker_version": chunk.get("chunker_version"),
+                **context,
+                "embedder_model_id": self.embedder_model_id,
+                "weights_hash": self.weights_hash,
+                "chunk_integrity_hash": chunk["integrity_hash"],
+                "embedding_cache_hit": hit,
+            })
+            points.append(PointStruct(
+                id=point_id(chunk["chunk_id"]),
+                vector=embedding,
+                payload={
+                    "chunk_id": chunk["chunk_id"],
+                    "doc_id": chunk["doc_id"],
+                    "chunk_index": chunk["chunk_index"],
+                    "text_content": chunk["text_content"],
+                    "source_type": chunk.get("source_type", "text"),
+                    "chunk_locator": chunk.get("chunk_locator", {}),
+                    "chunker_version": chunk.get("chunker_version"),
+                    **context,
+                    "chunk_integrity_hash": chunk["integrity_hash"],
+                },
+            ))
+        self.qdrant_client.upsert(collection_name=self.collection_name, points=points)
+        return sum(hits)
+
+    def _delete_points(self, chunk_ids: List[str]) -> None:
+        if not chunk_ids or not self.qdrant_client.collection_exists(self.collection_name):
+            return
+        from qdrant_client.models import PointIdsList
+
+        for start in range(0, len(chunk_ids), 1000):
+            ids = [point_id(cid) for cid in chunk_ids[start:start + 1000]]
+            self.qdrant_client.delete(collection_name=self.collection_name, points_selector=PointIdsList(points=ids))
+
+    def _ensure_collection(self, dim: int) -> None:
+        if self.qdrant_client.collection_exists(self.collection_name):
+            return
+        from qdrant_client.models import Distance, VectorParams
+
+        print(f"Creating collection: {self.collection_name}")
+        self.qdrant_client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
+        )
+
+
+def _load_encoder(model_id: str) -> Callable[[List[str]], List[List[float]]]:
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from lib.normalize import l2_normalize
+
+    model = SentenceTransformer(model_id)
+    model.eval()
+
+    def encode(texts: List[str]) -> List[List[float]]:
+        with torch.no_grad():
+            embeddings = model.encode(texts, convert_to_tensor=True, show_progress_bar=False)
+            return l2_normalize(embeddings).cpu().tolist()
+
+    return encode
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Index a git repository, re-processing only files changed since the last run.")
+    parser.add_argument("repo", type=Path, help="git repository to index")
+    parser.add_argument("--repo-key", required=True, help="routing key, e.g. org/repo")
+    parser.add_argument("--commit", default="HEAD")
+    parser.add_argument("--full", action="store_true", help="re-process every file")
+    parser.add_argument("--manifest-dir", type=Path, default=Path(os.getenv("INGEST_MANIFEST_DIR", "/data/manifests")))
+    parser.add_argument("--ledger", type=Path, default=Path("/data/ledger/ledger.jsonl"))
+    parser.add_argument("--blob-dir", type=Path, default=Path(os.getenv("INGEST_BLOB_DIR", "/tmp/docling_uploads")))
+    parser.add_argument("--cache-dir", default=os.getenv("EMBED_CACHE_DIR", "/data/embed_cache"), help="empty disables the cache")
+    parser.add_argument("--qdrant-host", default=os.getenv("QDRANT_HOST", "qdrant"))
+    parser.add_argument("--qdrant-port", type=int, default=int(os.getenv("QDRANT_PORT", "6333")))
+    parser.add_argument("--collection", default="docling_chunks")
+    parser.add_argument("--max-file-bytes", type=int, default=DEFAULT_MAX_FILE_BYTES)
+    args = parser.parse_args()
+
+    from qdrant_client import QdrantClient
+
+    cache = (
+        EmbeddingCache(args.cache_dir, MODEL_CONFIG["embedder_model_id"], MODEL_CONFIG["weights_hash"])
+        if args.cache_dir
+        else None
+    )
+    ingestor = IncrementalIngestor(
+        repo_path=args.repo,
+        repo_key=args.repo_key,
+        manifest_root=args.manifest_dir,
+        encode=_load_encoder(MODEL_CONFIG["embedder_model_id"]),
+        qdrant_client=QdrantClient(host=args.qdrant_host, port=args.qdrant_port),
+        collection_name=args.collection,
+        ledger_path=args.ledger,
+        blob_store=BlobStore(args.blob_dir),
+        embedding_cache=cache,
+        max_file_bytes=args.max_file_bytes,
+    )
+    summary = ingestor.run(args.commit, full=args.full)
+    print(f"{summary['mode']}: {summary['files_processed']} files processed, {summary['files_removed']} removed "
+          f"in {summary['wall_s']}s")
+    if cache is not None:
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,82 @@
 """
 FastAPI Ingest Service
 Handles file uploads and enqueues parsing tasks.
+
+Uploads are streamed in chunks into a content-addressed blob store
+(``INGEST_BLOB_DIR``), so request size does not drive the API's memory
+use and identical uploads are stored once. Tar and zip archives are fanned
+out into one task per member, streamed member by member.
 """
 
+import os
+import tarfile
 import uuid
+import zipfile
 import redis
 import json
-from pathlib import Path
-from typing import Optional
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from fastapi import Depends, FastAPI, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import sys
 
 # Add parent directory to path for lib imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.blob_store import BlobStore, BlobTooLarge, StoredBlob
 from lib.canonical import hash_canonical_without_integrity
 
 app = FastAPI(title="Docling Ingest API")
 
 # Redis connection
 redis_client = redis.Redis(
-    host='redis',
-    port=6379,
+    host=os.getenv("REDIS_HOST", "redis"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
     db=0,
     decode_responses=True
 )
 
 PARSE_QUEUE = "parse_queue"
 
+# Shared with the docling worker, which reads blobs by path
+BLOB_DIR = Path(os.getenv("INGEST_BLOB_DIR", "/tmp/docling_uploads"))
+UPLOAD_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_BYTES = int(os.getenv("INGEST_MAX_UPLOAD_BYTES", str(2 * 1024 ** 3)))
+MAX_ARCHIVE_MEMBERS = int(os.getenv("INGEST_MAX_ARCHIVE_MEMBERS", "10000"))
+MAX_ARCHIVE_BYTES = int(os.getenv("INGEST_MAX_ARCHIVE_BYTES", str(4 * 1024 ** 3)))
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get or create the upload blob store."""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(BLOB_DIR)
+    return _blob_store
+
+
+def reset_blob_store() -> None:
+    """Drop the cached blob store (e.g. after changing ``BLOB_DIR``)."""
+    global _blob_store
+    _blob_store = None
+
 
 class IngestResponse(BaseModel):
     bundle_id: str
     status: str
     message: str
+    content_sha256: Optional[str] = None
+    deduplicated: bool = False
+
+
+class BatchIngestResponse(BaseModel):
+    bundle_ids: List[str]
+    status: str
+    message: str
+    files: List[Dict[str, Any]]
 
 
 @app.get("/health")
@@ -45,10 +89,7 @@ async def health_check():
         raise HTTPException(status_code=503, detail=f"Redis unavailable: {str(e)}")
 
 
-@app.post("/ingest", response_model=IngestResponse)
-async def ingest_document(
-    file: UploadFile = File(...),
-    pipeline_version: str = Form("v1.0.0"),
+def route_metadata(
     metadata: Optional[str] = Form(None),
     repo_key: Optional[str] = Form(None),
     repo_kind: Optional[str] = Form(None),
@@ -58,6 +99,149 @@ async def ingest_document(
     commit_sha: Optional[str] = Form(None),
     branch: Optional[str] = Form(None),
     module_name: Optional[str] = Form(None),
+) -> Dict[str, Any]:
+    """Task metadata from the optional JSON ``metadata`` field and routing form fields."""
+    meta_dict = {}
+    if metadata:
+        try:
+            meta_dict = json.loads(metadata)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON metadata")
+
+    route_fields = {
+        "repo_key": (repo_key or "").strip(),
+        "repo_kind": (repo_kind or "").strip(),
+        "repo_url": (repo_url or "").strip(),
+        "repo_root": (repo_root or "").strip(),
+        "relative_path": (relative_path or "").strip(),
+        "commit_sha": (commit_sha or "").strip(),
+        "branch": (branch or "").strip(),
+        "module_name": (module_name or "").strip(),
+    }
+    route_fields = {k: v for k, v in route_fields.items() if v}
+    if route_fields:
+        # Explicit form fields win over metadata-provided routing keys.
+        meta_dict.update(route_fields)
+    return meta_dict
+
+
+def _is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+async def _store_upload(file: UploadFile) -> StoredBlob:
+    """Stream an upload into the blob store, hashing it chunk by chunk."""
+    with get_blob_store().writer(Path(file.filename or "").suffix, MAX_UPLOAD_BYTES) as blob:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            blob.write(chunk)
+        return blob.commit()
+
+
+def _build_task(filename: str, blob: StoredBlob, pipeline_version: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    task_payload = {
+        "bundle_id": str(uuid.uuid4()),
+        "filename": filename,
+        "content_size": blob.size,
+        "content_sha256": blob.sha256,
+        "pipeline_version": pipeline_version,
+        "metadata": metadata
+    }
+    
+    # Compute integrity hash
+    hash_canonical_without_integrity(task_payload)
+    
+    # Add file path to payload
+    task_payload["file_path"] = str(blob.path)
+    return task_payload
+
+
+def _enqueue(tasks: List[Dict[str, Any]]) -> None:
+    """Enqueue parse tasks in one MULTI/EXEC round trip."""
+    pipe = redis_client.pipeline(transaction=True)
+    for task_payload in tasks:
+        pipe.rpush(PARSE_QUEUE, json.dumps(task_payload))
+    pipe.execute()
+
+
+def _file_summary(task_payload: Dict[str, Any], blob: StoredBlob) -> Dict[str, Any]:
+    return {
+        "bundle_id": task_payload["bundle_id"],
+        "filename": task_payload["filename"],
+        "relative_path": task_payload["metadata"].get("relative_path", task_payload["filename"]),
+        "content_sha256": blob.sha256,
+        "content_size": blob.size,
+        "deduplicated": blob.deduplicated,
+    }
+
+
+def _member_path(name: str) -> Optional[str]:
+    """Archive member name as a clean relative path, or None to skip it."""
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts or not path.parts or path.parts[0] == "__MACOSX":
+        return None
+    return str(path)
+
+
+def _iter_archive(archive_path: Path) -> Iterator[Tuple[str, BinaryIO]]:
+    """Yield (member name, stream) for each regular file, reading members one at a time."""
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as member:
+                    yield info.filename, member
+        return
+    try:
+        archive = tarfile.open(archive_path, "r:*")
+    except tarfile.TarError:
+        raise HTTPException(status_code=400, detail="Unsupported or corrupt archive")
+    with archive:
+        for info in archive:
+            if not info.isfile():
+                continue
+            member = archive.extractfile(info)
+            with member:
+                yield info.name, member
+
+
+def _fan_out_archive(
+    archive: StoredBlob,
+    archive_name: str,
+    pipeline_version: str,
+    metadata: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Store each archive member as its own blob and build one task per member."""
+    store = get_blob_store()
+    prefix = metadata.get("relative_path")
+    remaining = MAX_ARCHIVE_BYTES
+    tasks, files = [], []
+    for name, stream in _iter_archive(archive.path):
+        relative = _member_path(name)
+        if relative is None:
+            continue
+        if len(tasks) >= MAX_ARCHIVE_MEMBERS:
+            raise HTTPException(status_code=413, detail=f"Archive has more than {MAX_ARCHIVE_MEMBERS} files")
+        blob = store.put_stream(stream, PurePosixPath(relative).suffix, max_bytes=remaining, chunk_size=UPLOAD_CHUNK_SIZE)
+        remaining -= blob.size
+        member_meta = dict(metadata)
+        member_meta["relative_path"] = str(PurePosixPath(prefix) / relative) if prefix else relative
+        member_meta["archive_name"] = archive_name
+        member_meta["archive_sha256"] = archive.sha256
+        task_payload = _build_task(PurePosixPath(relative).name, blob, pipeline_version, member_meta)
+        tasks.append(task_payload)
+        files.append(_file_summary(task_payload, blob))
+    return tasks, files
+
+
+@app.post("/ingest", response_model=IngestResponse)
+async def ingest_document(
+    file: UploadFile = File(...),
+    pipeline_version: str = Form("v1.0.0"),
+    meta_dict: Dict[str, Any] = Depends(route_metadata),
 ):
     """
     Ingest a document for processing.
@@ -65,73 +249,123 @@ async def ingest_document(
     Args:
         file: Uploaded file
         pipeline_version: Pipeline version identifier
-        metadata: Optional JSON metadata
+        meta_dict: Metadata from the ``metadata`` JSON and routing form fields
     
     Returns:
         IngestResponse with bundle_id
     """
     try:
-        # Generate bundle ID
-        bundle_id = str(uuid.uuid4())
-        
-        # Parse metadata if provided
-        meta_dict = {}
-        if metadata:
-            try:
-                meta_dict = json.loads(metadata)
-            except json.JSONDecodeError:
-                raise HTTPException(status_code=400, detail="Invalid JSON metadata")
-
-        route_fields = {
-            "repo_key": (repo_key or "").strip(),
-            "repo_kind": (repo_kind or "").strip(),
-            "repo_url": (repo_url or "").strip(),
-            "repo_root": (repo_root or "").strip(),
-            "relative_path": (relative_path or "").strip(),
-            "commit_sha": (commit_sha or "").strip(),
-            "branch": (branch or "").strip(),
-            "module_name": (module_name or "").strip(),
-        }
-        route_fields = {k: v for k, v in route_fields.items() if v}
-        if route_fields:
-            # Explicit form fields win over metadata-provided routing keys.
-            meta_dict.update(route_fields)
-        
-        # Read file content
-        content = await file.read()
-        
-        # Create task payload
-        task_payload = {
-            "bundle_id": bundle_id,
-            "filename": file.filename,
-            "content_size": len(content),
-            "pipeline_version": pipeline_version,
-            "metadata": meta_dict
-        }
-        
-        # Compute integrity hash
-        hash_canonical_without_integrity(task_payload)
+        blob = await _store_upload(file)
+        task_payload = _build_task(file.filename or blob.sha256, blob, pipeline_version, meta_dict)
+        _enqueue([task_payload])
+        bundle_id = task_payload["bundle_id"]
         
-        # Store file temporarily (in production, use object storage)
-        temp_dir = Path("/tmp/docling_uploads")
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        file_path = temp_dir / f"{bundle_id}_{file.filename}"
+        return IngestResponse(
+            bundle_id=bundle_id,
+            status="queued",
+            message=f"Document queued for processing with bundle_id: {bundle_id}",
+            content_sha256=blob.sha256,
+            deduplicated=blob.deduplicated,
+        )
         
-        with open(file_path, "wb") as f:
-            f.write(content)
+    except BlobTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
+
+
+@app.post("/ingest/batch", response_model=BatchIngestResponse)
+async def ingest_batch(
+    files: List[UploadFile] = File(...),
+    pipeline_version: str = Form("v1.0.0"),
+    meta_dict: Dict[str, Any] = Depends(route_metadata),
+):
+    """
+    Ingest several documents; all tasks are enqueued in one Redis pipeline.
+    
+    Args:
+        files: Uploaded files
+        pipeline_version: Pipeline version identifier
+        meta_dict: Metadata shared by every file; each file's name becomes
+            its ``relative_path`` (under the form's ``relative_path``, if given)
+    
+    Returns:
+        BatchIngestResponse with one bundle_id per file
+    """
+    try:
+        prefix = meta_dict.get("relative_path")
+        tasks, summaries = [], []
+        for file in files:
+            blob = await _store_upload(file)
+            relative = _member_path(file.filename or "") or blob.sha256
+            file_meta = dict(meta_dict)
+            file_meta["relative_path"] = str(PurePosixPath(prefix) / relative) if prefix else relative
+            task_payload = _build_task(PurePosixPath(relative).name, blob, pipeline_version, file_meta)
+            tasks.append(task_payload)
+            summaries.append(_file_summary(task_payload, blob))
+        _enqueue(tasks)
         
-        # Add file path to payload
-        task_payload["file_path"] = str(file_path)
+        return BatchIngestResponse(
+            bundle_ids=[task["bundle_id"] for task in tasks],
+            status="queued",
+            message=f"{len(tasks)} documents queued for processing",
+            files=summaries,
+        )
         
-        # Enqueue to Redis
-        redis_client.rpush(PARSE_QUEUE, json.dumps(task_payload))
+    except BlobTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
+
+
+@app.post("/ingest/archive", response_model=BatchIngestResponse)
+async def ingest_archive(
+    file: UploadFile = File(...),
+    pipeline_version: str = Form("v1.0.0"),
+    meta_dict: Dict[str, Any] = Depends(route_metadata),
+):
+    """
+    Ingest a tar or zip archive as one task per contained file.
+    
+    The archive is streamed to the blob store, then each member is streamed
+    into its own blob; nothing is extracted in memory. Member paths become
+    ``relative_path`` (under the form's ``relative_path``, if given).
+    
+    Args:
+        file: Uploaded .zip / .tar[.gz|.bz2|.xz] archive
+        pipeline_version: Pipeline version identifier
+        meta_dict: Metadata shared by every member
+    
+    Returns:
+        BatchIngestResponse with one bundle_id per member
+    """
+    filename = file.filename or ""
+    if not _is_archive(filename):
+        raise HTTPException(status_code=400, detail=f"Expected an archive ({', '.join(ARCHIVE_SUFFIXES)})")
+    try:
+        archive = await _store_upload(file)
+        tasks, summaries = await run_in_threadpool(_fan_out_archive, archive, filename, pipeline_version, meta_dict)
+        if not tasks:
+            raise HTTPException(status_code=400, detail="Archive contains no files")
+        _enqueue(tasks)
         
-        return IngestResponse(
-            bundle_id=bundle_id,
+        return BatchIngestResponse(
+            bundle_ids=[task["bundle_id"] for task in tasks],
             status="queued",
-            message=f"Document queued for processing with bundle_id: {bundle_id}"
+            message=f"{len(tasks)} files from {filename} queued for processing",
+            files=summaries,
         )
         
+    except BlobTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise HTTPException(status_code=400, detail=f"Unsupported or corrupt archive: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
 
@@ -4,15 +4,35 @@ from .canonical import (
     jcs_canonical_bytes,
     sha256_hex,
     hash_canonical_without_integrity,
-    append_to_ledger
+    append_to_ledger,
+    read_ledger_head,
+    get_ledger_writer,
+    LedgerWriter,
 )
+from .blob_store import BlobStore, BlobTooLarge, StoredBlob
+from .embedding_cache import EmbeddingCache, embed_with_cache
+from .embedding_sidecar import EmbeddingSidecar, SidecarReader, sidecar_path
 from .normalize import normalize_text, l2_normalize
+from .repo_manifest import RepoManifest, manifest_path
 
 __all__ = [
     'jcs_canonical_bytes',
     'sha256_hex',
     'hash_canonical_without_integrity',
     'append_to_ledger',
+    'read_ledger_head',
+    'get_ledger_writer',
+    'LedgerWriter',
+    'BlobStore',
+    'BlobTooLarge',
+    'StoredBlob',
+    'EmbeddingCache',
+    'embed_with_cache',
+    'EmbeddingSidecar',
+    'SidecarReader',
+    'sidecar_path',
     'normalize_text',
-    'l2_normalize'
+    'l2_normalize',
+    'RepoManifest',
+    'manifest_path'
 ]
@@ -0,0 +1,152 @@
+"""
+Content-addressed local blob store for uploaded files.
+
+Blobs are written incrementally (hashing as the bytes arrive) to a temp
+file and atomically renamed to ``<root>/sha256/<2 hex>/<sha256><suffix>``.
+Identical content uploaded again is deduplicated: the temp file is
+dropped and the existing blob is returned. The file suffix is kept in the
+name because the parsers downstream dispatch on it.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple, Optional, Union
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobTooLarge(ValueError):
+    """A blob exceeded the writer's ``max_bytes`` limit."""
+
+
+class StoredBlob(NamedTuple):
+    """Result of committing a blob."""
+
+    sha256: str
+    size: int
+    path: Path
+    deduplicated: bool
+
+
+def _safe_suffix(suffix: str) -> str:
+    suffix = suffix.lower()
+    if not suffix.startswith('.') or not suffix[1:].replace('.', '').isalnum() or len(suffix) > 16:
+        return ''
+    return suffix
+
+
+class BlobWriter:
+    """
+    Incremental writer for one blob; obtain from :meth:`BlobStore.writer`.
+
+    Call ``write`` with successive chunks, then ``commit``. Used as a
+    context manager, an uncommitted blob is discarded on exit.
+    """
+
+    def __init__(self, store: "BlobStore", suffix: str, max_bytes: Optional[int]):
+        self._store = store
+        self._suffix = _safe_suffix(suffix)
+        self._max_bytes = max_bytes
+        self._hash = hashlib.sha256()
+        self._size = 0
+        fd, tmp_name = tempfile.mkstemp(prefix='.incoming-', dir=store.tmp_dir)
+        self._tmp_path = Path(tmp_name)
+        self._file: Optional[BinaryIO] = os.fdopen(fd, 'wb')
+
+    @property
+    def size(self) -> int:
+        """Bytes written so far."""
+        return self._size
+
+    def write(self, chunk: bytes) -> None:
+        """Append ``chunk`` to the blob and the running hash."""
+        self._size += len(chunk)
+        if self._max_bytes is not None and self._size > self._max_bytes:
+            self.abort()
+            raise BlobTooLarge(f"Blob exceeds {self._max_bytes} bytes")
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> StoredBlob:
+        """
+        Finish the blob and move it to its content address.
+
+        Returns:
+            The stored blob; ``deduplicated`` is True when identical content
+            (with the same suffix) was already present
+        """
+        self._file.flush()
+        if self._store.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+        digest = self._hash.hexdigest()
+        final_path = self._store.path_for(digest, self._suffix)
+        if final_path.exists():
+            self._tmp_path.unlink()
+            return StoredBlob(digest, self._size, final_path, True)
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._tmp_path, final_path)
+        return StoredBlob(digest, self._size, final_path, False)
+
+    def abort(self) -> None:
+        """Discard the partially written blob."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.abort()
+
+
+class BlobStore:
+    """
+    Content-addressed blob store on the local filesystem.
+
+    Args:
+        root: Store directory (created if missing)
+        fsync: fsync each blob before it is renamed into place
+    """
+
+    def __init__(self, root: Union[str, Path], fsync: bool = False):
+        self.root = Path(root)
+        self.fsync = fsync
+        self.tmp_dir = self.root / 'tmp'
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sha256: str, suffix: str = '') -> Path:
+        """Location of the blob with digest ``sha256`` and ``suffix``."""
+        return self.root / 'sha256' / sha256[:2] / f"{sha256}{_safe_suffix(suffix)}"
+
+    def writer(self, suffix: str = '', max_bytes: Optional[int] = None) -> BlobWriter:
+        """
+        Start a new blob.
+
+        Args:
+            suffix: File suffix to keep on the stored blob (e.g. ``.pdf``)
+            max_bytes: Abort with :class:`BlobTooLarge` beyond this size
+        """
+        return BlobWriter(self, suffix, max_bytes)
+
+    def put_stream(
+        self,
+        stream: BinaryIO,
+        suffix: str = '',
+        max_bytes: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> StoredBlob:
+        """Copy a readable binary stream into the store in ``chunk_size`` pieces."""
+        with self.writer(suffix, max_bytes) as blob:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                blob.write(chunk)
+            return blob.commit()
@@ -6,8 +6,15 @@ Implements RFC8785-style JSON canonicalization for deterministic hashing.
 import json
 import hashlib
 import math
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+try:  # POSIX advisory locks; other platforms fall back to in-process locking
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
 
 def _normalize_numbers(value: Any) -> Any:
@@ -79,32 +86,220 @@ def hash_canonical_without_integrity(payload: Dict[str, Any]) -> str:
     return hash_value
 
 
-def append_to_ledger(record: Dict[str, Any], ledger_path: Path) -> None:
+GENESIS_HASH = "0" * 64
+_TAIL_READ_CHUNK = 64 * 1024
+
+
+def read_ledger_head(ledger_path: Path, chunk_size: int = _TAIL_READ_CHUNK) -> Tuple[str, int]:
+    """
+    Recover the chain head by seeking backwards to the last ledger line.
+
+    Only the tail of the file is read, so recovery cost does not depend on
+    the length of the ledger.
+
+    Args:
+        ledger_path: Path to the ledger file (JSONL format)
+        chunk_size: Bytes read per backward step
+
+    Returns:
+        Tuple of (last integrity_hash, ledger size in bytes)
+    """
+    try:
+        f = open(ledger_path, 'rb')
+    except FileNotFoundError:
+        return GENESIS_HASH, 0
+
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size
+        tail = b''
+        line = b''
+        while pos > 0:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            stripped = tail.rstrip()
+            newline = stripped.rfind(b'\n')
+            if newline != -1:
+                line = stripped[newline + 1:]
+                break
+            line = stripped
+
+    if not line.strip():
+        return GENESIS_HASH, size
+    last_record = json.loads(line.decode('utf-8'))
+    return last_record.get('integrity_hash', GENESIS_HASH), size
+
+
+class LedgerWriter:
+    """
+    Hash-chained JSONL ledger writer with an in-memory chain head.
+
+    The head (last integrity_hash and file offset) is recovered once with a
+    backward seek and then kept in memory, so appends are O(1) in ledger
+    length. Each batch is written under an exclusive file lock; if another
+    process appended since our last write the head is re-read from the tail
+    before chaining. ``append_many`` group-commits a batch with a single
+    write and at most one fsync.
+
+    Args:
+        ledger_path: Path to the ledger file (JSONL format)
+        fsync: fsync the ledger after every committed batch
+    """
+
+    def __init__(self, ledger_path: Union[str, Path], fsync: bool = True):
+        self.ledger_path = Path(ledger_path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        self._head_hash = GENESIS_HASH
+        self._offset = -1
+
+    @property
+    def head_hash(self) -> str:
+        """Integrity hash of the last record known to this writer."""
+        with self._lock:
+            if self._offset < 0:
+                self._head_hash, self._offset = read_ledger_head(self.ledger_path)
+            return self._head_hash
+
+    def append(self, record: Dict[str, Any]) -> str:
+        """
+        Append a single record to the ledger.
+
+        Args:
+            record: Record to append (``prev_ledger_hash`` and
+                ``integrity_hash`` are injected in-place)
+
+        Returns:
+            The record's integrity hash
+        """
+        return self.append_many([record])[-1]
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Group-commit a batch of records: one lock, one write, one fsync.
+
+        Args:
+            records: Records to append in order (modified in-place)
+
+        Returns:
+            Integrity hashes of the appended records, in order
+        """
+        records = list(records)
+        if not records:
+            return []
+
+        with self._lock:
+            f = self._open()
+            self._acquire_file_lock(f)
+            try:
+                size = os.fstat(f.fileno()).st_size
+                if size != self._offset:
+                    # First use, or another writer appended since our last batch
+                    self._head_hash, _ = read_ledger_head(self.ledger_path)
+
+                prev_hash = self._head_hash
+                hashes = []
+                lines = []
+                for record in records:
+                    record['prev_ledger_hash'] = prev_hash
+                    prev_hash = hash_canonical_without_integrity(record)
+                    hashes.append(prev_hash)
+                    lines.append(json.dumps(record, ensure_ascii=False))
+
+                data = ('\n'.join(lines) + '\n').encode('utf-8')
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+                self._head_hash = prev_hash
+                self._offset = size + len(data)
+                return hashes
+            finally:
+                self._release_file_lock(f)
+
+    def close(self) -> None:
+        """Close the underlying file handle."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._offset = -1
+
+    def __enter__(self) -> "LedgerWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _open(self):
+        if self._file is not None:
+            try:
+                current = os.stat(self.ledger_path)
+                opened = os.fstat(self._file.fileno())
+                if (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino):
+                    return self._file
+            except FileNotFoundError:
+                pass
+            # Ledger was rotated or removed underneath us
+            self._file.close()
+            self._file = None
+            self._offset = -1
+
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.ledger_path, 'ab')
+        return self._file
+
+    @staticmethod
+    def _acquire_file_lock(f) -> None:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    @staticmethod
+    def _release_file_lock(f) -> None:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+_ledger_writers: Dict[Path, LedgerWriter] = {}
+_ledger_writers_lock = threading.Lock()
+
+
+def get_ledger_writer(ledger_path: Union[str, Path], fsync: bool = False) -> LedgerWriter:
+    """
+    Return the process-wide writer for a ledger path, creating it on first use.
+
+    Args:
+        ledger_path: Path to the ledger file (JSONL format)
+        fsync: fsync setting used when the writer is first created
+
+    Returns:
+        Shared LedgerWriter for the resolved path
+    """
+    key = Path(ledger_path).resolve()
+    with _ledger_writers_lock:
+        writer = _ledger_writers.get(key)
+        if writer is None:
+            writer = LedgerWriter(key, fsync=fsync)
+            _ledger_writers[key] = writer
+        return writer
+
+
+def append_to_ledger(record: Dict[str, Any], ledger_path: Union[str, Path]) -> str:
     """
     Append a record to the ledger with hash chaining.
-    
+
+    Uses the shared LedgerWriter for ``ledger_path``, so the previous hash
+    comes from the in-memory chain head instead of re-reading the file.
+
     Args:
         record: Record to append
         ledger_path: Path to the ledger file (JSONL format)
+
+    Returns:
+        The record's integrity hash
     """
-    # Ensure ledger directory exists
-    ledger_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Read last hash if ledger exists
-    prev_hash = "0" * 64  # Genesis hash
-    if ledger_path.exists():
-        with open(ledger_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            if lines:
-                last_record = json.loads(lines[-1])
-                prev_hash = last_record.get('integrity_hash', prev_hash)
-    
-    # Add previous hash to record
-    record['prev_ledger_hash'] = prev_hash
-    
-    # Compute integrity hash
-    hash_canonical_without_integrity(record)
-    
-    # Append to ledger
-    with open(ledger_path, 'a', encoding='utf-8') as f:
-        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return get_ledger_writer(ledger_path).append(record)
@@ -0,0 +1,275 @@
+"""
+Persistent embedding cache keyed by model and chunk content.
+
+Vectors are stored as raw float32 in an append-only blob file; a SQLite
+index maps each key to its offset and dimension and tracks last use for
+LRU eviction. When the live vectors exceed ``max_bytes`` the least recently
+used entries are dropped and the survivors are compacted into a new blob
+generation, so the files on disk stay bounded.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+_FLOAT_BYTES = 4
+_SQLITE_MAX_VARS = 500
+
+Vector = List[float]
+
+
+def text_hash(text: str) -> str:
+    """
+    Hash chunk text for cache lookups.
+
+    Chunk text is already normalized by the docling worker; only line
+    endings and surrounding whitespace are folded here so the same content
+    hashes alike however it was submitted.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Hex SHA-256 of the folded text
+    """
+    folded = text.replace('\r\n', '\n').replace('\r', '\n').strip()
+    return hashlib.sha256(folded.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed float32 embedding store for one embedder.
+
+    Keys are ``sha256(embedder_model_id, weights_hash, text_hash)``, so a
+    model or weights change never serves stale vectors. Safe for concurrent
+    use by threads and by several worker processes sharing ``root``: blob
+    appends and compaction happen inside SQLite write transactions.
+
+    Args:
+        root: Directory holding ``index.sqlite3`` and ``vectors-<gen>.f32``
+        embedder_model_id: Model identifier recorded in the ledger
+        weights_hash: Hash of the model weights recorded in the ledger
+        max_bytes: Upper bound on live vector bytes before eviction
+        low_watermark: Fraction of ``max_bytes`` kept after an eviction pass
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        embedder_model_id: str,
+        weights_hash: str,
+        max_bytes: int = 4 * 1024 ** 3,
+        low_watermark: float = 0.8,
+    ):
+        self.root = Path(root)
+        self.embedder_model_id = embedder_model_id
+        self.weights_hash = weights_hash
+        self.max_bytes = max_bytes
+        self.low_watermark = low_watermark
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "compactions": 0}
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.root / "index.sqlite3", timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL,
+                dim INTEGER NOT NULL,
+                last_used INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', '0');
+            """
+        )
+
+    def key(self, text: str) -> str:
+        """Cache key for ``text`` under this cache's model and weights."""
+        material = f"{self.embedder_model_id}\0{self.weights_hash}\0{text_hash(text)}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Vector]]:
+        """
+        Look up vectors for ``keys``.
+
+        Args:
+            keys: Cache keys from :meth:`key`
+
+        Returns:
+            Vectors in ``keys`` order, None for misses
+        """
+        found: Dict[str, Tuple[int, int]] = {}
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                generation = self._generation()
+                unique = list(dict.fromkeys(keys))
+                for i in range(0, len(unique), _SQLITE_MAX_VARS):
+                    part = unique[i:i + _SQLITE_MAX_VARS]
+                    rows = self._db.execute(
+                        f"SELECT key, offset, dim FROM entries WHERE key IN ({','.join('?' * len(part))})", part
+                    )
+                    found.update((key, (offset, dim)) for key, offset, dim in rows)
+                vectors = self._read_vectors(generation, found)
+                if vectors:
+                    now = time.time_ns()
+                    self._db.executemany(
+                        "UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in vectors]
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+            results = [vectors.get(key) for key in keys]
+            hits = sum(1 for v in results if v is not None)
+            self._stats["hits"] += hits
+            self._stats["misses"] += len(results) - hits
+        return results
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """
+        Store vectors (as float32) and evict if the cache is over budget.
+
+        Args:
+            keys: Cache keys from :meth:`key`
+            vectors: Vectors in ``keys`` order
+        """
+        if not keys:
+            return
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                path = self._blob_path(self._generation())
+                rows = []
+                with open(path, 'ab') as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    for key, vector in zip(keys, vectors):
+                        data = array('f', vector).tobytes()
+                        f.write(data)
+                        rows.append((key, offset, len(vector), time.time_ns()))
+                        offset += len(data)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO entries (key, offset, dim, last_used) VALUES (?, ?, ?, ?)", rows
+                )
+                live_bytes = self._db.execute("SELECT COALESCE(SUM(dim), 0) FROM entries").fetchone()[0] * _FLOAT_BYTES
+                replaced = self._evict(live_bytes) if live_bytes > self.max_bytes else None
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._stats["stored"] += len(rows)
+            if replaced is not None:
+                # Readers that resolved the old generation before the commit see a miss, not bad data.
+                replaced.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Process-local counters plus entry count and live bytes on disk."""
+        with self._lock:
+            entries, dims = self._db.execute("SELECT COUNT(*), COALESCE(SUM(dim), 0) FROM entries").fetchone()
+            return {**self._stats, "entries": entries, "live_bytes": dims * _FLOAT_BYTES}
+
+    def close(self) -> None:
+        """Close the SQLite index."""
+        with self._lock:
+            self._db.close()
+
+    def _generation(self) -> int:
+        return int(self._db.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0])
+
+    def _blob_path(self, generation: int) -> Path:
+        return self.root / f"vectors-{generation}.f32"
+
+    def _read_vectors(self, generation: int, found: Dict[str, Tuple[int, int]]) -> Dict[str, Vector]:
+        if not found:
+            return {}
+        try:
+            f = open(self._blob_path(generation), 'rb')
+        except FileNotFoundError:
+            return {}
+        vectors = {}
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            for key, (offset, dim) in sorted(found.items(), key=lambda item: item[1][0]):
+                length = dim * _FLOAT_BYTES
+                if offset + length > size:
+                    continue  # torn write from a crashed process; treat as a miss
+                f.seek(offset)
+                vectors[key] = array('f', f.read(length)).tolist()
+        return vectors
+
+    def _evict(self, live_bytes: int) -> Path:
+        """
+        Drop LRU entries down to the low watermark and compact the survivors
+        into the next blob generation. Runs inside a write transaction;
+        returns the superseded blob for the caller to remove after commit.
+        """
+        target = int(self.max_bytes * self.low_watermark)
+        victims = []
+        for key, dim in self._db.execute("SELECT key, dim FROM entries ORDER BY last_used ASC"):
+            if live_bytes <= target:
+                break
+            victims.append((key,))
+            live_bytes -= dim * _FLOAT_BYTES
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._stats["evicted"] += len(victims)
+
+        generation = self._generation()
+        old_path, new_path = self._blob_path(generation), self._blob_path(generation + 1)
+        moved = []
+        with open(old_path, 'rb') as src, open(new_path, 'wb') as dst:
+            for key, offset, dim in self._db.execute("SELECT key, offset, dim FROM entries ORDER BY offset"):
+                src.seek(offset)
+                moved.append((dst.tell(), key))
+                dst.write(src.read(dim * _FLOAT_BYTES))
+        self._db.executemany("UPDATE entries SET offset = ? WHERE key = ?", moved)
+        self._db.execute("UPDATE meta SET value = ? WHERE name = 'generation'", (str(generation + 1),))
+        self._stats["compactions"] += 1
+        return old_path
+
+
+def embed_with_cache(
+    cache: Optional[EmbeddingCache],
+    texts: Sequence[str],
+    encode: Callable[[List[str]], List[Vector]],
+) -> Tuple[List[Vector], List[bool]]:
+    """
+    Embed ``texts``, sending only cache misses to ``encode``.
+
+    Duplicate texts within a batch are encoded once. New vectors are
+    written back to the cache.
+
+    Args:
+        cache: Cache to consult, or None to encode everything
+        texts: Chunk texts in batch order
+        encode: Batch encoder returning one vector per input text
+
+    Returns:
+        Tuple of (vectors in ``texts`` order, per-text cache hit flags)
+    """
+    if cache is None:
+        return encode(list(texts)), [False] * len(texts)
+
+    keys = [cache.key(text) for text in texts]
+    vectors = cache.get_many(keys)
+    hits = [vector is not None for vector in vectors]
+
+    pending: Dict[str, int] = {}
+    for i, (key, vector) in enumerate(zip(keys, vectors)):
+        if vector is None and key not in pending:
+            pending[key] = i
+    if pending:
+        fresh = encode([texts[i] for i in pending.values()])
+        by_key = dict(zip(pending, fresh))
+        cache.put_many(list(by_key), list(by_key.values()))
+        vectors = [vector if vector is not None else by_key[key] for key, vector in zip(keys, vectors)]
+    return vectors, hits
@@ -0,0 +1,183 @@
+"""
+Binary sidecar storage for ledger embeddings.
+
+Ledger records reference their vector instead of inlining it as JSON:
+
+    "embedding_ref": {"file": "ledger.f32", "dtype": "float32",
+                      "offset": <byte offset>, "dim": 768, "sha256": <hex>}
+
+The sidecar is an append-only file of little-endian float32 (or float16)
+rows. ``sha256`` is taken over those canonical bytes and is part of the
+record, so the ledger's hash chain covers the vector. Readers map the
+sidecar with ``numpy.memmap`` and get zero-copy views.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:  # POSIX advisory locks; other platforms fall back to in-process locking
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+SIDECAR_DTYPES = {
+    "float32": (np.dtype("<f4"), "f32"),
+    "float16": (np.dtype("<f2"), "f16"),
+}
+
+
+def sidecar_path(ledger_path: Union[str, Path], dtype: str = "float32") -> Path:
+    """Sidecar file that sits next to ``ledger_path`` for ``dtype``."""
+    ledger_path = Path(ledger_path)
+    return ledger_path.with_name(f"{ledger_path.stem}.{SIDECAR_DTYPES[dtype][1]}")
+
+
+def canonical_embedding_bytes(vector: Sequence[float], dtype: str = "float32") -> bytes:
+    """Little-endian bytes of ``vector`` in ``dtype``: what the sidecar stores and ``sha256`` covers."""
+    return np.asarray(vector, dtype=SIDECAR_DTYPES[dtype][0]).tobytes()
+
+
+class EmbeddingSidecar:
+    """
+    Append-only writer for a vector sidecar.
+
+    Each ``append`` is one write under an exclusive file lock, so several
+    processes can share a sidecar; offsets come from the file size under
+    the lock. Append (and fsync) vectors before the ledger records that
+    reference them, so a record never points past the end of the file.
+
+    Args:
+        path: Sidecar file (see :func:`sidecar_path`)
+        dtype: ``float32`` or ``float16``
+        fsync: fsync after every append
+    """
+
+    def __init__(self, path: Union[str, Path], dtype: str = "float32", fsync: bool = True):
+        if dtype not in SIDECAR_DTYPES:
+            raise ValueError(f"Unsupported sidecar dtype: {dtype}")
+        self.path = Path(path)
+        self.dtype = dtype
+        self.fsync = fsync
+        self._np_dtype = SIDECAR_DTYPES[dtype][0]
+        self._lock = threading.Lock()
+        self._file = None
+
+    def append(self, vectors: Sequence[Sequence[float]]) -> List[Dict[str, Any]]:
+        """
+        Append vectors and return their ledger references.
+
+        Args:
+            vectors: Equal-length vectors, in record order
+
+        Returns:
+            One ``embedding_ref`` dict per vector
+        """
+        rows = np.asarray(vectors, dtype=self._np_dtype)
+        if rows.size == 0:
+            return []
+        rows = np.ascontiguousarray(rows.reshape(len(rows), -1))
+        row_bytes = rows.shape[1] * rows.itemsize
+
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'ab')
+            f = self._file
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                offset = os.fstat(f.fileno()).st_size
+                f.write(rows.tobytes())
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        return [
+            {
+                "file": self.path.name,
+                "dtype": self.dtype,
+                "offset": offset + i * row_bytes,
+                "dim": rows.shape[1],
+                "sha256": hashlib.sha256(row.data).hexdigest(),
+            }
+            for i, row in enumerate(rows)
+        ]
+
+    def close(self) -> None:
+        """Close the underlying file handle."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "EmbeddingSidecar":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class SidecarReader:
+    """
+    Resolve ledger records to vectors through ``numpy.memmap``.
+
+    Sidecar files are looked up next to the ledger and mapped read-only on
+    first use; a mapping is refreshed when a record points past its end
+    (the sidecar grew). Records in the legacy format with an inline
+    ``embedding`` list are converted (copied) instead.
+
+    Args:
+        ledger_path: Ledger whose records will be resolved
+    """
+
+    def __init__(self, ledger_path: Union[str, Path]):
+        self.root = Path(ledger_path).parent
+        self._maps: Dict[str, np.memmap] = {}
+
+    def vector(self, record: Dict[str, Any]) -> np.ndarray:
+        """
+        Vector for a ledger record.
+
+        Returns:
+            A read-only view into the sidecar for ``embedding_ref`` records
+        """
+        ref = record.get("embedding_ref")
+        if ref is None:
+            return np.asarray(record["embedding"], dtype=np.float32)
+        np_dtype = SIDECAR_DTYPES[ref["dtype"]][0]
+        start = ref["offset"] // np_dtype.itemsize
+        stop = start + ref["dim"]
+        mapped = self._map(ref["file"], np_dtype, stop)
+        return mapped[start:stop]
+
+    def verify(self, record: Dict[str, Any]) -> bool:
+        """Whether the sidecar bytes still match the record's ``sha256``."""
+        ref = record.get("embedding_ref")
+        if ref is None:
+            return True
+        try:
+            view = self.vector(record)
+        except (FileNotFoundError, IndexError, ValueError):
+            return False
+        return hashlib.sha256(memoryview(view)).hexdigest() == ref["sha256"]
+
+    def close(self) -> None:
+        """Drop all mappings."""
+        self._maps.clear()
+
+    def _map(self, name: str, np_dtype: np.dtype, min_items: int) -> np.memmap:
+        mapped: Optional[np.memmap] = self._maps.get(name)
+        if mapped is None or mapped.dtype != np_dtype or len(mapped) < min_items:
+            mapped = np.memmap(self.root / name, dtype=np_dtype, mode='r')
+            self._maps[name] = mapped
+        if len(mapped) < min_items:
+            raise IndexError(f"{name} is shorter than the referenced vector")
+        return mapped
@@ -0,0 +1,82 @@
+"""
+Per-repository ingestion manifests.
+
+A manifest records what the index holds for one repository: the commit it
+was last brought up to and, for each ingested ``relative_path``, the git
+blob SHA that was indexed and the chunk ids produced from it. Incremental
+re-ingestion diffs a new commit against ``commit_sha`` and uses the
+manifest to find the vectors that became stale.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+MANIFEST_VERSION = "repo.manifest.v1"
+
+
+def manifest_path(root: Union[str, Path], repo_key: str) -> Path:
+    """Manifest file for ``repo_key`` under ``root``."""
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '__', repo_key).strip('_') or 'repo'
+    return Path(root) / f"{slug}.json"
+
+
+class RepoManifest:
+    """
+    Indexed state of one repository.
+
+    Args:
+        repo_key: Repository routing key (e.g. ``org/repo``)
+        commit_sha: Commit the index reflects (None before the first run)
+        files: ``relative_path -> {"blob_sha": ..., "chunk_ids": [...]}``
+    """
+
+    def __init__(self, repo_key: str, commit_sha: Optional[str] = None, files: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.repo_key = repo_key
+        self.commit_sha = commit_sha
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+
+    @classmethod
+    def load(cls, root: Union[str, Path], repo_key: str) -> "RepoManifest":
+        """Load the manifest for ``repo_key``, or an empty one if none exists."""
+        path = manifest_path(root, repo_key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(repo_key)
+        if data.get('manifest_version') != MANIFEST_VERSION or data.get('repo_key') != repo_key:
+            raise ValueError(f"{path} is not a {MANIFEST_VERSION} manifest for {repo_key}")
+        return cls(repo_key, data.get('commit_sha'), data.get('files', {}))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "manifest_version": MANIFEST_VERSION,
+            "repo_key": self.repo_key,
+            "commit_sha": self.commit_sha,
+            "files": {path: self.files[path] for path in sorted(self.files)},
+        }
+
+    def digest(self) -> str:
+        """SHA-256 of the manifest's canonical JSON; ledger checkpoints record it."""
+        data = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def chunk_ids(self, relative_path: str) -> List[str]:
+        """Chunk ids currently indexed for ``relative_path``."""
+        return list(self.files.get(relative_path, {}).get('chunk_ids', []))
+
+    def save(self, root: Union[str, Path]) -> Path:
+        """Atomically write the manifest (temp file, fsync, rename)."""
+        path = manifest_path(root, self.repo_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Migrate a JSON-embedding ledger to the binary sidecar format.
+
+Streams an existing ``ledger.jsonl`` whose records inline ``embedding`` as
+JSON floats, moves each vector into a sidecar file and replaces it with an
+``embedding_ref`` (see ``lib/embedding_sidecar.py``). Records change, so the
+output is re-chained from genesis; each migrated record keeps its original
+hash as ``legacy_integrity_hash``. The input chain is verified while reading.
+
+Usage:
+    python migrate_ledger_sidecar.py ledger/ledger.jsonl
+    python migrate_ledger_sidecar.py ledger/ledger.jsonl --in-place --dtype float16
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.canonical import GENESIS_HASH, LedgerWriter, hash_canonical_without_integrity
+from lib.embedding_sidecar import SIDECAR_DTYPES, EmbeddingSidecar, sidecar_path
+
+
+class LedgerChainError(ValueError):
+    """The input ledger's hash chain does not verify."""
+
+
+def _read_ledger(ledger_path: Path, verify: bool) -> Iterator[Dict[str, Any]]:
+    prev_hash = GENESIS_HASH
+    with open(ledger_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if verify:
+                stored = record.get('integrity_hash')
+                if record.get('prev_ledger_hash') != prev_hash:
+                    raise LedgerChainError(f"line {line_no}: prev_ledger_hash does not match the previous record")
+                if hash_canonical_without_integrity(dict(record)) != stored:
+                    raise LedgerChainError(f"line {line_no}: integrity_hash does not match the record")
+                prev_hash = stored
+            yield record
+
+
+def _flush(writer: LedgerWriter, sidecar: EmbeddingSidecar, pending: List[Dict[str, Any]]) -> None:
+    with_vectors = [record for record in pending if 'embedding' in record]
+    refs = sidecar.append([record['embedding'] for record in with_vectors])
+    for record, ref in zip(with_vectors, refs):
+        del record['embedding']
+        record['embedding_ref'] = ref
+    writer.append_many(pending)
+    pending.clear()
+
+
+def migrate_ledger(
+    ledger_path: Path,
+    output_path: Path,
+    dtype: str = "float32",
+    batch_size: int = 1024,
+    verify: bool = True,
+) -> Tuple[int, int]:
+    """
+    Write a sidecar-format copy of ``ledger_path`` to ``output_path``.
+
+    Args:
+        ledger_path: Existing JSONL ledger
+        output_path: New ledger; its sidecar is written next to it
+        dtype: Sidecar dtype (``float32`` or ``float16``)
+        batch_size: Records per group commit
+        verify: Check the input hash chain while migrating
+
+    Returns:
+        Tuple of (records written, vectors moved to the sidecar)
+    """
+    output_path = Path(output_path)
+    vectors_path = sidecar_path(output_path, dtype)
+    for path in (output_path, vectors_path):
+        if path.exists():
+            raise FileExistsError(f"Refusing to overwrite {path}")
+
+    records = vectors = 0
+    pending: List[Dict[str, Any]] = []
+    with LedgerWriter(output_path, fsync=False) as writer, EmbeddingSidecar(vectors_path, dtype, fsync=False) as sidecar:
+        for record in _read_ledger(Path(ledger_path), verify):
+            record['legacy_integrity_hash'] = record.pop('integrity_hash', None)
+            record.pop('prev_ledger_hash', None)
+            vectors += 'embedding' in record
+            pending.append(record)
+            if len(pending) >= batch_size:
+                records += len(pending)
+                _flush(writer, sidecar, pending)
+        records += len(pending)
+        _flush(writer, sidecar, pending)
+
+    for path in (vectors_path, output_path):
+        if path.exists():
+            with open(path, 'rb') as f:
+                os.fsync(f.fileno())
+    return records, vectors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Move inline ledger embeddings into a binary sidecar.")
+    parser.add_argument("ledger", type=Path, help="existing ledger.jsonl")
+    parser.add_argument("--output", type=Path, help="migrated ledger (default: <ledger>.sidecar.jsonl)")
+    parser.add_argument("--in-place", action="store_true", help="replace the ledger, keeping <ledger>.bak")
+    parser.add_argument("--dtype", choices=sorted(SIDECAR_DTYPES), default="float32")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--no-verify", action="store_true", help="skip input chain verification")
+    args = parser.parse_args()
+
+    ledger = args.ledger
+    if args.in_place:
+        if sidecar_path(ledger, args.dtype).exists():
+            parser.error(f"{sidecar_path(ledger, args.dtype)} already exists; migrate with --output instead")
+        # Stage under the final names: records reference their sidecar by file name.
+        staging = ledger.parent / f".{ledger.name}.migrating"
+        staging.mkdir()
+        output = staging / ledger.name
+    else:
+        output = args.output or ledger.with_name(f"{ledger.stem}.sidecar{ledger.suffix}")
+
+    before = ledger.stat().st_size
+    records, vectors = migrate_ledger(ledger, output, args.dtype, args.batch_size, verify=not args.no_verify)
+    vectors_path = sidecar_path(output, args.dtype)
+
+    if args.in_place:
+        backup = ledger.with_name(ledger.name + ".bak")
+        os.replace(ledger, backup)
+        os.replace(output, ledger)
+        if vectors_path.exists():
+            os.replace(vectors_path, sidecar_path(ledger, args.dtype))
+        staging.rmdir()
+        print(f"Original ledger kept at {backup}")
+        output, vectors_path = ledger, sidecar_path(ledger, args.dtype)
+
+    sidecar_bytes = vectors_path.stat().st_size if vectors_path.exists() else 0
+    print(f"Migrated {records} records ({vectors} embeddings) to {output}")
+    print(f"Ledger: {before} -> {output.stat().st_size} bytes; sidecar {vectors_path.name}: {sidecar_bytes} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
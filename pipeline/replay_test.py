@@ -5,11 +5,16 @@ Verifies deterministic processing by comparing hashes across multiple runs.
 """
 
 import json
+import sys
 import time
+import numpy as np
 import requests
 from pathlib import Path
 from qdrant_client import QdrantClient
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.embedding_sidecar import SidecarReader
+
 API_URL = "http://localhost:8000"
 QDRANT_URL = "http://localhost:6333"
 LEDGER_PATH = Path("./ledger/ledger.jsonl")
@@ -78,6 +83,13 @@ def get_bundle_hashes(bundle_id: str):
     return hashes
 
 
+def get_bundle_vectors(bundle_id: str, reader: SidecarReader):
+    """Embedding vectors for a bundle, as zero-copy views into the ledger sidecar."""
+    records = [r for r in read_ledger() if r.get('doc_id') == bundle_id and 'chunk_id' in r]
+    corrupt = [r['chunk_id'] for r in records if not reader.verify(r)]
+    return [reader.vector(r) for r in records], corrupt
+
+
 def purge_data(bundle_id: str):
     """Purge data for a bundle (for testing purposes)."""
     # In production, implement proper cleanup
@@ -152,10 +164,24 @@ def run_replay_test(test_file: str):
         print(f"\n❌ FAIL: {mismatches} hash mismatches detected")
         return False
     
+    # Compare embeddings straight from the sidecar (numpy.memmap, no JSON float parsing)
+    reader = SidecarReader(LEDGER_PATH)
+    vectors_1, corrupt_1 = get_bundle_vectors(bundle_id_1, reader)
+    vectors_2, corrupt_2 = get_bundle_vectors(bundle_id_2, reader)
+    if corrupt_1 or corrupt_2:
+        print(f"❌ FAIL: sidecar bytes do not match ledger hashes for {corrupt_1 + corrupt_2}")
+        return False
+    
+    vector_mismatches = sum(1 for v1, v2 in zip(vectors_1, vectors_2) if not np.array_equal(v1, v2))
+    if vector_mismatches > 0:
+        print(f"\n❌ FAIL: {vector_mismatches} embedding mismatches detected")
+        return False
+    
     print(f"\n✅ SUCCESS: All {len(hashes_1['chunk_hashes'])} chunk hashes match!")
     print("\nDeterminism verified:")
     print(f"  - Identical chunk counts")
     print(f"  - Identical chunk integrity hashes")
+    print(f"  - Identical embeddings ({len(vectors_1)} vectors)")
     print(f"  - Pipeline is deterministic")
     
     return True
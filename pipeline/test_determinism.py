@@ -6,11 +6,15 @@ Verifies hash-anchored, deterministic processing.
 
 import json
 import time
+import numpy as np
 import requests
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.embedding_sidecar import SidecarReader
+
 # Configuration
 API_URL = "http://localhost:8000"
 LEDGER_PATH = Path("./ledger/ledger.jsonl")
@@ -92,6 +96,21 @@ class DeterminismTest:
         
         return hashes
     
+    def get_bundle_vectors(self, bundle_id: str, reader: SidecarReader) -> List[np.ndarray]:
+        """Embeddings for a bundle, read zero-copy from the ledger sidecar."""
+        vectors = []
+        
+        if not LEDGER_PATH.exists():
+            return vectors
+        
+        with open(LEDGER_PATH, 'r') as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get('doc_id') == bundle_id:
+                    vectors.append(reader.vector(record))
+        
+        return vectors
+    
     def test_replay_determinism(self, test_file: Path) -> bool:
         """
         Test determinism by processing the same file twice.
@@ -135,7 +154,15 @@ class DeterminismTest:
             self.log(f"✗ FAIL: {mismatches} hash mismatches", "ERROR")
             return False
         
-        self.log(f"✓ PASS: All {len(hashes_1)} chunk hashes match!")
+        reader = SidecarReader(LEDGER_PATH)
+        vectors_1 = self.get_bundle_vectors(bundle_id_1, reader)
+        vectors_2 = self.get_bundle_vectors(bundle_id_2, reader)
+        vector_mismatches = sum(1 for v1, v2 in zip(vectors_1, vectors_2) if not np.array_equal(v1, v2))
+        if vector_mismatches > 0:
+            self.log(f"✗ FAIL: {vector_mismatches} embedding mismatches", "ERROR")
+            return False
+        
+        self.log(f"✓ PASS: All {len(hashes_1)} chunk hashes and embeddings match!")
         return True
     
     def test_hash_chain_integrity(self) -> bool:
@@ -156,6 +183,7 @@ class DeterminismTest:
                 records.append(json.loads(line))
         
         self.log(f"Verifying {len(records)} ledger entries...")
+        reader = SidecarReader(LEDGER_PATH)
         
         for i, record in enumerate(records):
             # Check integrity hash exists
@@ -171,6 +199,11 @@ class DeterminismTest:
                 if expected_prev != actual_prev:
                     self.log(f"✗ Entry {i}: Chain broken", "ERROR")
                     return False
+            
+            # Sidecar bytes must match the hash committed in the record
+            if not reader.verify(record):
+                self.log(f"✗ Entry {i}: Embedding sidecar bytes do not match embedding_ref", "ERROR")
+                return False
         
         self.log(f"✓ PASS: Hash chain intact for {len(records)} entries")
         return True
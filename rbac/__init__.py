@@ -1,6 +1,6 @@
 """RBAC package — Agent onboarding and permission enforcement."""
 
 from rbac.models import AgentRole, AgentRegistration, PermissionCheckRequest
-from rbac.client import RBACClient
+from rbac.client import AsyncRBACClient, RBACClient
 
-__all__ = ["AgentRole", "AgentRegistration", "PermissionCheckRequest", "RBACClient"]
+__all__ = ["AgentRole", "AgentRegistration", "PermissionCheckRequest", "RBACClient", "AsyncRBACClient"]
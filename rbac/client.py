@@ -1,17 +1,103 @@
 """
-RBAC Client — Lightweight HTTP client for the orchestrator to call the RBAC gateway.
+RBAC Client — Lightweight HTTP clients for the orchestrator to call the RBAC gateway.
+
+Both clients keep pooled keep-alive connections and a TTL-bounded cache of
+permission decisions keyed on (agent_id, action, transition).
 """
 
 from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
-import requests
+import httpx
 
 logger = logging.getLogger(__name__)
 
+DecisionKey = Tuple[str, Optional[str], Optional[str]]
+
+
+class DecisionCache:
+    """
+    TTL-bounded LRU of permission decisions.
+
+    Entries expire after ``ttl_seconds`` so permission changes made by other
+    gateway clients are picked up; local changes invalidate immediately.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[DecisionKey, Tuple[bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: DecisionKey) -> Optional[bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            allowed, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return allowed
+
+    def put(self, key: DecisionKey, allowed: bool) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (allowed, self.clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, agent_id: Optional[str] = None) -> None:
+        """Drop cached decisions for one agent, or all of them."""
+        with self._lock:
+            if agent_id is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == agent_id]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _decision_key(agent_id: str, action: Optional[str], transition: Optional[str]) -> DecisionKey:
+    return (agent_id, action or None, transition or None)
+
+
+def _check_payload(agent_id: str, action: Optional[str], transition: Optional[str]) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"agent_id": agent_id}
+    if action:
+        payload["action"] = action
+    if transition:
+        payload["transition"] = transition
+    return payload
+
+
+def _decide_from_scope(scope: Dict[str, Any], action: Optional[str], transition: Optional[str]) -> bool:
+    """Apply the gateway's verify rules to a fetched permission scope."""
+    if not scope.get("active", False):
+        return False
+    if action:
+        return action in scope.get("actions", [])
+    if transition:
+        return transition in scope.get("transitions", [])
+    return False
+
 
 class RBACClient:
     """
@@ -22,6 +108,9 @@ class RBACClient:
         result = client.onboard_agent("agent-1", "ManagingAgent", "pipeline_operator")
         allowed = client.verify_permission("agent-1", action="run_pipeline")
         # Optionally provide explicit token; otherwise RBAC_SECRET env var is used.
+
+    Requests share a pooled keep-alive httpx client. Allowed/denied decisions are
+    cached for ``decision_ttl`` seconds (0 disables caching).
     """
 
     def __init__(
@@ -29,24 +118,42 @@ class RBACClient:
         base_url: str = "http://localhost:8001",
         timeout: int = 5,
         token: str | None = None,
+        decision_ttl: float = 30.0,
+        pool_maxsize: int = 10,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.token = (token if token is not None else os.getenv("RBAC_SECRET", "")).strip()
+        self.decisions = DecisionCache(ttl_seconds=decision_ttl)
+        self.http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_maxsize,
+            ),
+        )
 
     def _auth_headers(self) -> Dict[str, str]:
         if not self.token:
             return {}
         return {"Authorization": f"Bearer {self.token}"}
 
+    def close(self) -> None:
+        self.http.close()
+
+    def __enter__(self) -> "RBACClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     # ── Health ───────────────────────────────────────────────────────
 
     def is_healthy(self) -> bool:
         """Check if the RBAC gateway is reachable."""
         try:
-            r = requests.get(f"{self.base_url}/health", timeout=self.timeout)
+            r = self.http.get(f"{self.base_url}/health", timeout=self.timeout)
             return r.status_code == 200
-        except requests.RequestException:
+        except httpx.HTTPError:
             return False
 
     # ── Onboarding ───────────────────────────────────────────────────
@@ -74,20 +181,21 @@ class RBACClient:
         }
 
         try:
-            r = requests.post(
+            r = self.http.post(
                 f"{self.base_url}/agents/onboard",
                 json=payload,
                 headers=self._auth_headers(),
                 timeout=self.timeout,
             )
             if r.status_code == 201:
+                self.decisions.invalidate(agent_id)
                 return r.json()
             elif r.status_code == 409:
                 logger.info("Agent '%s' already onboarded.", agent_id)
                 return {"agent_id": agent_id, "onboarded": False, "detail": "already_exists"}
             else:
                 r.raise_for_status()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.warning("RBAC onboarding failed for '%s': %s", agent_id, e)
             raise RuntimeError(f"RBAC onboarding failed: {e}") from e
 
@@ -106,46 +214,82 @@ class RBACClient:
 
         Returns True if allowed, False otherwise.
         On network failure, logs a warning and returns False (fail-closed).
+        Gateway decisions are cached; failures and unknown agents are not.
         """
-        payload: Dict[str, Any] = {"agent_id": agent_id}
-        if action:
-            payload["action"] = action
-        if transition:
-            payload["transition"] = transition
+        key = _decision_key(agent_id, action, transition)
+        cached = self.decisions.get(key)
+        if cached is not None:
+            return cached
 
         try:
-            r = requests.post(
+            r = self.http.post(
                 f"{self.base_url}/agents/{agent_id}/verify",
-                json=payload,
+                json=_check_payload(agent_id, action, transition),
                 headers=self._auth_headers(),
                 timeout=self.timeout,
             )
             if r.status_code == 200:
-                return r.json().get("allowed", False)
+                allowed = bool(r.json().get("allowed", False))
+                self.decisions.put(key, allowed)
+                return allowed
             elif r.status_code == 404:
                 logger.warning("Agent '%s' not registered in RBAC.", agent_id)
                 return False
             else:
                 r.raise_for_status()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.warning("RBAC check failed for '%s': %s (fail-closed)", agent_id, e)
             return False
 
         return False
 
+    def prefetch(
+        self,
+        agent_id: str,
+        actions: Iterable[str] = (),
+        transitions: Iterable[str] = (),
+    ) -> Dict[DecisionKey, bool]:
+        """
+        Warm the decision cache for a pipeline's checks with one scope fetch.
+
+        Returns the decisions that were cached (empty if the scope could not
+        be fetched, in which case checks fall back to the gateway).
+        """
+        scope = self.get_permissions(agent_id)
+        return _cache_scope(self.decisions, agent_id, scope, actions, transitions)
+
+    def invalidate(self, agent_id: Optional[str] = None) -> None:
+        """Forget cached decisions, e.g. after a role change elsewhere."""
+        self.decisions.invalidate(agent_id)
+
+    def deactivate_agent(self, agent_id: str) -> bool:
+        """Soft-deactivate an agent. Returns True if the gateway accepted it."""
+        try:
+            r = self.http.delete(
+                f"{self.base_url}/agents/{agent_id}",
+                headers=self._auth_headers(),
+                timeout=self.timeout,
+            )
+            return r.status_code == 204
+        except httpx.HTTPError as e:
+            logger.warning("RBAC deactivation failed for '%s': %s", agent_id, e)
+            return False
+        finally:
+            self.decisions.invalidate(agent_id)
+
     # ── Query ────────────────────────────────────────────────────────
 
     def get_permissions(self, agent_id: str) -> Dict[str, Any]:
         """Fetch the full permission scope for an agent."""
         try:
-            r = requests.get(
+            r = self.http.get(
                 f"{self.base_url}/agents/{agent_id}/permissions",
                 headers=self._auth_headers(),
                 timeout=self.timeout,
             )
             r.raise_for_status()
             return r.json()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.warning("Failed to fetch permissions for '%s': %s", agent_id, e)
             return {}
 
@@ -176,7 +320,7 @@ class RBACClient:
             "ttl_seconds": ttl_seconds,
         }
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/tokens/issue",
                 json=payload,
                 headers=self._auth_headers(),
@@ -184,14 +328,14 @@ class RBACClient:
             )
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as exc:
+        except httpx.HTTPError as exc:
             raise RuntimeError(f"RBAC token issuance failed: {exc}") from exc
 
     def introspect_access_token(self, access_token: str) -> Dict[str, Any]:
         """Verify token via RBAC introspection endpoint."""
 
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/tokens/introspect",
                 json={"access_token": access_token},
                 headers=self._auth_headers(),
@@ -199,5 +343,119 @@ class RBACClient:
             )
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as exc:
+        except httpx.HTTPError as exc:
             raise RuntimeError(f"RBAC token introspection failed: {exc}") from exc
+
+
+def _cache_scope(
+    cache: DecisionCache,
+    agent_id: str,
+    scope: Dict[str, Any],
+    actions: Iterable[str],
+    transitions: Iterable[str],
+) -> Dict[DecisionKey, bool]:
+    if not scope:
+        return {}
+    decided: Dict[DecisionKey, bool] = {}
+    for action in actions:
+        decided[_decision_key(agent_id, action, None)] = _decide_from_scope(scope, action, None)
+    for transition in transitions:
+        decided[_decision_key(agent_id, None, transition)] = _decide_from_scope(scope, None, transition)
+    for key, allowed in decided.items():
+        cache.put(key, allowed)
+    return decided
+
+
+class AsyncRBACClient:
+    """
+    Async counterpart of :class:`RBACClient` for use inside event-loop code.
+
+    Shares the same decision-cache semantics over a pooled ``httpx.AsyncClient``.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8001",
+        timeout: float = 5.0,
+        token: str | None = None,
+        decision_ttl: float = 30.0,
+        max_connections: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = (token if token is not None else os.getenv("RBAC_SECRET", "")).strip()
+        self.decisions = DecisionCache(ttl_seconds=decision_ttl)
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    async def __aenter__(self) -> "AsyncRBACClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def verify_permission(
+        self,
+        agent_id: str,
+        action: Optional[str] = None,
+        transition: Optional[str] = None,
+    ) -> bool:
+        """Async, cached permission check; fail-closed like RBACClient."""
+        key = _decision_key(agent_id, action, transition)
+        cached = self.decisions.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            r = await self.http.post(
+                f"/agents/{agent_id}/verify",
+                json=_check_payload(agent_id, action, transition),
+            )
+        except httpx.HTTPError as e:
+            logger.warning("RBAC check failed for '%s': %s (fail-closed)", agent_id, e)
+            return False
+        if r.status_code == 200:
+            allowed = bool(r.json().get("allowed", False))
+            self.decisions.put(key, allowed)
+            return allowed
+        if r.status_code == 404:
+            logger.warning("Agent '%s' not registered in RBAC.", agent_id)
+        else:
+            logger.warning("RBAC check for '%s' returned HTTP %s (fail-closed)", agent_id, r.status_code)
+        return False
+
+    async def get_permissions(self, agent_id: str) -> Dict[str, Any]:
+        """Fetch the full permission scope for an agent."""
+        try:
+            r = await self.http.get(f"/agents/{agent_id}/permissions")
+            r.raise_for_status()
+            return r.json()
+        except httpx.HTTPError as e:
+            logger.warning("Failed to fetch permissions for '%s': %s", agent_id, e)
+            return {}
+
+    async def prefetch(
+        self,
+        agent_id: str,
+        actions: Iterable[str] = (),
+        transitions: Iterable[str] = (),
+    ) -> Dict[DecisionKey, bool]:
+        """Warm the decision cache for a pipeline's checks with one scope fetch."""
+        scope = await self.get_permissions(agent_id)
+        return _cache_scope(self.decisions, agent_id, scope, actions, transitions)
+
+    def invalidate(self, agent_id: Optional[str] = None) -> None:
+        """Forget cached decisions, e.g. after a role change elsewhere."""
+        self.decisions.invalidate(agent_id)
@@ -42,6 +42,26 @@ class PlanStateModel(Base):
         return f"<PlanState(plan_id={self.plan_id})>"
 
 
+class PlanStateDeltaModel(Base):
+    """One FSM transition recorded after the plan's last full snapshot."""
+    __tablename__ = "plan_state_deltas"
+
+    plan_id = Column(Text, nullable=False)
+    seq = Column(BigInteger, nullable=False)
+    state = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_retries = Column(Integer, nullable=False, default=3)
+    transition = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("plan_id", "seq", name="pk_plan_state_delta"),
+    )
+
+    def __repr__(self):
+        return f"<PlanStateDelta(plan_id={self.plan_id}, seq={self.seq})>"
+
+
 class FSMExecutionModel(Base):
     __tablename__ = "fsm_execution"
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark DMN token evaluation: per-token evaluate_token versus batched evaluate_many."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from judge.dmn_decision_engine import DMNDecisionEngine
+from schemas.telemetry import DMNToken
+
+
+def _tokens(count: int, seed: int) -> list[DMNToken]:
+    rng = random.Random(seed)
+    return [
+        DMNToken(
+            token_id=f"token-{i}",
+            loose_thread_id=f"thread-{i}",
+            vector=[0.0] * 8,
+            problem_statement="benchmark loose thread",
+            decision_criteria_input={
+                "structural_gap_count": float(rng.randint(0, 6)),
+                "critical_dtc": float(rng.random() < 0.05),
+                "SAFETY": rng.random(),
+                "LATENCY": rng.random(),
+            },
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tokens = _tokens(args.tokens, args.seed)
+
+    engine = DMNDecisionEngine()
+    started = time.perf_counter()
+    single = [engine.evaluate_token(token)[0] for token in tokens]
+    single_seconds = time.perf_counter() - started
+
+    engine = DMNDecisionEngine()
+    started = time.perf_counter()
+    batched = [outcome for outcome, _ in engine.evaluate_many(tokens)]
+    batched_seconds = time.perf_counter() - started
+
+    report = {
+        "tokens": args.tokens,
+        "evaluate_token_per_second": round(args.tokens / single_seconds, 1),
+        "evaluate_many_per_second": round(args.tokens / batched_seconds, 1),
+        "speedup": round(single_seconds / batched_seconds, 2),
+        "outcomes_match": single == batched,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["outcomes_match"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Benchmark: legacy single-loop docling worker vs the process-pool supervisor.
+
+Queues tracked text/code files of this repository as parse tasks on a local
+Redis stand-in (``fakeredis.TcpFakeServer`` unless ``--redis-url`` is given)
+and drains the queue twice: once with the old ``blpop`` + ``process_document``
+loop, and once with ``run_supervisor`` for each ``--processes``/``--threads``
+combination. Reports documents per second and embed batches produced.
+
+Without docling installed the worker takes its plain-text path, so this
+measures queue handling and chunking, not Docling conversion.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+WORKER_ROOT = REPO_ROOT / "pipeline" / "docling_worker"
+if str(WORKER_ROOT) not in sys.path:
+    sys.path.insert(0, str(WORKER_ROOT))
+
+import redis  # noqa: E402
+
+import worker  # noqa: E402
+
+
+def _start_fake_server() -> tuple[str, int]:
+    from fakeredis import TcpFakeServer
+
+    class NoDelayServer(TcpFakeServer):
+        # fakeredis writes each reply separately; without TCP_NODELAY (which real Redis sets)
+        # Nagle + delayed ACK add ~40 ms to every MULTI/EXEC.
+        def get_request(self):
+            conn, addr = super().get_request()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return conn, addr
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = NoDelayServer(("127.0.0.1", port))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return "127.0.0.1", port
+
+
+def _tasks(max_files: int) -> list[str]:
+    extensions = worker.CODE_EXTENSIONS | (worker.DOCUMENT_EXTENSIONS - {".pdf", ".docx"})
+    tracked = subprocess.run(["git", "ls-files"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+    files = [REPO_ROOT / line for line in tracked.splitlines() if Path(line).suffix in extensions]
+    files = [path for path in files if path.is_file()][:max_files or None]
+    return [
+        json.dumps({"bundle_id": f"bench-{i}", "file_path": str(path), "pipeline_version": "v1.0.0"})
+        for i, path in enumerate(files)
+    ]
+
+
+def _reset(client: redis.Redis, tasks: list[str]) -> None:
+    client.flushdb()
+    client.rpush(worker.PARSE_QUEUE, *tasks)
+
+
+def _drained(client: redis.Redis) -> bool:
+    if client.llen(worker.PARSE_QUEUE):
+        return False
+    return all(client.llen(key) == 0 for key in client.scan_iter(match=f"{worker.PROCESSING_PREFIX}*"))
+
+
+def _result(client: redis.Redis, documents: int, elapsed: float) -> dict:
+    return {
+        "wall_s": round(elapsed, 2),
+        "docs_per_s": round(documents / elapsed, 1),
+        "embed_batches": client.llen(worker.EMBED_QUEUE),
+        "dead_letters": client.llen(worker.DEAD_LETTER_QUEUE),
+    }
+
+
+def _run_legacy(client: redis.Redis, tasks: list[str]) -> dict:
+    _reset(client, tasks)
+    worker.redis_client = client
+    started = time.perf_counter()
+    while True:
+        popped = client.blpop(worker.PARSE_QUEUE, timeout=1)
+        if popped is None:
+            break
+        worker.process_document(json.loads(popped[1]))
+    return _result(client, len(tasks), time.perf_counter() - started - 1)
+
+
+def _run_supervisor(client: redis.Redis, tasks: list[str], host: str, port: int, processes: int, threads: int, prefetch: int) -> dict:
+    client.flushdb()
+    stop = threading.Event()
+    supervisor = threading.Thread(
+        target=worker.run_supervisor,
+        kwargs={"processes": processes, "prefetch": prefetch, "concurrency": threads, "host": host, "port": port, "stop": stop},
+    )
+    supervisor.start()
+    # Time the warm pool only: process start-up is paid once per deployment, not per document.
+    while len(list(client.scan_iter(match=f"{worker.HEARTBEAT_PREFIX}*"))) < processes:
+        time.sleep(0.05)
+    started = time.perf_counter()
+    client.rpush(worker.PARSE_QUEUE, *tasks)
+    while not _drained(client):
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    supervisor.join()
+    result = _result(client, len(tasks), elapsed)
+    result.update(processes=processes, threads=threads, prefetch=prefetch)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-files", type=int, default=300, help="0 queues every tracked text/code file")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--prefetch", type=int, default=4)
+    parser.add_argument("--redis-url", help="use a real Redis instead of fakeredis (the database is flushed)")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+        host, port = client.connection_pool.connection_kwargs["host"], client.connection_pool.connection_kwargs["port"]
+    else:
+        host, port = _start_fake_server()
+        client = redis.Redis(host=host, port=port, decode_responses=True)
+
+    tasks = _tasks(args.max_files)
+    # Workers (including spawned ones, which inherit fd 1) print per document; keep the report readable.
+    sys.stdout.flush()
+    saved_stdout = os.dup(1)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+    try:
+        results = {"documents": len(tasks), "cpus": os.cpu_count(), "legacy": _run_legacy(client, tasks), "supervisor": []}
+        for processes in args.processes:
+            for threads in args.threads:
+                results["supervisor"].append(
+                    _run_supervisor(client, tasks, host, port, processes, threads, max(args.prefetch, threads))
+                )
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_stdout, 1)
+        os.close(saved_stdout)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
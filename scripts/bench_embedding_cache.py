@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Benchmark: re-ingesting this repository with and without the embedding cache.
+
+Chunks tracked files exactly as ``pipeline/docling_worker`` does (plain-text
+path, hybrid chunker, batches of 32) and embeds each batch the way
+``pipeline/embed_worker`` does. The repository is ingested twice into a
+fresh cache: pass 1 is cold, pass 2 is the "nothing changed since the last
+commit" re-index. An uncached pass gives the baseline.
+
+``--model`` defaults to the embed worker's model. Without network access to
+fetch it, pass ``--model random-mpnet``: a randomly initialised model with the
+same architecture (MPNet-base, 384-token window, mean pooling) and a
+WordPiece vocabulary trained on the sampled files, so encoder cost matches
+while the vectors are meaningless.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PIPELINE_ROOT = REPO_ROOT / "pipeline"
+for path in (REPO_ROOT, PIPELINE_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import torch  # noqa: E402
+
+from lib.embedding_cache import EmbeddingCache, embed_with_cache  # noqa: E402
+from lib.normalize import l2_normalize, normalize_text  # noqa: E402
+
+WORKER_MODEL_ID = "sentence-transformers/all-mpnet-base-v2"
+WORKER_WEIGHTS_HASH = "sha256:4509c1ee9d2c8edeefc99bd9ca58668916bee2b9b0cf8bf505310e7b64baf670"
+
+
+def _load_docling_worker():
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location("docling_worker", PIPELINE_ROOT / "docling_worker" / "worker.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _chunk_repository(max_files: int) -> list[list[str]]:
+    """Batches of chunk texts, in the order the docling worker would enqueue them."""
+    worker = _load_docling_worker()
+    extensions = worker.CODE_EXTENSIONS | (worker.DOCUMENT_EXTENSIONS - {".pdf", ".docx"})
+    tracked = subprocess.run(["git", "ls-files"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+    files = [REPO_ROOT / line for line in tracked.splitlines() if Path(line).suffix in extensions]
+    if max_files:
+        files = files[:max_files]
+
+    batches = []
+    for file_path in files:
+        if not file_path.is_file():
+            continue
+        raw_text = file_path.read_text(encoding="utf-8", errors="ignore")
+        source_type = worker._infer_source_type(file_path)
+        text = worker._normalize_code_text(raw_text) if source_type == "code" else normalize_text(raw_text)
+        chunks = [
+            str(chunk.get("text_content", "")).strip()
+            for chunk in worker.hybrid_chunk_text(text=text, source_type=source_type, file_path=file_path)
+        ]
+        chunks = [chunk for chunk in chunks if chunk]
+        batches.extend(chunks[i:i + worker.BATCH_SIZE] for i in range(0, len(chunks), worker.BATCH_SIZE))
+    return batches
+
+
+def _random_mpnet(texts: list[str], workdir: Path):
+    from sentence_transformers import SentenceTransformer, models
+    from tokenizers import BertWordPieceTokenizer
+    from transformers import MPNetConfig, MPNetModel, MPNetTokenizerFast
+
+    wordpiece = BertWordPieceTokenizer(lowercase=True)
+    wordpiece.train_from_iterator(texts, vocab_size=30527, special_tokens=["<s>", "<pad>", "</s>", "[UNK]", "<mask>"])
+    MPNetTokenizerFast(
+        tokenizer_object=wordpiece._tokenizer,
+        bos_token="<s>",
+        eos_token="</s>",
+        sep_token="</s>",
+        cls_token="<s>",
+        unk_token="[UNK]",
+        pad_token="<pad>",
+        mask_token="<mask>",
+    ).save_pretrained(workdir)
+    torch.manual_seed(0)
+    MPNetModel(MPNetConfig()).save_pretrained(workdir)
+
+    transformer = models.Transformer(str(workdir), max_seq_length=384)
+    return SentenceTransformer(modules=[transformer, models.Pooling(transformer.get_word_embedding_dimension(), "mean")])
+
+
+def _encoder(model):
+    def encode(texts: list[str]) -> list[list[float]]:
+        with torch.no_grad():
+            embeddings = model.encode(texts, convert_to_tensor=True, show_progress_bar=False)
+            return l2_normalize(embeddings).cpu().tolist()
+
+    return encode
+
+
+def _ingest(batches: list[list[str]], cache, encode) -> dict:
+    started = time.perf_counter()
+    hits = total = 0
+    ratios = []
+    for texts in batches:
+        _, batch_hits = embed_with_cache(cache, texts, encode)
+        hits += sum(batch_hits)
+        total += len(texts)
+        ratios.append(sum(batch_hits) / len(texts))
+    return {
+        "wall_s": round(time.perf_counter() - started, 2),
+        "chunks": total,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+        "batches_fully_cached": sum(1 for r in ratios if r == 1.0),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=WORKER_MODEL_ID)
+    parser.add_argument("--max-files", type=int, default=200, help="0 ingests every tracked text/code file")
+    parser.add_argument("--skip-uncached", action="store_true", help="skip the uncached baseline pass")
+    args = parser.parse_args()
+
+    batches = _chunk_repository(args.max_files)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.model == "random-mpnet":
+            model = _random_mpnet([t for batch in batches for t in batch], Path(tmp))
+        else:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(args.model)
+        model.eval()
+        encode = _encoder(model)
+
+        results = {"model": args.model, "files": args.max_files or "all", "batches": len(batches)}
+        if not args.skip_uncached:
+            results["uncached"] = _ingest(batches, None, encode)
+        cache = EmbeddingCache(Path(tmp) / "cache", args.model, WORKER_WEIGHTS_HASH)
+        results["cached_pass_1"] = _ingest(batches, cache, encode)
+        results["cached_pass_2"] = _ingest(batches, cache, encode)
+        results["cache"] = cache.stats()
+        cache.close()
+
+    baseline = results.get("uncached", results["cached_pass_1"])["wall_s"]
+    results["pass_2_speedup"] = round(baseline / max(results["cached_pass_2"]["wall_s"], 1e-3), 1)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
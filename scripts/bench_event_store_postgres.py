@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Benchmark: PostgresEventStore append throughput and fan-out latency.
+
+Needs a reachable Postgres (``--dsn`` or ``EVENT_STORE_BENCH_DSN``), e.g.
+``docker run -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres:16``.
+Each run uses a throwaway table and reports events/second for:
+
+* ``per_event``: ``append_event`` one event at a time (one round trip each);
+* ``unnest_batches``: ``append_events`` below ``copy_threshold`` (one
+  ``INSERT ... unnest`` statement per batch);
+* ``copy_batches``: ``append_events`` at/above ``copy_threshold`` (COPY);
+* ``observers``: per-event appends with a slow observer behind the bounded
+  queue, to show appends are paced by ``observer_queue_size`` rather than
+  spawning a task per event;
+* ``listen``: median/p95 milliseconds from calling ``append_event`` to the
+  notification arriving on a second pool's ``listen()`` stream (commit
+  round trip included).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from event_store.models import Event  # noqa: E402
+from event_store.postgres_event_store import PostgresEventStore  # noqa: E402
+
+
+def _events(n: int, execution_id: str) -> list[Event]:
+    return [
+        Event(
+            execution_id=execution_id,
+            event_type="SIMULATION_STEP",
+            state="RUNNING",
+            hash_current=uuid.uuid4().hex,
+            timestamp=datetime.utcnow(),
+            payload={"step": i, "telemetry": {"x": i * 0.5, "y": -i * 0.25}},
+        )
+        for i in range(n)
+    ]
+
+
+class _SlowObserver:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.seen = 0
+
+    async def on_state_change(self, event: Event) -> None:
+        await asyncio.sleep(self.delay)
+        self.seen += 1
+
+
+def _rate(n: int, seconds: float) -> dict:
+    return {"events": n, "seconds": round(seconds, 3), "events_per_s": round(n / seconds, 1)}
+
+
+async def _appends(store: PostgresEventStore, events: list[Event], batch: int) -> float:
+    started = time.perf_counter()
+    if batch == 1:
+        for event in events:
+            await store.append_event(event)
+    else:
+        for i in range(0, len(events), batch):
+            await store.append_events(events[i : i + batch])
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> dict:
+    table = f"event_store_bench_{uuid.uuid4().hex[:8]}"
+    opts = {"table": table, "channel": f"{table}_channel", "copy_threshold": args.copy_threshold}
+    store = await PostgresEventStore.connect(args.dsn, **opts)
+    reader = await PostgresEventStore.connect(args.dsn, **opts)
+    results: dict = {}
+    try:
+        await store.ensure_schema()
+
+        seconds = await _appends(store, _events(args.events, "per-event"), 1)
+        results["per_event"] = _rate(args.events, seconds)
+
+        small = max(1, args.copy_threshold - 1)
+        seconds = await _appends(store, _events(args.events * 10, "unnest"), small)
+        results["unnest_batches"] = {**_rate(args.events * 10, seconds), "batch": small}
+
+        seconds = await _appends(store, _events(args.events * 10, "copy"), args.copy_batch)
+        results["copy_batches"] = {**_rate(args.events * 10, seconds), "batch": args.copy_batch}
+
+        observer = _SlowObserver(args.observer_delay_ms / 1000)
+        observed = PostgresEventStore(
+            store.pool, [observer], observer_queue_size=args.observer_queue, observer_workers=args.observer_workers, **opts
+        )
+        tasks_before = len(asyncio.all_tasks())
+        seconds = await _appends(observed, _events(args.events, "observed"), 1)
+        peak_tasks = len(asyncio.all_tasks()) - tasks_before
+        await observed.aclose()
+        results["observers"] = {
+            **_rate(args.events, seconds),
+            "observer_delay_ms": args.observer_delay_ms,
+            "observer_workers": args.observer_workers,
+            "extra_tasks_after_appends": peak_tasks,
+            "delivered": observer.seen,
+        }
+
+        # The first notification registers the listener; later ones are buffered by listen().
+        stream = reader.listen()
+        warmup = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.1)
+        await store.append_events(_events(1, "listen"))
+        await asyncio.wait_for(warmup, 5)
+        latencies = []
+        for event in _events(args.listen_samples, "listen"):
+            sent = time.perf_counter()
+            await store.append_event(event)
+            await asyncio.wait_for(stream.__anext__(), 5)
+            latencies.append((time.perf_counter() - sent) * 1000)
+        await stream.aclose()
+        latencies.sort()
+        results["listen"] = {
+            "samples": len(latencies),
+            "median_ms": round(statistics.median(latencies), 3),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        }
+        results["stats"] = store.stats()
+    finally:
+        async with store.pool.acquire() as conn:
+            await conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        await store.pool.close()
+        await reader.pool.close()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.getenv("EVENT_STORE_BENCH_DSN", ""))
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--copy-threshold", type=int, default=256)
+    parser.add_argument("--copy-batch", type=int, default=1000)
+    parser.add_argument("--observer-delay-ms", type=float, default=2.0)
+    parser.add_argument("--observer-queue", type=int, default=100)
+    parser.add_argument("--observer-workers", type=int, default=4)
+    parser.add_argument("--listen-samples", type=int, default=200)
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or EVENT_STORE_BENCH_DSN is required")
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Benchmark: FSM event store appends, chain verification and bundle export.
+
+Runs against a fresh SQLite file and, when ``--postgres-url`` (or
+``FSM_BENCH_POSTGRES_URL``) points at a scratch database — e.g. the ``db``
+service from ``docker-compose.unified.yml`` or
+``docker run -p 5432:5432 -e POSTGRES_PASSWORD=pass postgres:15`` — against
+Postgres as well. Compares:
+
+* ``append_event_uncached``: one event per call with the head cache cleared,
+  i.e. a head read per append as before;
+* ``append_event``: one event per call with a warm head cache;
+* ``append_events``: batched appends of ``--batch`` events;
+* ``verify_full`` / ``verify_incremental``: re-hashing the whole chain versus
+  resuming from the last checkpoint after ``--tail`` new events;
+* ``export_materialized`` / ``export_streamed``: building the bundle from a
+  list of all events versus streaming it, with tracemalloc peaks.
+
+Postgres tables are dropped and recreated; never point this at real data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from orchestrator.fsm_persistence import EventInput, FSMEventStore, canonical_json_bytes
+from orchestrator.storage import DBManager
+from schemas.database import Base, FSMEventModel, FSMExecutionModel, FSMSnapshotModel
+
+FSM_TABLES = [FSMExecutionModel.__table__, FSMEventModel.__table__, FSMSnapshotModel.__table__]
+
+
+def _store(url: str) -> FSMEventStore:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    Base.metadata.drop_all(bind=engine, tables=FSM_TABLES)
+    Base.metadata.create_all(bind=engine, tables=FSM_TABLES)
+    manager = DBManager()
+    manager.engine = engine
+    manager.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return FSMEventStore(manager)
+
+
+def _event(seq: int, payload_bytes: int) -> EventInput:
+    occurred = datetime.fromtimestamp(1_700_000_000 + seq, tz=timezone.utc)
+    return EventInput(
+        event_type="RUN_DISPATCHED",
+        payload={"step": seq, "state": "EXECUTING", "blob": "x" * payload_bytes},
+        occurred_at_iso=occurred.isoformat().replace("+00:00", "Z"),
+    )
+
+
+def _rate(events: int, elapsed: float) -> dict:
+    return {"events": events, "wall_ms": round(elapsed * 1000, 1), "events_per_s": round(events / elapsed, 1)}
+
+
+def _single(store: FSMEventStore, execution_id: str, events: int, payload_bytes: int, *, cached: bool) -> dict:
+    started = time.perf_counter()
+    for seq in range(1, events + 1):
+        if not cached:
+            store.head_cache.invalidate("bench", execution_id)
+        event = _event(seq, payload_bytes)
+        store.append_event(
+            tenant_id="bench",
+            execution_id=execution_id,
+            event_type=event.event_type,
+            payload=event.payload,
+            occurred_at_iso=event.occurred_at_iso,
+            expected_seq=seq,
+        )
+    return _rate(events, time.perf_counter() - started)
+
+
+def _batched(store: FSMEventStore, execution_id: str, events: int, payload_bytes: int, batch: int) -> dict:
+    started = time.perf_counter()
+    for first in range(1, events + 1, batch):
+        chunk = [_event(seq, payload_bytes) for seq in range(first, min(events, first + batch - 1) + 1)]
+        store.append_events(tenant_id="bench", execution_id=execution_id, events=chunk, expected_seq=first)
+    return {**_rate(events, time.perf_counter() - started), "batch": batch}
+
+
+def _timed(fn) -> tuple[object, float]:
+    started = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - started) * 1000
+
+
+def _traced(fn) -> dict:
+    tracemalloc.start()
+    try:
+        value, wall_ms = _timed(fn)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"wall_ms": round(wall_ms, 1), "peak_kib": round(peak / 1024, 1), "bytes": value}
+
+
+def _materialized_export(store: FSMEventStore, execution_id: str) -> int:
+    head_seq, head_hash = store.get_head("bench", execution_id)
+    events = store.load_events("bench", execution_id)
+    payload = {
+        "tenant_id": "bench",
+        "execution_id": execution_id,
+        "head_seq": head_seq,
+        "head_hash": head_hash.hex() if head_hash else None,
+        "events": [store._bundle_event(e) for e in events],
+    }
+    return len(canonical_json_bytes(payload))
+
+
+def _streamed_export(store: FSMEventStore, execution_id: str) -> int:
+    return sum(len(chunk) for chunk in store.iter_execution_bundle("bench", execution_id))
+
+
+def run(url: str, args: argparse.Namespace) -> dict:
+    store = _store(url)
+    results = {
+        "append_event_uncached": _single(store, "single-uncached", args.events, args.payload_bytes, cached=False),
+        "append_event": _single(store, "single-cached", args.events, args.payload_bytes, cached=True),
+        "append_events": _batched(store, "batched", args.events, args.payload_bytes, args.batch),
+    }
+
+    _, full_ms = _timed(lambda: store.verify_chain("bench", "batched", full=True))
+    _batched_tail = [_event(seq, args.payload_bytes) for seq in range(args.events + 1, args.events + args.tail + 1)]
+    store.append_events(tenant_id="bench", execution_id="batched", events=_batched_tail)
+    ok, incremental_ms = _timed(lambda: store.verify_chain("bench", "batched"))
+    assert ok
+    results["verify_full_ms"] = round(full_ms, 1)
+    results["verify_incremental_ms"] = round(incremental_ms, 1)
+
+    results["export_materialized"] = _traced(lambda: _materialized_export(store, "batched"))
+    results["export_streamed"] = _traced(lambda: _streamed_export(store, "batched"))
+    store._db.engine.dispose()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--tail", type=int, default=20)
+    parser.add_argument("--payload-bytes", type=int, default=512)
+    parser.add_argument("--postgres-url", default=os.getenv("FSM_BENCH_POSTGRES_URL", ""))
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        results["sqlite"] = run(f"sqlite:///{tmp}/fsm_bench.db", args)
+    if args.postgres_url:
+        results["postgres"] = run(args.postgres_url, args)
+    else:
+        results["postgres"] = "skipped: pass --postgres-url or set FSM_BENCH_POSTGRES_URL"
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
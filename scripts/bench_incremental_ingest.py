@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark: full vs incremental reindex of this repository between two commits.
+
+Indexes ``--commit`` twice with ``pipeline/incremental_ingest.py``:
+
+* full: a fresh index built from every ingestible file at ``--commit``;
+* incremental: a fresh index of ``--base`` (reported as setup), then a
+  ``git diff --name-status``-driven update to ``--commit``.
+
+Both end states are checked to hold the same Qdrant points (in-memory
+``QdrantClient``) and the same manifest digest. Embeddings come from a
+deterministic hash encoder so the numbers show parse/chunk/store work and
+the number of chunks each mode has to embed; multiply ``chunks_upserted``
+by the model's per-chunk cost for a real embedder.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from qdrant_client import QdrantClient  # noqa: E402
+
+from pipeline.lib.blob_store import BlobStore  # noqa: E402
+
+
+def _load_incremental():
+    spec = importlib.util.spec_from_file_location("incremental_ingest", REPO_ROOT / "pipeline" / "incremental_ingest.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _hash_encoder(dim: int):
+    def encode(texts: list[str]) -> list[list[float]]:
+        rows = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            row = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+            rows.append((row / np.linalg.norm(row)).tolist())
+        return rows
+
+    return encode
+
+
+def _point_ids(client: QdrantClient, collection: str) -> set:
+    ids, offset = set(), None
+    while True:
+        points, offset = client.scroll(collection, limit=10_000, offset=offset, with_payload=False)
+        ids.update(p.id for p in points)
+        if offset is None:
+            return ids
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default="HEAD~1")
+    parser.add_argument("--commit", default="HEAD")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--max-file-bytes", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="Local mode is not recommended")
+    incremental_ingest = _load_incremental()
+    encode = _hash_encoder(args.dim)
+    with tempfile.TemporaryDirectory() as tmp:
+        blob_store = BlobStore(Path(tmp) / "blobs")
+
+        def ingestor(state: str, client: QdrantClient):
+            return incremental_ingest.IncrementalIngestor(
+                repo_path=REPO_ROOT,
+                repo_key="bench/A2A_MCP",
+                manifest_root=Path(tmp) / state / "manifests",
+                encode=encode,
+                qdrant_client=client,
+                collection_name="chunks",
+                ledger_path=Path(tmp) / state / "ledger.jsonl",
+                blob_store=blob_store,
+                max_file_bytes=args.max_file_bytes,
+                ledger_fsync=False,
+            )
+
+        # The ingestor logs per file; keep the report readable.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            full_client = QdrantClient(":memory:")
+            full = ingestor("full", full_client).run(args.commit, full=True)
+            full_points = _point_ids(full_client, "chunks")
+            del full_client
+
+            incremental_client = QdrantClient(":memory:")
+            incremental_ingestor = ingestor("incremental", incremental_client)
+            initial = incremental_ingestor.run(args.base)
+            incremental = incremental_ingestor.run(args.commit)
+            incremental_points = _point_ids(incremental_client, "chunks")
+
+    assert incremental["mode"] == "incremental"
+    assert full_points == incremental_points, "incremental index differs from the full reindex"
+    assert full["manifest_sha256"] == incremental["manifest_sha256"]
+
+    keys = ("files_processed", "files_removed", "chunks_upserted", "chunks_deleted", "wall_s")
+    results = {
+        "base": initial["commit"],
+        "commit": full["commit"],
+        "files_indexed": full["files_indexed"],
+        "points": len(full_points),
+        "full": {k: full[k] for k in keys},
+        "incremental_setup": {k: initial[k] for k in keys},
+        "incremental": {k: incremental[k] for k in keys},
+    }
+    results["speedup"] = round(full["wall_s"] / max(incremental["wall_s"], 1e-3), 1)
+    results["chunks_to_embed_ratio"] = round(full["chunks_upserted"] / max(incremental["chunks_upserted"], 1), 1)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark: IntentEngine.run_full_pipeline over a 20-action blueprint.
+
+Every agent is replaced by a fake with simulated latency (async sleeps for
+LLM/tester calls, a blocking sleep for artifact persistence), so the wall
+time reflects scheduling only. Sweeps the action concurrency limit; a limit
+of 1 reproduces the previous sequential walk.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for path in (REPO_ROOT, REPO_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("RBAC_ENABLED", "false")
+
+from orchestrator.intent_engine import IntentEngine
+from orchestrator.stateflow import StateMachine
+from schemas.agent_artifacts import MCPArtifact
+from schemas.project_plan import PlanAction, ProjectPlan
+
+STAGES = ("ArchitectureAgent", "CoderAgent", "TesterAgent", "ReviewAgent")
+
+
+def _blueprint(tasks: int) -> ProjectPlan:
+    actions = [
+        PlanAction(
+            action_id=f"a{t}-{stage}",
+            title=f"{stage} task",
+            instruction=f"Execute task {t} via {stage}",
+            metadata={"delegated_to": stage, "original_task": f"task {t}"},
+        )
+        for t in range(tasks)
+        for stage in STAGES
+    ]
+    return ProjectPlan(plan_id="blueprint-bench", project_name="bench", requester="bench", actions=actions)
+
+
+def _fake_engine(args: argparse.Namespace) -> IntentEngine:
+    engine = IntentEngine(sm=StateMachine())
+    llm_delay = args.llm_ms / 1000.0
+    db_delay = args.db_ms / 1000.0
+
+    async def categorize_project(description, requester):
+        return ProjectPlan(plan_id="plan-bench", project_name=description, requester=requester)
+
+    async def build_blueprint(project_name, task_descriptions, requester):
+        return _blueprint(args.tasks)
+
+    async def map_system(blueprint):
+        return []
+
+    async def generate_solution(parent_id, feedback=None):
+        await asyncio.sleep(llm_delay)
+        return MCPArtifact(
+            artifact_id=str(uuid.uuid4()),
+            parent_artifact_id=parent_id,
+            agent_name="CoderAgent",
+            type="code_solution",
+            content="def solve():\n    return 42\n",
+        )
+
+    async def validate(artifact_id):
+        await asyncio.sleep(llm_delay / 2)
+        return SimpleNamespace(status="PASS", critique="ok")
+
+    engine.manager = SimpleNamespace(categorize_project=categorize_project)
+    engine.orchestrator = SimpleNamespace(build_blueprint=build_blueprint)
+    engine.architect = SimpleNamespace(map_system=map_system)
+    engine.coder = SimpleNamespace(generate_solution=generate_solution)
+    engine.tester = SimpleNamespace(validate=validate)
+    engine.judge = SimpleNamespace(
+        get_agent_system_context=lambda _agent: "context",
+        judge_action=lambda **_kw: SimpleNamespace(overall_score=1.0),
+    )
+    engine.db = SimpleNamespace(save_artifact=lambda _artifact: time.sleep(db_delay))
+    engine.pinn = SimpleNamespace(calculate_residual=lambda _content: 0.01)
+    return engine
+
+
+async def _run(args: argparse.Namespace, concurrency: int) -> dict:
+    engine = _fake_engine(args)
+    engine.sm.trigger("OBJECTIVE_INGRESS")
+    started = time.perf_counter()
+    result = await engine.run_full_pipeline("bench project", max_concurrency=concurrency)
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "wall_ms": round(elapsed * 1000, 1),
+        "success": result.success,
+        "actions": len(result.blueprint.actions),
+        "pipeline_state": engine.sm.state.value,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=5, help="tasks x 4 stages = blueprint actions")
+    parser.add_argument("--llm-ms", type=float, default=40.0)
+    parser.add_argument("--db-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 5, 10])
+    args = parser.parse_args()
+
+    runs = [asyncio.run(_run(args, concurrency)) for concurrency in args.concurrency]
+    baseline = runs[0]["wall_ms"]
+    for run in runs:
+        run["speedup"] = round(baseline / run["wall_ms"], 2)
+    print(json.dumps(runs, indent=2))
+    return 0 if all(run["success"] for run in runs) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark JudgmentModel action scoring against the per-action criterion loop."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from judge.decision import ActionScore, CriteriaType, DecisionCriteria, JudgmentModel
+
+CONTEXT = {"nearest_obstacle_distance_m": 12, "intent_match": 0.8, "elapsed_ms": 30, "budget_ms": 100}
+
+
+def _per_action_loop(model: JudgmentModel, actions: list[str], context: dict) -> list[ActionScore]:
+    """Scores every criterion for every action, as judge_actions used to."""
+    scored = []
+    for action in actions:
+        criterion_scores = {}
+        weighted_sum = weight_sum = 0.0
+        for crit_type, criterion in model._criteria.items():
+            crit_score = criterion.score_action(action, context)
+            criterion_scores[crit_type] = crit_score
+            weighted_sum += criterion.weight * crit_score
+            weight_sum += criterion.weight
+        scored.append(
+            ActionScore(
+                action=action,
+                overall_score=weighted_sum / weight_sum if weight_sum > 0 else 0.5,
+                criterion_scores=criterion_scores,
+                metadata={"preset": "simulation", "context_keys": list(context.keys())},
+            )
+        )
+    scored.sort(key=lambda s: s.overall_score, reverse=True)
+    return scored
+
+
+def _time(fn, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--actions", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--action-dependent", action="store_true",
+                        help="register an action-dependent intent criterion")
+    args = parser.parse_args()
+
+    model = JudgmentModel()
+    if args.action_dependent:
+        model.register_criterion(
+            DecisionCriteria(
+                criteria_type=CriteriaType.PLAYER_INTENT,
+                weight=0.7,
+                scorer=lambda action, context: (hash(action) % 100) / 100,
+                action_dependent=True,
+            )
+        )
+    actions = [f"candidate-{i}" for i in range(args.actions)]
+
+    loop_seconds = _time(lambda: _per_action_loop(model, actions, CONTEXT), args.repeats)
+    judge_seconds = _time(lambda: model.judge_actions(actions, CONTEXT), args.repeats)
+    best_seconds = _time(lambda: model.best_action(actions, CONTEXT), args.repeats)
+
+    expected = _per_action_loop(model, actions, CONTEXT)[0].action
+    report = {
+        "actions": args.actions,
+        "action_dependent": args.action_dependent,
+        "per_action_loop_ms": round(loop_seconds * 1e3, 3),
+        "judge_actions_ms": round(judge_seconds * 1e3, 3),
+        "best_action_ms": round(best_seconds * 1e3, 3),
+        "judge_speedup": round(loop_seconds / judge_seconds, 2),
+        "best_matches": model.best_action(actions, CONTEXT).action == expected,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["best_matches"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark hash-chained ledger appends and check per-append latency stays flat."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from pipeline.lib.canonical import LedgerWriter
+
+
+def _record(i: int) -> dict:
+    return {
+        "chunk_id": f"chunk-{i:08d}",
+        "doc_id": f"doc-{i // 64:06d}",
+        "chunk_integrity_hash": f"{i:064x}",
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1, help="records per group commit")
+    parser.add_argument("--buckets", type=int, default=10, help="latency windows compared for flatness")
+    parser.add_argument("--max-ratio", type=float, default=2.0, help="allowed last/first window latency ratio")
+    parser.add_argument("--fsync", action="store_true", help="fsync once per batch")
+    parser.add_argument("--ledger", help="ledger path (defaults to a temporary file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger_path = Path(args.ledger) if args.ledger else Path(tmp) / "ledger.jsonl"
+        bucket_size = max(1, args.records // args.buckets)
+        bucket_means: list[float] = []
+        elapsed_in_bucket = 0.0
+        appended_in_bucket = 0
+
+        started = time.perf_counter()
+        with LedgerWriter(ledger_path, fsync=args.fsync) as writer:
+            i = 0
+            while i < args.records:
+                batch = [_record(n) for n in range(i, min(i + args.batch_size, args.records))]
+                t0 = time.perf_counter()
+                writer.append_many(batch)
+                elapsed_in_bucket += time.perf_counter() - t0
+                appended_in_bucket += len(batch)
+                i += len(batch)
+                if appended_in_bucket >= bucket_size:
+                    bucket_means.append(elapsed_in_bucket / appended_in_bucket)
+                    elapsed_in_bucket = 0.0
+                    appended_in_bucket = 0
+        total = time.perf_counter() - started
+        ledger_bytes = ledger_path.stat().st_size
+
+    # Compare the median of the first and last windows to ignore warm-up noise
+    head = statistics.median(bucket_means[: max(1, len(bucket_means) // 5)])
+    tail = statistics.median(bucket_means[-max(1, len(bucket_means) // 5):])
+    ratio = tail / head if head else 0.0
+    report = {
+        "records": args.records,
+        "batch_size": args.batch_size,
+        "fsync": args.fsync,
+        "total_seconds": round(total, 3),
+        "appends_per_second": round(args.records / total, 1) if total else None,
+        "ledger_bytes": ledger_bytes,
+        "window_mean_us": [round(m * 1e6, 2) for m in bucket_means],
+        "tail_to_head_ratio": round(ratio, 3),
+        "flat": ratio <= args.max_ratio,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["flat"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
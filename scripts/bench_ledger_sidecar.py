@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark: JSON-inline embeddings vs the binary sidecar ledger format.
+
+Writes ``--records`` chunk.embedding records (768-dim float32 vectors, like
+the embed worker) as a legacy JSON ledger, migrates it with
+``pipeline/migrate_ledger_sidecar.py``, and compares on-disk size and the
+time replay needs to get every vector back as a numpy array (``json.loads``
+of inline floats vs ``numpy.memmap`` views through ``SidecarReader``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from pipeline.lib.canonical import LedgerWriter  # noqa: E402
+from pipeline.lib.embedding_sidecar import SidecarReader, sidecar_path  # noqa: E402
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("migrate_ledger_sidecar", REPO_ROOT / "pipeline" / "migrate_ledger_sidecar.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _replay(ledger: Path) -> tuple[float, float]:
+    """Seconds to load every record's vector, and a checksum so the work is not skipped."""
+    reader = SidecarReader(ledger)
+    started = time.perf_counter()
+    total = 0.0
+    with open(ledger, "r", encoding="utf-8") as f:
+        for line in f:
+            total += float(reader.vector(json.loads(line))[0])
+    return time.perf_counter() - started, total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--dtype", choices=("float32", "float16"), default="float32")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / "legacy" / "ledger.jsonl"
+        with LedgerWriter(legacy, fsync=False) as writer:
+            for start in range(0, args.records, 1000):
+                vectors = rng.standard_normal((min(1000, args.records - start), args.dim)).astype(np.float32)
+                writer.append_many(
+                    [
+                        {"chunk_id": f"chunk-{start + i}", "doc_id": f"doc-{(start + i) // 32}", "embedding": v.tolist()}
+                        for i, v in enumerate(vectors)
+                    ]
+                )
+
+        migrated = Path(tmp) / "sidecar" / "ledger.jsonl"
+        started = time.perf_counter()
+        _load_migration().migrate_ledger(legacy, migrated, dtype=args.dtype)
+        migrate_s = time.perf_counter() - started
+
+        json_s, json_sum = _replay(legacy)
+        sidecar_s, sidecar_sum = _replay(migrated)
+        if args.dtype == "float32":
+            assert json_sum == sidecar_sum
+
+        results = {
+            "records": args.records,
+            "dim": args.dim,
+            "dtype": args.dtype,
+            "json_ledger_bytes": legacy.stat().st_size,
+            "sidecar_ledger_bytes": migrated.stat().st_size,
+            "sidecar_vector_bytes": sidecar_path(migrated, args.dtype).stat().st_size,
+            "json_replay_s": round(json_s, 3),
+            "sidecar_replay_s": round(sidecar_s, 3),
+            "migrate_s": round(migrate_s, 2),
+        }
+        results["total_size_ratio"] = round(
+            results["json_ledger_bytes"] / (results["sidecar_ledger_bytes"] + results["sidecar_vector_bytes"]), 2
+        )
+        results["replay_speedup"] = round(json_s / sidecar_s, 1)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: LLM calls against a local fake OpenAI-compatible server.
+
+The fake server answers ``/v1/chat/completions`` after a simulated model
+latency and supports ``stream: true`` (server-sent events). Compares:
+
+* ``fresh_connection_threads``: the previous ``acall_llm`` — a worker thread
+  per call doing a session-less ``requests.post``;
+* ``pooled_async``: ``LLMService.acall_llm`` on the shared pooled
+  ``httpx.AsyncClient`` under the provider concurrency limit;
+* ``stream_first_token``: time to first chunk via ``EndpointAdapter.astream``
+  versus time to the full completion.
+
+The response cache is bypassed so every call reaches the server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import requests
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from orchestrator.llm_adapters.base import InternalLLMRequest
+from orchestrator.llm_adapters.endpoint_adapter import EndpointAdapter
+from orchestrator.llm_adapters.transport import ProviderTransport
+from orchestrator.llm_util import LLMService
+
+
+def _fake_server(latency_s: float, chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        if not body.get("stream"):
+            await asyncio.sleep(latency_s)
+            return JSONResponse({"choices": [{"message": {"content": "ok " * chunks}}]})
+
+        async def events():
+            for _ in range(chunks):
+                await asyncio.sleep(latency_s / chunks)
+                yield f"data: {json.dumps({'choices': [{'delta': {'content': 'ok '}}]})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def _result(calls: int, elapsed: float) -> dict:
+    return {"calls": calls, "wall_ms": round(elapsed * 1000, 1), "calls_per_s": round(calls / elapsed, 1)}
+
+
+async def _fresh_connection_threads(endpoint: str, calls: int) -> dict:
+    def call(i: int) -> str:
+        response = requests.post(
+            endpoint,
+            headers={"Authorization": "Bearer bench", "Content-Type": "application/json"},
+            json={"model": "bench", "messages": [{"role": "user", "content": f"prompt {i}"}]},
+            timeout=30,
+        )
+        return response.json()["choices"][0]["message"]["content"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(asyncio.to_thread(call, i) for i in range(calls)))
+    return _result(calls, time.perf_counter() - started)
+
+
+async def _pooled_async(calls: int, concurrency: int) -> dict:
+    transport = ProviderTransport("endpoint", max_concurrency=concurrency, max_connections=concurrency)
+    service = LLMService(transport=transport)
+    started = time.perf_counter()
+    await asyncio.gather(*(service.acall_llm(f"prompt {i}", use_cache=False) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    await transport.aclose()
+    return {**_result(calls, elapsed), "concurrency": concurrency, "http2": transport.http2}
+
+
+async def _stream_first_token(samples: int) -> dict:
+    transport = ProviderTransport("endpoint")
+    adapter = EndpointAdapter(transport)
+    first, full = [], []
+    for i in range(samples):
+        request = InternalLLMRequest(prompt=f"stream {i}")
+        started = time.perf_counter()
+        async for _chunk in adapter.astream(request):
+            if len(first) == i:
+                first.append(time.perf_counter() - started)
+        full.append(time.perf_counter() - started)
+    await transport.aclose()
+    mean = lambda values: round(sum(values) / len(values) * 1000, 1)
+    return {"first_chunk_ms": mean(first), "full_completion_ms": mean(full), "samples": samples}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=250.0)
+    parser.add_argument("--chunks", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32])
+    args = parser.parse_args()
+
+    port = _free_port()
+    endpoint = f"http://127.0.0.1:{port}/v1/chat/completions"
+    os.environ.update({"LLM_API_KEY": "bench", "LLM_ENDPOINT": endpoint, "LLM_MODEL": "bench"})
+    os.environ["LLM_FALLBACK_MODELS"] = ""
+    server = _start_server(_fake_server(args.latency_ms / 1000.0, args.chunks), port)
+
+    results = {}
+    try:
+        results["fresh_connection_threads"] = asyncio.run(_fresh_connection_threads(endpoint, args.calls))
+        results["pooled_async"] = [
+            asyncio.run(_pooled_async(args.calls, concurrency)) for concurrency in args.concurrency
+        ]
+        results["stream_first_token"] = asyncio.run(_stream_first_token(10))
+    finally:
+        server.should_exit = True
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
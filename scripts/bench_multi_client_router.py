@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Load benchmark: drive MultiClientMCPRouter.process_request for many tenants concurrently.
+
+Runs the CPU-only numpy core at each concurrency level (one tenant per
+concurrent stream) for every requested micro-batch size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for path in (REPO_ROOT, REPO_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from multi_client_router import InMemoryEventStore, MultiClientMCPRouter
+
+
+async def _tenant_loop(
+    router: MultiClientMCPRouter,
+    client_key: str,
+    requests: int,
+    tokens: np.ndarray,
+    latencies: list[float],
+) -> None:
+    for _ in range(requests):
+        started = time.perf_counter()
+        await router.process_request(client_key, tokens)
+        latencies.append(time.perf_counter() - started)
+
+
+async def _run(args: argparse.Namespace, tenants: int, batch_size: int) -> dict:
+    router = MultiClientMCPRouter(
+        InMemoryEventStore(), batch_size=batch_size, batch_wait_ms=args.batch_wait_ms
+    )
+    tokens = np.zeros(args.dim, dtype=float)
+    keys = []
+    for i in range(tenants):
+        await router.register_client(f"bench-key-{i}", quota=10**12)
+        key = next(reversed(router.pipelines))
+        await router.set_client_baseline(key, tokens)
+        keys.append(key)
+
+    latencies: list[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_tenant_loop(router, key, args.requests, tokens, latencies) for key in keys)
+    )
+    total = time.perf_counter() - started
+    ordered = sorted(latencies)
+    dispatcher = router.dispatcher
+    return {
+        "tenants": tenants,
+        "batch_size": batch_size,
+        "mean_batch": round(dispatcher.items_run / dispatcher.batches_run, 2) if dispatcher else 1.0,
+        "total_seconds": round(total, 3),
+        "requests_per_second": round(len(latencies) / total, 1) if total else None,
+        "p50_ms": round(statistics.median(ordered) * 1e3, 3),
+        "p99_ms": round(ordered[int(len(ordered) * 0.99) - 1] * 1e3, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", default="1,8,64,256", help="comma-separated tenant counts")
+    parser.add_argument("--batch-sizes", default="1,32", help="comma-separated micro-batch sizes")
+    parser.add_argument("--batch-wait-ms", type=float, default=2.0)
+    parser.add_argument("--requests", type=int, default=20, help="requests per tenant")
+    parser.add_argument("--dim", type=int, default=4096, help="tokens per request")
+    args = parser.parse_args()
+
+    os.environ.setdefault("A2A_ROUTER_CORE", "numpy")
+    results = [
+        asyncio.run(_run(args, int(tenants), int(batch_size)))
+        for tenants in args.concurrency.split(",")
+        for batch_size in args.batch_sizes.split(",")
+    ]
+    print(json.dumps({"dim": args.dim, "requests_per_tenant": args.requests, "runs": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: app.security.oidc.verify_bearer_token against a local JWKS endpoint.
+
+Compares the previous per-call ``jwt.PyJWKClient`` path with the cached JWKS
+key set (distinct tokens, so every call checks a signature) and with the
+verified-token cache (one token reused). Reports verifications per second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.security import oidc
+
+ISSUER = "https://issuer.bench"
+AUDIENCE = "a2a-mcp"
+
+
+def _serve_jwks(private_key: rsa.RSAPrivateKey) -> tuple[ThreadingHTTPServer, str]:
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    body = json.dumps({"keys": [{**jwk, "kid": "bench", "use": "sig", "alg": "RS256"}]}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}/jwks"
+
+
+def _legacy_verify(token: str, jwks_url: str) -> dict:
+    signing_key = jwt.PyJWKClient(jwks_url).get_signing_key_from_jwt(token).key
+    return jwt.decode(token, signing_key, algorithms=["RS256"], audience=AUDIENCE, issuer=ISSUER)
+
+
+def _rate(verify, tokens: list[str]) -> float:
+    started = time.perf_counter()
+    for token in tokens:
+        verify(token)
+    return round(len(tokens) / (time.perf_counter() - started), 1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=500)
+    args = parser.parse_args()
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    httpd, jwks_url = _serve_jwks(private_key)
+    os.environ.update(OIDC_ISSUER=ISSUER, OIDC_AUDIENCE=AUDIENCE, OIDC_JWKS_URL=jwks_url)
+    claims = {"iss": ISSUER, "aud": AUDIENCE, "exp": int(time.time()) + 3600, "repository": "r", "actor": "a"}
+    tokens = [
+        jwt.encode({**claims, "jti": str(i)}, private_key, algorithm="RS256", headers={"kid": "bench"})
+        for i in range(args.tokens)
+    ]
+
+    try:
+        oidc.reset_oidc_caches()
+        results = {
+            "per_call_jwks_client": _rate(lambda t: _legacy_verify(t, jwks_url), tokens),
+            "cached_jwks": _rate(lambda t: oidc.verify_bearer_token(t, request_id="bench"), tokens),
+            "cached_token": _rate(
+                lambda _t: oidc.verify_bearer_token(tokens[0], request_id="bench"), tokens
+            ),
+        }
+        fetches = oidc.get_jwks_cache(jwks_url).fetch_count
+    finally:
+        httpd.shutdown()
+
+    print(json.dumps({"verifications_per_sec": results, "jwks_fetches": fetches, "tokens": args.tokens}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark: StateMachine persistence cost as plan history grows.
+
+Drives one long retry loop per mode against a fresh SQLite database and
+reports caller-side latency per transition (first/last window of
+``--window`` transitions), wall time until everything is durable, and the
+time to load the plan back. Compares:
+
+* ``sync_snapshot``: ``persistence_callback=storage.save_plan_state`` — a full
+  JSON snapshot to ``plan_states`` and the FSM ledger on the calling thread;
+* ``write_behind``: ``persistence_writer=PlanStateWriter`` — per-transition
+  deltas flushed in batches, a compacted checkpoint every
+  ``--checkpoint-every`` transitions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ.pop("DATABASE_URL", None)
+os.environ["DATABASE_MODE"] = "sqlite"
+os.environ["SQLITE_PATH"] = f"{_TMP.name}/plan_state_bench.db"
+
+from orchestrator import storage  # noqa: E402
+from orchestrator.plan_state_writer import PlanStateWriter  # noqa: E402
+from orchestrator.stateflow import PartialVerdict, StateMachine  # noqa: E402
+
+CYCLE = ("EXECUTION_COMPLETE", "VERDICT_PARTIAL", "RETRY_DISPATCHED")
+
+
+def _partial():
+    raise PartialVerdict()
+
+
+def _drive(sm: StateMachine, transitions: int) -> list[float]:
+    samples = []
+    for i in range(transitions):
+        if i == 0:
+            step = lambda: sm.trigger("OBJECTIVE_INGRESS")
+        elif i == 1:
+            step = lambda: sm.trigger("RUN_DISPATCHED")
+        elif CYCLE[(i - 2) % 3] == "VERDICT_PARTIAL":
+            step = lambda: sm.evaluate_apply_policy(_partial, cycle=i)
+        else:
+            step = lambda event=CYCLE[(i - 2) % 3]: sm.trigger(event, cycle=i)
+        started = time.perf_counter()
+        step()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _window_ms(samples: list[float]) -> float:
+    return round(sum(samples) / len(samples) * 1000, 3)
+
+
+def run(mode: str, args: argparse.Namespace) -> dict:
+    writer = None
+    if mode == "sync_snapshot":
+        sm = StateMachine(max_retries=10**9, persistence_callback=storage.save_plan_state)
+    else:
+        writer = PlanStateWriter(checkpoint_every=args.checkpoint_every)
+        sm = StateMachine(max_retries=10**9, persistence_writer=writer)
+    sm.plan_id = f"bench-{mode}"
+
+    started = time.perf_counter()
+    samples = _drive(sm, args.transitions)
+    caller_s = time.perf_counter() - started
+    if writer is not None:
+        writer.flush()
+    durable_s = time.perf_counter() - started
+
+    load_started = time.perf_counter()
+    loaded = storage.load_plan_state(sm.plan_id)
+    load_ms = (time.perf_counter() - load_started) * 1000
+    assert loaded is not None and len(loaded["history"]) == args.transitions
+
+    result = {
+        "transitions": args.transitions,
+        "first_window_ms_per_transition": _window_ms(samples[: args.window]),
+        "last_window_ms_per_transition": _window_ms(samples[-args.window:]),
+        "caller_wall_ms": round(caller_s * 1000, 1),
+        "durable_wall_ms": round(durable_s * 1000, 1),
+        "load_ms": round(load_ms, 1),
+    }
+    if writer is not None:
+        result["writer"] = writer.stats()
+        writer.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transitions", type=int, default=1500)
+    parser.add_argument("--window", type=int, default=100)
+    parser.add_argument("--checkpoint-every", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {mode: run(mode, args) for mode in ("sync_snapshot", "write_behind")}
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
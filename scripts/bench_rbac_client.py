@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Latency benchmark: RBAC permission checks against a local uvicorn gateway.
+
+Compares a session-less ``requests.post`` per check (the previous client), the
+pooled keep-alive client with caching disabled, the pooled async client and
+the decision cache after a prefetch. Reports p50/p99 per check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import requests
+import uvicorn
+
+from rbac.client import AsyncRBACClient, RBACClient
+from rbac.rbac_service import app
+
+TOKEN = os.getenv("RBAC_SECRET", "dev-secret-change-me")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_gateway(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def _percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+    return {"p50_us": round(pick(0.50), 1), "p99_us": round(pick(0.99), 1), "checks": len(samples)}
+
+
+def _time_sync(check, checks: int) -> dict:
+    samples = []
+    for _ in range(checks):
+        started = time.perf_counter()
+        assert check()
+        samples.append(time.perf_counter() - started)
+    return _percentiles(samples)
+
+
+async def _time_async(check, checks: int) -> dict:
+    samples = []
+    for _ in range(checks):
+        started = time.perf_counter()
+        assert await check()
+        samples.append(time.perf_counter() - started)
+    return _percentiles(samples)
+
+
+def _fresh_connection_check(base_url: str):
+    headers = {"Authorization": f"Bearer {TOKEN}"}
+
+    def check() -> bool:
+        r = requests.post(
+            f"{base_url}/agents/bench-agent/verify",
+            json={"agent_id": "bench-agent", "action": "run_pipeline"},
+            headers=headers,
+        )
+        return r.json()["allowed"]
+
+    return check
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--checks", type=int, default=2000)
+    args = parser.parse_args()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = _start_gateway(port)
+    results = {}
+    try:
+        with RBACClient(base_url, token=TOKEN, decision_ttl=0) as pooled:
+            pooled.onboard_agent("bench-agent", "Bench", "pipeline_operator")
+            results["fresh_connection"] = _time_sync(_fresh_connection_check(base_url), args.checks)
+            results["pooled_sync"] = _time_sync(
+                lambda: pooled.verify_permission("bench-agent", action="run_pipeline"), args.checks
+            )
+
+        async def run_async() -> None:
+            async with AsyncRBACClient(base_url, token=TOKEN, decision_ttl=0) as client:
+                results["pooled_async"] = await _time_async(
+                    lambda: client.verify_permission("bench-agent", action="run_pipeline"), args.checks
+                )
+
+        asyncio.run(run_async())
+
+        with RBACClient(base_url, token=TOKEN) as cached:
+            cached.prefetch("bench-agent", actions=["run_pipeline"])
+            results["cached"] = _time_sync(
+                lambda: cached.verify_permission("bench-agent", action="run_pipeline"), args.checks
+            )
+    finally:
+        server.should_exit = True
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark telemetry persistence: per-event commits versus the write-behind sink."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from orchestrator.telemetry_service import TelemetryService
+from orchestrator.telemetry_sink import TelemetrySink
+from schemas.database import Base
+
+
+def _run(service: TelemetryService, events: int) -> float:
+    started = time.perf_counter()
+    for i in range(events):
+        service.log_event(
+            "orchestrator",
+            "step",
+            input_embedding=[0.1] * 16,
+            output_embedding=[0.2] * 16,
+            metadata={"i": i},
+            duration_ms=1.0,
+        )
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    parser.add_argument("--database-url", help="SQLAlchemy URL (defaults to a temporary SQLite file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for mode in ("inline", "write_behind"):
+            url = args.database_url or f"sqlite:///{Path(tmp) / f'{mode}.db'}"
+            engine = create_engine(url)
+            Base.metadata.create_all(engine)
+            session = sessionmaker(bind=engine)()
+
+            sink = None
+            if mode == "write_behind":
+                sink = TelemetrySink.from_session(
+                    session,
+                    capacity=args.events,
+                    batch_size=args.batch_size,
+                    flush_interval=args.flush_interval,
+                )
+            service = TelemetryService(session, sink=sink)
+            started = time.perf_counter()
+            enqueue_seconds = _run(service, args.events)
+            service.flush()
+            drained_seconds = time.perf_counter() - started
+            service.close()
+            session.close()
+            engine.dispose()
+
+            results[mode] = {
+                "request_path_seconds": round(enqueue_seconds, 3),
+                "events_per_second": round(args.events / enqueue_seconds, 1),
+                "drained_seconds": round(drained_seconds, 3),
+                "sink": sink.stats() if sink else None,
+            }
+
+    speedup = results["write_behind"]["events_per_second"] / results["inline"]["events_per_second"]
+    print(json.dumps({"events": args.events, **results, "speedup": round(speedup, 2)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import hashlib
 import hmac
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Protocol
+from typing import Any, Callable, Dict, Protocol, Sequence
 from uuid import uuid4
 
 import numpy as np
@@ -12,7 +14,6 @@ from app.mcp_tooling import TELEMETRY
 
 from drift_suite.drift_metrics import ks_statistic
 
-<<<<<<< HEAD
 
 @dataclass
 class LightweightMCPResult:
@@ -54,12 +55,40 @@ class DeterministicMCPCore:
             },
             execution_hash=execution_hash,
         )
-=======
-try:  # pragma: no cover - import guarded for lightweight test environments
-    import torch
-except ModuleNotFoundError:  # pragma: no cover
-    torch = None
->>>>>>> origin/main
+
+    def run_batch(self, embeddings: Sequence[np.ndarray]) -> list[LightweightMCPResult]:
+        """Process several embeddings in one stacked pass; same results as per-call."""
+        if not embeddings:
+            return []
+        sources = [np.asarray(e, dtype=float).ravel() for e in embeddings]
+        sources = [s if s.size else np.zeros(1, dtype=float) for s in sources]
+
+        expanded = np.stack([np.resize(s, self.hidden_dim * 8) for s in sources])
+        features = expanded.reshape(len(sources), self.hidden_dim, 8).mean(axis=2)
+        for row in features:
+            norm = np.linalg.norm(row)
+            if norm > 0:
+                row /= norm
+
+        role_logits = np.stack(
+            [np.resize(row, self.n_roles * 4) for row in features]
+        ).reshape(len(sources), self.n_roles, 4).mean(axis=2)
+        role_logits = role_logits - np.max(role_logits, axis=1, keepdims=True)
+        role_exp = np.exp(role_logits)
+        arbitration = role_exp / np.clip(np.sum(role_exp, axis=1, keepdims=True), 1e-12, None)
+
+        return [
+            LightweightMCPResult(
+                processed_embedding=row.reshape(1, -1),
+                arbitration_scores=scores,
+                protocol_features={
+                    "similarity_features": np.resize(row, 64).tolist(),
+                    "feature_norm": float(np.linalg.norm(source)),
+                },
+                execution_hash=hashlib.sha256(row.tobytes()).hexdigest(),
+            )
+            for row, scores, source in zip(features, arbitration, sources)
+        ]
 
 
 class ClientNotFound(KeyError):
@@ -98,6 +127,12 @@ class EventStore(Protocol):
     async def get_execution(self, tenant_id: str, execution_id: str) -> list[dict[str, Any]]: ...
 
 
+class BatchEventStore(EventStore, Protocol):
+    """Store that can commit several events for one tenant in a single write."""
+
+    async def append_events(self, tenant_id: str, events: Sequence[dict[str, Any]]) -> None: ...
+
+
 class InMemoryEventStore:
     """Simple async-compatible event store for local execution and tests."""
 
@@ -114,6 +149,13 @@ class InMemoryEventStore:
         key = (tenant_id, execution_id)
         self._events.setdefault(key, []).append({"state": state, "payload": payload})
 
+    async def append_events(self, tenant_id: str, events: Sequence[dict[str, Any]]) -> None:
+        for event in events:
+            key = (tenant_id, event["execution_id"])
+            self._events.setdefault(key, []).append(
+                {"state": event["state"], "payload": event["payload"]}
+            )
+
     async def get_execution(self, tenant_id: str, execution_id: str) -> list[dict[str, Any]]:
         return list(self._events.get((tenant_id, execution_id), []))
 
@@ -122,14 +164,28 @@ class ClientTokenPipe:
     """Bifurcated pipeline that isolates token transformations per tenant."""
 
     CONTAMINATION_THRESHOLD = 0.10
+    PROJECTION_CACHE_SIZE = 8
 
     def __init__(self, store: EventStore, ctx: ClientContext) -> None:
         self.store = store
         self.ctx = ctx
         self._tokens_processed = 0
         self._seen_hash_fingerprints: dict[str, tuple[int, float]] = {}
+        self._projections: OrderedDict[tuple[int, ...], np.ndarray] = OrderedDict()
+        self._baseline: np.ndarray | None = None
 
     async def ingress(self, raw_tokens: np.ndarray) -> np.ndarray:
+        namespaced, event = self.stage_ingress(raw_tokens)
+        await self._append_events([event])
+        return namespaced
+
+    def stage_ingress(self, raw_tokens: np.ndarray) -> tuple[np.ndarray, dict[str, Any]]:
+        """Project tokens into the tenant namespace; return the ingress event unwritten.
+
+        Callers pass the event to ``egress`` so ingress, witness and
+        MCP_PROCESSED are committed together, or to ``commit_events`` if
+        inference fails before egress.
+        """
         raw_tokens = np.asarray(raw_tokens, dtype=float)
         self._enforce_quota(raw_tokens.size)
         namespaced = self._namespace_embedding(raw_tokens)
@@ -142,16 +198,23 @@ class ClientTokenPipe:
         )
         self._check_hash_anomaly(stage="namespace_projection", embedding=namespaced, embedding_hash=embedding_hash)
 
-        await self.store.append_event(
-            tenant_id=self.ctx.tenant_id,
-            execution_id=f"ingress-{uuid4()}",
-            state="TOKEN_INGRESS",
-            payload={"embedding_hash": embedding_hash, "token_count": int(raw_tokens.size)},
-        )
-        return namespaced
+        event = {
+            "execution_id": f"ingress-{uuid4()}",
+            "state": "TOKEN_INGRESS",
+            "payload": {"embedding_hash": embedding_hash, "token_count": int(raw_tokens.size)},
+        }
+        return namespaced, event
 
-    async def egress(self, mcp_result: Any) -> Dict[str, Any]:
-        """Client-specific formatting + contamination verification"""
+    async def egress(
+        self,
+        mcp_result: Any,
+        staged_events: Sequence[dict[str, Any]] = (),
+    ) -> Dict[str, Any]:
+        """Client-specific formatting + contamination verification
+
+        ``staged_events`` (e.g. from ``stage_ingress``) are committed in the
+        same batch as the witness and MCP_PROCESSED events.
+        """
         processed_embedding_np = _to_numpy(mcp_result.processed_embedding).reshape(-1)
         embedding_hash = _array_hash(processed_embedding_np)
 
@@ -174,11 +237,12 @@ class ClientTokenPipe:
         drift = self._compute_drift(baseline, processed_embedding_np)
 
         if drift > ClientTokenPipe.CONTAMINATION_THRESHOLD:
+            await self._append_events(staged_events)
             await self._quarantine_pipeline(drift)
             raise ContaminationError(f"Drift violation: {drift:.4f}")
 
         # 2. WITNESSING AND SIGNING
-        witness_hash = await self._witness_result(processed_embedding_np)
+        witness_hash, witness_event = self._witness_result(processed_embedding_np)
 
         # 3. CLIENT-SPECIFIC FORMATING
         client_result = {
@@ -193,22 +257,51 @@ class ClientTokenPipe:
         }
 
         # 4. EVENT STORE COMMIT (client namespace)
-        await self.store.append_event(
-            tenant_id=self.ctx.tenant_id,
-            execution_id=f"mcp-{uuid4().hex[:8]}",
-            state="MCP_PROCESSED",
-            payload={
+        processed_event = {
+            "execution_id": f"mcp-{uuid4().hex[:8]}",
+            "state": "MCP_PROCESSED",
+            "payload": {
                 "mcp_result_hash": mcp_result.execution_hash,
                 "drift_score": float(drift),
                 "witness_hash": witness_hash,
             },
-        )
+        }
+        await self._append_events([*staged_events, witness_event, processed_event])
 
         return client_result
 
+    async def commit_events(self, events: Sequence[dict[str, Any]]) -> None:
+        """Write staged events on their own, e.g. when the request fails before egress."""
+        await self._append_events(events)
+
+    def invalidate_baseline(self) -> None:
+        """Drop the cached baseline so the next egress reloads it from the store."""
+        self._baseline = None
+
+    async def _append_events(self, events: Sequence[dict[str, Any]]) -> None:
+        if not events:
+            return
+        append_events = getattr(self.store, "append_events", None)
+        if append_events is not None:
+            await append_events(self.ctx.tenant_id, events)
+            return
+        for event in events:
+            await self.store.append_event(tenant_id=self.ctx.tenant_id, **event)
+
     def _namespace_embedding(self, embedding: np.ndarray) -> np.ndarray:
-        projection = _tenant_projection(self.ctx.tenant_id, embedding.shape)
-        return embedding * projection
+        return embedding * self._projection(embedding.shape)
+
+    def _projection(self, shape: tuple[int, ...]) -> np.ndarray:
+        projection = self._projections.get(shape)
+        if projection is None:
+            projection = _tenant_projection(self.ctx.tenant_id, shape)
+            projection.setflags(write=False)
+            self._projections[shape] = projection
+            if len(self._projections) > self.PROJECTION_CACHE_SIZE:
+                self._projections.popitem(last=False)
+        else:
+            self._projections.move_to_end(shape)
+        return projection
 
     def _enforce_quota(self, new_tokens: int) -> None:
         projected_total = self._tokens_processed + new_tokens
@@ -219,12 +312,17 @@ class ClientTokenPipe:
         self._tokens_processed = projected_total
 
     async def _load_client_baseline(self) -> np.ndarray:
+        if self._baseline is not None:
+            return self._baseline
+
         events = await self.store.get_execution(self.ctx.tenant_id, "baseline")
         if not events:
-            return np.zeros(1, dtype=float)
-
-        baseline = events[-1]["payload"].get("embedding", [0.0])
-        return np.asarray(baseline, dtype=float)
+            baseline = np.zeros(1, dtype=float)
+        else:
+            baseline = np.asarray(events[-1]["payload"].get("embedding", [0.0]), dtype=float)
+        baseline.setflags(write=False)
+        self._baseline = baseline
+        return baseline
 
     def _compute_drift(self, baseline: np.ndarray, current: np.ndarray) -> float:
         baseline = np.asarray(baseline, dtype=float).ravel()
@@ -237,7 +335,7 @@ class ClientTokenPipe:
 
         return ks_statistic(baseline, current)
 
-    async def _witness_result(self, result: np.ndarray) -> str:
+    def _witness_result(self, result: np.ndarray) -> tuple[str, dict[str, Any]]:
         message = result.astype(float).tobytes()
         key = self.ctx.api_key_hash.encode("utf-8")
         digest = hmac.new(key=key, msg=message, digestmod=hashlib.sha256).hexdigest()
@@ -247,13 +345,12 @@ class ClientTokenPipe:
             token_count=int(result.size),
             embedding_hash=digest[:16],
         )
-        await self.store.append_event(
-            tenant_id=self.ctx.tenant_id,
-            execution_id="witness",
-            state="RESULT_WITNESSED",
-            payload={"witness_hash": digest},
-        )
-        return digest
+        event = {
+            "execution_id": "witness",
+            "state": "RESULT_WITNESSED",
+            "payload": {"witness_hash": digest},
+        }
+        return digest, event
 
     async def _quarantine_pipeline(self, drift: float) -> None:
         # Placeholder for quarantine logic
@@ -282,18 +379,108 @@ class ClientTokenPipe:
             self._seen_hash_fingerprints[embedding_hash] = fingerprint
 
 
+class MicroBatchDispatcher:
+    """Coalesces concurrent core calls into batches.
+
+    Submissions are collected until ``max_batch_size`` is reached or
+    ``max_wait_ms`` has passed since the first pending one, then run through
+    ``run_batch`` once; each caller receives its own result.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[np.ndarray]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches_run = 0
+        self.items_run = 0
+        self._pending: list[tuple[np.ndarray, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def submit(self, item: np.ndarray) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            try:
+                results = list(self.run_batch([item for item, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"run_batch returned {len(results)} results for {len(batch)} inputs"
+                    )
+            except BaseException as exc:  # propagate to every caller in the batch
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                if not isinstance(exc, Exception):
+                    for _, future in self._pending:
+                        if not future.done():
+                            future.set_exception(exc)
+                    self._pending.clear()
+                    raise
+            else:
+                self.batches_run += 1
+                self.items_run += len(batch)
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            if len(self._pending) < self.max_batch_size:
+                break
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_wait_ms / 1000.0, self._flush
+            )
+
+
 class MultiClientMCPRouter:
-    """Routes client-specific ingress/egress around a shared MCP core."""
+    """Routes client-specific ingress/egress around a shared MCP core.
 
-    def __init__(self, store: EventStore) -> None:
+    With ``batch_size > 1`` concurrent requests are micro-batched through the
+    core; ingress, drift and witness checks stay per tenant. Defaults come
+    from ``A2A_ROUTER_BATCH_SIZE`` and ``A2A_ROUTER_BATCH_WAIT_MS``.
+    """
+
+    def __init__(
+        self,
+        store: EventStore,
+        *,
+        batch_size: int | None = None,
+        batch_wait_ms: float | None = None,
+    ) -> None:
         self.store = store
         self.pipelines: dict[str, ClientTokenPipe] = {}
         self.handshake_registry: dict[str, dict[str, Any]] = {}
         self.mcp_core: Any | None = None
+        if batch_size is None:
+            batch_size = int(os.getenv("A2A_ROUTER_BATCH_SIZE", "1"))
+        if batch_wait_ms is None:
+            batch_wait_ms = float(os.getenv("A2A_ROUTER_BATCH_WAIT_MS", "2.0"))
+        self.dispatcher: MicroBatchDispatcher | None = (
+            MicroBatchDispatcher(self._infer_batch, batch_size, batch_wait_ms)
+            if batch_size > 1
+            else None
+        )
 
     def _get_mcp_core(self) -> Any:
         if self.mcp_core is None:
-<<<<<<< HEAD
             if os.getenv("A2A_ROUTER_CORE", "numpy").strip().lower() == "torch":
                 import torch
                 from mcp_core import MCPCore
@@ -301,11 +488,6 @@ class MultiClientMCPRouter:
                 self.mcp_core = ("torch", torch, MCPCore())
             else:
                 self.mcp_core = ("numpy", None, DeterministicMCPCore())
-=======
-            from mcp_core import MCPCore
-
-            self.mcp_core = MCPCore()
->>>>>>> origin/main
         return self.mcp_core
 
     async def register_client(self, api_key: str, quota: int = 1_000_000) -> str:
@@ -333,31 +515,37 @@ class MultiClientMCPRouter:
             state="BASELINE_SET",
             payload={"embedding": np.asarray(baseline, dtype=float).ravel().tolist()},
         )
+        pipe.invalidate_baseline()
 
     async def process_request(self, client_key: str, tokens: np.ndarray) -> dict[str, Any]:
         pipe = self.pipelines.get(client_key)
         if pipe is None:
             raise ClientNotFound(f"Client {client_key} not registered")
-        if torch is None:
-            raise RuntimeError("torch is required to process MCP requests in multi-client router")
 
-        mcp_token = await pipe.ingress(np.asarray(tokens, dtype=float))
-<<<<<<< HEAD
+        mcp_token, ingress_event = pipe.stage_ingress(np.asarray(tokens, dtype=float))
+        try:
+            if self.dispatcher is not None:
+                mcp_result = await self.dispatcher.submit(mcp_token)
+            else:
+                mcp_result = self._infer_batch([mcp_token])[0]
+        except Exception:
+            # Inference failed: still record the ingress, as the drift-violation path does
+            await pipe.commit_events([ingress_event])
+            raise
+        return await pipe.egress(mcp_result, staged_events=[ingress_event])
+
+    def _infer_batch(self, tokens: list[np.ndarray]) -> list[Any]:
         core_kind, torch_module, core = self._get_mcp_core()
-
         if core_kind == "torch":
-            mcp_token_tensor = torch_module.from_numpy(_project_to_core_width(mcp_token)).float()
-            mcp_result = core(mcp_token_tensor)
-        else:
-            mcp_result = core(mcp_token)
-=======
-        mcp_core = self._get_mcp_core()
-
-        # Reshape to (1, 4096) for the MCPCore model
-        mcp_token_tensor = torch.from_numpy(mcp_token.reshape(1, -1)).float()
-        mcp_result = mcp_core(mcp_token_tensor)
->>>>>>> origin/main
-        return await pipe.egress(mcp_result)
+            # MCPCore takes a single (1, 4096) embedding per forward pass
+            return [
+                core(torch_module.from_numpy(_project_to_core_width(token)).float())
+                for token in tokens
+            ]
+        run_batch = getattr(core, "run_batch", None)
+        if run_batch is not None and len(tokens) > 1:
+            return run_batch(tokens)
+        return [core(token) for token in tokens]
 
     def register_handshake(
         self,
@@ -7,9 +7,9 @@ import json
 import os
 import sys
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List
 from uuid import uuid4
@@ -52,8 +52,12 @@ def _canonical_json(payload: dict[str, Any]) -> str:
     return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
-@lru_cache(maxsize=8)
-def _projection_matrix(source_dim: int, target_dim: int) -> tuple[np.ndarray, str]:
+DENSE_PROJECTION_DIMS = (16, 768)
+PROJECTION_CACHE_DIR_ENV = "A2A_PROJECTION_CACHE_DIR"
+_HASH_EXPAND_CACHE_SIZE = 64
+
+
+def _generate_projection_matrix(source_dim: int, target_dim: int) -> tuple[np.ndarray, str]:
     seed_text = f"a2a-manifold-v1:{source_dim}->{target_dim}"
     seed_hash = _sha256_text(seed_text)
     seed = int(seed_hash[:16], 16) % (2**32)
@@ -63,6 +67,102 @@ def _projection_matrix(source_dim: int, target_dim: int) -> tuple[np.ndarray, st
     return matrix, seed_hash[:16]
 
 
+def _generate_hash_expand_table(source_dim: int, target_dim: int) -> tuple[np.ndarray, np.ndarray]:
+    indices = np.empty(target_dim, dtype=np.intp)
+    signs = np.empty(target_dim, dtype=np.float64)
+    for i in range(target_dim):
+        seed = _sha256_text(f"hash-expand:{source_dim}:{i}")
+        indices[i] = int(seed[:8], 16) % source_dim
+        signs[i] = -1.0 if int(seed[8], 16) % 2 else 1.0
+    return indices, signs
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+class ProjectionCache:
+    """Process-wide, size-keyed cache of read-only projection tables.
+
+    Dense seeded matrices are generated once per ``(source_dim, target_dim)``.
+    When ``cache_dir`` (or ``A2A_PROJECTION_CACHE_DIR``) is set they are
+    persisted as ``.npy`` files and memory-mapped read-only, so worker
+    processes on the same host share pages instead of each holding a copy.
+    Hash-expand index/sign tables are kept in a small LRU keyed by size.
+    """
+
+    def __init__(self, cache_dir: Path | str | None = None) -> None:
+        configured = cache_dir if cache_dir is not None else os.getenv(PROJECTION_CACHE_DIR_ENV)
+        self._cache_dir = Path(configured) if configured else None
+        self._lock = threading.Lock()
+        self._dense: dict[tuple[int, int], tuple[np.ndarray, str]] = {}
+        self._hash_expand: OrderedDict[tuple[int, int], tuple[np.ndarray, np.ndarray]] = OrderedDict()
+
+    def dense(self, source_dim: int, target_dim: int) -> tuple[np.ndarray, str]:
+        key = (source_dim, target_dim)
+        cached = self._dense.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            cached = self._dense.get(key)
+            if cached is None:
+                cached = self._load_or_generate_dense(source_dim, target_dim)
+                self._dense[key] = cached
+            return cached
+
+    def hash_expand(self, source_dim: int, target_dim: int) -> tuple[np.ndarray, np.ndarray]:
+        key = (source_dim, target_dim)
+        with self._lock:
+            cached = self._hash_expand.get(key)
+            if cached is not None:
+                self._hash_expand.move_to_end(key)
+                return cached
+        indices, signs = _generate_hash_expand_table(source_dim, target_dim)
+        table = (_read_only(indices), _read_only(signs))
+        with self._lock:
+            self._hash_expand[key] = table
+            while len(self._hash_expand) > _HASH_EXPAND_CACHE_SIZE:
+                self._hash_expand.popitem(last=False)
+        return table
+
+    def warm(self, target_dim: int = TARGET_EMBEDDING_DIM) -> None:
+        """Precompute the dense matrices used by ``_project_to_target``."""
+        for source_dim in DENSE_PROJECTION_DIMS:
+            self.dense(source_dim, target_dim)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dense.clear()
+            self._hash_expand.clear()
+
+    def _load_or_generate_dense(self, source_dim: int, target_dim: int) -> tuple[np.ndarray, str]:
+        seed = _sha256_text(f"a2a-manifold-v1:{source_dim}->{target_dim}")[:16]
+        if self._cache_dir is None:
+            matrix, seed = _generate_projection_matrix(source_dim, target_dim)
+            return _read_only(matrix), seed
+
+        path = self._cache_dir / f"projection-{source_dim}x{target_dim}-{seed}.npy"
+        if path.exists():
+            mapped = np.load(path, mmap_mode="r")
+            if mapped.shape == (target_dim, source_dim) and mapped.dtype == np.float64:
+                return mapped, seed
+
+        matrix, seed = _generate_projection_matrix(source_dim, target_dim)
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{uuid4().hex[:8]}.tmp.npy")
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, path)
+        return np.load(path, mmap_mode="r"), seed
+
+
+_PROJECTION_CACHE = ProjectionCache()
+
+
+def _projection_matrix(source_dim: int, target_dim: int) -> tuple[np.ndarray, str]:
+    return _PROJECTION_CACHE.dense(source_dim, target_dim)
+
+
 def _deterministic_text_embedding(text: str, dim: int = TARGET_EMBEDDING_DIM) -> np.ndarray:
     digest = hashlib.sha256(text.encode("utf-8")).digest()
     embedding = np.zeros(dim, dtype=np.float64)
@@ -75,20 +175,41 @@ def _deterministic_text_embedding(text: str, dim: int = TARGET_EMBEDDING_DIM) ->
     return embedding
 
 
+def _normalize_rows(batch: np.ndarray) -> np.ndarray:
+    # Per-row np.linalg.norm keeps the same reduction as the single-vector path.
+    norms = np.array([np.linalg.norm(row) for row in batch], dtype=np.float64)
+    norms[norms == 0] = 1.0
+    return batch / norms[:, None]
+
+
 def _hash_expand_projection(vector: np.ndarray, target_dim: int) -> tuple[np.ndarray, str]:
     source = np.asarray(vector, dtype=np.float64).ravel()
-    output = np.zeros(target_dim, dtype=np.float64)
-    for i in range(target_dim):
-        seed = _sha256_text(f"hash-expand:{source.size}:{i}")
-        index = int(seed[:8], 16) % source.size
-        sign = -1.0 if int(seed[8], 16) % 2 else 1.0
-        output[i] = source[index] * sign
+    indices, signs = _PROJECTION_CACHE.hash_expand(int(source.size), target_dim)
+    output = source[indices] * signs
     norm = np.linalg.norm(output)
     if norm > 0:
         output = output / norm
     return output, "hash-expand-v1"
 
 
+def _projection_metadata(source_dim: int) -> ProjectionMetadata | None:
+    if source_dim == TARGET_EMBEDDING_DIM:
+        return None
+    if source_dim in DENSE_PROJECTION_DIMS:
+        return ProjectionMetadata(
+            source_dim=source_dim,
+            target_dim=TARGET_EMBEDDING_DIM,
+            method="dense-seeded-projection",
+            seed=_projection_matrix(source_dim, TARGET_EMBEDDING_DIM)[1],
+        )
+    return ProjectionMetadata(
+        source_dim=source_dim,
+        target_dim=TARGET_EMBEDDING_DIM,
+        method="hash-expand-v1",
+        seed=_sha256_text(f"{source_dim}->{TARGET_EMBEDDING_DIM}")[:16],
+    )
+
+
 def _project_to_target(vector: np.ndarray) -> tuple[np.ndarray, ProjectionMetadata | None]:
     source = np.asarray(vector, dtype=np.float64).ravel()
     source_dim = int(source.size)
@@ -98,28 +219,44 @@ def _project_to_target(vector: np.ndarray) -> tuple[np.ndarray, ProjectionMetada
     if source_dim == TARGET_EMBEDDING_DIM:
         return source, None
 
-    if source_dim in (16, 768):
-        matrix, seed = _projection_matrix(source_dim, TARGET_EMBEDDING_DIM)
+    if source_dim in DENSE_PROJECTION_DIMS:
+        matrix, _ = _projection_matrix(source_dim, TARGET_EMBEDDING_DIM)
         projected = matrix @ source
         norm = np.linalg.norm(projected)
         if norm > 0:
             projected = projected / norm
-        metadata = ProjectionMetadata(
-            source_dim=source_dim,
-            target_dim=TARGET_EMBEDDING_DIM,
-            method="dense-seeded-projection",
-            seed=seed,
-        )
-        return projected, metadata
+        return projected, _projection_metadata(source_dim)
 
-    projected, method = _hash_expand_projection(source, TARGET_EMBEDDING_DIM)
-    metadata = ProjectionMetadata(
-        source_dim=source_dim,
-        target_dim=TARGET_EMBEDDING_DIM,
-        method=method,
-        seed=_sha256_text(f"{source_dim}->{TARGET_EMBEDDING_DIM}")[:16],
-    )
-    return projected, metadata
+    projected, _ = _hash_expand_projection(source, TARGET_EMBEDDING_DIM)
+    return projected, _projection_metadata(source_dim)
+
+
+def project_batch_to_target(tokens: np.ndarray) -> tuple[np.ndarray, ProjectionMetadata | None]:
+    """Project ``N`` token vectors of equal width to the manifold in one pass.
+
+    Dense projections run as a single matmul; rows agree with
+    ``_project_to_target`` to BLAS reduction-order tolerance (~1e-15 relative).
+    Hash-expand rows are bit-identical to the single-vector path.
+    """
+    batch = np.asarray(tokens, dtype=np.float64)
+    if batch.ndim == 1:
+        batch = batch[np.newaxis, :]
+    elif batch.ndim > 2:
+        batch = batch.reshape(batch.shape[0], -1)
+    source_dim = int(batch.shape[1])
+    if source_dim < 1:
+        raise ValueError("Input token vectors must contain at least one element.")
+
+    if source_dim == TARGET_EMBEDDING_DIM:
+        return batch, None
+
+    if source_dim in DENSE_PROJECTION_DIMS:
+        matrix, _ = _projection_matrix(source_dim, TARGET_EMBEDDING_DIM)
+        projected = batch @ matrix.T
+    else:
+        indices, signs = _PROJECTION_CACHE.hash_expand(source_dim, TARGET_EMBEDDING_DIM)
+        projected = batch[:, indices] * signs
+    return _normalize_rows(projected), _projection_metadata(source_dim)
 
 
 @dataclass
@@ -148,6 +285,7 @@ class RuntimeScenarioService:
         self._records: dict[str, ExecutionRecord] = {}
         default_path = Path(os.getenv("A2A_FORENSIC_NDJSON", "/tmp/a2a_runtime_scenario_audit.ndjson"))
         self._forensic_path = forensic_path or default_path
+        _PROJECTION_CACHE.warm()
 
     @staticmethod
     def hash_payload(prev_hash: str | None, payload: dict[str, Any]) -> str:
@@ -1,6 +1,11 @@
 import asyncio
 import inspect
 
+import pytest
+
+# Shared helpers in tests/utils.py assert; keep pytest's detailed failure output.
+pytest.register_assert_rewrite("tests.utils")
+
 
 def pytest_pyfunc_call(pyfuncitem):
     testfunction = pyfuncitem.obj
@@ -8,3 +13,18 @@ def pytest_pyfunc_call(pyfuncitem):
         asyncio.run(testfunction(**pyfuncitem.funcargs))
         return True
     return None
+
+
+class FakeClock:
+    """Settable stand-in for ``time.monotonic``; advance it with ``clock.now += seconds``."""
+
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from orchestrator.action_scheduler import ActionDAGError, build_action_dag, run_action_dag
+from orchestrator.stateflow import State, StateMachine
+from schemas.project_plan import PlanAction
+
+
+def _action(action_id: str, **metadata: str) -> PlanAction:
+    return PlanAction(action_id=action_id, title=action_id, instruction=action_id, metadata=metadata)
+
+
+def test_dag_chains_stages_of_a_task_and_honours_explicit_dependencies() -> None:
+    actions = [
+        _action("a1", original_task="A"),
+        _action("b1", original_task="B"),
+        _action("a2", original_task="A"),
+        _action("free"),
+        _action("join", depends_on="a2, b1"),
+    ]
+
+    assert build_action_dag(actions) == {
+        "a1": (),
+        "b1": (),
+        "a2": ("a1",),
+        "free": (),
+        "join": ("a2", "b1"),
+    }
+
+
+def test_dag_rejects_unknown_and_cyclic_dependencies() -> None:
+    with pytest.raises(ActionDAGError):
+        build_action_dag([_action("a", depends_on="missing")])
+    with pytest.raises(ActionDAGError):
+        build_action_dag([_action("a", depends_on="b"), _action("b", depends_on="a")])
+
+
+@pytest.mark.asyncio
+async def test_run_action_dag_respects_order_limit_and_returns_blueprint_order() -> None:
+    actions = [_action(f"{task}{stage}", original_task=task) for task in "ABCD" for stage in (1, 2)]
+    finished: list[str] = []
+    running = 0
+    peak = 0
+
+    async def worker(action: PlanAction) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02 if action.action_id.startswith("A") else 0.005)
+        running -= 1
+        finished.append(action.action_id)
+        return action.action_id.lower()
+
+    results = await run_action_dag(actions, build_action_dag(actions), worker, max_concurrency=3)
+
+    assert results == [a.action_id.lower() for a in actions]
+    assert peak == 3
+    for task in "ABCD":
+        assert finished.index(f"{task}1") < finished.index(f"{task}2")
+
+
+@pytest.mark.asyncio
+async def test_run_action_dag_cancels_remaining_work_on_failure() -> None:
+    actions = [_action("boom"), _action("slow"), _action("after", depends_on="boom")]
+    started: list[str] = []
+
+    async def worker(action: PlanAction) -> None:
+        started.append(action.action_id)
+        if action.action_id == "boom":
+            raise RuntimeError("coder crashed")
+        await asyncio.sleep(10)
+
+    with pytest.raises(RuntimeError, match="coder crashed"):
+        await asyncio.wait_for(run_action_dag(actions, build_action_dag(actions), worker, 4), timeout=2)
+    assert "after" not in started
+
+
+def test_state_machine_shards_scope_plan_id_without_persisting() -> None:
+    snapshots = []
+    parent = StateMachine(max_retries=5, persistence_callback=lambda plan_id, snap: snapshots.append(plan_id))
+    parent.plan_id = "plan-1"
+
+    shard = parent.spawn_shard("a1")
+    shard.trigger("OBJECTIVE_INGRESS")
+
+    assert shard.max_retries == 5
+    assert shard.plan_id == "plan-1:a1"
+    assert shard.state == State.SCHEDULED and parent.state == State.IDLE
+    assert snapshots == []
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.services.auth_broker import (
+    A2AAuthBroker,
+    AuthBrokerError,
+    ClaimPolicyValidator,
+    GeminiServiceAccountTokenProvider,
+)
+from rbac.token_service import RBACJWTIssuer
+
+SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+
+class _TokenEndpoint:
+    """Local OAuth token endpoint that counts (slow) exchanges."""
+
+    def __init__(self, expires_in: int = 3600, delay: float = 0.05) -> None:
+        self.requests = 0
+        self.expires_in = expires_in
+        self.delay = delay
+        self.fail = False
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+                jwt.decode(form["assertion"][0], options={"verify_signature": False})
+                endpoint.requests += 1
+                time.sleep(endpoint.delay)
+                if endpoint.fail:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps(
+                    {
+                        "access_token": f"ya29.token-{endpoint.requests}",
+                        "token_type": "Bearer",
+                        "expires_in": endpoint.expires_in,
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/token"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def token_endpoint(monkeypatch):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    monkeypatch.setenv(
+        "GOOGLE_SERVICE_ACCOUNT_JSON",
+        json.dumps({"client_email": "sa@test.iam.gserviceaccount.com", "private_key": pem}),
+    )
+    endpoint = _TokenEndpoint()
+    yield endpoint
+    endpoint.httpd.shutdown()
+
+
+def test_tokens_are_cached_per_scope_set_until_expiry(token_endpoint, clock) -> None:
+    provider = GeminiServiceAccountTokenProvider(token_endpoint=token_endpoint.url, clock=clock)
+
+    first = provider.get_access_token(scopes=SCOPES)
+    clock.now += 1000
+    again = provider.get_access_token(scopes=list(reversed(SCOPES * 2)))
+    other = provider.get_access_token(scopes=SCOPES + ["openid"])
+
+    assert again.access_token == first.access_token
+    assert again.expires_in == 2600
+    assert other.access_token != first.access_token
+    assert token_endpoint.requests == 2
+
+    clock.now += 2600
+    assert provider.get_access_token(scopes=SCOPES).access_token != first.access_token
+    stats = provider.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["refreshes"]) == (1, 3, 3)
+
+
+def test_concurrent_misses_share_one_exchange(token_endpoint) -> None:
+    provider = GeminiServiceAccountTokenProvider(token_endpoint=token_endpoint.url)
+    token_endpoint.delay = 0.3
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(provider.get_access_token(scopes=SCOPES)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert token_endpoint.requests == 1
+    assert len({token.access_token for token in results}) == 1
+    assert provider.cache_stats()["coalesced"] == 7
+
+
+def test_refresh_after_a_racing_flight_reuses_its_token(token_endpoint, clock) -> None:
+    provider = GeminiServiceAccountTokenProvider(token_endpoint=token_endpoint.url, clock=clock)
+    key = tuple(sorted(SCOPES))
+    first = provider.get_access_token(scopes=SCOPES)
+
+    # A caller that missed the cache just before that flight landed.
+    clock.now += 10
+    late = provider._refresh(key)
+
+    assert late.access_token == first.access_token
+    assert late.expires_in == first.expires_in - 10
+    assert token_endpoint.requests == 1
+    assert provider.cache_stats()["coalesced"] == 1
+
+
+def test_refresh_ahead_serves_cached_token_while_refreshing(token_endpoint, clock) -> None:
+    provider = GeminiServiceAccountTokenProvider(token_endpoint=token_endpoint.url, clock=clock)
+    first = provider.get_access_token(scopes=SCOPES)
+
+    clock.now += 3400  # inside the 300s refresh margin
+    assert provider.get_access_token(scopes=SCOPES).access_token == first.access_token
+    deadline = time.time() + 5
+    while token_endpoint.requests < 2 or provider._flights:
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+    refreshed = provider.get_access_token(scopes=SCOPES)
+    assert refreshed.access_token != first.access_token
+    assert provider.cache_stats()["background_refreshes"] == 1
+
+
+def test_failed_refresh_raises_and_is_counted(token_endpoint) -> None:
+    token_endpoint.fail = True
+    provider = GeminiServiceAccountTokenProvider(token_endpoint=token_endpoint.url)
+
+    with pytest.raises(AuthBrokerError):
+        provider.get_access_token(scopes=SCOPES)
+    assert provider.cache_stats()["refresh_failures"] == 1
+    assert provider.cache_stats()["cached_scope_sets"] == 0
+
+
+def test_async_exchange_reuses_cached_gemini_token(token_endpoint, monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    provider = GeminiServiceAccountTokenProvider(token_endpoint=token_endpoint.url)
+    broker = A2AAuthBroker(
+        validator=ClaimPolicyValidator(),
+        rbac_issuer=RBACJWTIssuer(secret="unit-secret-" * 4, issuer="i", audience="a"),
+        gemini_provider=provider,
+    )
+    request = {
+        "tenant_id": "tenant-a",
+        "client_id": "client-a",
+        "avatar_id": "avatar-a",
+        "requested_scopes": ["mcp:handshake"],
+        "requested_tools": [],
+        "ttl_seconds": 900,
+    }
+
+    async def exchange_many() -> list[dict]:
+        return await asyncio.gather(*(broker.aexchange(**request) for _ in range(5)))
+
+    results = asyncio.run(exchange_many())
+    sync_result = broker.exchange(**request)
+
+    assert token_endpoint.requests == 1
+    assert {r["gemini_token_fingerprint"] for r in results} == {sync_result["gemini_token_fingerprint"]}
@@ -0,0 +1,82 @@
+from context.window import ContextWindow
+
+
+def test_streaming_window_summarizes_each_evicted_turn_once() -> None:
+    window = ContextWindow(window_size=3, compression_threshold=3)
+    calls = []
+    original = window._create_summary
+
+    def counting_summary(turns):
+        calls.extend(t.turn_id for t in turns)
+        return original(turns)
+
+    window._create_summary = counting_summary
+    for i in range(10):
+        window.add_turn(f"message {i}")
+
+    assert calls == list(range(7))
+    assert window._all_turns == []
+    assert [t.turn_id for t in window._turns] == [7, 8, 9]
+    assert sum(node.turn_count for node in window._summary_nodes) == 7
+
+
+def test_streaming_summaries_stay_within_token_budget() -> None:
+    window = ContextWindow(window_size=4, summary_token_budget=30)
+    for i in range(500):
+        window.add_turn(f"turn {i} reported status nominal")
+
+    nodes = window._summary_nodes
+    assert sum(node.tokens for node in nodes) <= 30
+    assert sum(node.turn_count for node in nodes) == 496
+    assert len(nodes) <= 9  # at most one node per level
+
+
+def test_streaming_waits_for_compression_threshold() -> None:
+    window = ContextWindow(window_size=2, compression_threshold=5)
+    for i in range(4):
+        window.add_turn(f"message {i}")
+
+    assert window._compressed_summaries == []
+    assert [t.turn_id for t in window._deferred_turns] == [0, 1]
+
+    window.add_turn("message 4")
+    assert window._deferred_turns == []
+    assert sum(node.turn_count for node in window._summary_nodes) == 3
+    assert "message 0" in window.get_context()
+
+
+def test_get_context_is_cached_until_window_changes() -> None:
+    window = ContextWindow(window_size=2)
+    window.add_turn("first")
+    rendered = window.get_context()
+
+    assert window.get_context() is rendered
+
+    window.pin_artifact("spec", "max speed 155 mph")
+    updated = window.get_context()
+    assert updated is not rendered
+    assert "[spec] max speed 155 mph" in updated
+
+    window.add_turn("second")
+    assert "Agent (turn 1): second" in window.get_context()
+
+
+def test_streaming_keeps_pinned_turns_after_eviction() -> None:
+    window = ContextWindow(window_size=2)
+    window.add_turn("safety policy updated", pinned=True)
+    for i in range(5):
+        window.add_turn(f"routine {i}")
+
+    context = window.get_context()
+    assert "[pinned turn 0] safety policy updated" in context
+    assert window.get_json_context()["pinned_turns"][0]["agent"] == "safety policy updated"
+    assert all("safety policy" not in s for s in window._compressed_summaries)
+
+
+def test_legacy_mode_keeps_full_history() -> None:
+    window = ContextWindow(window_size=2, compression_threshold=3, streaming=False)
+    for i in range(4):
+        window.add_turn(f"message {i}")
+
+    assert len(window._all_turns) == 4
+    assert window._compressed_summaries[-1].startswith("[SUMMARY: 2 turns]")
@@ -0,0 +1,148 @@
+import random
+
+import pytest
+
+from judge.dmn_compiler import ConditionSyntaxError, parse_condition
+from judge.dmn_decision_engine import (
+    EXPRESSION_CONDITIONS,
+    DecisionOutcome,
+    DMNDecisionEngine,
+    DMNDecisionRule,
+    DMNHitPolicyViolation,
+    DMNTable,
+)
+from schemas.telemetry import DMNToken
+
+
+def _legacy_matches(rule, context) -> bool:
+    """The pre-compilation substring matcher, kept as a reference."""
+    if "critical_dtc" in context and context["critical_dtc"]:
+        if "critical" in rule.condition.lower():
+            return True
+    if "healing_loop_exhausted" in context and context["healing_loop_exhausted"]:
+        if "exhausted" in rule.condition.lower():
+            return True
+    if "structural_gap_count" in context:
+        if context["structural_gap_count"] > 3 and "gaps" in rule.condition.lower():
+            return True
+    return False
+
+
+def _legacy_evaluate(table, context):
+    for rule in sorted(table.rules, key=lambda r: r.priority, reverse=True):
+        if _legacy_matches(rule, context):
+            return rule.outcome, rule.name
+    return DecisionOutcome.PROCEED, "No specific rules matched, proceeding"
+
+
+def _random_context(rng: random.Random) -> dict:
+    context = {}
+    if rng.random() < 0.8:
+        context["critical_dtc"] = rng.random() < 0.3
+    if rng.random() < 0.8:
+        context["healing_loop_exhausted"] = rng.choice([True, False, 0, 1])
+    if rng.random() < 0.8:
+        context["structural_gap_count"] = rng.randint(0, 6)
+    context["retries_remaining"] = rng.randint(0, 3)
+    return context
+
+
+def _rule(rule_id, condition, outcome, priority=0):
+    return DMNDecisionRule(rule_id, rule_id, condition, outcome, priority)
+
+
+def test_compiled_tables_reproduce_legacy_outcomes() -> None:
+    engine = DMNDecisionEngine()
+    rng = random.Random(7)
+    contexts = [_random_context(rng) for _ in range(500)]
+
+    for table in engine.tables.values():
+        expected = [_legacy_evaluate(table, c) for c in contexts]
+        assert [table.evaluate(c) for c in contexts] == expected
+        assert table.evaluate_many(contexts) == expected
+
+
+def test_evaluate_many_matches_evaluate_token() -> None:
+    engine = DMNDecisionEngine()
+    tokens = [
+        DMNToken(
+            token_id=f"t{i}",
+            loose_thread_id=f"lt{i}",
+            vector=[0.0],
+            problem_statement="gap",
+            decision_criteria_input={"structural_gap_count": float(i % 6), "critical_dtc": float(i % 5 == 0)},
+        )
+        for i in range(30)
+    ]
+
+    batched = engine.evaluate_many(tokens)
+    single = [engine.evaluate_token(t) for t in tokens]
+
+    assert [o for o, _ in batched] == [o for o, _ in single]
+    assert [f["table_evaluations"] for _, f in batched] == [f["table_evaluations"] for _, f in single]
+    assert batched[0][0] == DecisionOutcome.TERMINATE
+    assert batched[4][0] == DecisionOutcome.ESCALATE_TO_MANUAL
+    assert batched[1][0] == DecisionOutcome.PROCEED
+
+
+def test_expression_conditions_and_hit_policies() -> None:
+    def table(policy):
+        t = DMNTable("t", "t", hit_policy=policy, condition_mode=EXPRESSION_CONDITIONS)
+        t.add_rule(_rule("low", "gaps > 0 AND gaps <= 3", DecisionOutcome.HEALING_REQUIRED, 10))
+        t.add_rule(_rule("any_gap", "gaps > 0", DecisionOutcome.HEALING_REQUIRED, 5))
+        t.add_rule(_rule("miss", "status = CRITICAL_MISS OR NOT healthy", DecisionOutcome.ESCALATE_TO_MANUAL, 1))
+        return t
+
+    contexts = [
+        {"gaps": 2, "healthy": True},
+        {"gaps": 5, "healthy": True, "status": "CRITICAL_MISS"},
+        {"healthy": True},
+    ]
+
+    first = table("first")
+    assert [o for o, _ in first.evaluate_many(contexts)] == [
+        DecisionOutcome.HEALING_REQUIRED,
+        DecisionOutcome.HEALING_REQUIRED,
+        DecisionOutcome.PROCEED,
+    ]
+    assert table("priority").evaluate(contexts[1]) == (DecisionOutcome.ESCALATE_TO_MANUAL, "miss")
+    assert table("collect").evaluate(contexts[0])[1] == "low; any_gap"
+    assert table("any").evaluate(contexts[0])[0] == DecisionOutcome.HEALING_REQUIRED
+    for policy, bad in (("unique", contexts[0]), ("any", contexts[1])):
+        with pytest.raises(DMNHitPolicyViolation):
+            table(policy).evaluate(bad)
+        with pytest.raises(DMNHitPolicyViolation):
+            table(policy).evaluate_many([bad])
+    for policy in ("priority", "collect"):
+        t = table(policy)
+        assert t.evaluate_many(contexts) == [t.evaluate(c) for c in contexts]
+
+
+def test_negated_rule_matches_when_key_absent() -> None:
+    t = DMNTable("t", "t", condition_mode=EXPRESSION_CONDITIONS)
+    t.add_rule(_rule("unapproved", "NOT approved", DecisionOutcome.ESCALATE_TO_MANUAL, 10))
+    t.add_rule(_rule("gated", "gaps > 0 AND NOT healed", DecisionOutcome.HEALING_REQUIRED, 5))
+    contexts = [{"other": 1}, {"approved": True, "gaps": 2}, {"approved": True, "gaps": 2, "healed": True}]
+
+    assert t.evaluate(contexts[0]) == (DecisionOutcome.ESCALATE_TO_MANUAL, "unapproved")
+    assert t.evaluate_many(contexts) == [t.evaluate(c) for c in contexts]
+    assert [o for o, _ in t.evaluate_many(contexts)] == [
+        DecisionOutcome.ESCALATE_TO_MANUAL,
+        DecisionOutcome.HEALING_REQUIRED,
+        DecisionOutcome.PROCEED,
+    ]
+
+
+def test_add_rule_keeps_stable_priority_order() -> None:
+    t = DMNTable("t", "t")
+    for rule_id, priority in (("a", 1), ("b", 5), ("c", 1), ("d", 5)):
+        t.add_rule(_rule(rule_id, "critical", DecisionOutcome.PROCEED, priority))
+
+    assert [r.rule_id for r in t.rules] == ["b", "d", "a", "c"]
+
+
+def test_parse_condition_rejects_bad_syntax() -> None:
+    for text in ("gaps >", "gaps > high", "(a AND b"):
+        with pytest.raises(ConditionSyntaxError):
+            parse_condition(text)
+    assert parse_condition("flag == true").matches({"flag": True})
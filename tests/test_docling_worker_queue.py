@@ -0,0 +1,147 @@
+import importlib
+import importlib.util
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+ROOT = Path(__file__).resolve().parents[1]
+WORKER_PATH = ROOT / "pipeline" / "docling_worker" / "worker.py"
+
+
+def _load_worker_module():
+    spec = importlib.util.spec_from_file_location("docling_worker_queue_module", WORKER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec is not None and spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def worker():
+    return _load_worker_module()
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def _task(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return json.dumps({"bundle_id": name, "file_path": str(path), "pipeline_version": "v1.0.0"})
+
+
+def test_consumer_acks_after_enqueueing_batches(worker, client, tmp_path):
+    client.rpush(worker.PARSE_QUEUE, _task(tmp_path, "a.md", "# Title\n\nSome text."), _task(tmp_path, "b.md", "More text."))
+
+    consumer = worker.QueueConsumer(client, worker_id="w1", prefetch=2, concurrency=2, block_timeout=0.1)
+    consumer.run(max_tasks=2)
+
+    batches = [json.loads(raw) for raw in client.lrange(worker.EMBED_QUEUE, 0, -1)]
+    assert sorted(batch["doc_id"] for batch in batches) == ["a.md", "b.md"]
+    assert client.llen(worker.PARSE_QUEUE) == 0
+    assert client.llen(consumer.processing_key) == 0
+    assert not client.exists(consumer.heartbeat_key)
+    assert (consumer.processed, consumer.failed) == (2, 0)
+
+
+def test_failed_task_moves_to_dead_letter(worker, client):
+    raw = json.dumps({"bundle_id": "missing", "file_path": "/nonexistent/file.md", "pipeline_version": "v1.0.0"})
+    client.rpush(worker.PARSE_QUEUE, raw)
+
+    consumer = worker.QueueConsumer(client, worker_id="w1", block_timeout=0.1)
+    consumer.run(max_tasks=1)
+
+    assert client.lrange(worker.DEAD_LETTER_QUEUE, 0, -1) == [raw]
+    assert client.llen(consumer.processing_key) == 0
+    assert client.llen(worker.EMBED_QUEUE) == 0
+    assert consumer.failed == 1
+
+
+def test_stale_in_flight_tasks_are_requeued_in_order(worker, client):
+    client.rpush(worker.PARSE_QUEUE, "queued")
+    client.rpush(f"{worker.PROCESSING_PREFIX}crashed", "first", "second")
+    client.rpush(f"{worker.PROCESSING_PREFIX}alive", "busy")
+    client.set(f"{worker.HEARTBEAT_PREFIX}alive", 1)
+
+    assert worker.recover_stale_tasks(client) == 2
+    assert client.lrange(worker.PARSE_QUEUE, 0, -1) == ["first", "second", "queued"]
+    assert client.lrange(f"{worker.PROCESSING_PREFIX}alive", 0, -1) == ["busy"]
+
+
+def _start_tcp_server():
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_supervisor_requeues_killed_workers_tasks(monkeypatch):
+    # Spawned children re-import the worker by module name, so load it from sys.path.
+    monkeypatch.syspath_prepend(str(WORKER_PATH.parent))
+    monkeypatch.delitem(sys.modules, "worker", raising=False)
+    worker = importlib.import_module("worker")
+    monkeypatch.setitem(sys.modules, "worker", worker)
+
+    server = _start_tcp_server()
+    host, port = server.server_address
+    client = worker.redis.Redis(host=host, port=port, decode_responses=True)
+    stop = threading.Event()
+    supervisor = threading.Thread(
+        target=worker.run_supervisor,
+        kwargs={"processes": 1, "host": host, "port": port, "stop": stop},
+    )
+    supervisor.start()
+    try:
+        assert _wait_for(lambda: list(client.scan_iter(match=f"{worker.HEARTBEAT_PREFIX}*")), 60)
+        worker_id = next(client.scan_iter(match=f"{worker.HEARTBEAT_PREFIX}*"))[len(worker.HEARTBEAT_PREFIX):]
+        raw = json.dumps({"bundle_id": "killed", "file_path": "/nonexistent/killed.md", "pipeline_version": "v1.0.0"})
+        client.rpush(f"{worker.PROCESSING_PREFIX}{worker_id}", raw)  # taken, not yet acknowledged
+        os.kill(int(worker_id.rsplit(":", 1)[1]), signal.SIGKILL)
+
+        # Well inside HEARTBEAT_TTL: the dead worker's heartbeat key is still live.
+        assert _wait_for(lambda: not client.exists(f"{worker.PROCESSING_PREFIX}{worker_id}"), worker.HEARTBEAT_TTL / 2)
+        assert not client.exists(f"{worker.HEARTBEAT_PREFIX}{worker_id}")
+        # The replacement worker picks the task up again; its missing file dead-letters it.
+        assert _wait_for(lambda: client.lrange(worker.DEAD_LETTER_QUEUE, 0, -1) == [raw], 60)
+    finally:
+        stop.set()
+        supervisor.join()
+        server.shutdown()
+        server.server_close()
+
+
+def test_converter_is_reused_per_thread(worker, monkeypatch):
+    created = []
+
+    class FakeConverter:
+        def __init__(self):
+            created.append(self)
+
+    monkeypatch.setattr(worker, "DocumentConverter", FakeConverter)
+    assert worker.get_converter() is worker.get_converter()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(worker.get_converter()))
+    thread.start()
+    thread.join()
+    assert other[0] is not created[0]
+    assert len(created) == 2
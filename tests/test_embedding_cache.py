@@ -0,0 +1,73 @@
+from array import array
+
+from pipeline.lib.embedding_cache import EmbeddingCache, embed_with_cache
+
+MODEL = "sentence-transformers/all-mpnet-base-v2"
+WEIGHTS = "sha256:abc"
+
+
+def _vector(seed: float, dim: int = 4):
+    # Round-trip through float32 so values compare exactly, like torch's float32 .tolist().
+    return array("f", [seed + i / 8 for i in range(dim)]).tolist()
+
+
+class _CountingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [_vector(len(text)) for text in texts]
+
+
+def test_vectors_persist_across_instances(tmp_path):
+    cache = EmbeddingCache(tmp_path, MODEL, WEIGHTS)
+    keys = [cache.key("def add(a, b):\n    return a + b"), cache.key("# Title")]
+    cache.put_many(keys, [_vector(1.0), _vector(2.0)])
+    cache.close()
+
+    reopened = EmbeddingCache(tmp_path, MODEL, WEIGHTS)
+    assert reopened.get_many(keys + ["missing"]) == [_vector(1.0), _vector(2.0), None]
+    assert reopened.key("def add(a, b):\r\n    return a + b\n") == keys[0]
+    assert EmbeddingCache(tmp_path, MODEL, "sha256:other").key("# Title") != keys[1]
+
+
+def test_only_misses_reach_the_encoder(tmp_path):
+    cache = EmbeddingCache(tmp_path, MODEL, WEIGHTS)
+    encode = _CountingEncoder()
+
+    first, hits = embed_with_cache(cache, ["a", "bb", "a"], encode)
+    assert encode.calls == [["a", "bb"]]
+    assert hits == [False, False, False]
+    assert first == [_vector(1), _vector(2), _vector(1)]
+
+    second, hits = embed_with_cache(cache, ["bb", "ccc", "a"], encode)
+    assert encode.calls[-1] == ["ccc"]
+    assert hits == [True, False, True]
+    assert second == [_vector(2), _vector(3), _vector(1)]
+
+
+def test_eviction_drops_least_recently_used_and_compacts(tmp_path):
+    # Four 4-dim float32 vectors fit; the fifth triggers eviction down to 3.
+    cache = EmbeddingCache(tmp_path, MODEL, WEIGHTS, max_bytes=64, low_watermark=0.75)
+    keys = [cache.key(str(i)) for i in range(5)]
+    for i in range(4):
+        cache.put_many([keys[i]], [_vector(i)])
+    cache.get_many([keys[0]])  # refresh 0 so 1 and 2 are the oldest
+
+    cache.put_many([keys[4]], [_vector(4)])
+
+    assert cache.get_many(keys) == [_vector(0), None, None, _vector(3), _vector(4)]
+    stats = cache.stats()
+    assert stats["evicted"] == 2 and stats["compactions"] == 1
+    assert stats["live_bytes"] == 48
+    assert sorted(p.name for p in tmp_path.glob("vectors-*.f32")) == ["vectors-1.f32"]
+    assert (tmp_path / "vectors-1.f32").stat().st_size == 48
+
+
+def test_no_cache_encodes_everything():
+    encode = _CountingEncoder()
+    vectors, hits = embed_with_cache(None, ["a", "a"], encode)
+    assert encode.calls == [["a", "a"]]
+    assert hits == [False, False]
+    assert len(vectors) == 2
@@ -0,0 +1,104 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pipeline.lib.canonical import LedgerWriter
+from pipeline.lib.embedding_sidecar import EmbeddingSidecar, SidecarReader, sidecar_path
+from tests.utils import assert_ledger_chain, read_ledger
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_migration_module():
+    spec = importlib.util.spec_from_file_location("migrate_ledger_sidecar", ROOT / "pipeline" / "migrate_ledger_sidecar.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec is not None and spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def _vectors(n, dim=8):
+    rng = np.random.default_rng(7)
+    return rng.standard_normal((n, dim)).astype(np.float32).tolist()
+
+
+def test_records_resolve_to_zero_copy_views(tmp_path):
+    ledger = tmp_path / "ledger.jsonl"
+    vectors = _vectors(3)
+    with EmbeddingSidecar(sidecar_path(ledger)) as sidecar, LedgerWriter(ledger) as writer:
+        refs = sidecar.append(vectors[:2]) + sidecar.append(vectors[2:])
+        writer.append_many([{"chunk_id": f"c{i}", "embedding_ref": ref} for i, ref in enumerate(refs)])
+
+    records = read_ledger(ledger)
+    assert_ledger_chain(records)
+    assert [r["embedding_ref"]["offset"] for r in records] == [0, 32, 64]
+
+    reader = SidecarReader(ledger)
+    for record, expected in zip(records, vectors):
+        view = reader.vector(record)
+        assert isinstance(view.base, np.memmap) or isinstance(view, np.memmap)
+        assert view.tolist() == expected
+        assert reader.verify(record)
+
+
+def test_tampered_sidecar_fails_verification(tmp_path):
+    ledger = tmp_path / "ledger.jsonl"
+    with EmbeddingSidecar(sidecar_path(ledger)) as sidecar:
+        ref = sidecar.append(_vectors(1))[0]
+
+    data = bytearray(sidecar_path(ledger).read_bytes())
+    data[0] ^= 0xFF
+    sidecar_path(ledger).write_bytes(bytes(data))
+
+    assert not SidecarReader(ledger).verify({"embedding_ref": ref})
+
+
+def test_float16_sidecar_halves_storage(tmp_path):
+    ledger = tmp_path / "ledger.jsonl"
+    vectors = _vectors(2)
+    with EmbeddingSidecar(sidecar_path(ledger, "float16"), dtype="float16") as sidecar:
+        refs = sidecar.append(vectors)
+
+    assert sidecar_path(ledger, "float16").name == "ledger.f16"
+    assert sidecar_path(ledger, "float16").stat().st_size == 2 * 8 * 2
+    reader = SidecarReader(ledger)
+    view = reader.vector({"embedding_ref": refs[1]})
+    assert view.dtype == np.float16
+    np.testing.assert_allclose(view, vectors[1], rtol=1e-3, atol=1e-3)
+
+
+def test_migration_moves_inline_embeddings_and_rechains(tmp_path):
+    migration = _load_migration_module()
+    legacy = tmp_path / "ledger.jsonl"
+    vectors = _vectors(5)
+    with LedgerWriter(legacy) as writer:
+        writer.append_many([{"chunk_id": f"c{i}", "embedding": v} for i, v in enumerate(vectors)])
+        writer.append({"event": "checkpoint"})
+    legacy_hashes = [r["integrity_hash"] for r in read_ledger(legacy)]
+
+    output = tmp_path / "migrated.jsonl"
+    assert migration.migrate_ledger(legacy, output, batch_size=2) == (6, 5)
+
+    migrated = read_ledger(output)
+    assert_ledger_chain(migrated)
+    assert [r["legacy_integrity_hash"] for r in migrated] == legacy_hashes
+    assert "embedding" not in migrated[0] and "embedding_ref" not in migrated[-1]
+    assert migrated[0]["embedding_ref"]["file"] == "migrated.f32"
+    reader = SidecarReader(output)
+    assert [reader.vector(r).tolist() for r in migrated[:5]] == vectors
+
+
+def test_migration_rejects_a_broken_chain(tmp_path):
+    migration = _load_migration_module()
+    legacy = tmp_path / "ledger.jsonl"
+    with LedgerWriter(legacy) as writer:
+        writer.append_many([{"chunk_id": "a", "embedding": [0.5]}, {"chunk_id": "b", "embedding": [0.25]}])
+    records = read_ledger(legacy)
+    records[0]["embedding"] = [0.75]
+    legacy.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+    with pytest.raises(migration.LedgerChainError):
+        migration.migrate_ledger(legacy, tmp_path / "out.jsonl")
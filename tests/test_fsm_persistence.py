@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from orchestrator.fsm_persistence import FSMEventStore
+import pytest
+
+from orchestrator.fsm_persistence import EventInput, FSMEventStore, IntegrityError, canonical_json_bytes
 from orchestrator.storage import DBManager
 from schemas.database import FSMEventModel
 
@@ -165,3 +167,122 @@ def test_snapshot_accelerates_but_does_not_change_result(tmp_path):
     assert latest_snapshot is not None
     assert latest_snapshot == payloads[-1]
     assert full_replay_last_payload == store.load_events("tenant-a", "p5")[-1].payload_canonical
+
+
+def _events(count: int, start: int = 1) -> list[EventInput]:
+    return [
+        EventInput(
+            event_type="RUN_DISPATCHED",
+            payload={"plan_id": "batch", "step": seq},
+            occurred_at_iso=_iso(1000.0 + seq),
+        )
+        for seq in range(start, start + count)
+    ]
+
+
+def test_append_events_batch_matches_single_appends(tmp_path):
+    store = _store(tmp_path)
+    batched = store.append_events(tenant_id="tenant-a", execution_id="b1", events=_events(5), expected_seq=1)
+    for event in _events(5):
+        store.append_event(
+            tenant_id="tenant-a",
+            execution_id="b2",
+            event_type=event.event_type,
+            payload=event.payload,
+            occurred_at_iso=event.occurred_at_iso,
+        )
+
+    assert [e.seq for e in batched] == [1, 2, 3, 4, 5]
+    assert store.get_head("tenant-a", "b1") == (5, batched[-1].event_hash)
+    assert store.verify_chain("tenant-a", "b1") is True
+    assert store.latest_snapshot("tenant-a", "b1") == {"plan_id": "batch", "step": 5}
+    assert [e.payload_hash for e in store.load_events("tenant-a", "b2")] == [e.payload_hash for e in batched]
+
+
+def test_append_events_retry_returns_stored_and_appends_rest(tmp_path):
+    store = _store(tmp_path)
+    first = store.append_events(tenant_id="tenant-a", execution_id="b3", events=_events(3), expected_seq=1)
+    retried = store.append_events(tenant_id="tenant-a", execution_id="b3", events=_events(5, start=2), expected_seq=2)
+
+    assert [e.event_hash for e in retried[:2]] == [e.event_hash for e in first[1:]]
+    assert [e.seq for e in retried] == [2, 3, 4, 5, 6]
+    assert store.get_head("tenant-a", "b3")[0] == 6
+    with pytest.raises(IntegrityError):
+        store.append_events(tenant_id="tenant-a", execution_id="b3", events=_events(1), expected_seq=9)
+
+
+def test_stale_head_cache_is_reloaded(tmp_path):
+    store = _store(tmp_path)
+    store.append_events(tenant_id="tenant-a", execution_id="b4", events=_events(2))
+    stale = store.head_cache.get("tenant-a", "b4")
+    # Another writer (process) moves the head past what this process cached.
+    store.head_cache.invalidate("tenant-a", "b4")
+    store.append_events(tenant_id="tenant-a", execution_id="b4", events=_events(2, start=3))
+    store.head_cache.put("tenant-a", "b4", stale)
+
+    appended = store.append_events(tenant_id="tenant-a", execution_id="b4", events=_events(1, start=5))
+    replayed = store.append_events(tenant_id="tenant-a", execution_id="b4", events=_events(1, start=4), expected_seq=4)
+
+    assert appended[0].seq == 5
+    assert replayed[0].seq == 4
+    assert store.verify_chain("tenant-a", "b4", full=True) is True
+
+
+def test_verify_chain_resumes_from_checkpoint(tmp_path):
+    store = _store(tmp_path)
+    store.append_events(tenant_id="tenant-a", execution_id="b5", events=_events(4))
+    assert store.verify_chain("tenant-a", "b5") is True
+    assert store.head_cache.get_checkpoint("tenant-a", "b5")[0] == 4
+
+    store.append_events(tenant_id="tenant-a", execution_id="b5", events=_events(2, start=5))
+    session = store._db.SessionLocal()
+    try:
+        row = session.query(FSMEventModel).filter(FSMEventModel.execution_id == "b5", FSMEventModel.seq == 6).one()
+        row.payload_canonical = b'{"tampered":true}'
+        session.commit()
+    finally:
+        session.close()
+
+    assert store.verify_chain("tenant-a", "b5") is False
+    assert store.head_cache.get_checkpoint("tenant-a", "b5")[0] == 4
+
+
+def test_verify_chain_detects_rewritten_checkpoint(tmp_path):
+    store = _store(tmp_path)
+    store.append_events(tenant_id="tenant-a", execution_id="b6", events=_events(3))
+    assert store.verify_chain("tenant-a", "b6") is True
+
+    session = store._db.SessionLocal()
+    try:
+        row = session.query(FSMEventModel).filter(FSMEventModel.execution_id == "b6", FSMEventModel.seq == 3).one()
+        row.event_hash = b"\x00" * 32
+        session.commit()
+    finally:
+        session.close()
+
+    assert store.verify_chain("tenant-a", "b6") is False
+    assert store.head_cache.get_checkpoint("tenant-a", "b6") is None
+
+
+def test_streamed_bundle_matches_canonical_export(tmp_path):
+    store = _store(tmp_path)
+    store.stream_batch_size = 2
+    store.append_events(tenant_id="tenant-a", execution_id="b7", events=_events(5))
+    head_seq, head_hash = store.get_head("tenant-a", "b7")
+    expected = canonical_json_bytes(
+        {
+            "tenant_id": "tenant-a",
+            "execution_id": "b7",
+            "head_seq": head_seq,
+            "head_hash": head_hash.hex(),
+            "events": [store._bundle_event(e) for e in store.load_events("tenant-a", "b7")],
+        }
+    )
+
+    chunks = list(store.iter_execution_bundle("tenant-a", "b7"))
+
+    assert len(chunks) == 7
+    assert b"".join(chunks) == expected == store.export_execution_bundle_bytes("tenant-a", "b7")
+    assert store.export_execution_bundle_bytes("tenant-a", "missing") == canonical_json_bytes(
+        {"tenant_id": "tenant-a", "execution_id": "missing", "head_seq": 0, "head_hash": None, "events": []}
+    )
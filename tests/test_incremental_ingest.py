@@ -0,0 +1,134 @@
+import hashlib
+import importlib.util
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+qdrant_client = pytest.importorskip("qdrant_client")
+
+from pipeline.lib.blob_store import BlobStore
+from pipeline.lib.canonical import GENESIS_HASH, hash_canonical_without_integrity
+from pipeline.lib.repo_manifest import RepoManifest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("incremental_ingest", ROOT / "pipeline" / "incremental_ingest.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec is not None and spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit(repo, files, deletions=()):
+    for name, text in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    for name in deletions:
+        (repo / name).unlink()
+    _git(repo, "add", "-A")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", "change")
+    return _git(repo, "rev-parse", "HEAD")
+
+
+calls = []
+
+
+def _encode(texts):
+    calls.append(len(texts))
+    return [[b / 255.0 for b in hashlib.sha256(t.encode()).digest()[:8]] for t in texts]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    return repo
+
+
+def _ingestor(module, repo, tmp_path, state, client):
+    return module.IncrementalIngestor(
+        repo_path=repo,
+        repo_key="org/repo",
+        manifest_root=tmp_path / state / "manifests",
+        encode=_encode,
+        qdrant_client=client,
+        collection_name="chunks",
+        ledger_path=tmp_path / state / "ledger.jsonl",
+        blob_store=BlobStore(tmp_path / "blobs"),
+        ledger_fsync=False,
+    )
+
+
+def _point_ids(client):
+    points, _ = client.scroll("chunks", limit=10_000)
+    return {p.id for p in points}
+
+
+def test_incremental_reindex_matches_full_reindex(repo, tmp_path):
+    module = _load_module()
+    _commit(repo, {
+        "pkg/a.py": "def a():\n    return 1\n",
+        "pkg/b.py": "def b():\n    return 2\n",
+        "docs/guide.md": "# Guide\n\nRead me.\n",
+        "image.bin": "not ingested",
+    })
+    client = qdrant_client.QdrantClient(":memory:")
+    ingestor = _ingestor(module, repo, tmp_path, "incremental", client)
+    first = ingestor.run()
+    assert (first["mode"], first["files_processed"]) == ("full", 3)
+
+    head = _commit(repo, {"pkg/a.py": "def a():\n    return 10\n", "pkg/c.py": "def c():\n    return 3\n"}, deletions=["pkg/b.py"])
+    calls.clear()
+    second = ingestor.run()
+    assert second["mode"] == "incremental"
+    assert (second["files_processed"], second["files_removed"]) == (2, 1)
+    assert sum(calls) == second["chunks_upserted"]
+
+    full_client = qdrant_client.QdrantClient(":memory:")
+    full = _ingestor(module, repo, tmp_path, "full", full_client).run(full=True)
+    assert _point_ids(client) == _point_ids(full_client)
+    assert second["manifest_sha256"] == full["manifest_sha256"]
+
+    manifest = RepoManifest.load(tmp_path / "incremental" / "manifests", "org/repo")
+    assert manifest.commit_sha == head
+    assert sorted(manifest.files) == ["docs/guide.md", "pkg/a.py", "pkg/c.py"]
+
+    records = [json.loads(line) for line in (tmp_path / "incremental" / "ledger.jsonl").read_text().splitlines()]
+    prev = GENESIS_HASH
+    for record in records:
+        assert record["prev_ledger_hash"] == prev
+        assert hash_canonical_without_integrity(dict(record)) == record["integrity_hash"]
+        prev = record["integrity_hash"]
+    checkpoints = [r for r in records if r.get("event") == module.CHECKPOINT_EVENT]
+    assert [c["commit"] for c in checkpoints] == [first["commit"], head]
+    assert records[-1]["event"] == module.CHECKPOINT_EVENT
+    tombstones = [r for r in records if r.get("event") == module.TOMBSTONE_EVENT]
+    assert {t["relative_path"] for t in tombstones} == {"pkg/a.py", "pkg/b.py"}
+
+
+def test_unchanged_commit_processes_nothing(repo, tmp_path):
+    module = _load_module()
+    _commit(repo, {"a.md": "# A\n"})
+    ingestor = _ingestor(module, repo, tmp_path, "state", qdrant_client.QdrantClient(":memory:"))
+    ingestor.run()
+    again = ingestor.run()
+    assert (again["files_processed"], again["chunks_upserted"], again["chunks_deleted"]) == (0, 0, 0)
+
+
+def test_missing_base_commit_falls_back_to_full(repo, tmp_path):
+    module = _load_module()
+    head = _commit(repo, {"a.md": "# A\n"})
+    manifest = RepoManifest("org/repo", "0" * 40, {"gone.md": {"blob_sha": "1" * 40, "chunk_ids": ["x"]}})
+    plan = module.plan_reingest(repo, manifest, head)
+    assert plan.mode == "full"
+    assert list(plan.upserts) == ["a.md"] and plan.deletes == ["gone.md"]
@@ -0,0 +1,120 @@
+import importlib.util
+import io
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from pipeline.lib.blob_store import BlobStore, BlobTooLarge
+
+ROOT = Path(__file__).resolve().parents[1]
+INGEST_PATH = ROOT / "pipeline" / "ingest_api" / "main.py"
+
+
+def _load_ingest_module():
+    spec = importlib.util.spec_from_file_location("ingest_api_streaming_module", INGEST_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec is not None and spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def ingest(tmp_path, monkeypatch):
+    module = _load_ingest_module()
+    monkeypatch.setattr(module, "redis_client", fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(module, "BLOB_DIR", tmp_path / "blobs")
+    module.reset_blob_store()
+    return module
+
+
+def _queued(module):
+    return [json.loads(raw) for raw in module.redis_client.lrange(module.PARSE_QUEUE, 0, -1)]
+
+
+def test_blob_store_deduplicates_and_enforces_limits(tmp_path):
+    store = BlobStore(tmp_path)
+    first = store.put_stream(io.BytesIO(b"hello world"), ".md", chunk_size=4)
+    second = store.put_stream(io.BytesIO(b"hello world"), ".md")
+
+    assert first.path == second.path and first.path.name.endswith(".md")
+    assert (first.deduplicated, second.deduplicated) == (False, True)
+    assert first.path.read_bytes() == b"hello world"
+
+    with pytest.raises(BlobTooLarge):
+        store.put_stream(io.BytesIO(b"x" * 10), max_bytes=5, chunk_size=4)
+    assert list(store.tmp_dir.iterdir()) == []
+
+
+def test_single_upload_is_streamed_to_a_content_addressed_blob(ingest):
+    client = TestClient(ingest.app)
+    for _ in range(2):
+        response = client.post(
+            "/ingest",
+            files={"file": ("notes.md", b"# Notes\n\nbody", "text/markdown")},
+            data={"repo_key": "org/repo", "metadata": json.dumps({"source": "test"})},
+        )
+        assert response.status_code == 200
+
+    first, second = _queued(ingest)
+    assert response.json()["deduplicated"] is True
+    assert first["file_path"] == second["file_path"]
+    assert Path(first["file_path"]).read_bytes() == b"# Notes\n\nbody"
+    assert first["content_size"] == 13
+    assert first["metadata"] == {"source": "test", "repo_key": "org/repo"}
+
+
+def test_invalid_metadata_is_a_client_error(ingest):
+    response = TestClient(ingest.app).post(
+        "/ingest", files={"file": ("a.txt", b"a", "text/plain")}, data={"metadata": "{not json"}
+    )
+    assert response.status_code == 400
+
+
+def test_batch_enqueues_one_task_per_file(ingest):
+    response = TestClient(ingest.app).post(
+        "/ingest/batch",
+        files=[("files", ("a.py", b"print(1)\n", "text/x-python")), ("files", ("b.md", b"# B\n", "text/markdown"))],
+        data={"relative_path": "src"},
+    )
+    assert response.status_code == 200
+    tasks = _queued(ingest)
+    assert [t["bundle_id"] for t in tasks] == response.json()["bundle_ids"]
+    assert [t["metadata"]["relative_path"] for t in tasks] == ["src/a.py", "src/b.md"]
+
+
+@pytest.mark.parametrize("kind", ["tar.gz", "zip"])
+def test_archive_fans_out_into_member_tasks(ingest, kind):
+    members = {"pkg/mod.py": b"def f():\n    return 1\n", "README.md": b"# Readme\n", "../escape.txt": b"nope"}
+    buffer = io.BytesIO()
+    if kind == "zip":
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+    else:
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+    response = TestClient(ingest.app).post(
+        "/ingest/archive",
+        files={"file": (f"repo.{kind}", buffer.getvalue(), "application/octet-stream")},
+        data={"repo_key": "org/repo"},
+    )
+    assert response.status_code == 200
+
+    tasks = {t["metadata"]["relative_path"]: t for t in _queued(ingest)}
+    assert sorted(tasks) == ["README.md", "pkg/mod.py"]
+    module_task = tasks["pkg/mod.py"]
+    assert module_task["filename"] == "mod.py"
+    assert module_task["file_path"].endswith(".py")
+    assert Path(module_task["file_path"]).read_bytes() == members["pkg/mod.py"]
+    assert module_task["metadata"]["repo_key"] == "org/repo"
+    assert module_task["metadata"]["archive_name"] == f"repo.{kind}"
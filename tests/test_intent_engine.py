@@ -135,3 +135,56 @@ def test_intent_engine_with_unified_fsm(monkeypatch):
     assert State.PRIME_EXPORTING in states
     assert State.PRIME_COMMITTING in states
     assert sm.state == State.TERMINATED_SUCCESS
+
+
+def test_full_pipeline_records_shards_under_the_parent_plan(monkeypatch):
+    from orchestrator.stateflow import StateMachine, State
+    snapshots = []
+    sm = StateMachine(persistence_callback=lambda plan_id, snap: snapshots.append(plan_id))
+    sm.plan_id = "plan-dag"
+    sm.trigger("OBJECTIVE_INGRESS")
+    engine = IntentEngine(sm=sm)
+    engine._rbac_client = None
+    actions = [PlanAction(action_id=f"a{i}", title=f"Task {i}", instruction="Do it") for i in range(2)]
+    plan = ProjectPlan(plan_id="plan-dag", project_name="dag", requester="tester", actions=actions)
+
+    async def categorize_project(description, requester):
+        return plan
+
+    async def build_blueprint(project_name, task_descriptions, requester):
+        return plan
+
+    async def map_system(blueprint):
+        return []
+
+    async def fake_generate_solution(parent_id, feedback=None):
+        return SimpleNamespace(artifact_id=str(uuid.uuid4()), content="x" * 400, type="code_solution", metadata={})
+
+    async def fake_validate(_artifact_id):
+        return TestReport(status="PASS", critique="looks good")
+
+    monkeypatch.setattr(engine.manager, "categorize_project", categorize_project)
+    monkeypatch.setattr(engine.orchestrator, "build_blueprint", build_blueprint)
+    monkeypatch.setattr(engine.architect, "map_system", map_system)
+    monkeypatch.setattr(engine.coder, "generate_solution", fake_generate_solution)
+    monkeypatch.setattr(engine.tester, "validate", fake_validate)
+    monkeypatch.setattr(engine.db, "save_artifact", lambda x: None)
+    monkeypatch.setattr(engine.pinn, "calculate_residual", lambda content: 0.01)
+
+    result = asyncio.run(engine.run_full_pipeline("dag"))
+
+    assert result.success
+    assert set(snapshots) == {"plan-dag"}
+    assert [h.event for h in sm.history[2:]] == [
+        "EXECUTION_COMPLETE",
+        "VERDICT_PASS",
+        "PRIME_RENDER_COMPLETE",
+        "PRIME_VALIDATION_PASS",
+        "PRIME_EXPORT_COMPLETE",
+        "PRIME_COMMIT_COMPLETE",
+    ]
+    assert sm.state == State.TERMINATED_SUCCESS
+    shards = sm.history[2].meta["action_shards"]
+    assert sorted(shards) == ["a0", "a1"]
+    assert shards["a0"]["plan_id"] == "plan-dag:a0"
+    assert shards["a0"]["state"] == State.TERMINATED_SUCCESS.value
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from judge.decision import CriteriaType, DecisionCriteria, JudgmentModel, rank_scores
+
+
+CONTEXT = {"nearest_obstacle_distance_m": 3, "intent_match": 0.9, "elapsed_ms": 20}
+
+
+def _reference_overall(model: JudgmentModel, action: str, context) -> float:
+    weighted_sum = weight_sum = 0.0
+    for criterion in model._criteria.values():
+        weighted_sum += criterion.weight * criterion.score_action(action, context)
+        weight_sum += criterion.weight
+    return weighted_sum / weight_sum
+
+
+def _with_action_criterion() -> JudgmentModel:
+    model = JudgmentModel()
+    model.register_criterion(
+        DecisionCriteria(
+            criteria_type=CriteriaType.PLAYER_INTENT,
+            weight=0.7,
+            scorer=lambda action, context: (len(action) % 4) / 3,
+            action_dependent=True,
+        )
+    )
+    return model
+
+
+def test_context_only_criteria_are_scored_once_per_call() -> None:
+    model = JudgmentModel()
+    calls = []
+    original = model._criteria[CriteriaType.SAFETY].scorer
+    model._criteria[CriteriaType.SAFETY].scorer = lambda ctx: calls.append(1) or original(ctx)
+    actions = [f"action-{i}" for i in range(50)]
+
+    scores = model.judge_actions(actions, CONTEXT)
+
+    assert len(calls) == 1
+    assert [s.action for s in scores] == actions
+    assert scores[0].overall_score == _reference_overall(model, actions[0], CONTEXT)
+    assert scores[0].criterion_scores == scores[-1].criterion_scores
+    assert scores[0].criterion_scores is not scores[-1].criterion_scores
+
+
+def test_action_dependent_ranking_matches_reference() -> None:
+    model = _with_action_criterion()
+    actions = ["brake", "coast", "go", "accelerate", "hold", "turn left"]
+
+    scores = model.judge_actions(actions, CONTEXT)
+    expected = sorted(actions, key=lambda a: _reference_overall(model, a, CONTEXT), reverse=True)
+
+    assert [s.action for s in scores] == expected
+    for score in scores:
+        assert score.overall_score == pytest.approx(_reference_overall(model, score.action, CONTEXT))
+        assert score.criterion_scores[CriteriaType.PLAYER_INTENT] == (len(score.action) % 4) / 3
+
+
+def test_top_actions_streams_same_winners_as_full_ranking() -> None:
+    model = _with_action_criterion()
+    actions = [f"a{'x' * (i % 7)}" for i in range(200)]
+
+    full = model.judge_actions(actions, CONTEXT)
+    top = model.top_actions(iter(actions), CONTEXT, k=5, chunk_size=16)
+
+    assert [(s.action, s.overall_score) for s in top] == [(s.action, s.overall_score) for s in full[:5]]
+    assert model.best_action(actions, CONTEXT).action == full[0].action
+    assert model.best_action([], CONTEXT) is None
+    assert JudgmentModel().best_action(["first", "second"], CONTEXT).action == "first"
+
+
+def test_rank_scores_orders_feature_matrix() -> None:
+    features = np.array([[0.2, 1.0], [0.9, 0.5], [0.9, 0.5], [0.0, 0.0]])
+
+    overall, order = rank_scores(features, np.array([1.0, 1.0]))
+
+    assert np.allclose(overall, [0.6, 0.7, 0.7, 0.0])
+    assert order.tolist() == [1, 2, 0, 3]
+    assert rank_scores(features, np.zeros(2))[0].tolist() == [0.5] * 4
@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from orchestrator.llm_adapters.base import BaseLLMAdapter, InternalLLMRequest, InternalLLMResponse
+from orchestrator.llm_adapters.cached_adapter import CachedLLMAdapter
+from orchestrator.llm_adapters.registry import LLMAdapterRegistry, ProviderRoutingPolicy
+from orchestrator.llm_adapters.transport import ProviderTransport
+from orchestrator.llm_cache import LLMResponseCache, llm_cache_key
+from orchestrator.llm_util import LLMService
+from orchestrator.telemetry_service import TelemetryService
+
+
+def test_cache_key_is_content_addressed() -> None:
+    messages = [{"role": "user", "content": "hi"}]
+    assert llm_cache_key("endpoint", "m1", messages) == llm_cache_key("endpoint", "m1", list(messages))
+    assert llm_cache_key("endpoint", "m1", messages) != llm_cache_key("endpoint", "m2", messages)
+    assert llm_cache_key("endpoint", "m1", messages) != llm_cache_key("endpoint", "m1", messages, {"t": 1})
+
+
+def test_memory_tier_honours_ttl_and_lru_bound(clock) -> None:
+    cache = LLMResponseCache(ttl_seconds=10, max_entries=2, clock=clock)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == (True, "A")
+    cache.put("c", "C")  # evicts least recently used "b"
+
+    assert cache.get("b") == (False, None)
+    clock.now += 11
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_hits_are_copies_of_the_cached_value() -> None:
+    cache = LLMResponseCache()
+    value = {"content": "plan", "raw_response": {"choices": []}}
+    cache.put("k", value)
+    value["content"] = "mutated by producer"
+
+    _, first = cache.get("k")
+    first["raw_response"]["choices"].append("mutated by consumer")
+
+    assert cache.get("k") == (True, {"content": "plan", "raw_response": {"choices": []}})
+    assert cache.get_or_compute("k", lambda: None) is not cache.get_or_compute("k", lambda: None)
+
+def test_disk_tier_survives_a_new_cache_and_is_size_bounded(tmp_path) -> None:
+    path = str(tmp_path / "llm.sqlite")
+    first = LLMResponseCache(disk_path=path, max_disk_entries=2)
+    first.put("k1", {"content": "one"}, latency_ms=120.0)
+    first.put("k2", {"content": "two"})
+    first.put("k3", {"content": "three"})
+    first.close()
+
+    second = LLMResponseCache(disk_path=path, max_disk_entries=2)
+    assert second.get("k1") == (False, None)
+    assert second.get("k3") == (True, {"content": "three"})
+    assert second.get("k3") == (True, {"content": "three"})
+    stats = second.stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+    second.close()
+
+
+def test_concurrent_misses_are_single_flighted() -> None:
+    cache = LLMResponseCache()
+    calls = []
+    release = threading.Event()
+
+    def compute() -> str:
+        calls.append(1)
+        release.wait(2)
+        return "answer"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert results == ["answer"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 4
+
+
+def test_errors_are_not_cached_and_opt_out_bypasses() -> None:
+    cache = LLMResponseCache()
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", lambda: (_ for _ in ()).throw(RuntimeError("provider down")))
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+    assert cache.get_or_compute("k", lambda: "fresh", use_cache=False) == "fresh"
+    assert cache.get_or_compute("k", lambda: "ignored") == "ok"
+
+    stats = cache.stats()
+    assert stats["errors"] == 1 and stats["bypassed"] == 1
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+
+def test_llm_service_reuses_identical_prompts(monkeypatch) -> None:
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_ENDPOINT", "https://example.invalid/v1/chat/completions")
+    monkeypatch.setenv("LLM_MODEL", "codestral-latest")
+    monkeypatch.setenv("LLM_FALLBACK_MODELS", "")
+    posts = []
+
+    def fake_post(request):
+        posts.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"reply-{len(posts)}"}}]})
+
+    transport = ProviderTransport("endpoint", transport=httpx.MockTransport(fake_post))
+    svc = LLMService(cache=LLMResponseCache(), transport=transport)
+
+    assert svc.call_llm("fix the bug") == "reply-1"
+    assert svc.call_llm("fix the bug") == "reply-1"
+    assert svc.call_llm("fix the bug", use_cache=False) == "reply-2"
+    assert svc.call_llm("fix the bug", system_prompt="You are a tester.") == "reply-3"
+    assert len(posts) == 3
+
+
+class _CountingAdapter(BaseLLMAdapter):
+    provider_name = "endpoint"
+    calls = 0
+
+    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+        type(self).calls += 1
+        return InternalLLMResponse(content=request.prompt.upper(), provider="endpoint", model="m")
+
+
+def test_registry_adapters_share_the_response_cache() -> None:
+    _CountingAdapter.calls = 0
+    registry = LLMAdapterRegistry(ProviderRoutingPolicy(default_provider="endpoint"), cache=LLMResponseCache())
+    registry._adapters["endpoint"] = _CountingAdapter
+    request = InternalLLMRequest(prompt="plan")
+
+    first = registry.resolve(request).generate(request)
+    second = registry.resolve(request).generate(request)
+    registry.resolve(request).generate(InternalLLMRequest(prompt="plan", metadata={"cache": False}))
+
+    assert first == second == InternalLLMResponse(content="PLAN", provider="endpoint", model="m")
+    assert _CountingAdapter.calls == 2
+
+
+def test_cache_stats_are_exported_through_telemetry() -> None:
+    cache = LLMResponseCache()
+    cache.put("k", "v", latency_ms=250.0)
+    cache.get("k")
+    telemetry = TelemetryService()
+
+    event = telemetry.record_llm_cache_stats(cache.stats())
+
+    assert event.component == "llm_cache"
+    assert event.metadata["hit_ratio"] == 1.0
+    assert event.duration_ms == 250.0
+
+
+class _StreamingAdapter(BaseLLMAdapter):
+    provider_name = "endpoint"
+    _default_model = "requested"
+
+    def generate(self, request: InternalLLMRequest) -> InternalLLMResponse:
+        raise NotImplementedError
+
+    async def astream(self, request, on_response=None):
+        for chunk in ("pl", "an"):
+            yield chunk
+        if on_response is not None:
+            on_response(InternalLLMResponse(content="plan", provider="endpoint", model="served-2024"))
+
+
+def test_streamed_responses_cache_the_served_model() -> None:
+    cache = LLMResponseCache()
+    adapter = CachedLLMAdapter(_StreamingAdapter(), cache)
+    request = InternalLLMRequest(prompt="plan")
+
+    async def stream():
+        responses = []
+        chunks = [chunk async for chunk in adapter.astream(request, responses.append)]
+        return chunks, responses
+
+    assert asyncio.run(stream()) == (
+        ["pl", "an"],
+        [InternalLLMResponse(content="plan", provider="endpoint", model="served-2024")],
+    )
+    replay, responses = asyncio.run(stream())
+
+    assert replay == ["plan"]
+    assert responses[0].model == "served-2024"
+    assert adapter.generate(request).model == "served-2024"
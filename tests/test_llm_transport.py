@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from orchestrator.llm_adapters.base import InternalLLMRequest
+from orchestrator.llm_adapters.endpoint_adapter import EndpointAdapter
+from orchestrator.llm_adapters.http_adapter import HTTPLLMAdapter
+from orchestrator.llm_adapters.ollama_adapter import OllamaAdapter
+from orchestrator.llm_adapters.registry import LLMAdapterRegistry, ProviderRoutingPolicy
+from orchestrator.llm_adapters.transport import ProviderTransport
+from orchestrator.llm_cache import LLMResponseCache
+from orchestrator.llm_util import LLMService
+
+
+def _completion(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+@pytest.fixture
+def endpoint_env(monkeypatch):
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_ENDPOINT", "https://llm.invalid/v1/chat/completions")
+    monkeypatch.setenv("LLM_MODEL", "m1")
+    monkeypatch.setenv("LLM_FALLBACK_MODELS", "")
+
+
+def test_transport_retries_retryable_status_with_backoff(monkeypatch) -> None:
+    statuses = iter([503, 429, 200])
+    sleeps = []
+    monkeypatch.setattr("orchestrator.llm_adapters.transport.time.sleep", sleeps.append)
+
+    def handler(request):
+        status = next(statuses)
+        headers = {"retry-after": "0.5"} if status == 429 else {}
+        return httpx.Response(status, headers=headers, json={})
+
+    transport = ProviderTransport("endpoint", max_retries=2, backoff_base=0.1, transport=httpx.MockTransport(handler))
+
+    assert transport.post("https://llm.invalid").status_code == 200
+    assert len(sleeps) == 2
+    assert 0.0 <= sleeps[0] <= 0.1
+    assert sleeps[1] == 0.5
+
+
+def test_transport_gives_up_after_max_retries(monkeypatch) -> None:
+    monkeypatch.setattr("orchestrator.llm_adapters.transport.time.sleep", lambda _s: None)
+    transport = ProviderTransport(
+        "endpoint",
+        max_retries=1,
+        transport=httpx.MockTransport(lambda request: httpx.Response(502)),
+    )
+
+    assert transport.post("https://llm.invalid").status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_async_requests_respect_provider_concurrency_limit() -> None:
+    running = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return httpx.Response(200, json={})
+
+    transport = ProviderTransport("endpoint", max_concurrency=3, async_transport=httpx.MockTransport(handler))
+    await asyncio.gather(*(transport.apost("https://llm.invalid") for _ in range(10)))
+    await transport.aclose()
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_endpoint_adapter_agenerate_and_stream(endpoint_env) -> None:
+    async def handler(request):
+        body = json.loads(request.content)
+        if not body.get("stream"):
+            return _completion("whole")
+        events = [{"choices": [{"delta": {"content": piece}}]} for piece in ("he", "llo")]
+        lines = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        return httpx.Response(200, text=lines, headers={"content-type": "text/event-stream"})
+
+    adapter = EndpointAdapter(ProviderTransport("endpoint", async_transport=httpx.MockTransport(handler)))
+    request = InternalLLMRequest(prompt="hi")
+
+    response = await adapter.agenerate(request)
+    streamed = []
+    chunks = [chunk async for chunk in adapter.astream(request, streamed.append)]
+    await adapter.transport.aclose()
+
+    assert (response.content, response.model) == ("whole", "m1")
+    assert chunks == ["he", "llo"]
+    assert [(r.content, r.model) for r in streamed] == [("hello", "m1")]
+
+
+@pytest.mark.asyncio
+async def test_ollama_adapter_streams_ndjson() -> None:
+    lines = [{"message": {"content": "a"}, "done": False}, {"message": {"content": "b"}, "done": True}]
+
+    async def handler(request):
+        return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+    adapter = OllamaAdapter(ProviderTransport("ollama", async_transport=httpx.MockTransport(handler)))
+    chunks = [chunk async for chunk in adapter.astream(InternalLLMRequest(prompt="hi"))]
+    await adapter.transport.aclose()
+
+    assert chunks == ["a", "b"]
+
+
+def test_streaming_support_follows_stream_line_hook() -> None:
+    class BufferedAdapter(HTTPLLMAdapter):
+        provider_name = "buffered"
+
+        def _prepare(self, request, stream=False):
+            raise NotImplementedError
+
+        def _parse(self, raw):
+            return ""
+
+    assert EndpointAdapter.supports_streaming and OllamaAdapter.supports_streaming
+    assert not BufferedAdapter.supports_streaming
+    assert BufferedAdapter()._parse_stream_line("data: {}") is None
+
+
+def test_registry_returns_one_adapter_per_provider() -> None:
+    registry = LLMAdapterRegistry(ProviderRoutingPolicy(default_provider="endpoint"))
+
+    first = registry.resolve(InternalLLMRequest(prompt="a"))
+    assert registry.resolve(InternalLLMRequest(prompt="b")) is first
+    assert registry.resolve(InternalLLMRequest(prompt="c", model="claude-3")) is not first
+
+
+@pytest.mark.asyncio
+async def test_acall_llm_is_native_async_and_coalesces(endpoint_env) -> None:
+    posts = []
+
+    async def handler(request):
+        posts.append(request)
+        await asyncio.sleep(0.01)
+        return _completion("done")
+
+    transport = ProviderTransport("endpoint", async_transport=httpx.MockTransport(handler))
+    svc = LLMService(cache=LLMResponseCache(), transport=transport)
+
+    results = await asyncio.gather(*(svc.acall_llm("same prompt") for _ in range(4)))
+    await transport.aclose()
+
+    assert results == ["done"] * 4
+    assert len(posts) == 1
+    assert svc.cache.stats()["coalesced"] == 3
@@ -1,21 +1,14 @@
+import json
+
+import httpx
 import pytest
 
+from orchestrator.llm_adapters.transport import ProviderTransport
 from orchestrator.llm_util import LLMService
 
 
-class _Response:
-    def __init__(self, status_code, payload):
-        self.status_code = status_code
-        self._payload = payload
-        self.ok = 200 <= status_code < 300
-        self.text = str(payload)
-
-    def json(self):
-        return self._payload
-
-    def raise_for_status(self):
-        if not self.ok:
-            raise RuntimeError(f"HTTP {self.status_code}")
+def _transport(handler):
+    return ProviderTransport("endpoint", max_retries=0, transport=httpx.MockTransport(handler))
 
 
 def test_llm_service_falls_back_on_unsupported_model(monkeypatch):
@@ -26,21 +19,21 @@ def test_llm_service_falls_back_on_unsupported_model(monkeypatch):
 
     calls = []
 
-    def fake_post(_endpoint, headers=None, json=None, timeout=None):
-        calls.append(json["model"])
-        if json["model"] == "codestral-latest":
-            return _Response(
+    def fake_post(request):
+        model = json.loads(request.content)["model"]
+        calls.append(model)
+        if model == "codestral-latest":
+            return httpx.Response(
                 400,
-                {"error": {"message": "The requested model is not supported."}},
+                json={"error": {"message": "The requested model is not supported."}},
             )
-        return _Response(
+        return httpx.Response(
             200,
-            {"choices": [{"message": {"content": "ok"}}]},
+            json={"choices": [{"message": {"content": "ok"}}]},
         )
 
-    monkeypatch.setattr("requests.post", fake_post)
-    svc = LLMService()
-    out = svc.call_llm("hello")
+    svc = LLMService(transport=_transport(fake_post))
+    out = svc.call_llm("hello", use_cache=False)
     assert out == "ok"
     assert calls == ["codestral-latest", "gpt-4o-mini"]
 
@@ -51,13 +44,12 @@ def test_llm_service_errors_when_all_models_unsupported(monkeypatch):
     monkeypatch.setenv("LLM_MODEL", "m1")
     monkeypatch.setenv("LLM_FALLBACK_MODELS", "m2")
 
-    def fake_post(_endpoint, headers=None, json=None, timeout=None):
-        return _Response(
+    def fake_post(request):
+        return httpx.Response(
             400,
-            {"error": {"message": "The requested model is not supported."}},
+            json={"error": {"message": "The requested model is not supported."}},
         )
 
-    monkeypatch.setattr("requests.post", fake_post)
-    svc = LLMService()
+    svc = LLMService(transport=_transport(fake_post))
     with pytest.raises(RuntimeError, match="No supported model found"):
         svc.call_llm("hello")
@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 
 import numpy as np
@@ -7,6 +8,7 @@ from multi_client_router import (
     ClientNotFound,
     ContaminationError,
     InMemoryEventStore,
+    MicroBatchDispatcher,
     MultiClientMCPRouter,
     QuotaExceededError,
 )
@@ -79,3 +81,151 @@ async def test_missing_client_raises_not_found() -> None:
 
     with pytest.raises(ClientNotFound):
         await router.process_request("missing-client", np.array([1.0]))
+
+
+class CountingEventStore(InMemoryEventStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+        self.reads = 0
+
+    async def append_event(self, *args, **kwargs) -> None:
+        self.writes += 1
+        await super().append_event(*args, **kwargs)
+
+    async def append_events(self, tenant_id, events) -> None:
+        self.writes += 1
+        await super().append_events(tenant_id, events)
+
+    async def get_execution(self, tenant_id, execution_id):
+        self.reads += 1
+        return await super().get_execution(tenant_id, execution_id)
+
+
+@pytest.mark.asyncio
+async def test_projection_is_cached_per_shape() -> None:
+    router = MultiClientMCPRouter(InMemoryEventStore())
+    await router.register_client("openai-key")
+    pipe = router.pipelines[hashlib.sha256(b"openai-key").hexdigest()[:16]]
+
+    sample = np.linspace(0.0, 1.0, 12)
+    first = pipe._namespace_embedding(sample)
+    again = pipe._namespace_embedding(sample)
+    seed = int(hashlib.sha256(pipe.ctx.tenant_id.encode("utf-8")).hexdigest()[:8], 16)
+    fresh = np.random.default_rng(seed).uniform(0.95, 1.05, size=(12,))
+
+    assert np.array_equal(first, again)
+    assert np.array_equal(first, sample * fresh)
+    assert pipe._projection((12,)) is pipe._projection((12,))
+    assert pipe._projection((3, 4)).shape == (3, 4)
+
+
+@pytest.mark.asyncio
+async def test_request_commits_events_in_one_batch_and_caches_baseline() -> None:
+    store = CountingEventStore()
+    router = MultiClientMCPRouter(store)
+    await router.register_client("openai-key")
+    key = hashlib.sha256(b"openai-key").hexdigest()[:16]
+    pipe = router.pipelines[key]
+    await router.set_client_baseline(key, np.zeros(64, dtype=float))
+    store.writes = 0
+
+    for _ in range(3):
+        await router.process_request(key, np.zeros(64, dtype=float))
+
+    assert store.writes == 3
+    assert store.reads == 1
+    witnessed = await store.get_execution(pipe.ctx.tenant_id, "witness")
+    assert [e["state"] for e in witnessed] == ["RESULT_WITNESSED"] * 3
+
+    await router.set_client_baseline(key, np.ones(64, dtype=float) * 10)
+    with pytest.raises(ContaminationError):
+        await router.process_request(key, np.zeros(64, dtype=float))
+    ingress_events = [k for k in store._events if k[1].startswith("ingress-")]
+    assert len(ingress_events) == 4
+
+
+async def _drive(router: MultiClientMCPRouter, tenants: int) -> list[dict]:
+    keys = []
+    for i in range(tenants):
+        await router.register_client(f"key-{i}")
+        key = hashlib.sha256(f"key-{i}".encode()).hexdigest()[:16]
+        await router.set_client_baseline(key, np.zeros(64, dtype=float))
+        keys.append(key)
+    samples = [np.full(64, 0.01 * i) for i in range(tenants)]
+    return await asyncio.gather(
+        *(router.process_request(key, sample) for key, sample in zip(keys, samples)),
+        return_exceptions=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_micro_batched_requests_match_unbatched_results() -> None:
+    single = await _drive(MultiClientMCPRouter(InMemoryEventStore()), 10)
+    router = MultiClientMCPRouter(InMemoryEventStore(), batch_size=4, batch_wait_ms=1.0)
+    batched = await _drive(router, 10)
+
+    assert router.dispatcher.items_run == 10
+    assert router.dispatcher.batches_run == 3
+    for expected, actual in zip(single, batched):
+        if isinstance(expected, Exception):
+            assert type(actual) is type(expected)
+            continue
+        assert actual["tenant_id"] == expected["tenant_id"]
+        assert actual["mcp_tensor"] == expected["mcp_tensor"]
+        assert actual["drift"] == expected["drift"]
+        assert actual["sovereignty_hash"] == expected["sovereignty_hash"]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_flushes_partial_batch_and_propagates_errors() -> None:
+    batches = []
+
+    def run_batch(items):
+        batches.append(len(items))
+        if any(item[0] < 0 for item in items):
+            raise ValueError("bad batch")
+        return [item * 2 for item in items]
+
+    dispatcher = MicroBatchDispatcher(run_batch, max_batch_size=8, max_wait_ms=1.0)
+    results = await asyncio.gather(*(dispatcher.submit(np.array([float(i)])) for i in range(3)))
+
+    assert batches == [3]
+    assert [r[0] for r in results] == [0.0, 2.0, 4.0]
+    with pytest.raises(ValueError):
+        await asyncio.gather(dispatcher.submit(np.array([1.0])), dispatcher.submit(np.array([-1.0])))
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_fails_every_caller_on_short_result_list() -> None:
+    dispatcher = MicroBatchDispatcher(lambda items: [items[0]], max_batch_size=3, max_wait_ms=1.0)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(dispatcher.submit(np.array([float(i)])) for i in range(3)), return_exceptions=True),
+        timeout=1.0,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert dispatcher.batches_run == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size", [1, 4])
+async def test_ingress_is_recorded_when_core_raises(batch_size) -> None:
+    store = CountingEventStore()
+    router = MultiClientMCPRouter(store, batch_size=batch_size, batch_wait_ms=1.0)
+    await router.register_client("openai-key")
+    key = hashlib.sha256(b"openai-key").hexdigest()[:16]
+
+    def failing_core(tokens):
+        raise RuntimeError("core unavailable")
+
+    router._infer_batch = failing_core
+    if router.dispatcher is not None:
+        router.dispatcher.run_batch = failing_core
+    with pytest.raises(RuntimeError, match="core unavailable"):
+        await router.process_request(key, np.zeros(8, dtype=float))
+
+    ingress = [events for (_, execution_id), events in store._events.items() if execution_id.startswith("ingress-")]
+    assert [[e["state"] for e in events] for events in ingress] == [["TOKEN_INGRESS"]]
+    assert not any(execution_id == "witness" for _, execution_id in store._events)
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.security import oidc
+from app.security.jwks_cache import JWKSCache, JWKSUnavailableError, VerifiedTokenCache
+
+ISSUER = "https://issuer.test"
+AUDIENCE = "a2a-mcp"
+
+
+class _JWKSServer:
+    """Local JWKS endpoint that counts fetches and can be taken offline."""
+
+    def __init__(self) -> None:
+        self.keys: dict[str, rsa.RSAPrivateKey] = {}
+        self.fetches = 0
+        self.offline = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server.fetches += 1
+                if server.offline:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps(server.document()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/jwks"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add_key(self, kid: str) -> None:
+        self.keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def document(self) -> dict:
+        keys = []
+        for kid, private_key in self.keys.items():
+            jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+            keys.append({**jwk, "kid": kid, "use": "sig", "alg": "RS256"})
+        return {"keys": keys}
+
+    def token(self, kid: str, signing_kid: str | None = None, ttl: int = 300, **claims) -> str:
+        payload = {
+            "iss": ISSUER,
+            "aud": AUDIENCE,
+            "exp": int(time.time()) + ttl,
+            "repository": "adaptco/A2A_MCP",
+            "actor": "github-actions",
+            **claims,
+        }
+        return jwt.encode(payload, self.keys[signing_kid or kid], algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def jwks_server(monkeypatch):
+    server = _JWKSServer()
+    server.add_key("k1")
+    monkeypatch.setenv("OIDC_ISSUER", ISSUER)
+    monkeypatch.setenv("OIDC_AUDIENCE", AUDIENCE)
+    monkeypatch.setenv("OIDC_JWKS_URL", server.url)
+    oidc.reset_oidc_caches()
+    yield server
+    oidc.reset_oidc_caches()
+    server.httpd.shutdown()
+
+
+def test_verify_bearer_token_fetches_jwks_once_and_caches_tokens(jwks_server) -> None:
+    first = jwks_server.token("k1", jti="a")
+    second = jwks_server.token("k1", jti="b")
+
+    for _ in range(3):
+        assert oidc.verify_bearer_token(first, request_id="r")["actor"] == "github-actions"
+    assert oidc.verify_bearer_token(second, request_id="r")["jti"] == "b"
+
+    assert jwks_server.fetches == 1
+    assert len(oidc._VERIFIED_TOKENS) == 2
+
+
+def test_unknown_kid_refetches_at_most_once_per_interval(jwks_server) -> None:
+    oidc.verify_bearer_token(jwks_server.token("k1"), request_id="r")
+    jwks_server.add_key("k2")
+    oidc.get_jwks_cache(jwks_server.url)._last_attempt = None  # rotation after the interval
+
+    assert oidc.verify_bearer_token(jwks_server.token("k2"), request_id="r")
+    assert jwks_server.fetches == 2
+
+    jwks_server.add_key("k3")
+    for _ in range(3):
+        with pytest.raises(oidc.OIDCAuthError):
+            oidc.verify_bearer_token(jwks_server.token("k3", jti="x"), request_id="r")
+    assert jwks_server.fetches == 2
+
+
+def test_bad_signature_is_rejected_and_not_cached(jwks_server) -> None:
+    jwks_server.add_key("other")
+    forged = jwks_server.token("k1", signing_kid="other")
+
+    for _ in range(2):
+        with pytest.raises(oidc.OIDCAuthError):
+            oidc.verify_bearer_token(forged, request_id="r")
+    assert len(oidc._VERIFIED_TOKENS) == 0
+
+
+def test_stale_keys_are_served_while_issuer_is_unreachable(jwks_server, clock) -> None:
+    cache = JWKSCache(jwks_server.url, refresh_interval=60, max_stale=600, clock=clock)
+    key = cache.get_signing_key("k1")
+
+    jwks_server.offline = True
+    clock.now += 120
+    assert cache.get_signing_key("k1") is key
+    deadline = time.time() + 5
+    while cache._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.fetch_count == 2
+    assert cache.get_signing_key("k1") is key
+
+    clock.now += 600
+    with pytest.raises(JWKSUnavailableError):
+        cache.get_signing_key("k1")
+
+
+def test_verified_token_cache_expires_at_exp_and_evicts_lru(clock) -> None:
+    cache = VerifiedTokenCache(max_entries=2, clock=clock)
+    cache.put("a", {"exp": clock.now + 10})
+    cache.put("no-exp", {"sub": "x"})
+    cache.put("b", {"exp": clock.now + 100})
+    cache.get("a")
+    cache.put("c", {"exp": clock.now + 100})
+
+    assert cache.get("no-exp") is None
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    clock.now += 10
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
@@ -0,0 +1,58 @@
+from pipeline.lib.canonical import GENESIS_HASH, LedgerWriter, append_to_ledger, read_ledger_head
+from tests.utils import assert_ledger_chain, read_ledger
+
+
+def test_append_to_ledger_chains_records(tmp_path) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+
+    first = append_to_ledger({"chunk_id": "a"}, ledger)
+    second = append_to_ledger({"chunk_id": "b"}, ledger)
+
+    records = read_ledger(ledger)
+    assert [r["integrity_hash"] for r in records] == [first, second]
+    assert_ledger_chain(records)
+
+
+def test_append_many_group_commits_in_order(tmp_path) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+
+    with LedgerWriter(ledger) as writer:
+        hashes = writer.append_many([{"i": i} for i in range(5)])
+        assert writer.head_hash == hashes[-1]
+
+    records = read_ledger(ledger)
+    assert [r["i"] for r in records] == list(range(5))
+    assert_ledger_chain(records)
+
+
+def test_read_ledger_head_seeks_back_across_chunks(tmp_path) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+    with LedgerWriter(ledger, fsync=False) as writer:
+        writer.append({"text": "x" * 300})
+        last = writer.append({"text": "y" * 300})
+
+    head, size = read_ledger_head(ledger, chunk_size=16)
+
+    assert head == last
+    assert size == ledger.stat().st_size
+    assert read_ledger_head(tmp_path / "missing.jsonl") == (GENESIS_HASH, 0)
+
+
+def test_writer_recovers_head_after_foreign_append(tmp_path) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+    a = LedgerWriter(ledger, fsync=False)
+    b = LedgerWriter(ledger, fsync=False)
+
+    a.append({"writer": "a", "n": 1})
+    b.append({"writer": "b", "n": 1})
+    a.append({"writer": "a", "n": 2})
+    a.close()
+    b.close()
+
+    reopened = LedgerWriter(ledger, fsync=False)
+    reopened.append({"writer": "c", "n": 1})
+    reopened.close()
+
+    records = read_ledger(ledger)
+    assert len(records) == 4
+    assert_ledger_chain(records)
@@ -0,0 +1,185 @@
+import threading
+import time
+import uuid
+
+from orchestrator import storage
+from orchestrator.fsm_persistence import FSMEventStore, load_state_machine_snapshot
+from orchestrator.plan_state_writer import PlanStateWriter
+from orchestrator.stateflow import PartialVerdict, State, StateMachine
+from schemas.database import PlanStateDeltaModel, PlanStateModel
+
+
+def _drive(sm: StateMachine, retries: int) -> None:
+    sm.trigger("OBJECTIVE_INGRESS")
+    sm.trigger("RUN_DISPATCHED")
+    for _ in range(retries):
+        sm.trigger("EXECUTION_COMPLETE")
+
+        def policy_partial():
+            raise PartialVerdict()
+
+        sm.evaluate_apply_policy(policy_partial)
+        sm.trigger("RETRY_DISPATCHED")
+    sm.trigger("EXECUTION_COMPLETE")
+
+
+def _stored_rows(plan_id: str):
+    session = storage._db_manager.SessionLocal()
+    try:
+        checkpoint = session.query(PlanStateModel).filter(PlanStateModel.plan_id == plan_id).first()
+        deltas = [
+            row.seq
+            for row in session.query(PlanStateDeltaModel)
+            .filter(PlanStateDeltaModel.plan_id == plan_id)
+            .order_by(PlanStateDeltaModel.seq)
+        ]
+        return checkpoint, deltas
+    finally:
+        session.close()
+
+
+def test_rebuild_from_checkpoint_and_deltas_matches_machine():
+    writer = PlanStateWriter(checkpoint_every=4, flush_interval=0.01)
+    plan_id = f"plan-{uuid.uuid4()}"
+    sm = StateMachine(max_retries=5, persistence_writer=writer)
+    sm.plan_id = plan_id
+    try:
+        _drive(sm, retries=2)  # 9 transitions
+        assert writer.flush(5.0)
+
+        checkpoint, deltas = _stored_rows(plan_id)
+        assert checkpoint is not None
+        assert deltas == [9]
+        assert storage.load_plan_state(plan_id) == sm.to_dict()
+
+        restored = StateMachine.from_dict(storage.load_plan_state(plan_id))
+        assert restored.current_state() == State.EVALUATING
+        assert restored.attempts == 2
+        assert writer.stats()["submitted"] == 9
+    finally:
+        writer.close()
+
+
+def test_rebuild_without_checkpoint_replays_deltas():
+    writer = PlanStateWriter(checkpoint_every=100, flush_interval=0.01, ledger=None)
+    plan_id = f"plan-{uuid.uuid4()}"
+    sm = StateMachine(persistence_writer=writer)
+    sm.plan_id = plan_id
+    try:
+        sm.trigger("OBJECTIVE_INGRESS")
+        sm.trigger("RUN_DISPATCHED")
+        assert writer.flush(5.0)
+
+        checkpoint, deltas = _stored_rows(plan_id)
+        assert checkpoint is None
+        assert deltas == [1, 2]
+        assert storage.load_plan_state(plan_id) == sm.to_dict()
+    finally:
+        writer.close()
+
+
+def test_writes_are_ordered_per_plan_and_off_the_caller_thread():
+    calls = []
+
+    def slow_save(plan_id, deltas, checkpoint):
+        time.sleep(0.02)
+        calls.append((plan_id, [d["seq"] for d in deltas], threading.current_thread().name))
+
+    writer = PlanStateWriter(save=slow_save, ledger=None, checkpoint_every=1000, batch_size=3, flush_interval=0.01)
+    machines = []
+    for i in range(3):
+        sm = StateMachine(max_retries=5, persistence_writer=writer)
+        sm.plan_id = f"plan-{i}"
+        machines.append(sm)
+    try:
+        started = time.perf_counter()
+        threads = [threading.Thread(target=_drive, args=(sm, 3)) for sm in machines]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        submit_seconds = time.perf_counter() - started
+        assert writer.flush(10.0)
+    finally:
+        writer.close()
+
+    for sm in machines:
+        seqs = [seq for plan_id, batch, _ in calls if plan_id == sm.plan_id for seq in batch]
+        assert seqs == list(range(1, len(sm.history) + 1))
+    assert {thread for _, _, thread in calls} == {"plan-state-writer"}
+    assert submit_seconds < 0.02 * len(calls)
+
+
+def test_failed_write_requests_checkpoint_on_next_transition():
+    failures = {"left": 1}
+
+    def flaky_save(plan_id, deltas, checkpoint):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise RuntimeError("database unavailable")
+        storage.save_plan_state_deltas(plan_id, deltas, checkpoint)
+
+    writer = PlanStateWriter(save=flaky_save, ledger=None, checkpoint_every=1000, flush_interval=0.01)
+    plan_id = f"plan-{uuid.uuid4()}"
+    sm = StateMachine(persistence_writer=writer)
+    sm.plan_id = plan_id
+    try:
+        sm.trigger("OBJECTIVE_INGRESS")
+        assert writer.flush(5.0)
+        assert writer.checkpoint_due(plan_id, 2)
+
+        sm.trigger("RUN_DISPATCHED")
+        assert writer.flush(5.0)
+        assert not writer.checkpoint_due(plan_id, 3)
+        assert storage.load_plan_state(plan_id) == sm.to_dict()
+        assert writer.stats()["failed"] == 1
+    finally:
+        writer.close()
+
+
+def test_rejected_submit_forces_checkpoint_on_next_transition(caplog):
+    class RejectingWriter:
+        def __init__(self):
+            self.calls = []
+            self.reject = 1
+
+        def checkpoint_due(self, plan_id, seq):
+            return False
+
+        def submit(self, plan_id, delta, checkpoint=None):
+            if self.reject:
+                self.reject -= 1
+                raise RuntimeError("PlanStateWriter is closed")
+            self.calls.append((delta["seq"], checkpoint))
+
+    writer = RejectingWriter()
+    sm = StateMachine(persistence_writer=writer)
+    sm.plan_id = "plan-gap"
+
+    sm.trigger("OBJECTIVE_INGRESS")
+    sm.trigger("RUN_DISPATCHED")
+    sm.trigger("EXECUTION_COMPLETE")
+
+    assert "Failed to submit transition 1 for plan plan-gap" in caplog.text
+    (seq, checkpoint), (next_seq, next_checkpoint) = writer.calls
+    assert seq == 2 and checkpoint["state"] == State.EXECUTING.value and len(checkpoint["history"]) == 2
+    assert next_seq == 3 and next_checkpoint is None
+
+
+def test_deltas_are_chained_in_the_fsm_ledger():
+    writer = PlanStateWriter(checkpoint_every=1000, flush_interval=0.01)
+    plan_id = f"plan-{uuid.uuid4()}"
+    sm = StateMachine(persistence_writer=writer)
+    sm.plan_id = plan_id
+    try:
+        _drive(sm, retries=1)
+        assert writer.flush(5.0)
+    finally:
+        writer.close()
+
+    store = FSMEventStore()
+    events = store.load_events("default", plan_id)
+    assert [e.event_type for e in events] == [rec.event for rec in sm.history]
+    assert store.verify_chain("default", plan_id, full=True)
+    assert load_state_machine_snapshot(plan_id) is None
+    assert writer.stats()["ledger_failed"] == 0
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+from event_store.models import Event
+from event_store.postgres_event_store import PostgresEventStore
+
+TEST_DSN = os.getenv("EVENT_STORE_TEST_DSN", "")
+
+
+class _FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.log.append(("begin",))
+        yield
+        self.log.append(("commit",))
+
+    async def fetchrow(self, sql, *args):
+        self.log.append(("insert", list(args[0])))
+
+    async def fetchval(self, sql, *args):
+        self.log.append(("notify", len(args[1])))
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.log.append(("copy", table, [r[0] for r in records]))
+
+
+class _FakePool:
+    def __init__(self):
+        self.log = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield _FakeConnection(self.log)
+
+
+class _RecordingObserver:
+    def __init__(self, log, delay=0.0, fail_on=None):
+        self.log = log
+        self.delay = delay
+        self.fail_on = fail_on
+        self.seen = []
+
+    async def on_state_change(self, event):
+        self.log.append(("observed", event.execution_id))
+        await asyncio.sleep(self.delay)
+        if event.execution_id == self.fail_on:
+            raise RuntimeError("observer down")
+        self.seen.append(event.execution_id)
+
+
+def _event(execution_id, state="RUNNING", **payload):
+    return Event(
+        execution_id=execution_id,
+        event_type="SIMULATION_STEP",
+        state=state,
+        hash_current=uuid.uuid4().hex,
+        timestamp=datetime(2026, 1, 1, 12, 0, 0),
+        payload=payload,
+    )
+
+
+@pytest.mark.asyncio
+async def test_observers_run_after_commit_in_order():
+    pool = _FakePool()
+    observer = _RecordingObserver(pool.log)
+    store = PostgresEventStore(pool, [observer], observer_workers=1)
+
+    await store.append_events([_event("a"), _event("b")])
+    await store.drain()
+
+    assert pool.log[0] == ("insert", ["a", "b"])
+    assert pool.log[1:] == [("observed", "a"), ("observed", "b")]
+    assert observer.seen == ["a", "b"]
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_large_batches_use_copy_inside_a_transaction():
+    pool = _FakePool()
+    store = PostgresEventStore(pool, copy_threshold=3)
+
+    await store.append_events([_event(str(i)) for i in range(3)])
+
+    assert pool.log == [("begin",), ("copy", "event_store_events", ["0", "1", "2"]), ("notify", 3), ("commit",)]
+    assert store.stats()["copy_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_observer_queue_applies_backpressure():
+    pool = _FakePool()
+    observer = _RecordingObserver(pool.log, delay=0.05)
+    store = PostgresEventStore(pool, [observer], observer_queue_size=1, observer_workers=1)
+    tasks_before = len(asyncio.all_tasks())
+
+    started = asyncio.get_running_loop().time()
+    for i in range(4):
+        await store.append_event(_event(str(i)))
+    elapsed = asyncio.get_running_loop().time() - started
+
+    # Worker holds one event and the queue one more; the rest wait for room.
+    assert elapsed >= 0.09
+    # One worker plus its in-flight observer call, however many events were appended.
+    assert len(asyncio.all_tasks()) - tasks_before <= 2
+    await store.aclose()
+    assert observer.seen == ["0", "1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_observer_errors_are_counted_and_swallowed():
+    pool = _FakePool()
+    observer = _RecordingObserver(pool.log, fail_on="bad")
+    store = PostgresEventStore(pool, [observer])
+
+    await store.append_events([_event("bad"), _event("good")])
+    await store.aclose()
+
+    assert observer.seen == ["good"]
+    assert store.stats()["observer_errors"] == 1
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="EVENT_STORE_TEST_DSN not set")
+@pytest.mark.asyncio
+async def test_postgres_roundtrip_and_listen_notify():
+    table = f"event_store_test_{uuid.uuid4().hex[:8]}"
+    channel = f"{table}_channel"
+    writer = await PostgresEventStore.connect(TEST_DSN, table=table, channel=channel, copy_threshold=4)
+    reader = await PostgresEventStore.connect(TEST_DSN, table=table, channel=channel)
+    try:
+        await writer.ensure_schema()
+        stream = reader.listen()
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.1)  # let the listener register
+
+        await writer.append_event(_event("exec-1", state="RUNNING", step=0))
+        await writer.append_events([_event("exec-1", step=i) for i in range(1, 5)])
+        await writer.append_event(_event("exec-1", state="FINALIZED", step=5))
+
+        received = [await asyncio.wait_for(first, 5)]
+        for _ in range(5):
+            received.append(await asyncio.wait_for(stream.__anext__(), 5))
+        await stream.aclose()
+
+        stored = await writer.get_execution("exec-1")
+        assert [e.payload["step"] for e in stored] == [0, 1, 2, 3, 4, 5]
+        assert stored[0].timestamp == datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        assert [n["hash_current"] for n in received] == [e.hash_current for e in stored]
+        assert received[-1]["state"] == "FINALIZED"
+        assert writer.stats()["copy_batches"] == 1 and writer.stats()["insert_batches"] == 2
+    finally:
+        async with writer.pool.acquire() as conn:
+            await conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        await writer.pool.close()
+        await reader.pool.close()
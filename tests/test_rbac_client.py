@@ -0,0 +1,126 @@
+import os
+
+import httpx
+import pytest
+
+from rbac.client import AsyncRBACClient, DecisionCache, RBACClient
+from rbac.rbac_service import _registry, app
+
+TOKEN = os.getenv("RBAC_SECRET", "dev-secret-change-me")
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    _registry.clear()
+    yield
+    _registry.clear()
+
+
+def _async_client(**kwargs) -> AsyncRBACClient:
+    return AsyncRBACClient(
+        "http://rbac.test",
+        token=TOKEN,
+        transport=httpx.ASGITransport(app=app),
+        **kwargs,
+    )
+
+
+def test_decision_cache_expires_and_invalidates_per_agent(clock) -> None:
+    cache = DecisionCache(ttl_seconds=10, max_entries=2, clock=clock)
+    cache.put(("a", "run_pipeline", None), True)
+    cache.put(("b", "run_pipeline", None), False)
+
+    assert cache.get(("b", "run_pipeline", None)) is False
+    cache.invalidate("b")
+    assert cache.get(("b", "run_pipeline", None)) is None
+
+    clock.now += 10
+    assert cache.get(("a", "run_pipeline", None)) is None
+
+    for agent in ("x", "y", "z"):
+        cache.put((agent, None, "RUN_DISPATCHED"), True)
+    assert len(cache) == 2
+    assert cache.get(("x", None, "RUN_DISPATCHED")) is None
+
+
+@pytest.mark.asyncio
+async def test_async_client_caches_gateway_decisions() -> None:
+    posts = []
+
+    async def record(request: httpx.Request) -> None:
+        posts.append(request.url.path)
+
+    async with _async_client() as client:
+        client.http.event_hooks["request"].append(record)
+        await client.http.post(
+            "/agents/onboard",
+            json={"agent_id": "ops", "agent_name": "Ops", "role": "pipeline_operator"},
+        )
+        posts.clear()
+
+        assert await client.verify_permission("ops", action="run_pipeline") is True
+        assert await client.verify_permission("ops", action="run_pipeline") is True
+        assert await client.verify_permission("ghost", action="run_pipeline") is False
+        assert await client.verify_permission("ghost", action="run_pipeline") is False
+
+    # Unknown agents are not cached: a later onboarding must be visible.
+    assert posts == ["/agents/ops/verify", "/agents/ghost/verify", "/agents/ghost/verify"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_matches_gateway_and_invalidation_refetches() -> None:
+    async with _async_client() as client:
+        await client.http.post(
+            "/agents/onboard",
+            json={"agent_id": "obs", "agent_name": "Observer", "role": "observer"},
+        )
+        actions = ["run_pipeline", "view_artifacts", "deploy"]
+        transitions = ["RUN_DISPATCHED", "EXECUTING"]
+
+        decided = await client.prefetch("obs", actions=actions, transitions=transitions)
+
+        uncached = _async_client(decision_ttl=0)
+        for action in actions:
+            assert decided[("obs", action, None)] == await uncached.verify_permission("obs", action=action)
+        for transition in transitions:
+            assert decided[("obs", None, transition)] == await uncached.verify_permission(
+                "obs", transition=transition
+            )
+        await uncached.aclose()
+
+        await client.http.delete("/agents/obs")
+        assert await client.verify_permission("obs", action="view_artifacts") is True
+        client.invalidate("obs")
+        assert await client.verify_permission("obs", action="view_artifacts") is False
+
+
+def test_sync_client_fails_closed_without_caching() -> None:
+    with RBACClient("http://127.0.0.1:9", timeout=1, token=TOKEN) as client:
+        assert client.verify_permission("ops", action="run_pipeline") is False
+        assert len(client.decisions) == 0
+        assert client.prefetch("ops", actions=["run_pipeline"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_intent_engine_prefetches_its_requester_and_closes_the_client() -> None:
+    from orchestrator.intent_engine import IntentEngine
+
+    paths = []
+
+    async def record(request: httpx.Request) -> None:
+        paths.append((request.method, request.url.path))
+
+    async with IntentEngine() as engine:
+        engine._rbac_enabled = True
+        engine._rbac_client = client = _async_client()
+        await client.http.post(
+            "/agents/onboard",
+            json={"agent_id": "obs", "agent_name": "Observer", "role": "observer"},
+        )
+        client.http.event_hooks["request"].append(record)
+
+        with pytest.raises(PermissionError):
+            await engine.run_full_pipeline("denied", requester="obs")
+
+    assert paths == [("GET", "/agents/obs/permissions")]
+    assert client.http.is_closed
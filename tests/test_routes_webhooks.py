@@ -42,6 +42,9 @@ class DummyMonday:
             "column_values": [],
         }
 
+    async def get_items(self, board_id, item_ids):
+        return [await self.get_item(board_id, item_id) for item_id in item_ids]
+
     async def close(self):
         pass
 
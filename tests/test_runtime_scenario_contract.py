@@ -1,10 +1,18 @@
 import json
 from pathlib import Path
 
+import hashlib
+
+import numpy as np
 import pytest
 from pydantic import ValidationError
 
-from runtime_scenario_service import RuntimeScenarioService
+from runtime_scenario_service import (
+    ProjectionCache,
+    RuntimeScenarioService,
+    _project_to_target,
+    project_batch_to_target,
+)
 from schemas.runtime_scenario import RuntimeScenarioEnvelope
 
 
@@ -72,3 +80,47 @@ def test_runtime_hashing_is_deterministic_for_identical_payload() -> None:
     h1 = RuntimeScenarioService.hash_payload("", payload)
     h2 = RuntimeScenarioService.hash_payload("", payload)
     assert h1 == h2
+
+
+def _reference_hash_expand(vector: np.ndarray, target_dim: int = 1536) -> np.ndarray:
+    source = np.asarray(vector, dtype=np.float64).ravel()
+    output = np.zeros(target_dim, dtype=np.float64)
+    for i in range(target_dim):
+        seed = hashlib.sha256(f"hash-expand:{source.size}:{i}".encode("utf-8")).hexdigest()
+        index = int(seed[:8], 16) % source.size
+        sign = -1.0 if int(seed[8], 16) % 2 else 1.0
+        output[i] = source[index] * sign
+    return output / np.linalg.norm(output)
+
+
+def test_hash_expand_table_matches_per_index_digest_loop() -> None:
+    vector = np.random.default_rng(7).standard_normal(100)
+
+    projected, metadata = _project_to_target(vector)
+
+    assert metadata is not None and metadata.method == "hash-expand-v1"
+    assert np.array_equal(projected, _reference_hash_expand(vector))
+
+
+@pytest.mark.parametrize("source_dim", [16, 768, 100])
+def test_batch_projection_matches_single_vector_path(source_dim: int) -> None:
+    batch = np.random.default_rng(source_dim).standard_normal((8, source_dim))
+
+    projected, metadata = project_batch_to_target(batch)
+    singles = [_project_to_target(row) for row in batch]
+
+    assert projected.shape == (8, 1536)
+    assert metadata == singles[0][1]
+    np.testing.assert_allclose(projected, np.stack([row for row, _ in singles]), rtol=0, atol=1e-12)
+
+
+def test_projection_cache_memory_maps_identical_read_only_matrices(tmp_path) -> None:
+    in_memory, seed = ProjectionCache().dense(768, 1536)
+    first, first_seed = ProjectionCache(tmp_path).dense(768, 1536)
+    mapped, mapped_seed = ProjectionCache(tmp_path).dense(768, 1536)
+
+    assert isinstance(mapped, np.memmap)
+    assert seed == first_seed == mapped_seed
+    assert np.array_equal(in_memory, mapped)
+    assert np.array_equal(first, mapped)
+    assert not in_memory.flags.writeable and not mapped.flags.writeable
@@ -2,10 +2,12 @@ import pytest
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy import select, func
 
+from app.models.audit import AuditLog
 from app.models.base import Base
+from app.models.id_map import IdMap
 from app.models.task import Task
 from app.schemas.task import CanonicalTask
-from app.services.sync import upsert_and_sync
+from app.services.sync import bulk_upsert_and_sync, upsert_and_sync
 
 
 @pytest.mark.asyncio
@@ -20,3 +22,31 @@ async def test_sync_idempotent(tmp_path):
         await upsert_and_sync(session, task, {"proposed_status": "todo"})
         count = await session.scalar(select(func.count()).select_from(Task))
         assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_merges_existing_rows_and_flags_gate_failures():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with Session() as session:
+        await upsert_and_sync(
+            session, CanonicalTask(source="monday", item_id="1", name="Old", description="keep"), {}
+        )
+        results = await bulk_upsert_and_sync(
+            session,
+            [
+                (CanonicalTask(source="monday", item_id="1", name="New", status="doing"), {}),
+                (CanonicalTask(source="monday", item_id="2", name="anomaly here"), {}),
+                (CanonicalTask(source="airtable", item_id="3", name="T", external_ids={"airtable": "rec3"}), {}),
+            ],
+        )
+
+        tasks = {t.item_id: t for t in (await session.scalars(select(Task))).all()}
+        assert (tasks["1"].name, tasks["1"].status, tasks["1"].description) == ("New", "doing", "keep")
+        assert tasks["2"].needs_human_review is True
+        assert not tasks["1"].needs_human_review
+        assert await session.scalar(select(IdMap.airtable_id).where(IdMap.monday_item_id == "3")) == "rec3"
+        assert await session.scalar(select(func.count()).select_from(AuditLog)) == 1
+        assert [all(r.ok for r in gates) for _, gates in results] == [True, False, True]
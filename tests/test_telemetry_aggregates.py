@@ -0,0 +1,75 @@
+from orchestrator.telemetry_aggregates import DTCAggregator, SlidingWindowCounter, classify_error
+from orchestrator.telemetry_service import TelemetryService
+from schemas.telemetry import DTCSeverity
+
+
+def test_classify_error_matches_keyword_order() -> None:
+    assert classify_error("Inference timed out while parsing") == "T01-01"
+    assert classify_error("could not PARSE intent") == "I01-01"
+    assert classify_error("persist failed") == "O01-01"
+    assert classify_error("unknown") is None
+    assert classify_error(None) is None
+
+
+def test_sliding_window_expires_old_buckets() -> None:
+    counter = SlidingWindowCounter(60.0)
+    counter.add(0.0)
+    counter.add(30.0, count=2)
+
+    assert counter.count(59.0) == 3
+    assert counter.count(61.0) == 2
+    assert counter.rate(61.0) == 2 / 60.0
+    assert counter.count(200.0) == 0
+
+
+def test_aggregator_tracks_components_severity_and_windows(clock) -> None:
+    aggregator = DTCAggregator(clock=clock)
+
+    aggregator.observe("IntentEngine", False, "parse error")
+    aggregator.observe("CoderAgent", True, None)
+    clock.now += 120
+    aggregator.observe("CoderAgent", False, "inference failed")
+    aggregator.observe("CoderAgent", False, "inference failed")
+
+    snapshot = aggregator.snapshot()
+    assert aggregator.detected_dtcs() == ["I01-01", "T01-01"]
+    assert snapshot["events_total"] == 4
+    assert snapshot["failures_total"] == 3
+    assert snapshot["max_severity"] == DTCSeverity.CRITICAL.value
+    assert snapshot["components"]["IntentEngine"] == {
+        "dtc_counts": {"I01-01": 1},
+        "max_severity": DTCSeverity.HIGH.value,
+    }
+    assert aggregator.window_counts("1m") == {"I01-01": 0, "T01-01": 2}
+    assert aggregator.window_counts("5m") == {"I01-01": 1, "T01-01": 2}
+    assert snapshot["rates"]["1m"]["dtcs"]["T01-01"] == 2 / 60.0
+
+
+def test_report_uses_aggregates_beyond_event_buffer() -> None:
+    service = TelemetryService(max_buffered_events=2)
+    service.log_event("CoderAgent", "generate", success=False, error_message="Inference failed")
+    for _ in range(5):
+        service.log_event("Judge", "score")
+    service.log_event("IntentEngine", "plan", success=False, error_message="parse error")
+
+    report = service.generate_diagnostic_report("transformer_output", "test")
+
+    assert report.detected_dtcs == ["T01-01", "I01-01"]
+    assert report.max_severity == DTCSeverity.CRITICAL
+    assert report.dtc_details["T01-01"]["occurrences"] == 1
+    assert len(report.critical_actions) == 1
+    assert service.get_dtc_rates()["1h"]["failures"] == 2 / 3600.0
+
+
+def test_clear_buffer_resets_aggregates() -> None:
+    service = TelemetryService()
+    service.log_event("CoderAgent", "generate", success=False, error_message="Inference failed")
+
+    service.clear_buffer()
+    report = service.generate_diagnostic_report("transformer_output", "test")
+
+    assert report.detected_dtcs == []
+    assert report.max_severity == DTCSeverity.LOW
+    assert service.get_health_snapshot()["events_total"] == 0
+    assert service.get_dtc_rates()["1h"] == {"events": 0.0, "failures": 0.0, "dtcs": {}}
+    assert service.dtc_aggregator.windows == {"1m": 60.0, "5m": 300.0, "1h": 3600.0}
@@ -0,0 +1,116 @@
+import threading
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from orchestrator.telemetry_service import TelemetryService
+from orchestrator.telemetry_sink import BLOCK, DROP_NEWEST, DROP_OLDEST, TelemetrySink
+from schemas.database import Base, TelemetryEventModel
+
+
+def _session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'telemetry.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _row(i: int) -> dict:
+    return {
+        "event_id": f"evt-{i}",
+        "component": "orchestrator",
+        "event_type": "step",
+        "metadata_json": {"i": i},
+        "success": True,
+    }
+
+
+def _count(factory) -> int:
+    with factory() as session:
+        return session.scalar(select(func.count()).select_from(TelemetryEventModel))
+
+
+class _GatedFactory:
+    """Session factory that holds the flusher until released."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.release.wait(5)
+        return self.factory()
+
+
+def test_sink_bulk_inserts_in_batches(tmp_path) -> None:
+    factory = _session_factory(tmp_path)
+    sink = TelemetrySink(factory, batch_size=10, flush_interval=5.0)
+
+    for i in range(25):
+        assert sink.enqueue(TelemetryEventModel, _row(i))
+    assert sink.flush(timeout=5)
+    sink.close()
+
+    stats = sink.stats()
+    assert _count(factory) == 25
+    assert stats["written"] == 25
+    assert stats["batches"] >= 3
+    assert stats["buffered"] == 0
+
+
+def test_drop_oldest_keeps_newest_rows(tmp_path) -> None:
+    factory = _GatedFactory(_session_factory(tmp_path))
+    sink = TelemetrySink(factory, capacity=5, batch_size=100, flush_interval=5.0,
+                         overflow_policy=DROP_OLDEST)
+
+    for i in range(8):
+        assert sink.enqueue(TelemetryEventModel, _row(i))
+    factory.release.set()
+    sink.close()
+
+    with factory.factory() as session:
+        ids = sorted(session.scalars(select(TelemetryEventModel.event_id)))
+    assert ids == [f"evt-{i}" for i in range(3, 8)]
+    assert sink.stats()["dropped_oldest"] == 3
+
+
+def test_drop_newest_and_block_report_rejections(tmp_path) -> None:
+    factory = _GatedFactory(_session_factory(tmp_path))
+    newest = TelemetrySink(factory, capacity=2, batch_size=100, flush_interval=5.0,
+                           overflow_policy=DROP_NEWEST)
+    blocking = TelemetrySink(factory, capacity=2, batch_size=100, flush_interval=5.0,
+                             overflow_policy=BLOCK, block_timeout=0.05)
+
+    results = [newest.enqueue(TelemetryEventModel, _row(i)) for i in range(3)]
+    results += [blocking.enqueue(TelemetryEventModel, _row(10 + i)) for i in range(3)]
+    factory.release.set()
+    newest.close()
+    blocking.close()
+
+    assert results == [True, True, False, True, True, False]
+    assert newest.stats()["dropped_newest"] == 1
+    assert blocking.stats()["blocked"] == 1
+    assert _count(factory.factory) == 4
+
+
+def test_service_enqueues_instead_of_committing(tmp_path) -> None:
+    factory = _session_factory(tmp_path)
+    session = factory()
+    commits = []
+    session.commit = lambda: commits.append(True)
+    service = TelemetryService(
+        db_session=session,
+        sink=TelemetrySink.from_session(session, flush_interval=5.0),
+        max_buffered_events=3,
+    )
+
+    for i in range(5):
+        service.log_event("orchestrator", "step", metadata={"i": i})
+    assert service.flush(timeout=5)
+    service.close()
+
+    assert commits == []
+    assert len(service.event_buffer) == 3
+    with factory() as check:
+        stored = check.scalars(select(TelemetryEventModel)).all()
+    assert len(stored) == 5
+    assert {e.metadata_json["i"] for e in stored} == set(range(5))
@@ -0,0 +1,181 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.clients.monday import MondayClient
+from app.deps import get_session
+from app.main import app
+from app.models.base import Base
+from app.models.task import Task
+from app.routes import webhooks
+from app.services.webhook_intake import CoalescingIntake
+
+
+class FakeMondayGraphQL:
+    """Local stand-in for the Monday GraphQL API: one board of items."""
+
+    def __init__(self, board_id: str, item_count: int) -> None:
+        self.board_id = board_id
+        self.items = {
+            str(i): {
+                "id": str(i),
+                "name": f"Task {i}",
+                "column_values": [{"id": "status", "text": "Working on it", "value": None}],
+            }
+            for i in range(item_count)
+        }
+        self.queries = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        variables = body["variables"]
+        self.queries.append(variables)
+        ids = variables["iid"] if isinstance(variables["iid"], list) else [variables["iid"]]
+        items = [self.items[i] for i in ids if i in self.items][: variables.get("limit", 25)]
+        return httpx.Response(200, json={"data": {"boards": [{"items_page": {"items": items}}]}})
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    async def init() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(init())
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def _get_session():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _get_session
+    yield Session
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_monday_client_batches_item_fetches() -> None:
+    server = FakeMondayGraphQL("b1", 250)
+    client = MondayClient(
+        token="tok",
+        client=httpx.AsyncClient(base_url="https://monday.invalid/v2", transport=httpx.MockTransport(server)),
+    )
+
+    items = await client.get_items("b1", [str(i) for i in range(250)])
+    await client.close()
+
+    assert [item["id"] for item in items] == [str(i) for i in range(250)]
+    assert all(item["board_id"] == "b1" for item in items)
+    assert [len(q["iid"]) for q in server.queries] == [100, 100, 50]
+
+
+def test_bulk_edit_webhooks_coalesce_into_one_fetch_and_flush(monkeypatch, session_factory) -> None:
+    server = FakeMondayGraphQL("b1", 40)
+    monkeypatch.setattr(
+        "app.routes.webhooks.MondayClient",
+        lambda: MondayClient(
+            token="tok",
+            client=httpx.AsyncClient(base_url="https://monday.invalid/v2", transport=httpx.MockTransport(server)),
+        ),
+    )
+    flushes = []
+    process = webhooks._sync_monday_events
+
+    async def counting_process(events, session):
+        flushes.append(len(events))
+        await process(events, session)
+
+    monkeypatch.setattr(webhooks, "monday_intake", webhooks._intake(counting_process, lambda e: e.item_id))
+
+    async def fire() -> list:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            # Every item is edited three times, as a board-wide bulk edit would.
+            events = [
+                {"board_id": "b1", "item_id": str(i % 40), "event": "update_column_value"}
+                for i in range(120)
+            ]
+            responses = await asyncio.gather(*(http.post("/webhook/monday", json=e) for e in events))
+        stats = webhooks.monday_intake.get().stats()
+        await webhooks.close_clients()
+        return [r.status_code for r in responses], stats
+
+    statuses, stats = asyncio.run(fire())
+
+    async def count_tasks() -> int:
+        async with session_factory() as session:
+            return await session.scalar(select(func.count()).select_from(Task))
+
+    assert statuses == [200] * 120
+    assert flushes == [40]
+    assert len(server.queries) == 1
+    assert stats["coalesced"] == 80
+    assert asyncio.run(count_tasks()) == 40
+
+
+@pytest.mark.asyncio
+async def test_intake_propagates_flush_errors_to_every_submitter() -> None:
+    async def failing(events, session):
+        raise RuntimeError("db down")
+
+    intake = CoalescingIntake(lambda e: e, failing, debounce_seconds=0.01)
+
+    results = await asyncio.gather(*(intake.submit(i, None) for i in range(3)), return_exceptions=True)
+    retry = await asyncio.gather(intake.submit(0, None), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results + retry)
+    assert intake.stats() == {"events": 4, "coalesced": 0, "flushes": 0, "flushed_events": 0}
+
+
+@pytest.mark.asyncio
+async def test_intake_batches_never_exceed_max_batch() -> None:
+    sizes = []
+
+    async def record(events, session):
+        sizes.append(len(events))
+
+    intake = CoalescingIntake(lambda e: e, record, debounce_seconds=0.05, max_batch=2)
+
+    await asyncio.gather(*(intake.submit(i, None) for i in range(5)))
+
+    assert sorted(sizes) == [1, 2, 2]
+    assert intake.stats()["flushed_events"] == 5
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_leader_still_flushes_for_followers() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    flushed = []
+
+    async def slow(events, session):
+        started.set()
+        await release.wait()
+        flushed.extend(events)
+
+    intake = CoalescingIntake(lambda e: e, slow, debounce_seconds=0.01)
+    leader = asyncio.ensure_future(intake.submit("a", None))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(intake.submit("b", None))
+    await started.wait()
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await follower
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert flushed == ["a", "b"]
+    assert intake.stats()["flushes"] == 1
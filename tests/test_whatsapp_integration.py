@@ -1,6 +1,6 @@
 import asyncio
 import pytest
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock
 from datetime import datetime
 from event_store.models import Event
 from event_store.postgres_event_store import PostgresEventStore
@@ -26,7 +26,8 @@ async def test_whatsapp_integration_flow():
     observer.session = mock_session
 
     # 3. Setup Event Store
-    mock_pool = Mock()
+    mock_pool = MagicMock()
+    mock_pool.acquire.return_value.__aenter__.return_value = AsyncMock()
     event_store = PostgresEventStore(pool=mock_pool, observers=[observer])
 
     # 4. Create a Test Event (Terminal State)
@@ -0,0 +1,87 @@
+import hashlib
+
+import numpy as np
+
+from world_vectors.encoder import Embedding, EmbeddingEncoder
+from world_vectors.vault import VectorVault
+
+
+def _reference_vector(text: str, dim: int = 768) -> list[float]:
+    hash_val = int(hashlib.md5(text.encode()).hexdigest(), 16)
+    vector = [((hash_val >> i) % 256) / 256.0 for i in range(dim)]
+    norm = sum(x ** 2 for x in vector) ** 0.5
+    return [x / norm for x in vector] if norm > 0 else vector
+
+
+class _SeededEncoder(EmbeddingEncoder):
+    """Random unit vectors keyed by text, so searches have distinct scores."""
+
+    def encode(self, text, metadata=None):
+        seed = int(hashlib.sha256(text.encode()).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).standard_normal(self.dim).tolist()
+        return Embedding(text=text, vector=vector, metadata=metadata or {})
+
+
+def test_encode_batch_matches_scalar_hash_vectors() -> None:
+    encoder = EmbeddingEncoder()
+    texts = ["Supra spec", "", "base44 lore", "é unicode"]
+
+    batch = encoder.encode_batch(texts)
+
+    assert [e.vector for e in batch] == [_reference_vector(t) for t in texts]
+    assert encoder.encode("Supra spec").vector == batch[0].vector
+
+
+def test_search_ranks_by_cosine_and_filters_by_ref_type() -> None:
+    vault = VectorVault(encoder=_SeededEncoder(dim=32))
+    for i in range(40):
+        vault.add_entry(f"doc-{i}", f"text {i}", "spec" if i % 2 else "lore")
+
+    query = vault.encoder.encode("text 7").vector
+    results = vault.knn_search(query, top_k=5)
+    expected = sorted(
+        vault.list_entries(),
+        key=lambda e: VectorVault._cosine_similarity(query, e.embedding.vector),
+        reverse=True,
+    )[:5]
+
+    assert [e.entry_id for e, _ in results] == [e.entry_id for e in expected]
+    assert results[0][0].entry_id == "doc-7"
+    assert np.isclose(results[0][1], 1.0, atol=1e-5)
+
+    filtered = vault.search("text 7", top_k=50, ref_type_filter="lore")
+    assert filtered and all(entry.ref_type == "lore" for entry, _ in filtered)
+    assert vault.search("text 7", ref_type_filter="missing") == []
+
+
+def test_replacing_entry_moves_it_between_ref_type_masks() -> None:
+    vault = VectorVault(encoder=_SeededEncoder(dim=16))
+    vault.add_entry("item", "alpha", "spec")
+    vault.add_entry("item", "alpha", "lore")
+
+    assert all(e.entry_id != "item" for e, _ in vault.search("alpha", 50, "spec"))
+    assert vault.search("alpha", 1, "lore")[0][0].entry_id == "item"
+
+
+def test_knn_search_with_mismatched_dimension_scores_zero() -> None:
+    vault = VectorVault()
+
+    results = vault.knn_search([1.0, 2.0], top_k=3)
+
+    assert len(results) == 3
+    assert all(score == 0.0 for _, score in results)
+
+
+def test_ivf_index_full_probe_matches_exact_search() -> None:
+    exact = VectorVault(encoder=_SeededEncoder(dim=24))
+    approx = VectorVault(encoder=_SeededEncoder(dim=24), ann_threshold=50, ann_lists=8, ann_probe=2)
+    for i in range(300):
+        exact.add_entry(f"r{i}", f"row {i}", "spec")
+        approx.add_entry(f"r{i}", f"row {i}", "spec")
+
+    query = exact.encoder.encode("probe").vector
+    full = approx.knn_search(query, top_k=10, n_probe=8)
+    narrow = approx.knn_search(query, top_k=10, n_probe=1)
+
+    assert [e.entry_id for e, _ in full] == [e.entry_id for e, _ in exact.knn_search(query, 10)]
+    assert len(narrow) <= 10
@@ -1,5 +1,25 @@
+import json
+
+from pipeline.lib.canonical import GENESIS_HASH, hash_canonical_without_integrity
+
+
 def run_standard_flow(machine):
     """Executes a standard state transition sequence for testing."""
     machine.trigger("initialize")
     machine.trigger("validate")
     machine.trigger("execute")
+
+
+def read_ledger(path):
+    """Load every record of a JSONL ledger."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def assert_ledger_chain(records):
+    """Assert each record links to its predecessor and carries a valid integrity hash."""
+    prev = GENESIS_HASH
+    for record in records:
+        assert record["prev_ledger_hash"] == prev
+        stored = record["integrity_hash"]
+        assert hash_canonical_without_integrity(dict(record)) == stored
+        prev = stored
@@ -5,6 +5,12 @@ import hashlib
 import pathlib
 from typing import Any, List, Optional
 
+import numpy as np
+
+# Weights that turn an 8-bit little-endian window of the hash into a byte value
+_BYTE_WEIGHTS = (1 << np.arange(8, dtype=np.uint16)).astype(np.uint16)
+_HASH_BITS = 128
+
 
 @dataclass
 class Embedding:
@@ -45,23 +51,50 @@ class EmbeddingEncoder:
         Returns:
             Embedding object with vector and metadata
         """
-        # Placeholder: normalized hash-based vector
-        # In production: call sentence-transformers or LLM embedding API
-        hash_val = int(hashlib.md5(text.encode()).hexdigest(), 16)
-        vector = [((hash_val >> i) % 256) / 256.0 for i in range(self.dim)]
-
-        # Normalize to unit norm (for cosine similarity)
-        norm = sum(x ** 2 for x in vector) ** 0.5
-        if norm > 0:
-            vector = [x / norm for x in vector]
-
-        return Embedding(text=text, vector=vector, metadata=metadata or {})
+        return self.encode_batch([text], [metadata or {}])[0]
 
     def encode_batch(self, texts: List[str], metadata: Optional[List[dict]] = None) -> List[Embedding]:
-        """Encode multiple texts efficiently."""
+        """Encode multiple texts in one vectorized pass."""
         if metadata is None:
             metadata = [{}] * len(texts)
-        return [self.encode(text, meta) for text, meta in zip(texts, metadata)]
+        vectors = self.encode_matrix(texts)
+        return [
+            Embedding(text=text, vector=vector, metadata=meta or {})
+            for text, vector, meta in zip(texts, vectors.tolist(), metadata)
+        ]
+
+    def encode_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts into an ``(len(texts), dim)`` float64 matrix of unit rows.
+
+        Placeholder: normalized hash-based vector. Row ``i`` element ``j`` is
+        ``((md5(text) >> j) % 256) / 256`` scaled to unit norm, computed for
+        the whole batch from the unpacked digest bits.
+        In production: call sentence-transformers or LLM embedding API.
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float64)
+        if not texts:
+            return matrix
+
+        digests = np.frombuffer(
+            b"".join(hashlib.md5(text.encode()).digest() for text in texts),
+            dtype=np.uint8,
+        ).reshape(len(texts), 16)
+        # Little-endian bit order of the 128-bit integer, zero-padded so every
+        # 8-bit window starting below bit 128 is defined.
+        bits = np.unpackbits(digests[:, ::-1], axis=1, bitorder="little")
+        bits = np.pad(bits, ((0, 0), (0, 8)))
+        windows = np.lib.stride_tricks.sliding_window_view(bits, 8, axis=1)[:, :_HASH_BITS]
+        width = min(self.dim, _HASH_BITS)
+        byte_values = windows[:, :width] @ _BYTE_WEIGHTS
+        matrix[:, :width] = byte_values / 256.0
+
+        # Values are multiples of 2**-8, so the sum of squares is exact and
+        # matches the scalar path bit-for-bit.
+        norms = np.array([float(value) ** 0.5 for value in np.square(matrix).sum(axis=1)])
+        nonzero = norms > 0
+        matrix[nonzero] /= norms[nonzero, np.newaxis]
+        return matrix
 
     def __repr__(self) -> str:
         return f"<EmbeddingEncoder dim={self.dim}>"
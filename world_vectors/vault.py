@@ -1,7 +1,10 @@
 """Vector vault for semantic search and pattern matching."""
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence
+
+import numpy as np
+
 from world_vectors.encoder import EmbeddingEncoder, Embedding
 
 
@@ -14,12 +17,90 @@ class VaultEntry:
     retrieval_count: int = 0
 
 
+class IVFIndex:
+    """
+    Inverted-file approximate index over the vault's normalized rows.
+
+    Rows are clustered with a few seeded spherical k-means iterations; a query
+    scores the centroids and only scans rows in the ``n_probe`` best lists.
+    Raising ``n_probe`` trades latency for recall (``n_probe == n_lists`` is
+    exact).
+    """
+
+    def __init__(self, n_lists: int = 64, n_probe: int = 8, train_iters: int = 10, seed: int = 0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_iters = train_iters
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.trained_rows = 0
+
+    def train(self, matrix: np.ndarray) -> None:
+        """Fit centroids on ``matrix`` (unit rows) and assign every row."""
+        n_rows = matrix.shape[0]
+        n_lists = max(1, min(self.n_lists, n_rows))
+        rng = np.random.default_rng(self.seed)
+        centroids = matrix[rng.choice(n_rows, size=n_lists, replace=False)].copy()
+        for _ in range(self.train_iters):
+            labels = np.argmax(matrix @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, matrix)
+            counts = np.bincount(labels, minlength=n_lists)
+            centroids = np.where(counts[:, np.newaxis] > 0, sums, centroids)
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms > 0, norms, 1.0)
+        self.centroids = centroids
+        self.assignments = np.argmax(matrix @ centroids.T, axis=1).astype(np.int32)
+        self.trained_rows = n_rows
+
+    def assign(self, row: int, vector: np.ndarray) -> None:
+        """Place a new or updated row in its nearest list."""
+        if row >= len(self.assignments):
+            grown = np.zeros(max(row + 1, 2 * len(self.assignments)), dtype=np.int32)
+            grown[: len(self.assignments)] = self.assignments
+            self.assignments = grown
+        self.assignments[row] = int(np.argmax(self.centroids @ vector))
+
+    def candidate_mask(self, query: np.ndarray, n_rows: int, n_probe: Optional[int] = None) -> np.ndarray:
+        """Boolean mask over the first ``n_rows`` rows living in the probed lists."""
+        probe = max(1, min(n_probe or self.n_probe, len(self.centroids)))
+        centroid_scores = self.centroids @ query
+        lists = np.argpartition(-centroid_scores, probe - 1)[:probe]
+        return np.isin(self.assignments[:n_rows], lists)
+
+
 class VectorVault:
-    """Persistent semantic knowledge vault with cosine similarity search."""
+    """
+    Persistent semantic knowledge vault with cosine similarity search.
+
+    Embeddings live in a contiguous, pre-normalized float32 matrix (one row per
+    entry, in insertion order) with a boolean row mask per ref_type, so a
+    query is a single mat-vec plus an argpartition for top-k. Pass
+    ``ann_threshold`` to switch to an IVF approximate scan once the vault has
+    at least that many entries; ``ann_probe`` (or ``n_probe`` per query) is
+    the recall-vs-latency knob.
+    """
 
-    def __init__(self, encoder: Optional[EmbeddingEncoder] = None):
+    _INITIAL_CAPACITY = 64
+
+    def __init__(
+        self,
+        encoder: Optional[EmbeddingEncoder] = None,
+        ann_threshold: Optional[int] = None,
+        ann_lists: int = 64,
+        ann_probe: int = 8,
+    ):
         self.encoder = encoder or EmbeddingEncoder(dim=768)
         self._entries: Dict[str, VaultEntry] = {}
+        self._rows: Dict[str, int] = {}
+        self._row_entries: List[VaultEntry] = []
+        self._matrix = np.zeros((self._INITIAL_CAPACITY, self.encoder.dim), dtype=np.float32)
+        self._type_masks: Dict[str, np.ndarray] = {}
+        self._ann_threshold = ann_threshold
+        self._ann: Optional[IVFIndex] = (
+            IVFIndex(n_lists=ann_lists, n_probe=ann_probe) if ann_threshold is not None else None
+        )
         self._load_defaults()
 
     def _load_defaults(self) -> None:
@@ -105,9 +186,16 @@ ESC Engagement: {supra_specs['handling_characteristics']['skid_pad_g']}g thresho
         embedding = self.encoder.encode(text, metadata=metadata)
         entry = VaultEntry(entry_id=ref_id, embedding=embedding, ref_type=ref_type)
         self._entries[ref_id] = entry
+        self._store_row(entry)
         return entry
 
-    def search(self, query: str, top_k: int = 5, ref_type_filter: Optional[str] = None) -> List[Tuple[VaultEntry, float]]:
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        ref_type_filter: Optional[str] = None,
+        n_probe: Optional[int] = None,
+    ) -> List[Tuple[VaultEntry, float]]:
         """
         Semantic search via cosine similarity.
 
@@ -115,46 +203,123 @@ ESC Engagement: {supra_specs['handling_characteristics']['skid_pad_g']}g thresho
             query: Text query
             top_k: Number of results to return
             ref_type_filter: Optional filter by reference type
+            n_probe: IVF lists to scan when the approximate index is active
 
         Returns:
             List of (VaultEntry, similarity_score) tuples, sorted by score desc
         """
         query_embedding = self.encoder.encode(query)
-        scores = []
+        if ref_type_filter:
+            mask = self._type_masks.get(ref_type_filter)
+            if mask is None:
+                return []
+            mask = mask[: len(self._row_entries)]
+        else:
+            mask = None
+        return self._top_k(query_embedding.vector, top_k, mask, n_probe)
 
-        for entry_id, entry in self._entries.items():
-            if ref_type_filter and entry.ref_type != ref_type_filter:
-                continue
+    def knn_search(
+        self, vector: Sequence[float], top_k: int = 5, n_probe: Optional[int] = None
+    ) -> List[Tuple[VaultEntry, float]]:
+        """KNN search using pre-computed vector."""
+        return self._top_k(vector, top_k, None, n_probe)
 
-            # Cosine similarity
-            sim = self._cosine_similarity(query_embedding.vector, entry.embedding.vector)
-            scores.append((entry, sim))
+    def _top_k(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        mask: Optional[np.ndarray],
+        n_probe: Optional[int],
+    ) -> List[Tuple[VaultEntry, float]]:
+        n_rows = len(self._row_entries)
+        if n_rows == 0 or top_k <= 0:
+            return []
 
-        # Sort by similarity, descending
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+        query = self._normalize(vector)
+        if self._ann_active():
+            candidates = self._ann.candidate_mask(query, n_rows, n_probe)
+            mask = candidates if mask is None else (mask & candidates)
 
-    def knn_search(self, vector: List[float], top_k: int = 5) -> List[Tuple[VaultEntry, float]]:
-        """KNN search using pre-computed vector."""
-        scores = []
-        for entry_id, entry in self._entries.items():
-            sim = self._cosine_similarity(vector, entry.embedding.vector)
-            scores.append((entry, sim))
+        if mask is None:
+            rows = np.arange(n_rows)
+            scores = self._matrix[:n_rows] @ query
+        else:
+            rows = np.flatnonzero(mask)
+            if rows.size == 0:
+                return []
+            scores = self._matrix[rows] @ query
+
+        k = min(top_k, rows.size)
+        if k < rows.size:
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            picked = np.flatnonzero(scores >= kth)
+        else:
+            picked = np.arange(rows.size)
+        # Score descending, insertion order on ties (matches a stable full sort)
+        order = picked[np.lexsort((rows[picked], -scores[picked]))][:k]
+        return [(self._row_entries[rows[i]], float(scores[i])) for i in order]
+
+    def _ann_active(self) -> bool:
+        if self._ann is None or len(self._row_entries) < self._ann_threshold:
+            return False
+        n_rows = len(self._row_entries)
+        if self._ann.centroids is None or n_rows >= 2 * self._ann.trained_rows:
+            self._ann.train(self._matrix[:n_rows])
+        return True
+
+    def _store_row(self, entry: VaultEntry) -> None:
+        row = self._rows.get(entry.entry_id)
+        if row is None:
+            row = len(self._row_entries)
+            if row == self._matrix.shape[0]:
+                self._grow(2 * row)
+            self._rows[entry.entry_id] = row
+            self._row_entries.append(entry)
+        else:
+            previous = self._row_entries[row]
+            self._type_masks[previous.ref_type][row] = False
+            self._row_entries[row] = entry
+
+        vector = self._normalize(entry.embedding.vector)
+        self._matrix[row] = vector
+        mask = self._type_masks.get(entry.ref_type)
+        if mask is None:
+            mask = np.zeros(self._matrix.shape[0], dtype=bool)
+            self._type_masks[entry.ref_type] = mask
+        mask[row] = True
+
+        if self._ann is not None and self._ann.centroids is not None:
+            self._ann.assign(row, vector)
+
+    def _grow(self, capacity: int) -> None:
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[: self._matrix.shape[0]] = self._matrix
+        self._matrix = matrix
+        for ref_type, mask in self._type_masks.items():
+            grown = np.zeros(capacity, dtype=bool)
+            grown[: mask.shape[0]] = mask
+            self._type_masks[ref_type] = grown
 
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray:
+        """Unit float32 row; zero for empty or dimension-mismatched vectors."""
+        array = np.asarray(vector, dtype=np.float32).ravel()
+        if array.shape[0] != self._matrix.shape[1]:
+            return np.zeros(self._matrix.shape[1], dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
 
     @staticmethod
     def _cosine_similarity(v1: List[float], v2: List[float]) -> float:
         """Compute cosine similarity between two vectors."""
         if len(v1) != len(v2):
             return 0.0
-        dot = sum(a * b for a, b in zip(v1, v2))
-        norm1 = sum(a ** 2 for a in v1) ** 0.5
-        norm2 = sum(b ** 2 for b in v2) ** 0.5
+        a = np.asarray(v1, dtype=np.float64)
+        b = np.asarray(v2, dtype=np.float64)
+        norm1 = np.linalg.norm(a)
+        norm2 = np.linalg.norm(b)
         if norm1 == 0 or norm2 == 0:
             return 0.0
-        return dot / (norm1 * norm2)
+        return float(a @ b / (norm1 * norm2))
 
     def list_entries(self, ref_type: Optional[str] = None) -> List[VaultEntry]:
         """List all entries, optionally filtered by type."""